@@ -17,12 +17,22 @@ is used as a catch-all but actually contains:
 Appends CSI columns to the original taxonomy file (does not create separate file).
 New columns added: dim_csi_section_id, csi_section, csi_inference_source, csi_title
 
+With --incremental, only tasks of schedule versions (file_ids) not yet
+enriched are inferred, e.g. rows just appended by generate_task_taxonomy.py
+--incremental, and only their task names are kept from task.csv. All rows
+are inferred again when CSI_RULES_VERSION changed or the taxonomy was
+rebuilt; rows whose task_id has no file_id prefix are always inferred.
+Enriched versions are recorded in the taxonomy's state file (see
+pipeline_utils.read_output_state). The taxonomy itself is still read and
+rewritten whole, since the CSI columns are added to every row.
+
 Input/Output:
     {WINDOWS_DATA_DIR}/processed/primavera/p6_task_taxonomy.csv
 
 Usage:
     python -m scripts.integrated_analysis.add_csi_to_p6_tasks
     python -m scripts.integrated_analysis.add_csi_to_p6_tasks --dry-run
+    python -m scripts.integrated_analysis.add_csi_to_p6_tasks --incremental
 """
 
 import argparse
@@ -37,11 +47,20 @@ _project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(_project_root))
 
 from src.config.settings import settings
-from scripts.shared.pipeline_utils import get_output_path
+from scripts.shared.pipeline_utils import get_output_path, read_output_state, write_output_state
 
 # Import shared CSI definitions
 from scripts.integrated_analysis.add_csi_to_raba import CSI_SECTIONS
 
+# Bump when CSI inference rules (keywords, code mappings) change
+# (incremental runs then re-infer every task)
+CSI_RULES_VERSION = 1
+
+CSI_COLUMNS = ['dim_csi_section_id', 'csi_section', 'csi_inference_source', 'csi_title']
+
+# Rows of task.csv read at a time when only some task names are needed
+TASK_NAME_CHUNK_SIZE = 200_000
+
 # Keyword patterns for task_name-based CSI inference
 # Order matters - more specific patterns checked first
 # Format: (keywords_list, csi_section_id, description)
@@ -291,8 +310,33 @@ def infer_csi_from_taxonomy(
     return None, None, "none"
 
 
-def add_csi_to_p6_tasks(dry_run: bool = False, staging_dir: Path = None):
-    """Add CSI section IDs to P6 task taxonomy (appends to original file)."""
+def task_file_ids(task_ids: pd.Series) -> pd.Series:
+    """file_id prefix of each task_id (NaN if the task_id has none)."""
+    return pd.to_numeric(task_ids.astype(str).str.split('_', n=1).str[0], errors='coerce')
+
+
+def load_task_names(task_path: Path, task_ids: Optional[set] = None) -> dict:
+    """task_id -> task_name from task.csv, limited to task_ids if given."""
+    if task_ids is None:
+        tasks_df = pd.read_csv(task_path, low_memory=False, usecols=['task_id', 'task_name'])
+        return tasks_df.set_index('task_id')['task_name'].to_dict()
+
+    names = {}
+    for chunk in pd.read_csv(task_path, usecols=['task_id', 'task_name'], chunksize=TASK_NAME_CHUNK_SIZE):
+        chunk = chunk[chunk['task_id'].astype(str).isin(task_ids)]
+        names.update(zip(chunk['task_id'], chunk['task_name']))
+    return names
+
+
+def add_csi_to_p6_tasks(dry_run: bool = False, staging_dir: Path = None, incremental: bool = False):
+    """
+    Add CSI section IDs to P6 task taxonomy (appends to original file).
+
+    Args:
+        dry_run: Preview without writing output
+        staging_dir: Read from and write to staging directory
+        incremental: Only infer tasks of schedule versions not enriched yet
+    """
 
     # When staging_dir is provided, read from and write to staging
     input_path = get_output_path('primavera/p6_task_taxonomy.csv', staging_dir)
@@ -305,15 +349,36 @@ def add_csi_to_p6_tasks(dry_run: bool = False, staging_dir: Path = None):
         return
 
     print(f"Loading task taxonomy from: {input_path}")
+    state = read_output_state(input_path)
     df = pd.read_csv(input_path, low_memory=False)
     print(f"Loaded {len(df):,} records")
 
+    file_ids = None
+    pending = pd.Series(True, index=df.index)
+    if incremental:
+        csi_state = state.get('csi')
+        if (
+            csi_state is None
+            or csi_state['rules_version'] != CSI_RULES_VERSION
+            or not set(CSI_COLUMNS).issubset(df.columns)
+        ):
+            print("Incremental: no current CSI state, inferring all tasks")
+        else:
+            # task_id is prefixed with its file_id; rows without one stay pending
+            file_ids = task_file_ids(df['task_id'])
+            pending = ~file_ids.isin(csi_state['file_ids'])
+            if not pending.any():
+                print("Incremental: CSI sections already added for all schedule versions")
+                return df
+            new_ids = sorted(int(file_id) for file_id in file_ids[pending].dropna().unique())
+            print(f"Incremental: {pending.sum():,} tasks of {len(new_ids)} new schedule version(s): {new_ids}")
+
     # Load task names for keyword-based inference
     task_names = None
     if task_path.exists():
         print(f"Loading task names from: {task_path}")
-        tasks_df = pd.read_csv(task_path, low_memory=False, usecols=['task_id', 'task_name'])
-        task_names = tasks_df.set_index('task_id')['task_name'].to_dict()
+        wanted = None if pending.all() else set(df.loc[pending, 'task_id'].astype(str))
+        task_names = load_task_names(task_path, wanted)
         print(f"Loaded {len(task_names):,} task names")
     else:
         print("Warning: task.csv not found, keyword-based inference disabled")
@@ -327,7 +392,7 @@ def add_csi_to_p6_tasks(dry_run: bool = False, staging_dir: Path = None):
             return None
         return task_names.get(task_id)
 
-    results = df.apply(
+    results = df[pending].apply(
         lambda row: infer_csi_from_taxonomy(
             get_task_name(row.get('task_id')),
             row.get('sub_trade'),
@@ -336,9 +401,12 @@ def add_csi_to_p6_tasks(dry_run: bool = False, staging_dir: Path = None):
         axis=1
     )
 
-    df['dim_csi_section_id'] = results.apply(lambda x: x[0])
-    df['csi_section'] = results.apply(lambda x: x[1])
-    df['csi_inference_source'] = results.apply(lambda x: x[2])
+    for i, column in enumerate(['dim_csi_section_id', 'csi_section', 'csi_inference_source']):
+        values = results.apply(lambda x: x[i])
+        if pending.all():
+            df[column] = values
+        else:
+            df.loc[pending, column] = values
 
     # Add CSI title for reference
     df['csi_title'] = df['dim_csi_section_id'].apply(
@@ -374,6 +442,11 @@ def add_csi_to_p6_tasks(dry_run: bool = False, staging_dir: Path = None):
 
     if not dry_run:
         df.to_csv(output_path, index=False)
+        if file_ids is None:
+            file_ids = task_file_ids(df['task_id'])
+        enriched = sorted(int(file_id) for file_id in file_ids.dropna().unique())
+        state['csi'] = {'rules_version': CSI_RULES_VERSION, 'file_ids': enriched}
+        write_output_state(output_path, state)
         print(f"\nCSI columns appended to: {output_path}")
     else:
         print("\nDRY RUN - no changes written")
@@ -386,9 +459,11 @@ def main():
     parser.add_argument('--dry-run', action='store_true', help='Preview without writing output')
     parser.add_argument('--staging-dir', type=Path, default=None,
                         help='Read from and write to staging directory')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only infer tasks of schedule versions not enriched yet')
     args = parser.parse_args()
 
-    add_csi_to_p6_tasks(dry_run=args.dry_run, staging_dir=args.staging_dir)
+    add_csi_to_p6_tasks(dry_run=args.dry_run, staging_dir=args.staging_dir, incremental=args.incremental)
 
 
 if __name__ == "__main__":
@@ -174,6 +174,7 @@ Command line:
     python -m scripts.integrated_analysis.schedule_slippage_analysis --year 2025 --month 9
     python -m scripts.integrated_analysis.schedule_slippage_analysis --prev-file 82 --curr-file 83
     python -m scripts.integrated_analysis.schedule_slippage_analysis --list-schedules
+    python -m scripts.integrated_analysis.schedule_slippage_analysis --all-months --workers 4
 
 Programmatic:
     analyzer = ScheduleSlippageAnalyzer()
@@ -181,12 +182,20 @@ Programmatic:
     # result['tasks'] - DataFrame with task-level metrics
     # result['project_metrics'] - dict with project-level metrics
     # result['new_tasks'] - DataFrame with new task analysis
+
+    # Every month at once (outputs under processed/integrated/schedule_slippage/YYYY-MM/)
+    summary = analyzer.analyze_all_months(workers=4)
 """
 
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext, redirect_stdout
+import hashlib
+import io
+import os
 import sys
 import argparse
 
@@ -194,6 +203,10 @@ import argparse
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.config.settings import settings
+from scripts.primavera.process.schedule_deltas import load_schedule_deltas, relationship_changes
+from scripts.integrated_analysis.slippage_data import RelationshipIndex, TaskSnapshotStore
+from scripts.integrated_analysis.slippage_cache import ComparisonCache
+from scripts.primavera.analyze.schedule_store import CACHE_DIRNAME
 
 
 ###############################################################################
@@ -215,6 +228,10 @@ FLOAT_SQUEEZE_THRESHOLD_DAYS = -5
 # Working hours per day for float conversion (P6 stores float in hours)
 HOURS_PER_WORKDAY = 8
 
+# Version of the compare_schedules output persisted by ComparisonCache
+# Bump whenever a change to compare_schedules alters its results
+COMPARISON_CACHE_VERSION = 1
+
 # Impact score weights (legacy - kept for backwards compatibility)
 CRITICALITY_WEIGHT = 2      # Tasks on critical path weighted 2x
 DRIVING_PATH_WEIGHT = 1.5   # Tasks on driving path weighted 1.5x
@@ -254,6 +271,248 @@ TIER_WEIGHTS = {
 }
 
 
+###############################################################################
+# TASK CATEGORIZATION RULES
+###############################################################################
+#
+# The rules are evaluated as column logic over the matched-task frame built by
+# compare_schedules ('common'). np.select picks the first matching condition,
+# so each condition list is in the same priority order as the if/elif chain it
+# replaces. Missing metrics count as 0, except float_loss_from_front/back,
+# where NaN fails every comparison.
+
+def _days(common, column):
+    """A metric column with missing values as 0."""
+    return common[column].fillna(0)
+
+
+def _flag(common, column):
+    """A boolean flag column; missing columns are False."""
+    if column not in common.columns:
+        return pd.Series(False, index=common.index)
+    return common[column].astype(bool)
+
+
+def categorize_tasks(common):
+    """
+    Assign a delay category to each task based on status and metrics.
+
+    Categories:
+        ACTIVE_DELAYER: In-progress task causing delay (own_delay > threshold AND finish slipped)
+        COMPLETED_DELAYER: Finished task that finished late (own_delay > threshold AND finish slipped)
+        WAITING_INHERITED: Not-started task with inherited delay
+        WAITING_SQUEEZED: Not-started task with significant float erosion
+        *_OK: Tasks not causing or experiencing significant delay
+
+    Note on DELAYER logic:
+        A task is only a "delayer" if BOTH conditions are true:
+        1. own_delay > threshold (task took longer than its duration estimate)
+        2. finish_slip > 0 (task's finish date actually moved later)
+
+        This prevents false positives where a task started early, took longer than
+        estimated, but still finishes on time or early. Such tasks have positive
+        own_delay but negative finish_slip - they're not causing project delay.
+
+    Args:
+        common: Matched tasks with status_curr, own_delay_days, inherited_delay_days,
+                float_change_days and finish_slip_days
+
+    Returns:
+        ndarray of category names, aligned with common
+    """
+    status = common['status_curr']
+    completed = status == 'TK_Complete'
+    active = status == 'TK_Active'
+    # Must have BOTH own_delay (took longer) AND finish_slip (actually slipped)
+    delayer = (_days(common, 'own_delay_days') > OWN_DELAY_THRESHOLD_DAYS) & (_days(common, 'finish_slip_days') > 0)
+
+    return np.select(
+        [
+            completed & delayer,
+            completed,
+            active & delayer,
+            active,
+            # Not-started tasks: check inherited delay and float squeeze
+            _days(common, 'inherited_delay_days') > INHERITED_DELAY_THRESHOLD_DAYS,
+            _days(common, 'float_change_days') < FLOAT_SQUEEZE_THRESHOLD_DAYS,
+        ],
+        ['COMPLETED_DELAYER', 'COMPLETED_OK', 'ACTIVE_DELAYER', 'ACTIVE_OK',
+         'WAITING_INHERITED', 'WAITING_SQUEEZED'],
+        default='WAITING_OK',
+    )
+
+
+def categorize_tasks_enhanced(common):
+    """
+    Enhanced categorization with full multi-dimensional attribution.
+
+    This provides more granular categories than categorize_tasks() by
+    considering backward pass (late date changes), constraint changes,
+    and relationship changes.
+
+    Categories:
+        CAUSE_DURATION: Task took longer (own_delay > threshold, no significant inherited)
+        CAUSE_CONSTRAINT: Task constraint was tightened
+        CAUSE_LOGIC_CHANGE: New predecessors added that pushed dates
+        INHERITED_FROM_PRED: Pushed by predecessors (start_slip > 0, own_delay ~ 0)
+        INHERITED_LOGIC_CHANGE: Inherited delay from new predecessor relationship
+        SQUEEZED_FROM_SUCC: Float loss from backward pull (successors/project constraint)
+        CAUSE_PLUS_INHERITED: Both own delay and inherited delay
+        DUAL_SQUEEZE: Float compressed from both directions
+        COMPLETED_OK: Completed without delay impact
+        ACTIVE_OK: Active without delay impact
+        WAITING_OK: Waiting without delay impact
+
+    Returns:
+        ndarray of category names, aligned with common
+    """
+    status = common['status_curr']
+    completed = status == 'TK_Complete'
+    active = status == 'TK_Active'
+    delayer = (_days(common, 'own_delay_days') > OWN_DELAY_THRESHOLD_DAYS) & (_days(common, 'finish_slip_days') > 0)
+    inherited = _days(common, 'inherited_delay_days')
+    squeezed = _days(common, 'float_change_days') < FLOAT_SQUEEZE_THRESHOLD_DAYS
+    float_loss_front = common['float_loss_from_front'] if 'float_loss_from_front' in common.columns else 0
+    float_loss_back = common['float_loss_from_back'] if 'float_loss_from_back' in common.columns else 0
+    constraint_tightened = _flag(common, 'constraint_tightened')
+    has_new_preds = _flag(common, 'has_new_predecessors')
+
+    return np.select(
+        [
+            # Completed tasks - simpler logic
+            completed & delayer & constraint_tightened,
+            completed & delayer,
+            completed,
+            # Active tasks - check what's causing the delay
+            active & delayer & constraint_tightened,
+            active & delayer & (inherited > OWN_DELAY_THRESHOLD_DAYS),
+            active & delayer,
+            active,
+            # Not-started tasks, in priority order:
+            # constraint > logic change > dual squeeze > backward pull > inherited > squeezed
+            constraint_tightened & squeezed,
+            has_new_preds & (inherited > INHERITED_DELAY_THRESHOLD_DAYS),
+            (float_loss_front > 1) & (float_loss_back > 1),
+            (float_loss_back > float_loss_front + 1) & squeezed,
+            inherited > INHERITED_DELAY_THRESHOLD_DAYS,
+            # Float squeeze without clear direction
+            squeezed & (float_loss_back > float_loss_front),
+            squeezed,
+        ],
+        ['CAUSE_CONSTRAINT', 'CAUSE_DURATION', 'COMPLETED_OK',
+         'CAUSE_CONSTRAINT', 'CAUSE_PLUS_INHERITED', 'CAUSE_DURATION', 'ACTIVE_OK',
+         'CAUSE_CONSTRAINT', 'INHERITED_LOGIC_CHANGE', 'DUAL_SQUEEZE', 'SQUEEZED_FROM_SUCC',
+         'INHERITED_FROM_PRED', 'SQUEEZED_FROM_SUCC', 'WAITING_SQUEEZED'],
+        default='WAITING_OK',
+    )
+
+
+def classify_priority_tiers(common):
+    """
+    Classify each task into a priority tier based on float status.
+
+    Tiers (in priority order):
+        DRIVING: On driving path with positive own_delay - direct project impact
+        CRITICAL: Float <= 0 (but not driving) - on parallel critical path
+        NEAR_CRITICAL: 0 < float <= 14 days - at risk of becoming critical
+        ERODING: Float lost > 7 days this period - accumulating issues
+        BUFFERED: Float > 14 days and stable - has runway
+
+    Note: Tasks with own_delay <= 0 still get tiered but will have low/zero
+    priority_score since score = own_delay × tier_weight.
+
+    Returns:
+        ndarray of tier names, aligned with common
+    """
+    # Handle NaN float (completed tasks, milestones)
+    # Treat as non-critical unless on driving path
+    float_curr = (common['total_float_hr_cnt_curr'] / HOURS_PER_WORKDAY).fillna(999)
+
+    return np.select(
+        [
+            common['on_driving_path'].astype(bool) & (_days(common, 'own_delay_days') > OWN_DELAY_THRESHOLD_DAYS),
+            float_curr <= 0,
+            float_curr <= TIER_NEAR_CRITICAL_FLOAT_THRESHOLD_DAYS,
+            _days(common, 'float_change_days') < -TIER_ERODING_FLOAT_LOSS_THRESHOLD_DAYS,
+        ],
+        ['DRIVING', 'CRITICAL', 'NEAR_CRITICAL', 'ERODING'],
+        default='BUFFERED',
+    )
+
+
+def priority_scores(own_delay_days, priority_tier):
+    """
+    priority_score = max(0, own_delay) × tier_weight.
+
+    This gives a single number for ranking that incorporates both magnitude
+    and urgency. Unknown tiers weigh 1.
+    """
+    weights = pd.Series(priority_tier, index=own_delay_days.index).map(TIER_WEIGHTS).fillna(1)
+    return own_delay_days.fillna(0).clip(lower=0) * weights.astype(int)
+
+
+###############################################################################
+# ROOT CAUSE TRACING
+###############################################################################
+
+def trace_driving_roots(next_task, cause_type, starts):
+    """
+    Resolve root causes over a driving-predecessor forest.
+
+    Each task points to the predecessor it inherits its delay from
+    (next_task[t] >= 0) or is its own root cause (next_task[t] == -1). Walking
+    from each start, every task is resolved once and reused by later walks:
+
+        root(t)  = t                  if next_task[t] == -1
+                 = root(next_task[t]) otherwise
+        depth(t) = 0 or depth(next_task[t]) + 1
+
+    A walk that comes back to a task already on its own path (a logic loop)
+    treats that task as the root with cause 'UNKNOWN'; depths along the loop
+    count steps to the point where the walk returned.
+
+    Args:
+        next_task: int array, driving predecessor per task (-1 = root cause)
+        cause_type: object array, cause type of each task if it is a root
+        starts: Task indices to resolve, in order
+
+    Returns:
+        (root, root_type, depth) arrays over all tasks; only tasks reachable
+        from starts are resolved (root -1 elsewhere)
+    """
+    n = len(next_task)
+    root = np.full(n, -1, dtype=np.int64)
+    root_type = np.full(n, None, dtype=object)
+    depth = np.zeros(n, dtype=np.int64)
+    on_path = np.zeros(n, dtype=bool)
+
+    for start in starts:
+        path = []
+        task = start
+        while root[task] < 0 and not on_path[task]:
+            on_path[task] = True
+            path.append(task)
+            if next_task[task] < 0:
+                root[task], root_type[task] = task, cause_type[task]
+                break
+            task = next_task[task]
+
+        if root[task] < 0:
+            # Logic loop: the walk returned to `task`
+            for position, looped in enumerate(path):
+                root[looped], root_type[looped] = task, 'UNKNOWN'
+                depth[looped] = len(path) - position
+        else:
+            for upstream in reversed(path):
+                if upstream != task:
+                    driver = next_task[upstream]
+                    root[upstream], root_type[upstream] = root[driver], root_type[driver]
+                    depth[upstream] = depth[driver] + 1
+        on_path[path] = False
+
+    return root, root_type, depth
+
+
 ###############################################################################
 # MAIN ANALYZER CLASS
 ###############################################################################
@@ -270,8 +529,9 @@ class ScheduleSlippageAnalyzer:
 
     Attributes:
         primavera_dir (Path): Directory containing processed P6 CSV files
-        tasks_df (DataFrame): All task records across all snapshots
+        tasks (TaskSnapshotStore): All task records across all snapshots (compact)
         files_df (DataFrame): Schedule snapshot metadata (file_id, date, etc.)
+        comparisons (ComparisonCache): Persisted compare_schedules results (None if disabled)
 
     Example:
         >>> analyzer = ScheduleSlippageAnalyzer()
@@ -279,29 +539,37 @@ class ScheduleSlippageAnalyzer:
         >>> print(f"Project slipped {result['project_metrics']['project_slippage_days']} days")
     """
 
-    def __init__(self):
+    def __init__(self, primavera_dir=None, use_cache=True):
         """
         Initialize analyzer by loading P6 data from processed CSV files.
 
         Loads:
-            - task.csv: ~470K task records across ~90 schedule snapshots
             - xer_files.csv: Metadata mapping file_id to snapshot dates
+            - project.csv: Data date of each snapshot
+
+        task.csv and taskpred.csv are loaded on first use (see `tasks` and
+        `relationships`), so comparisons served from the cache never read them.
+
+        Args:
+            primavera_dir: Processed P6 directory (default: settings.PRIMAVERA_PROCESSED_DIR)
+            use_cache: Persist compare_schedules results under
+                       {primavera_dir}/_cache/slippage_comparisons and reuse them
         """
-        self.primavera_dir = settings.PRIMAVERA_PROCESSED_DIR
-        self.tasks_df = None
+        self.primavera_dir = Path(primavera_dir) if primavera_dir is not None else settings.PRIMAVERA_PROCESSED_DIR
         self.files_df = None
+        self._tasks = None
+        self._schedule_deltas = None
+        self._relationships = None
+        self.comparisons = ComparisonCache(
+            self.primavera_dir / CACHE_DIRNAME / 'slippage_comparisons',
+            self.primavera_dir,
+            self.snapshot_fingerprint,
+            version=COMPARISON_CACHE_VERSION,
+        ) if use_cache else None
         self._load_data()
 
     def _load_data(self):
-        """
-        Load P6 task and file data from CSV files.
-
-        Loads only the columns needed for slippage analysis to minimize memory:
-            - Identifiers: file_id, task_id, task_code, task_name
-            - Dates: early_start/end, late_start/end, target_start/end, actual_start/end
-            - Criticality: total_float_hr_cnt, driving_path_flag
-            - Status: status_code, remain_drtn_hr_cnt
-        """
+        """Load schedule snapshot metadata and data dates from CSV files."""
         print("Loading P6 data...")
 
         # Load schedule snapshot metadata (file_id -> date mapping)
@@ -321,31 +589,70 @@ class ScheduleSlippageAnalyzer:
             self.data_date_by_file = {}
             print("  Warning: project.csv not found, data_date lookup not available")
 
-        # Define columns needed for analysis
-        # NOTE: We load all date fields even though we primarily use early_start/end
-        # because target dates may be useful for baseline comparison in future
-        # ENHANCED: Added constraint columns (cstr_type, cstr_date) for constraint change detection
-        cols_needed = [
-            'file_id', 'task_id', 'task_code', 'task_name', 'status_code',
-            'early_start_date', 'early_end_date', 'late_start_date', 'late_end_date',
-            'target_start_date', 'target_end_date', 'act_start_date', 'act_end_date',
-            'total_float_hr_cnt', 'remain_drtn_hr_cnt', 'target_drtn_hr_cnt', 'driving_path_flag',
-            'cstr_type', 'cstr_date'  # Constraint type and date for enhanced attribution
-        ]
+        # Precomputed snapshot deltas (written at ingestion); None if not generated
+        self._schedule_deltas = load_schedule_deltas(self.primavera_dir)
 
-        # Load tasks with date parsing
-        # NOTE: This is ~230MB in memory for 470K records
-        self.tasks_df = pd.read_csv(
-            self.primavera_dir / 'task.csv',
-            usecols=cols_needed,
-            parse_dates=['early_start_date', 'early_end_date',
-                        'late_start_date', 'late_end_date',
-                        'target_start_date', 'target_end_date',
-                        'act_start_date', 'act_end_date',
-                        'cstr_date']  # Parse constraint date
-        )
+    @property
+    def tasks(self):
+        """
+        Task records of all snapshots, read from task.csv on first use.
 
-        print(f"  Loaded {len(self.tasks_df):,} task records across {self.tasks_df['file_id'].nunique()} schedules")
+        Loads only the columns needed for slippage analysis to minimize memory:
+            - Identifiers: file_id, task_id, task_code, task_name
+            - Dates: early_start/end, late_start/end, target_start/end, actual_start/end
+            - Criticality: total_float_hr_cnt, driving_path_flag
+            - Status: status_code, remain_drtn_hr_cnt
+
+        Returns:
+            TaskSnapshotStore
+        """
+        if self._tasks is None:
+            # Load tasks (columns in slippage_data.TASK_COLUMNS) into a compact store
+            # NOTE: We load all date fields even though we primarily use early_start/end
+            # because target dates may be useful for baseline comparison in future
+            # ENHANCED: Added constraint columns (cstr_type, cstr_date) for constraint change detection
+            # NOTE: As a plain DataFrame this is ~230MB for 470K records; the store keeps
+            # text fields as categoricals and dates as int64 minutes, sorted by file_id
+            self._tasks = TaskSnapshotStore.from_csv(self.primavera_dir / 'task.csv')
+            print(f"  Loaded {len(self._tasks):,} task records across {len(self._tasks.file_ids())} schedules")
+        return self._tasks
+
+    @property
+    def relationships(self):
+        """
+        Predecessor relationships of all snapshots, translated to task_codes.
+
+        taskpred.csv is the largest processed table, so it is read once (on
+        first use) into a RelationshipIndex shared by every comparison.
+
+        Returns:
+            RelationshipIndex, or None if taskpred.csv does not exist
+        """
+        if self._relationships is None:
+            taskpred_path = self.primavera_dir / 'taskpred.csv'
+            if not taskpred_path.exists():
+                return None
+            self._relationships = RelationshipIndex.from_csv(taskpred_path, self.tasks.df)
+            print(f"  Indexed {len(self._relationships.pred):,} relationships")
+        return self._relationships
+
+    def snapshot_fingerprint(self, file_id):
+        """
+        Content hash of one snapshot's inputs to compare_schedules.
+
+        Hashes the snapshot's task rows, its relationships (by task_code) and
+        its data date from the data the analyzer holds, so task.csv and
+        taskpred.csv are read once however many snapshots are fingerprinted.
+        Values are hashed, not vocabulary codes, so the hash is unchanged when
+        other snapshots are added to the tables.
+        """
+        digest = hashlib.sha1()
+        digest.update(pd.util.hash_pandas_object(self.tasks.snapshot(file_id), index=False).to_numpy().tobytes())
+        if self.relationships is not None:
+            relationships = self.relationships.relationships(file_id)
+            digest.update(pd.util.hash_pandas_object(relationships, index=False).to_numpy().tobytes())
+        digest.update(str(self.data_date_by_file.get(file_id)).encode())
+        return digest.hexdigest()
 
     def _load_taxonomy_for_file(self, file_id):
         """
@@ -380,8 +687,8 @@ class ScheduleSlippageAnalyzer:
             return pd.DataFrame()
 
         # Get task_code mapping from task.csv
-        # Note: task_id in self.tasks_df already has the "{file_id}_" prefix
-        task_lookup = self.tasks_df[self.tasks_df['file_id'] == file_id][['task_id', 'task_code']].copy()
+        # Note: task_id in the task store already has the "{file_id}_" prefix
+        task_lookup = self.tasks.frame(file_id)[['task_id', 'task_code']]
 
         # Join taxonomy with task_code
         taxonomy = taxonomy.merge(task_lookup, on='task_id', how='inner')
@@ -413,12 +720,18 @@ class ScheduleSlippageAnalyzer:
 
         Note:
             P6 relationships use task_id (internal numeric IDs), not task_code.
-            This method joins with task data to translate to task_codes for
-            cross-snapshot comparison.
+            The relationship index translates them to task_codes once, at load
+            time, for cross-snapshot comparison.
+
+            Consecutive snapshot pairs are looked up in taskpred_delta.csv when
+            available; other pairs are diffed from taskpred.csv.
         """
-        # Load relationship data (taskpred.csv)
-        taskpred_path = self.primavera_dir / 'taskpred.csv'
-        if not taskpred_path.exists():
+        precomputed = relationship_changes(self._schedule_deltas, file_id_prev, file_id_curr)
+        if precomputed is not None:
+            return precomputed
+
+        relationships = self.relationships
+        if relationships is None:
             return {
                 'added_relationships': [],
                 'removed_relationships': [],
@@ -427,50 +740,10 @@ class ScheduleSlippageAnalyzer:
                 'new_pred_count': {}
             }
 
-        taskpred_df = pd.read_csv(taskpred_path)
-
-        # Get relationships for each file_id
-        rels_prev = taskpred_df[taskpred_df['file_id'] == file_id_prev][
-            ['task_id', 'pred_task_id', 'pred_type']
-        ].copy()
-        rels_curr = taskpred_df[taskpred_df['file_id'] == file_id_curr][
-            ['task_id', 'pred_task_id', 'pred_type']
-        ].copy()
-
-        # Build task_id -> task_code mappings for both snapshots
-        tasks_prev = self.tasks_df[self.tasks_df['file_id'] == file_id_prev][
-            ['task_id', 'task_code']
-        ].copy()
-        tasks_curr = self.tasks_df[self.tasks_df['file_id'] == file_id_curr][
-            ['task_id', 'task_code']
-        ].copy()
-
-        # Create lookup dicts
-        id_to_code_prev = dict(zip(tasks_prev['task_id'].astype(str), tasks_prev['task_code']))
-        id_to_code_curr = dict(zip(tasks_curr['task_id'].astype(str), tasks_curr['task_code']))
-
-        # Convert relationships to (pred_code, succ_code, type) tuples
-        def rel_to_tuple(row, id_to_code):
-            pred_id = str(row['pred_task_id'])
-            succ_id = str(row['task_id'])
-            pred_code = id_to_code.get(pred_id)
-            succ_code = id_to_code.get(succ_id)
-            if pred_code and succ_code:
-                return (pred_code, succ_code, row['pred_type'])
-            return None
-
-        rels_prev_set = set(
-            t for t in (rel_to_tuple(row, id_to_code_prev) for _, row in rels_prev.iterrows())
-            if t is not None
-        )
-        rels_curr_set = set(
-            t for t in (rel_to_tuple(row, id_to_code_curr) for _, row in rels_curr.iterrows())
-            if t is not None
-        )
-
-        # Find added and removed relationships
-        added = rels_curr_set - rels_prev_set
-        removed = rels_prev_set - rels_curr_set
+        # Find added and removed relationships as (pred_code, succ_code, type) tuples
+        added_keys, removed_keys = relationships.diff(file_id_prev, file_id_curr)
+        added = relationships.decode(added_keys)
+        removed = relationships.decode(removed_keys)
 
         # Extract affected tasks
         tasks_with_new_preds = {rel[1] for rel in added}  # succ_task_code
@@ -483,8 +756,8 @@ class ScheduleSlippageAnalyzer:
             new_pred_count[succ_code] = new_pred_count.get(succ_code, 0) + 1
 
         return {
-            'added_relationships': list(added),
-            'removed_relationships': list(removed),
+            'added_relationships': added,
+            'removed_relationships': removed,
             'tasks_with_new_preds': tasks_with_new_preds,
             'tasks_with_removed_preds': tasks_with_removed_preds,
             'new_pred_count': new_pred_count
@@ -500,12 +773,16 @@ class ScheduleSlippageAnalyzer:
         the delay from upstream tasks).
 
         Algorithm:
-            1. Build predecessor lookup from taskpred.csv
-            2. For each task with float decrease:
-               a. If own_delay >= threshold × float_decrease → ROOT_CAUSE
-               b. Else, trace upstream through predecessors
-               c. Find the first task in the chain that is a ROOT_CAUSE
-            3. Calculate propagation depth from root cause
+            1. For every task, decide once whether it is a ROOT_CAUSE:
+               a. own_delay >= threshold × float_decrease, a tightened
+                  constraint, new predecessors, or no predecessors
+               b. Otherwise its driving predecessor is the predecessor with the
+                  most float decrease, if that is >= 50% of the task's own
+                  decrease; without one the task is a ROOT_CAUSE
+            2. Driving predecessors form a forest over the predecessor DAG.
+               Resolve each task's root cause and depth in one memoized pass
+               (trace_driving_roots), so shared upstream chains are walked once
+            3. Count the affected tasks that trace back to each root cause
 
         Args:
             comparison_result: Output from compare_schedules()
@@ -537,8 +814,8 @@ class ScheduleSlippageAnalyzer:
             return pd.DataFrame()
 
         # Load predecessor relationships for the current schedule
-        taskpred_path = self.primavera_dir / 'taskpred.csv'
-        if not taskpred_path.exists():
+        relationships = self.relationships
+        if relationships is None:
             # No relationship data - mark all as root causes
             result = affected_tasks[['task_code']].copy()
             result['is_root_cause'] = True
@@ -548,142 +825,69 @@ class ScheduleSlippageAnalyzer:
             result['downstream_impact_count'] = 0
             return result
 
-        taskpred_df = pd.read_csv(taskpred_path)
-        rels_curr = taskpred_df[taskpred_df['file_id'] == file_id_curr][
-            ['task_id', 'pred_task_id']
-        ].copy()
-
-        # Build task_id -> task_code mapping
-        tasks_curr = self.tasks_df[self.tasks_df['file_id'] == file_id_curr][
-            ['task_id', 'task_code']
-        ].copy()
-        id_to_code = dict(zip(tasks_curr['task_id'].astype(str), tasks_curr['task_code']))
-
-        # Build predecessor adjacency: task_code -> list of predecessor task_codes
-        pred_adjacency = {}
-        for _, row in rels_curr.iterrows():
-            succ_code = id_to_code.get(str(row['task_id']))
-            pred_code = id_to_code.get(str(row['pred_task_id']))
-            if succ_code and pred_code:
-                if succ_code not in pred_adjacency:
-                    pred_adjacency[succ_code] = []
-                pred_adjacency[succ_code].append(pred_code)
-
-        # Create lookup dict for task metrics
-        task_metrics = {}
-        for _, row in tasks_df.iterrows():
-            task_metrics[row['task_code']] = {
-                'own_delay': row.get('own_delay_days', 0) or 0,
-                'float_change': row.get('float_change_days', 0) or 0,
-                'constraint_tightened': row.get('constraint_tightened', False),
-                'has_new_predecessors': row.get('has_new_predecessors', False),
-            }
-
-        # Memoization for root cause tracing
-        root_cause_cache = {}  # task_code -> (root_cause_task, cause_type, depth)
-
-        def determine_cause_type(task_code: str) -> str:
-            """Determine the type of cause for a root cause task."""
-            metrics = task_metrics.get(task_code, {})
-            if metrics.get('constraint_tightened', False):
-                return 'CONSTRAINT'
-            if metrics.get('has_new_predecessors', False):
-                return 'LOGIC_CHANGE'
-            if abs(metrics.get('own_delay', 0)) > 1:
-                return 'DURATION'
-            return 'UNKNOWN'
-
-        def trace_upstream(task_code: str, visited: set = None, depth: int = 0) -> tuple:
-            """
-            Recursively trace upstream to find root cause.
-
-            Returns (root_cause_task, cause_type, propagation_depth)
-            """
-            if visited is None:
-                visited = set()
-
-            # Prevent infinite loops in cyclic graphs
-            if task_code in visited:
-                return (task_code, 'UNKNOWN', depth)
-            visited.add(task_code)
-
-            # Check cache
-            if task_code in root_cause_cache:
-                cached = root_cause_cache[task_code]
-                return (cached[0], cached[1], cached[2] + depth)
-
-            metrics = task_metrics.get(task_code, {})
-            own_delay = abs(metrics.get('own_delay', 0))
-            float_decrease = abs(metrics.get('float_change', 0))
-
-            # Task is ROOT_CAUSE if own_delay explains the float decrease
-            if float_decrease > 0 and own_delay >= own_delay_threshold * float_decrease:
-                cause_type = determine_cause_type(task_code)
-                root_cause_cache[task_code] = (task_code, cause_type, 0)
-                return (task_code, cause_type, depth)
-
-            # Task is ROOT_CAUSE if it has constraint or logic change
-            if metrics.get('constraint_tightened', False):
-                root_cause_cache[task_code] = (task_code, 'CONSTRAINT', 0)
-                return (task_code, 'CONSTRAINT', depth)
-
-            if metrics.get('has_new_predecessors', False):
-                root_cause_cache[task_code] = (task_code, 'LOGIC_CHANGE', 0)
-                return (task_code, 'LOGIC_CHANGE', depth)
-
-            # Otherwise, trace upstream through predecessors
-            predecessors = pred_adjacency.get(task_code, [])
-            if not predecessors:
-                # No predecessors - this task is the root cause by default
-                cause_type = determine_cause_type(task_code)
-                root_cause_cache[task_code] = (task_code, cause_type, 0)
-                return (task_code, cause_type, depth)
-
-            # Find predecessor with most float decrease
-            max_pred_float_decrease = 0
-            max_pred = None
-            for pred_code in predecessors:
-                pred_metrics = task_metrics.get(pred_code, {})
-                pred_float_decrease = abs(pred_metrics.get('float_change', 0))
-                if pred_float_decrease > max_pred_float_decrease:
-                    max_pred_float_decrease = pred_float_decrease
-                    max_pred = pred_code
-
-            # If a predecessor has significant float decrease, trace upstream
-            if max_pred and max_pred_float_decrease >= float_decrease * 0.5:
-                result = trace_upstream(max_pred, visited, depth + 1)
-                root_cause_cache[task_code] = (result[0], result[1], result[2] - depth)
-                return result
-
-            # No predecessor with significant float decrease - this task is root cause
-            cause_type = determine_cause_type(task_code)
-            root_cause_cache[task_code] = (task_code, cause_type, 0)
-            return (task_code, cause_type, depth)
-
-        # Trace root causes for all affected tasks
-        results = []
-        for _, row in affected_tasks.iterrows():
-            task_code = row['task_code']
-            root_cause, cause_type, prop_depth = trace_upstream(task_code)
-            results.append({
-                'task_code': task_code,
-                'is_root_cause': root_cause == task_code,
-                'root_cause_task': root_cause,
-                'cause_type': cause_type,
-                'propagation_depth': prop_depth,
-            })
-
-        result_df = pd.DataFrame(results)
+        # Task metrics indexed by task code (relationship index vocabulary, plus
+        # any compared task it does not know); duplicate task_codes: last row wins
+        task_codes = relationships.task_codes
+        unknown = pd.Index(tasks_df['task_code'].unique()).difference(task_codes)
+        if len(unknown) > 0:
+            task_codes = task_codes.append(unknown)
+        n = len(task_codes)
+        rows = task_codes.get_indexer(tasks_df['task_code'])
+
+        def metric(column, default, dtype):
+            values = np.full(n, default, dtype=dtype)
+            if column in tasks_df.columns:
+                values[rows] = tasks_df[column].to_numpy(dtype=dtype)
+            return values
+
+        # Missing metrics are 0; NaN metrics stay NaN and fail every comparison
+        own_delay = np.abs(metric('own_delay_days', 0, float))
+        float_decrease = np.abs(metric('float_change_days', 0, float))
+        constraint_tightened = metric('constraint_tightened', False, bool)
+        has_new_preds = metric('has_new_predecessors', False, bool)
+
+        cause_type = np.select(
+            [constraint_tightened, has_new_preds, own_delay > 1],
+            ['CONSTRAINT', 'LOGIC_CHANGE', 'DURATION'],
+            default='UNKNOWN',
+        ).astype(object)
+
+        # Driving predecessor: the first predecessor (in export order) with the
+        # largest positive float decrease
+        pred, succ, _ = relationships.codes(file_id_curr)
+        has_preds = np.zeros(n, dtype=bool)
+        has_preds[succ] = True
+        pred_decrease = float_decrease[pred]
+        positive = pred_decrease > 0
+        cand_pred, cand_succ, cand_decrease = pred[positive], succ[positive], pred_decrease[positive]
+        order = np.lexsort((np.arange(len(cand_succ)), -cand_decrease, cand_succ))
+        first = np.r_[True, cand_succ[order][1:] != cand_succ[order][:-1]] if len(order) else np.zeros(0, bool)
+        max_pred = np.full(n, -1, dtype=np.int64)
+        max_pred_decrease = np.zeros(n)
+        max_pred[cand_succ[order][first]] = cand_pred[order][first]
+        max_pred_decrease[cand_succ[order][first]] = cand_decrease[order][first]
+
+        # A task propagates from its driving predecessor unless it is a root cause
+        is_root = (
+            ((float_decrease > 0) & (own_delay >= own_delay_threshold * float_decrease)) |
+            constraint_tightened | has_new_preds | ~has_preds
+        )
+        follows = ~is_root & (max_pred >= 0) & (max_pred_decrease >= float_decrease * 0.5)
+        next_task = np.where(follows, max_pred, -1)
+
+        starts = task_codes.get_indexer(affected_tasks['task_code'])
+        root, root_type, depth = trace_driving_roots(next_task, cause_type, starts)
+
+        result_df = pd.DataFrame({
+            'task_code': affected_tasks['task_code'].to_numpy(),
+            'is_root_cause': root[starts] == starts,
+            'root_cause_task': task_codes[root[starts]].to_numpy(),
+            'cause_type': root_type[starts],
+            'propagation_depth': depth[starts],
+        })
 
         # Calculate downstream impact for each root cause
-        if len(result_df) > 0:
-            root_cause_counts = result_df.groupby('root_cause_task').size()
-            result_df['downstream_impact_count'] = result_df['root_cause_task'].map(
-                lambda x: root_cause_counts.get(x, 0)
-            )
-        else:
-            result_df['downstream_impact_count'] = 0
-
+        result_df['downstream_impact_count'] = np.bincount(root[starts], minlength=n)[root[starts]]
         return result_df
 
     def get_ordered_schedules(self, schedule_type='YATES'):
@@ -744,8 +948,11 @@ class ScheduleSlippageAnalyzer:
             date_prev: Optional datetime for labeling (cosmetic only)
             date_curr: Optional datetime for labeling (cosmetic only)
 
+        Results are persisted in the analyzer's ComparisonCache and reused
+        while neither snapshot's task, relationship or project data changes.
+
         Returns:
-            dict with three keys:
+            dict with four keys:
                 'tasks': DataFrame with columns:
                     - task_code, task_name, status
                     - early_end_prev, early_end_curr, early_start_prev, early_start_curr
@@ -767,19 +974,35 @@ class ScheduleSlippageAnalyzer:
                     - on_driving_path, is_critical
                     - delay_category, potential_impact_days
 
+                'relationship_changes': dict from _compare_relationships()
+
         Algorithm:
-            1. Extract tasks for each file_id from the master DataFrame
+            1. Extract tasks for each file_id from the task snapshot store
             2. Calculate project finish as max(early_end_date) on driving path
             3. Merge tasks on task_code with outer join to detect added/removed
             4. For common tasks: compute finish_slip, start_slip, own_delay
             5. Categorize tasks based on status and delay metrics
             6. Analyze new tasks for critical path impact
         """
+        if self.comparisons is not None:
+            cached = self.comparisons.get(file_id_prev, file_id_curr, date_prev, date_curr)
+            if cached is not None:
+                print(f"  Loaded cached comparison (file_id={file_id_prev} -> {file_id_curr}): "
+                      f"{len(cached['tasks']):,} tasks")
+                return cached
+
+        result = self._compare_schedules(file_id_prev, file_id_curr, date_prev, date_curr)
+        if self.comparisons is not None:
+            self.comparisons.put(file_id_prev, file_id_curr, result, date_prev, date_curr)
+        return result
+
+    def _compare_schedules(self, file_id_prev, file_id_curr, date_prev, date_curr):
+        """compare_schedules() without the result cache."""
         # =========================================================================
         # STEP 1: Extract task sets for both snapshots
         # =========================================================================
-        tasks_prev = self.tasks_df[self.tasks_df['file_id'] == file_id_prev].copy()
-        tasks_curr = self.tasks_df[self.tasks_df['file_id'] == file_id_curr].copy()
+        tasks_prev = self.tasks.frame(file_id_prev)
+        tasks_curr = self.tasks.frame(file_id_curr)
 
         print(f"  Previous schedule (file_id={file_id_prev}): {len(tasks_prev):,} tasks")
         print(f"  Current schedule (file_id={file_id_curr}): {len(tasks_curr):,} tasks")
@@ -898,7 +1121,8 @@ class ScheduleSlippageAnalyzer:
             return {
                 'tasks': pd.DataFrame(),
                 'project_metrics': project_metrics,
-                'new_tasks': pd.DataFrame()
+                'new_tasks': pd.DataFrame(),
+                'relationship_changes': relationship_changes
             }
 
         # -------------------------------------------------------------------------
@@ -1032,45 +1256,20 @@ class ScheduleSlippageAnalyzer:
         #   - is_fast_tracked: Flag for analyst review
 
         # Load predecessor relationships for current snapshot
-        taskpred_path = self.primavera_dir / 'taskpred.csv'
+        relationships = self.relationships
         has_incomplete_pred = pd.Series(False, index=common.index)
 
-        if taskpred_path.exists():
-            taskpred_df = pd.read_csv(taskpred_path)
-            rels_curr = taskpred_df[taskpred_df['file_id'] == file_id_curr][
-                ['task_id', 'pred_task_id', 'pred_type']
-            ].copy()
-
-            # Build mapping: task_id -> status in current snapshot
-            # Need to get task_id for each task_code in common
-            task_status_curr = self.tasks_df[self.tasks_df['file_id'] == file_id_curr][
-                ['task_id', 'task_code', 'status_code']
-            ].copy()
-            task_id_to_status = task_status_curr.set_index('task_id')['status_code'].to_dict()
-            task_code_to_id = task_status_curr.set_index('task_code')['task_id'].to_dict()
-
-            # For each task, check if it has any incomplete predecessors
-            def check_incomplete_preds(task_code):
-                task_id = task_code_to_id.get(task_code)
-                if task_id is None:
-                    return False
-
-                # Get predecessors for this task
-                preds = rels_curr[rels_curr['task_id'] == task_id]['pred_task_id'].tolist()
-                if not preds:
-                    return False
-
-                # Check if any predecessor is NOT complete
-                for pred_id in preds:
-                    pred_status = task_id_to_status.get(pred_id)
-                    if pred_status and pred_status != 'TK_Complete':
-                        return True
-                return False
-
-            # Only check for tasks that were active in both snapshots
-            active_task_codes = common[was_active_both]['task_code'].tolist()
-            incomplete_pred_flags = {tc: check_incomplete_preds(tc) for tc in active_task_codes}
-            has_incomplete_pred = common['task_code'].map(incomplete_pred_flags).fillna(False)
+        if relationships is not None:
+            rels_curr = relationships.relationships(file_id_curr)
+
+            # Status of each predecessor in the current snapshot
+            status_by_code = tasks_curr.drop_duplicates('task_code', keep='last').set_index('task_code')['status_code']
+            pred_status = rels_curr['pred_task_code'].astype(object).map(status_by_code)
+
+            # Tasks with any predecessor that is NOT complete
+            incomplete = pred_status.notna() & (pred_status != 'TK_Complete')
+            tasks_with_incomplete_preds = set(rels_curr.loc[incomplete, 'task_code'].astype(object))
+            has_incomplete_pred = common['task_code'].isin(tasks_with_incomplete_preds)
 
         # is_fast_tracked: Active in both snapshots AND has incomplete predecessors
         common['is_fast_tracked'] = was_active_both & has_incomplete_pred
@@ -1319,138 +1518,12 @@ class ScheduleSlippageAnalyzer:
         # =========================================================================
         # Each task is assigned to one of these categories based on its status
         # and delay metrics. Thresholds are defined as module constants.
-        def categorize_task(row):
-            """
-            Assign a delay category to a task based on status and metrics.
-
-            Categories:
-                ACTIVE_DELAYER: In-progress task causing delay (own_delay > threshold AND finish slipped)
-                COMPLETED_DELAYER: Finished task that finished late (own_delay > threshold AND finish slipped)
-                WAITING_INHERITED: Not-started task with inherited delay
-                WAITING_SQUEEZED: Not-started task with significant float erosion
-                *_OK: Tasks not causing or experiencing significant delay
-
-            Note on DELAYER logic:
-                A task is only a "delayer" if BOTH conditions are true:
-                1. own_delay > threshold (task took longer than its duration estimate)
-                2. finish_slip > 0 (task's finish date actually moved later)
-
-                This prevents false positives where a task started early, took longer than
-                estimated, but still finishes on time or early. Such tasks have positive
-                own_delay but negative finish_slip - they're not causing project delay.
-            """
-            status = row['status_curr']
-            own_delay = row['own_delay_days'] if pd.notna(row['own_delay_days']) else 0
-            inherited = row['inherited_delay_days'] if pd.notna(row['inherited_delay_days']) else 0
-            float_change = row['float_change_days'] if pd.notna(row['float_change_days']) else 0
-            finish_slip = row['finish_slip_days'] if pd.notna(row['finish_slip_days']) else 0
-
-            if status == 'TK_Complete':
-                # Completed tasks: check if they finished late
-                # Must have BOTH own_delay (took longer) AND finish_slip (actually slipped)
-                if own_delay > OWN_DELAY_THRESHOLD_DAYS and finish_slip > 0:
-                    return 'COMPLETED_DELAYER'
-                return 'COMPLETED_OK'
-            elif status == 'TK_Active':
-                # Active tasks: check if they're running behind
-                # Must have BOTH own_delay (taking longer) AND finish_slip (finish date moved later)
-                if own_delay > OWN_DELAY_THRESHOLD_DAYS and finish_slip > 0:
-                    return 'ACTIVE_DELAYER'
-                return 'ACTIVE_OK'
-            else:  # TK_NotStart
-                # Not-started tasks: check inherited delay and float squeeze
-                if inherited > INHERITED_DELAY_THRESHOLD_DAYS:
-                    return 'WAITING_INHERITED'
-                if float_change < FLOAT_SQUEEZE_THRESHOLD_DAYS:
-                    return 'WAITING_SQUEEZED'
-                return 'WAITING_OK'
-
-        common['delay_category'] = common.apply(categorize_task, axis=1)
+        common['delay_category'] = categorize_tasks(common)
 
         # -------------------------------------------------------------------------
         # STEP 5.5: ENHANCED categorization with multi-dimensional attribution
         # -------------------------------------------------------------------------
-        def categorize_task_enhanced(row):
-            """
-            Enhanced categorization with full multi-dimensional attribution.
-
-            This provides more granular categories than the original categorize_task()
-            by considering backward pass (late date changes), constraint changes,
-            and relationship changes.
-
-            Categories:
-                CAUSE_DURATION: Task took longer (own_delay > threshold, no significant inherited)
-                CAUSE_CONSTRAINT: Task constraint was tightened
-                CAUSE_LOGIC_CHANGE: New predecessors added that pushed dates
-                INHERITED_FROM_PRED: Pushed by predecessors (start_slip > 0, own_delay ~ 0)
-                INHERITED_LOGIC_CHANGE: Inherited delay from new predecessor relationship
-                SQUEEZED_FROM_SUCC: Float loss from backward pull (successors/project constraint)
-                CAUSE_PLUS_INHERITED: Both own delay and inherited delay
-                DUAL_SQUEEZE: Float compressed from both directions
-                COMPLETED_OK: Completed without delay impact
-                ACTIVE_OK: Active without delay impact
-                WAITING_OK: Waiting without delay impact
-            """
-            status = row['status_curr']
-            own_delay = row['own_delay_days'] if pd.notna(row['own_delay_days']) else 0
-            inherited = row['inherited_delay_days'] if pd.notna(row['inherited_delay_days']) else 0
-            float_change = row['float_change_days'] if pd.notna(row['float_change_days']) else 0
-            finish_slip = row['finish_slip_days'] if pd.notna(row['finish_slip_days']) else 0
-            float_loss_front = row.get('float_loss_from_front', 0) or 0
-            float_loss_back = row.get('float_loss_from_back', 0) or 0
-            constraint_tightened = row.get('constraint_tightened', False)
-            has_new_preds = row.get('has_new_predecessors', False)
-
-            # Completed tasks - simpler logic
-            if status == 'TK_Complete':
-                if own_delay > OWN_DELAY_THRESHOLD_DAYS and finish_slip > 0:
-                    if constraint_tightened:
-                        return 'CAUSE_CONSTRAINT'
-                    return 'CAUSE_DURATION'
-                return 'COMPLETED_OK'
-
-            # Active tasks - check what's causing the delay
-            if status == 'TK_Active':
-                if own_delay > OWN_DELAY_THRESHOLD_DAYS and finish_slip > 0:
-                    if constraint_tightened:
-                        return 'CAUSE_CONSTRAINT'
-                    if inherited > OWN_DELAY_THRESHOLD_DAYS:
-                        return 'CAUSE_PLUS_INHERITED'
-                    return 'CAUSE_DURATION'
-                return 'ACTIVE_OK'
-
-            # Not-started tasks - full multi-dimensional analysis
-            # Priority order: constraint > logic change > own duration > inherited > squeezed
-
-            # Constraint tightening is a direct cause
-            if constraint_tightened and float_change < FLOAT_SQUEEZE_THRESHOLD_DAYS:
-                return 'CAUSE_CONSTRAINT'
-
-            # New predecessors causing delay
-            if has_new_preds and inherited > INHERITED_DELAY_THRESHOLD_DAYS:
-                return 'INHERITED_LOGIC_CHANGE'
-
-            # Check for dual squeeze (both forward and backward pressure)
-            if float_loss_front > 1 and float_loss_back > 1:
-                return 'DUAL_SQUEEZE'
-
-            # Primarily backward pull (squeezed by successors/project constraint)
-            if float_loss_back > float_loss_front + 1 and float_change < FLOAT_SQUEEZE_THRESHOLD_DAYS:
-                return 'SQUEEZED_FROM_SUCC'
-
-            # Standard inherited delay
-            if inherited > INHERITED_DELAY_THRESHOLD_DAYS:
-                return 'INHERITED_FROM_PRED'
-
-            # Float squeeze without clear direction
-            if float_change < FLOAT_SQUEEZE_THRESHOLD_DAYS:
-                if float_loss_back > float_loss_front:
-                    return 'SQUEEZED_FROM_SUCC'
-                return 'WAITING_SQUEEZED'
-
-            return 'WAITING_OK'
-
-        common['delay_category_enhanced'] = common.apply(categorize_task_enhanced, axis=1)
+        common['delay_category_enhanced'] = categorize_tasks_enhanced(common)
 
         # -------------------------------------------------------------------------
         # STEP 5.6: TIER-BASED PRIORITY CLASSIFICATION (Simplified Model)
@@ -1462,61 +1535,11 @@ class ScheduleSlippageAnalyzer:
         #
         # Tasks with positive own_delay are ranked by: priority_score = own_delay × tier_weight
         # This ensures a 10-day DRIVING delay ranks above a 100-day BUFFERED delay.
-
-        def classify_priority_tier(row):
-            """
-            Classify a task into a priority tier based on float status.
-
-            Tiers (in priority order):
-                DRIVING: On driving path with positive own_delay - direct project impact
-                CRITICAL: Float <= 0 (but not driving) - on parallel critical path
-                NEAR_CRITICAL: 0 < float <= 14 days - at risk of becoming critical
-                ERODING: Float lost > 7 days this period - accumulating issues
-                BUFFERED: Float > 14 days and stable - has runway
-
-            Note: Tasks with own_delay <= 0 still get tiered but will have low/zero
-            priority_score since score = own_delay × tier_weight.
-            """
-            own_delay = row['own_delay_days'] if pd.notna(row['own_delay_days']) else 0
-            # Calculate float_curr_days from raw hours (result column doesn't exist yet in common)
-            float_curr_hrs = row['total_float_hr_cnt_curr']
-            float_curr = float_curr_hrs / HOURS_PER_WORKDAY if pd.notna(float_curr_hrs) else None
-            float_change = row['float_change_days'] if pd.notna(row['float_change_days']) else 0
-            on_driving = row['on_driving_path']
-
-            # Handle NaN float (completed tasks, milestones)
-            # Treat as non-critical unless on driving path
-            if float_curr is None or pd.isna(float_curr):
-                float_curr = 999  # Effectively buffered
-
-            # Tier 1: DRIVING - on driving path with positive own_delay
-            if on_driving and own_delay > OWN_DELAY_THRESHOLD_DAYS:
-                return 'DRIVING'
-
-            # Tier 2: CRITICAL - float <= 0 (on critical path)
-            if float_curr <= 0:
-                return 'CRITICAL'
-
-            # Tier 3: NEAR_CRITICAL - float > 0 but <= threshold (at risk)
-            if float_curr <= TIER_NEAR_CRITICAL_FLOAT_THRESHOLD_DAYS:
-                return 'NEAR_CRITICAL'
-
-            # Tier 4: ERODING - losing float rapidly (accumulating issues)
-            if float_change < -TIER_ERODING_FLOAT_LOSS_THRESHOLD_DAYS:
-                return 'ERODING'
-
-            # Tier 5: BUFFERED - has runway
-            return 'BUFFERED'
-
-        common['priority_tier'] = common.apply(classify_priority_tier, axis=1)
+        common['priority_tier'] = classify_priority_tiers(common)
 
         # Calculate priority_score = own_delay × tier_weight
         # This gives a single number for ranking that incorporates both magnitude and urgency
-        common['priority_score'] = common.apply(
-            lambda row: max(0, row['own_delay_days'] if pd.notna(row['own_delay_days']) else 0) *
-                        TIER_WEIGHTS.get(row['priority_tier'], 1),
-            axis=1
-        )
+        common['priority_score'] = priority_scores(common['own_delay_days'], common['priority_tier'])
 
         # Also calculate float_prev for the tier report
         common['float_prev_days'] = common['total_float_hr_cnt_prev'] / HOURS_PER_WORKDAY
@@ -1647,9 +1670,10 @@ class ScheduleSlippageAnalyzer:
             # Categorize new tasks by criticality
             # NEW_CRITICAL: Added to critical/driving path (potential schedule pushers)
             # NEW_NONCRITICAL: Added but not on critical path (absorbed by float)
-            new_tasks['delay_category'] = new_tasks.apply(
-                lambda r: 'NEW_CRITICAL' if (r['on_driving_path'] or r['is_critical']) else 'NEW_NONCRITICAL',
-                axis=1
+            new_tasks['delay_category'] = np.where(
+                new_tasks['on_driving_path'] | new_tasks['is_critical'],
+                'NEW_CRITICAL',
+                'NEW_NONCRITICAL'
             )
 
             # Calculate potential schedule impact for new critical tasks
@@ -1688,7 +1712,8 @@ class ScheduleSlippageAnalyzer:
         return {
             'tasks': result,
             'project_metrics': project_metrics,
-            'new_tasks': new_tasks
+            'new_tasks': new_tasks,
+            'relationship_changes': relationship_changes
         }
 
     def get_top_slippage_contributors(self, comparison_df, top_n=25,
@@ -3331,45 +3356,24 @@ class ScheduleSlippageAnalyzer:
 
         return "\n".join(lines)
 
-    def analyze_month(self, year, month):
+    def select_month_snapshots(self, year, month, schedules=None):
         """
-        Analyze schedule slippage for a specific calendar month.
+        Select the snapshot pair that analyze_month() compares for a month.
 
-        This is a convenience method that automatically selects appropriate
-        schedule snapshots for comparison. It uses:
         - Previous snapshot: Last snapshot BEFORE the month started
         - Current snapshot: Last snapshot DURING the month (or first after if none)
 
-        This selection ensures we capture all schedule changes that occurred
-        during the month, including any that happened before the first snapshot
-        of the month.
-
         Args:
             year: Calendar year (e.g., 2025)
-            month: Calendar month (1-12, where 1=January)
+            month: Calendar month (1-12)
+            schedules: Output of get_ordered_schedules() (loaded if None)
 
         Returns:
-            dict from compare_schedules() with:
-                - 'tasks': DataFrame with task-level slippage metrics
-                - 'project_metrics': dict with project-level slippage
-                - 'new_tasks': DataFrame with new task analysis
-            Returns None if no suitable schedule snapshots exist.
-
-        Example:
-            >>> result = analyzer.analyze_month(2025, 9)  # September 2025
-            >>> print(f"Project slipped {result['project_metrics']['project_slippage_days']} days")
-
-        Snapshot Selection Logic:
-            Month: September 2025
-            Available snapshots: [..., Aug 22, Sep 5, Sep 12, Sep 25, Oct 3, ...]
-
-            prev = Aug 22  (last snapshot BEFORE Sep 1)
-            curr = Sep 25  (last snapshot IN September)
-
-            If no September snapshots exist:
-            curr = Oct 3   (first snapshot AFTER September)
+            (prev_schedule, curr_schedule) rows of schedules, or None if no
+            suitable snapshots exist
         """
-        schedules = self.get_ordered_schedules()
+        if schedules is None:
+            schedules = self.get_ordered_schedules()
 
         # Define month boundaries
         month_start = datetime(year, month, 1)
@@ -3403,6 +3407,51 @@ class ScheduleSlippageAnalyzer:
         # Select previous snapshot: last one before month start
         prev_schedule = before_month.iloc[-1]
 
+        return prev_schedule, curr_schedule
+
+    def analyze_month(self, year, month):
+        """
+        Analyze schedule slippage for a specific calendar month.
+
+        This is a convenience method that automatically selects appropriate
+        schedule snapshots for comparison. It uses:
+        - Previous snapshot: Last snapshot BEFORE the month started
+        - Current snapshot: Last snapshot DURING the month (or first after if none)
+
+        This selection ensures we capture all schedule changes that occurred
+        during the month, including any that happened before the first snapshot
+        of the month.
+
+        Args:
+            year: Calendar year (e.g., 2025)
+            month: Calendar month (1-12, where 1=January)
+
+        Returns:
+            dict from compare_schedules() with:
+                - 'tasks': DataFrame with task-level slippage metrics
+                - 'project_metrics': dict with project-level slippage
+                - 'new_tasks': DataFrame with new task analysis
+            Returns None if no suitable schedule snapshots exist.
+
+        Example:
+            >>> result = analyzer.analyze_month(2025, 9)  # September 2025
+            >>> print(f"Project slipped {result['project_metrics']['project_slippage_days']} days")
+
+        Snapshot Selection Logic:
+            Month: September 2025
+            Available snapshots: [..., Aug 22, Sep 5, Sep 12, Sep 25, Oct 3, ...]
+
+            prev = Aug 22  (last snapshot BEFORE Sep 1)
+            curr = Sep 25  (last snapshot IN September)
+
+            If no September snapshots exist:
+            curr = Oct 3   (first snapshot AFTER September)
+        """
+        selected = self.select_month_snapshots(year, month)
+        if selected is None:
+            return None
+        prev_schedule, curr_schedule = selected
+
         print(f"\nAnalyzing {year}-{month:02d}:")
         print(f"  Previous: {prev_schedule['snapshot_date'].strftime('%Y-%m-%d')} (file_id={prev_schedule['file_id']})")
         print(f"  Current: {curr_schedule['snapshot_date'].strftime('%Y-%m-%d')} (file_id={curr_schedule['file_id']})")
@@ -3634,6 +3683,152 @@ class ScheduleSlippageAnalyzer:
 
         return report
 
+    def save_comparison(self, comparison_result, output_dir):
+        """
+        Write a comparison's outputs to a directory.
+
+        Files:
+            - tasks.csv: comparison_result['tasks']
+            - new_tasks.csv: comparison_result['new_tasks']
+            - project_metrics.csv: comparison_result['project_metrics'] (one row)
+            - slippage_report.md: generate_slippage_report() output
+
+        Args:
+            comparison_result: Output from compare_schedules()
+            output_dir: Directory to write (created if needed)
+
+        Returns:
+            Path of the output directory
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        comparison_result['tasks'].to_csv(output_dir / 'tasks.csv', index=False)
+        comparison_result['new_tasks'].to_csv(output_dir / 'new_tasks.csv', index=False)
+        pd.DataFrame([comparison_result['project_metrics']]).to_csv(output_dir / 'project_metrics.csv', index=False)
+
+        # The text report is fixed-width; fence it so it renders as-is in markdown
+        report = self.generate_slippage_report(comparison_result)
+        (output_dir / 'slippage_report.md').write_text(
+            f"# Schedule Slippage: {output_dir.name}\n\n```text\n{report}\n```\n"
+        )
+        return output_dir
+
+    def month_comparisons(self):
+        """
+        Snapshot pairs for every month of the project.
+
+        Months run from the month after the first snapshot through the month of
+        the last snapshot; pairs are selected as in analyze_month(). Months
+        without a snapshot share the pair of the following month.
+
+        Returns:
+            DataFrame with columns month ('YYYY-MM'), file_id_prev, file_id_curr,
+            date_prev, date_curr
+        """
+        schedules = self.get_ordered_schedules()
+        columns = ['month', 'file_id_prev', 'file_id_curr', 'date_prev', 'date_curr']
+        if len(schedules) < 2:
+            return pd.DataFrame(columns=columns)
+
+        first, last = schedules['snapshot_date'].iloc[0], schedules['snapshot_date'].iloc[-1]
+        rows = []
+        for period in pd.period_range(first.to_period('M') + 1, last.to_period('M'), freq='M'):
+            with redirect_stdout(io.StringIO()):
+                selected = self.select_month_snapshots(period.year, period.month, schedules)
+            if selected is None:
+                continue
+            prev_schedule, curr_schedule = selected
+            rows.append({
+                'month': str(period),
+                'file_id_prev': int(prev_schedule['file_id']),
+                'file_id_curr': int(curr_schedule['file_id']),
+                'date_prev': prev_schedule['snapshot_date'],
+                'date_curr': curr_schedule['snapshot_date'],
+            })
+        return pd.DataFrame(rows, columns=columns)
+
+    def analyze_all_months(self, output_dir=None, workers=None, verbose=False):
+        """
+        Compare every month's snapshot pair and write all monthly outputs in one run.
+
+        The P6 data is loaded once (by this analyzer) and shared read-only with
+        worker processes; each distinct snapshot pair is compared once, and its
+        outputs are written by save_comparison() to output_dir/YYYY-MM/ for
+        every month that selects it.
+
+        Args:
+            output_dir: Output root (default: processed integrated dir / schedule_slippage)
+            workers: Number of worker processes (default: CPU count; 1 = in-process)
+            verbose: Print each comparison's progress output
+
+        Returns:
+            DataFrame with one row per month: month, the snapshot pair and the
+            project-level metrics (also written as monthly_summary.csv)
+        """
+        output_dir = Path(output_dir) if output_dir is not None else settings.INTEGRATED_PROCESSED_DIR / 'schedule_slippage'
+        months = self.month_comparisons()
+        pairs = months.groupby(['file_id_prev', 'file_id_curr', 'date_prev', 'date_curr'], sort=False)['month'].agg(list)
+        jobs = [(*pair, month_list) for pair, month_list in pairs.items()]
+        workers = workers or os.cpu_count() or 1
+
+        print(f"Analyzing {len(months)} months ({len(jobs)} snapshot pairs) with {min(workers, max(len(jobs), 1))} worker(s)")
+
+        # Load tasks and build the relationship index before forking so workers
+        # share them; pairs already in the comparison cache need neither
+        if self.comparisons is None or not all(self.comparisons.is_current(*job[:4]) for job in jobs):
+            self.relationships
+
+        rows = []
+        if workers == 1 or len(jobs) <= 1:
+            for job in jobs:
+                rows.extend(_analyze_month_pair(job, output_dir, verbose, analyzer=self))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_slippage_worker,
+                                     initargs=(self,)) as pool:
+                futures = [pool.submit(_analyze_month_pair, job, output_dir, verbose) for job in jobs]
+                for future in as_completed(futures):
+                    rows.extend(future.result())
+
+        summary = pd.DataFrame(rows)
+        if len(summary) > 0:
+            summary = summary.sort_values('month').reset_index(drop=True)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            summary.to_csv(output_dir / 'monthly_summary.csv', index=False)
+            print(f"Wrote {len(summary)} monthly reports to {output_dir}")
+        return summary
+
+
+###############################################################################
+# BATCH WORKERS
+###############################################################################
+
+# Analyzer held by each batch worker process (set by _init_slippage_worker)
+_worker_analyzer = None
+
+
+def _init_slippage_worker(analyzer):
+    global _worker_analyzer
+    _worker_analyzer = analyzer
+
+
+def _analyze_month_pair(job, output_dir, verbose=False, analyzer=None):
+    """
+    Compare one snapshot pair and write the outputs of every month that selects it.
+
+    Returns:
+        List of monthly summary rows (month plus project_metrics)
+    """
+    analyzer = analyzer or _worker_analyzer
+    file_id_prev, file_id_curr, date_prev, date_curr, months = job
+    with nullcontext() if verbose else redirect_stdout(io.StringIO()):
+        result = analyzer.compare_schedules(file_id_prev, file_id_curr, date_prev, date_curr)
+        if result['tasks'] is None or len(result['tasks']) == 0:
+            return []
+        for month in months:
+            analyzer.save_comparison(result, Path(output_dir) / month)
+    return [{'month': month, **result['project_metrics']} for month in months]
+
 
 def main():
     parser = argparse.ArgumentParser(description='Analyze schedule slippage between P6 snapshots')
@@ -3649,10 +3844,14 @@ def main():
     parser.add_argument('--attribution', action='store_true', help='Generate full slippage attribution report with investigation checklist')
     parser.add_argument('--categories', action='store_true', help='Generate category-based reports (not-started, active/completed, reopened)')
     parser.add_argument('--tiers', action='store_true', help='Generate tier-based priority report (DRIVING, CRITICAL, NEAR_CRITICAL, ERODING, BUFFERED)')
+    parser.add_argument('--all-months', action='store_true', help='Write outputs and reports for every month in one run')
+    parser.add_argument('--output-dir', type=str, help='Output root for --all-months')
+    parser.add_argument('--workers', type=int, help='Worker processes for --all-months (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true', help='Recompute comparisons instead of reusing cached results')
 
     args = parser.parse_args()
 
-    analyzer = ScheduleSlippageAnalyzer()
+    analyzer = ScheduleSlippageAnalyzer(use_cache=not args.no_cache)
 
     if args.list_schedules:
         schedules = analyzer.get_ordered_schedules()
@@ -3662,6 +3861,12 @@ def main():
             print(f"  file_id={row['file_id']:2d}  {row['snapshot_date'].strftime('%Y-%m-%d')}  {row['filename'][:40]}")
         return
 
+    if args.all_months:
+        summary = analyzer.analyze_all_months(output_dir=args.output_dir, workers=args.workers)
+        if len(summary) > 0:
+            print(summary[['month', 'file_id_prev', 'file_id_curr', 'project_slippage_days']].to_string(index=False))
+        return
+
     # Analyze specific month or file pair
     if args.year and args.month:
         comparison = analyzer.analyze_month(args.year, args.month)
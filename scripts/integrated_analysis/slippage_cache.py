@@ -0,0 +1,160 @@
+"""
+Persisted compare_schedules results for schedule slippage analysis.
+
+Every monthly, all-months or file-pair run compares snapshot pairs that were
+already compared by earlier runs; only pairs involving a new or re-exported
+snapshot produce different results. ComparisonCache keeps each pair's result
+on disk under ``{primavera_dir}/_cache/slippage_comparisons/{prev}_{curr}/``:
+
+    tasks.pkl, new_tasks.pkl  - the task-level DataFrames
+    result.pkl                - cache key, project_metrics, relationship_changes
+
+The key hashes the analyzer version, the pair, the date labels and the
+fingerprints of both snapshots, so an entry goes stale when either
+snapshot's own data changes or when the comparison logic is versioned up.
+result.pkl is written last and acts as the commit marker.
+
+Snapshot fingerprints are computed by the analyzer from the data it already
+holds (see ScheduleSlippageAnalyzer.snapshot_fingerprint) and recorded in
+fingerprints.json together with the signature (size, mtime) of the source
+CSVs. While the sources are unchanged, later runs take fingerprints from
+there, so cache hits read neither task.csv nor taskpred.csv. Re-exporting the
+tables with new snapshots appended recomputes the fingerprints, but leaves
+those of existing snapshots, and so existing entries, unchanged.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Callable, Optional
+
+import pandas as pd
+
+# Source tables whose content determines a comparison's result
+SOURCE_FILES = ('task.csv', 'taskpred.csv', 'project.csv')
+
+FRAME_KEYS = ('tasks', 'new_tasks')
+
+
+class ComparisonCache:
+    """
+    On-disk compare_schedules results keyed by snapshot pair and data fingerprint.
+
+    Example:
+        >>> cache = ComparisonCache(primavera_dir / '_cache' / 'slippage_comparisons',
+        ...                         primavera_dir, analyzer.snapshot_fingerprint, version=1)
+        >>> result = cache.get(82, 83)     # None on a miss or stale entry
+        >>> cache.put(82, 83, result)
+    """
+
+    def __init__(self, cache_dir: Path, source_dir: Path, fingerprint: Callable[[int], str], version: int):
+        """
+        Args:
+            cache_dir: Directory holding one subdirectory per snapshot pair
+            source_dir: Directory of the SOURCE_FILES the fingerprints are computed from
+            fingerprint: Content hash of one snapshot (file_id -> str)
+            version: Analyzer version; entries written by other versions are stale
+        """
+        self.cache_dir = Path(cache_dir)
+        self.source_dir = Path(source_dir)
+        self.fingerprint = fingerprint
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._fingerprints: dict = {}   # file_id -> fingerprint for self._signature
+        self._signature: Optional[dict] = None
+
+    def _pair_dir(self, file_id_prev, file_id_curr) -> Path:
+        return self.cache_dir / f'{int(file_id_prev)}_{int(file_id_curr)}'
+
+    def _source_signature(self) -> dict:
+        signature = {}
+        for name in SOURCE_FILES:
+            path = self.source_dir / name
+            if path.exists():
+                stat = path.stat()
+                signature[name] = f'{stat.st_size}|{stat.st_mtime_ns}'
+        return signature
+
+    def _write(self, path: Path, write) -> None:
+        # Write-then-rename so concurrent workers never read a partial file
+        tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+        write(tmp)
+        os.replace(tmp, path)
+
+    def snapshot_fingerprint(self, file_id) -> str:
+        """Fingerprint of one snapshot, computed once per version of the source CSVs."""
+        path = self.cache_dir / 'fingerprints.json'
+        signature = self._source_signature()
+        if signature != self._signature:
+            try:
+                with open(path) as f:
+                    recorded = json.load(f)
+            except (OSError, ValueError):
+                recorded = {}
+            self._fingerprints = recorded.get('file_ids', {}) if recorded.get('sources') == signature else {}
+            self._signature = signature
+
+        key = str(int(file_id))
+        if key not in self._fingerprints:
+            self._fingerprints[key] = self.fingerprint(int(file_id))
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            state = {'sources': signature, 'file_ids': self._fingerprints}
+            self._write(path, lambda tmp: tmp.write_text(json.dumps(state)))
+        return self._fingerprints[key]
+
+    def key(self, file_id_prev, file_id_curr, date_prev=None, date_curr=None) -> str:
+        """Hash identifying a comparison's inputs."""
+        digest = hashlib.sha1(
+            f'{self.version}|{int(file_id_prev)}|{int(file_id_curr)}|{date_prev}|{date_curr}'.encode()
+        )
+        for file_id in (file_id_prev, file_id_curr):
+            digest.update(self.snapshot_fingerprint(file_id).encode())
+        return digest.hexdigest()
+
+    def _load_entry(self, file_id_prev, file_id_curr, date_prev, date_curr) -> Optional[dict]:
+        """result.pkl contents (without the key) if present and current."""
+        try:
+            entry = pd.read_pickle(self._pair_dir(file_id_prev, file_id_curr) / 'result.pkl')
+        except Exception:
+            return None
+        if entry.pop('key', None) != self.key(file_id_prev, file_id_curr, date_prev, date_curr):
+            return None
+        return entry
+
+    def is_current(self, file_id_prev, file_id_curr, date_prev=None, date_curr=None) -> bool:
+        """Whether get() would return a result (without reading the frames)."""
+        return self._load_entry(file_id_prev, file_id_curr, date_prev, date_curr) is not None
+
+    def get(self, file_id_prev, file_id_curr, date_prev=None, date_curr=None) -> Optional[dict]:
+        """Cached comparison result, or None if missing or stale."""
+        entry = self._load_entry(file_id_prev, file_id_curr, date_prev, date_curr)
+        if entry is not None:
+            pair_dir = self._pair_dir(file_id_prev, file_id_curr)
+            try:
+                for name in FRAME_KEYS:
+                    entry[name] = pd.read_pickle(pair_dir / f'{name}.pkl')
+            except Exception:
+                entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, file_id_prev, file_id_curr, result: dict, date_prev=None, date_curr=None) -> None:
+        """Persist a comparison result (frames first, then the keyed result.pkl)."""
+        pair_dir = self._pair_dir(file_id_prev, file_id_curr)
+        pair_dir.mkdir(parents=True, exist_ok=True)
+        entry = {name: value for name, value in result.items() if name not in FRAME_KEYS}
+        entry['key'] = self.key(file_id_prev, file_id_curr, date_prev, date_curr)
+
+        for name, value in [*((name, result[name]) for name in FRAME_KEYS), ('result', entry)]:
+            self._write(pair_dir / f'{name}.pkl', lambda tmp: pd.to_pickle(value, tmp))
+
+    def clear(self) -> None:
+        """Delete every cached comparison."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
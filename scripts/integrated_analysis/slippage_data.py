@@ -0,0 +1,275 @@
+"""
+In-memory P6 data for schedule slippage analysis.
+
+ScheduleSlippageAnalyzer compares many snapshot pairs against the same
+multi-version tables. The structures here are built once per analyzer and
+answer per-snapshot queries without rescanning the full tables.
+
+RelationshipIndex
+-----------------
+taskpred.csv is the largest processed P6 table. It is read once with only the
+columns slippage analysis needs, and every relationship is translated from
+task_id to task_code at load time. Task codes are interned as integers in a
+vocabulary shared by all snapshots, so a relationship is a single int64 key:
+
+    key = (pred_code * n_codes + succ_code) * n_types + type_code
+
+Rows are sorted by file_id (stable, so each snapshot keeps its export order)
+and a file_id -> row slice index makes a snapshot's relationships a view.
+Added/removed relationships between two snapshots are np.setdiff1d over their
+distinct keys.
+
+TaskSnapshotStore
+-----------------
+task.csv holds every snapshot's tasks (~470K rows). The store keeps them in a
+compact frame sorted by file_id:
+
+    - task_code, task_name, status_code, driving_path_flag, cstr_type: categoricals
+      (values repeat across snapshots)
+    - dates: int64 minutes since the Unix epoch, NaT as NAT_MINUTES
+    - a file_id -> row slice index, so a snapshot is a zero-copy slice
+
+frame(file_id) decodes one snapshot back to the plain dtypes read_csv would
+produce (object strings, datetime64[ns]), which is what the comparison code
+expects. P6 dates have minute resolution, so the round trip is exact.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+TASKPRED_COLUMNS = ['file_id', 'task_id', 'pred_task_id', 'pred_type']
+
+TASK_COLUMNS = [
+    'file_id', 'task_id', 'task_code', 'task_name', 'status_code',
+    'early_start_date', 'early_end_date', 'late_start_date', 'late_end_date',
+    'target_start_date', 'target_end_date', 'act_start_date', 'act_end_date',
+    'total_float_hr_cnt', 'remain_drtn_hr_cnt', 'target_drtn_hr_cnt', 'driving_path_flag',
+    'cstr_type', 'cstr_date',
+]
+TASK_DATE_COLUMNS = [
+    'early_start_date', 'early_end_date', 'late_start_date', 'late_end_date',
+    'target_start_date', 'target_end_date', 'act_start_date', 'act_end_date',
+    'cstr_date',
+]
+TASK_CATEGORY_COLUMNS = ['task_code', 'task_name', 'status_code', 'driving_path_flag', 'cstr_type']
+
+NAT_MINUTES = np.iinfo(np.int64).min
+NS_PER_MINUTE = 60 * 10**9
+
+
+def encode_minutes(dates: pd.Series) -> np.ndarray:
+    """datetime64 values as int64 minutes since the epoch (NaT -> NAT_MINUTES)."""
+    ns = pd.to_datetime(dates, errors='coerce').to_numpy(dtype='datetime64[ns]').view(np.int64)
+    return np.where(ns == NAT_MINUTES, NAT_MINUTES, ns // NS_PER_MINUTE)
+
+
+def decode_minutes(minutes: np.ndarray) -> np.ndarray:
+    """Inverse of encode_minutes, as datetime64[ns]."""
+    minutes = np.asarray(minutes)
+    return np.where(minutes == NAT_MINUTES, NAT_MINUTES, minutes * NS_PER_MINUTE).view('datetime64[ns]')
+
+
+def _row_slices(file_ids: np.ndarray) -> dict:
+    """file_id -> row slice over an array sorted by file_id."""
+    if len(file_ids) == 0:
+        return {}
+    starts = np.flatnonzero(np.r_[True, file_ids[1:] != file_ids[:-1]])
+    stops = np.r_[starts[1:], len(file_ids)]
+    return {int(file_ids[s]): slice(int(s), int(e)) for s, e in zip(starts, stops)}
+
+
+class RelationshipIndex:
+    """
+    Predecessor relationships of all snapshots, keyed by task_code.
+
+    Attributes:
+        task_codes (Index): Task code vocabulary; integer codes index into it
+        pred_types (Index): Relationship type vocabulary (type code 0 is missing)
+        pred, succ (ndarray): Predecessor/successor task code per relationship
+        pred_type (ndarray): Relationship type code per relationship
+
+    Example:
+        >>> index = RelationshipIndex.from_csv(primavera_dir / 'taskpred.csv', tasks_df)
+        >>> added, removed = index.diff(82, 83)
+        >>> index.decode(added)[:3]
+    """
+
+    def __init__(self, taskpred: pd.DataFrame, tasks: pd.DataFrame):
+        """
+        Args:
+            taskpred: Relationship rows with TASKPRED_COLUMNS
+            tasks: Task rows with task_id and task_code (all snapshots)
+        """
+        coded = tasks[tasks['task_code'].notna()]
+        task_code = pd.Categorical(coded['task_code'].astype(str))
+        self.task_codes = task_code.categories
+
+        # task_id -> task_code code; task_ids are file-prefixed, so one map
+        # serves every snapshot (last row wins, as in relationship_keys)
+        id_to_code = pd.Series(task_code.codes, index=coded['task_id'].astype(str).values)
+        id_to_code = id_to_code[~id_to_code.index.duplicated(keep='last')]
+
+        def translate(ids: pd.Series) -> np.ndarray:
+            # Map each distinct id once; the trailing -1 catches missing ids (code -1)
+            ids = pd.Categorical(ids)
+            positions = id_to_code.index.get_indexer(ids.categories.astype(str))
+            codes = np.append(np.where(positions >= 0, id_to_code.to_numpy()[positions], -1), -1)
+            return codes[ids.codes].astype(np.int32)
+
+        pred = translate(taskpred['pred_task_id'])
+        succ = translate(taskpred['task_id'])
+        pred_type = pd.Categorical(taskpred['pred_type'])
+        self.pred_types = pd.Index([np.nan]).append(pred_type.categories.astype(object))
+
+        # Relationships whose tasks have no task_code cannot be matched across snapshots
+        keep = (pred >= 0) & (succ >= 0)
+        file_ids = taskpred['file_id'].to_numpy()[keep]
+        order = np.argsort(file_ids, kind='stable')
+        self.pred = pred[keep][order]
+        self.succ = succ[keep][order]
+        self.pred_type = (pred_type.codes[keep][order] + 1).astype(np.int8)
+
+        self._slices = _row_slices(file_ids[order])
+
+    @classmethod
+    def from_csv(cls, taskpred_path: Path, tasks: pd.DataFrame) -> 'RelationshipIndex':
+        """Read taskpred.csv once with pruned columns and categorical relationship types."""
+        taskpred = pd.read_csv(
+            taskpred_path,
+            usecols=TASKPRED_COLUMNS,
+            dtype={'task_id': 'category', 'pred_task_id': 'category', 'pred_type': 'category'},
+        )
+        return cls(taskpred, tasks)
+
+    def __contains__(self, file_id) -> bool:
+        return file_id in self._slices
+
+    def _slice(self, file_id) -> slice:
+        return self._slices.get(file_id, slice(0, 0))
+
+    def codes(self, file_id) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(pred, succ, pred_type) code arrays of one snapshot, in export order (views)."""
+        rows = self._slice(file_id)
+        return self.pred[rows], self.succ[rows], self.pred_type[rows]
+
+    def keys(self, file_id) -> np.ndarray:
+        """Distinct relationship keys of one snapshot (sorted)."""
+        pred, succ, pred_type = self.codes(file_id)
+        n_codes, n_types = len(self.task_codes), len(self.pred_types)
+        keys = (pred.astype(np.int64) * n_codes + succ) * n_types + pred_type
+        return np.unique(keys)
+
+    def diff(self, file_id_prev, file_id_curr) -> tuple[np.ndarray, np.ndarray]:
+        """Keys of relationships added and removed between two snapshots."""
+        keys_prev, keys_curr = self.keys(file_id_prev), self.keys(file_id_curr)
+        added = np.setdiff1d(keys_curr, keys_prev, assume_unique=True)
+        removed = np.setdiff1d(keys_prev, keys_curr, assume_unique=True)
+        return added, removed
+
+    def decode(self, keys: np.ndarray) -> list[tuple]:
+        """Relationship keys as (pred_task_code, succ_task_code, pred_type) tuples."""
+        n_codes, n_types = len(self.task_codes), len(self.pred_types)
+        pair, pred_type = np.divmod(keys, n_types)
+        pred, succ = np.divmod(pair, n_codes)
+        return list(zip(
+            self.task_codes[pred].tolist(),
+            self.task_codes[succ].tolist(),
+            self.pred_types[pred_type].tolist(),
+        ))
+
+    def relationships(self, file_id) -> pd.DataFrame:
+        """
+        One snapshot's relationships as a DataFrame.
+
+        Returns:
+            DataFrame with categorical columns pred_task_code, task_code and
+            pred_type, in export order (duplicates kept)
+        """
+        pred, succ, pred_type = self.codes(file_id)
+        return pd.DataFrame({
+            'pred_task_code': pd.Categorical.from_codes(pred, self.task_codes),
+            'task_code': pd.Categorical.from_codes(succ, self.task_codes),
+            'pred_type': pd.Categorical.from_codes(pred_type.astype(np.int16) - 1, self.pred_types[1:]),
+        })
+
+
+class TaskSnapshotStore:
+    """
+    Task records of all snapshots in a compact, file_id-sorted frame.
+
+    Attributes:
+        df (DataFrame): Compact task rows (categoricals, int64 minute dates),
+                        sorted by file_id; rows keep file order within a snapshot
+        date_columns (list): Columns stored as minute offsets
+
+    Example:
+        >>> store = TaskSnapshotStore.from_csv(primavera_dir / 'task.csv')
+        >>> store.snapshot(83)        # zero-copy slice of the compact frame
+        >>> store.frame(83)           # decoded to datetime64/object columns
+    """
+
+    def __init__(self, tasks: pd.DataFrame):
+        """
+        Args:
+            tasks: Task rows with datetime64 date columns (as read with parse_dates)
+        """
+        self.date_columns = [c for c in TASK_DATE_COLUMNS if c in tasks.columns]
+        order = np.argsort(tasks['file_id'].to_numpy(), kind='stable')
+        tasks = tasks.iloc[order].reset_index(drop=True)
+
+        compact = {}
+        for col in tasks.columns:
+            if col in self.date_columns:
+                compact[col] = encode_minutes(tasks[col])
+            elif col in TASK_CATEGORY_COLUMNS:
+                compact[col] = tasks[col].astype('category')
+            else:
+                compact[col] = tasks[col]
+        self.df = pd.DataFrame(compact)
+        self._slices = _row_slices(self.df['file_id'].to_numpy())
+
+    @classmethod
+    def from_csv(cls, task_path: Path, columns: list[str] = TASK_COLUMNS) -> 'TaskSnapshotStore':
+        """Read task.csv with pruned columns, categorical text fields and parsed dates."""
+        return cls(pd.read_csv(
+            task_path,
+            usecols=columns,
+            dtype={col: 'category' for col in TASK_CATEGORY_COLUMNS if col in columns},
+            parse_dates=[col for col in TASK_DATE_COLUMNS if col in columns],
+        ))
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def __contains__(self, file_id) -> bool:
+        return file_id in self._slices
+
+    def file_ids(self) -> list[int]:
+        """Snapshot file_ids present in the store (ascending)."""
+        return list(self._slices)
+
+    def snapshot(self, file_id) -> pd.DataFrame:
+        """One snapshot's compact rows, as a slice of the store (no copy)."""
+        return self.df.iloc[self._slices.get(file_id, slice(0, 0))]
+
+    def frame(self, file_id) -> pd.DataFrame:
+        """
+        One snapshot decoded to plain dtypes.
+
+        Returns:
+            New DataFrame with the store's columns: dates as datetime64[ns],
+            categoricals as object strings (missing values as NaN)
+        """
+        snapshot = self.snapshot(file_id)
+        decoded = {}
+        for col in snapshot.columns:
+            values = snapshot[col]
+            if col in self.date_columns:
+                decoded[col] = decode_minutes(values.to_numpy())
+            elif isinstance(values.dtype, pd.CategoricalDtype):
+                decoded[col] = values.astype(object)
+            else:
+                decoded[col] = values.to_numpy(copy=True)
+        return pd.DataFrame(decoded, index=snapshot.index)
@@ -11,11 +11,17 @@ from .cpm import (
     TaskImpactResult,
     DelayAttributionResult,
     CriticalPathResult,
+    MonteCarloResult,
     P6Calendar,
     TaskNetwork,
     CPMEngine,
+    ArrayCPMEngine,
+    IncrementalCPM,
+    MonteCarloCPM,
+    DurationDistribution,
 )
 from .data_loader import load_schedule, load_calendars, load_tasks, load_dependencies
+from .schedule_store import ScheduleStore, get_schedule_store
 
 __all__ = [
     # Models
@@ -25,13 +31,20 @@ __all__ = [
     'TaskImpactResult',
     'DelayAttributionResult',
     'CriticalPathResult',
+    'MonteCarloResult',
     # Core
     'P6Calendar',
     'TaskNetwork',
     'CPMEngine',
+    'ArrayCPMEngine',
+    'IncrementalCPM',
+    'MonteCarloCPM',
+    'DurationDistribution',
     # Loading
     'load_schedule',
     'load_calendars',
     'load_tasks',
     'load_dependencies',
+    'ScheduleStore',
+    'get_schedule_store',
 ]
@@ -4,10 +4,11 @@ Analysis modules for schedule what-if scenarios.
 
 from .critical_path import analyze_critical_path
 from .single_task_impact import analyze_task_impact
-from .delay_attribution import attribute_delays
+from .delay_attribution import attribute_delays, attribute_delays_windows
 
 __all__ = [
     'analyze_critical_path',
     'analyze_task_impact',
     'attribute_delays',
+    'attribute_delays_windows',
 ]
@@ -5,15 +5,21 @@ Compare schedule versions to identify which tasks and duration changes
 drove schedule slippage.
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, fields
 from datetime import datetime
 from pathlib import Path
 from collections import defaultdict
 from typing import Optional
 
+import pandas as pd
+
 from ..cpm.models import Task, TaskContribution, DelayAttributionResult
 from ..cpm.calendar import P6Calendar
 from ..cpm.network import TaskNetwork
 from ..cpm.engine import CPMEngine
+from ..cpm.incremental import IncrementalCPM
 from ..data_loader import load_schedule
 
 
@@ -153,50 +159,66 @@ def attribute_delays(
     )
 
 
-def attribute_delays_marginal(
+def _finish_slip_hours(calendar: Optional[P6Calendar], earlier: datetime, later: datetime) -> float:
+    """Work hours by which later is after earlier (0 if not later)."""
+    if calendar and later > earlier:
+        return calendar.work_hours_between(earlier, later)
+    return max(0, (later - earlier).total_seconds() / 3600)
+
+
+# What-if baseline held by each marginal-impact worker process (set by _init_marginal_worker)
+_worker_whatif: Optional[IncrementalCPM] = None
+
+
+def _init_marginal_worker(whatif: IncrementalCPM) -> None:
+    global _worker_whatif
+    _worker_whatif = whatif
+
+
+def _marginal_chunk(durations: list[tuple[str, float]],
+                    whatif: IncrementalCPM = None) -> list[tuple[str, datetime]]:
+    """Project finish with each task's duration reverted, one what-if at a time."""
+    whatif = whatif or _worker_whatif
+    finishes = []
+    for task_id, hours in durations:
+        try:
+            finishes.append((task_id, whatif.recalculate(durations={task_id: hours}).project_finish))
+        finally:
+            whatif.revert()
+    return finishes
+
+
+def _marginal_attribution(
     baseline_file_id: int,
     current_file_id: int,
-    data_dir: Path = None,
+    baseline_finish: datetime,
+    baseline_durations: dict[str, float],
+    whatif: IncrementalCPM,
     top_n: int = 50,
+    workers: int = 1,
     verbose: bool = False,
 ) -> DelayAttributionResult:
     """
-    Attribute delays using marginal impact analysis.
-
-    More accurate than simple attribution: tests actual schedule impact
-    of each task's duration change by running CPM with/without the change.
-
-    Warning: This is computationally expensive (runs CPM for each candidate task).
+    Marginal attribution of one version pair.
 
     Args:
         baseline_file_id: Earlier schedule version
         current_file_id: Later schedule version
-        data_dir: Directory containing P6 CSVs
+        baseline_finish: CPM project finish of the baseline
+        baseline_durations: Baseline duration_hours by task_code
+        whatif: IncrementalCPM of the current version (its baseline is the current CPM)
         top_n: Only test top N candidate tasks (by duration increase)
+        workers: Worker processes for the candidate what-ifs (default 1 = in-process, None = CPU count)
         verbose: Print progress messages
-
-    Returns:
-        DelayAttributionResult with precise marginal contributions
     """
-    if verbose:
-        print("Loading schedules...")
-
-    baseline_network, baseline_cals, baseline_info = load_schedule(baseline_file_id, data_dir)
-    current_network, current_cals, current_info = load_schedule(current_file_id, data_dir)
-
-    # Get baseline CPM
-    baseline_engine = CPMEngine(baseline_network, baseline_cals)
-    baseline_result = baseline_engine.run(data_date=baseline_info.get('data_date'))
-
-    # Get current CPM
-    current_engine = CPMEngine(current_network, current_cals)
-    current_result = current_engine.run(data_date=current_info.get('data_date'))
+    current_network = whatif.network
+    current_result = whatif.baseline
+    current_cals = whatif.engine.calendars
 
     # Match tasks
-    baseline_by_code = {t.task_code: t for t in baseline_network.tasks.values()}
     current_by_code = {t.task_code: t for t in current_network.tasks.values()}
 
-    baseline_codes = set(baseline_by_code.keys())
+    baseline_codes = set(baseline_durations.keys())
     current_codes = set(current_by_code.keys())
     new_tasks = list(current_codes - baseline_codes)
     removed_tasks = list(baseline_codes - current_codes)
@@ -205,10 +227,9 @@ def attribute_delays_marginal(
     # Find candidates: tasks with increased duration on or near critical path
     candidates = []
     for code in matched_codes:
-        baseline_task = baseline_by_code[code]
         current_task = current_by_code[code]
 
-        delta = current_task.duration_hours - baseline_task.duration_hours
+        delta = current_task.duration_hours - baseline_durations[code]
         if delta > 0:
             # Prioritize: critical tasks, then by duration delta
             priority = (
@@ -224,41 +245,39 @@ def attribute_delays_marginal(
     if verbose:
         print(f"Testing {len(candidates)} candidate tasks for marginal impact...")
 
+    # Project finish with each candidate's duration reverted to the baseline
+    reverted = [(current_by_code[code].task_id, baseline_durations[code]) for code, _, _ in candidates]
+    workers = min(workers or os.cpu_count() or 1, len(reverted))
+    if workers <= 1:
+        test_finishes = dict(_marginal_chunk(reverted, whatif))
+    else:
+        chunk_size = -(-len(reverted) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_marginal_worker,
+                                 initargs=(whatif,)) as pool:
+            futures = [pool.submit(_marginal_chunk, reverted[i:i + chunk_size])
+                       for i in range(0, len(reverted), chunk_size)]
+            test_finishes = {}
+            for future in as_completed(futures):
+                test_finishes.update(future.result())
+
     # Calculate marginal impact for each candidate
     contributions = []
     calendar = next(iter(current_cals.values())) if current_cals else None
 
-    for i, (code, delta, _) in enumerate(candidates):
-        if verbose and (i + 1) % 10 == 0:
-            print(f"  Progress: {i+1}/{len(candidates)}")
-
-        baseline_task = baseline_by_code[code]
+    for code, delta, _ in candidates:
         current_task = current_by_code[code]
 
-        # Create modified network: use current network but revert this task's duration
-        test_network = current_network.clone()
-        test_network.modify_task_duration(current_task.task_id, baseline_task.duration_hours)
-
-        # Run CPM on test network (use current schedule's data_date)
-        test_engine = CPMEngine(test_network, current_cals)
-        test_result = test_engine.run(data_date=current_info.get('data_date'))
-
         # Marginal impact = current finish - test finish
-        if calendar and current_result.project_finish > test_result.project_finish:
-            marginal_impact = calendar.work_hours_between(
-                test_result.project_finish,
-                current_result.project_finish
-            )
-        else:
-            diff = (current_result.project_finish - test_result.project_finish)
-            marginal_impact = max(0, diff.total_seconds() / 3600)
+        marginal_impact = _finish_slip_hours(
+            calendar, test_finishes[current_task.task_id], current_result.project_finish
+        )
 
         if marginal_impact > 0:
             contributions.append(TaskContribution(
                 task_id=current_task.task_id,
                 task_code=code,
                 task_name=current_task.task_name,
-                baseline_duration_hours=baseline_task.duration_hours,
+                baseline_duration_hours=baseline_durations[code],
                 current_duration_hours=current_task.duration_hours,
                 duration_delta_hours=delta,
                 slip_contribution_hours=marginal_impact,
@@ -267,14 +286,7 @@ def attribute_delays_marginal(
             ))
 
     # Calculate total slip
-    if calendar:
-        total_slip = calendar.work_hours_between(
-            baseline_result.project_finish,
-            current_result.project_finish
-        ) if current_result.project_finish > baseline_result.project_finish else 0
-    else:
-        diff = (current_result.project_finish - baseline_result.project_finish)
-        total_slip = max(0, diff.total_seconds() / 3600)
+    total_slip = _finish_slip_hours(calendar, baseline_finish, current_result.project_finish)
 
     # Calculate percentages
     total_contribution = sum(c.slip_contribution_hours for c in contributions)
@@ -287,7 +299,7 @@ def attribute_delays_marginal(
     return DelayAttributionResult(
         baseline_file_id=baseline_file_id,
         current_file_id=current_file_id,
-        baseline_finish=baseline_result.project_finish,
+        baseline_finish=baseline_finish,
         current_finish=current_result.project_finish,
         total_slip_hours=total_slip,
         total_slip_days=total_slip / 8.0,
@@ -298,6 +310,129 @@ def attribute_delays_marginal(
     )
 
 
+def attribute_delays_marginal(
+    baseline_file_id: int,
+    current_file_id: int,
+    data_dir: Path = None,
+    top_n: int = 50,
+    verbose: bool = False,
+    workers: int = 1,
+) -> DelayAttributionResult:
+    """
+    Attribute delays using marginal impact analysis.
+
+    More accurate than simple attribution: tests actual schedule impact
+    of each task's duration change by reverting it in the current schedule.
+    Each candidate is an incremental what-if against one current CPM.
+
+    Args:
+        baseline_file_id: Earlier schedule version
+        current_file_id: Later schedule version
+        data_dir: Directory containing P6 CSVs
+        top_n: Only test top N candidate tasks (by duration increase)
+        verbose: Print progress messages
+        workers: Worker processes for the candidate what-ifs (default 1 = in-process, None = CPU count)
+
+    Returns:
+        DelayAttributionResult with precise marginal contributions
+    """
+    if verbose:
+        print("Loading schedules...")
+
+    baseline_network, baseline_cals, baseline_info = load_schedule(baseline_file_id, data_dir)
+    current_network, current_cals, current_info = load_schedule(current_file_id, data_dir)
+
+    # Get baseline CPM
+    baseline_engine = CPMEngine(baseline_network, baseline_cals)
+    baseline_result = baseline_engine.run(data_date=baseline_info.get('data_date'))
+
+    # Get current CPM (the base for the what-ifs)
+    whatif = IncrementalCPM(current_network, current_cals, data_date=current_info.get('data_date'))
+
+    return _marginal_attribution(
+        baseline_file_id, current_file_id, baseline_result.project_finish,
+        {t.task_code: t.duration_hours for t in baseline_network.tasks.values()},
+        whatif, top_n=top_n, workers=workers, verbose=verbose,
+    )
+
+
+def attribute_delays_windows(
+    file_ids: list[int],
+    data_dir: Path = None,
+    top_n: int = 50,
+    workers: int = None,
+    output_path: Path = None,
+    verbose: bool = False,
+) -> list[DelayAttributionResult]:
+    """
+    Marginal delay attribution for every consecutive pair of snapshots.
+
+    Each snapshot is loaded and run through CPM once: as the current
+    version of one window it is the base for the candidate what-ifs, and
+    only its finish and durations are kept as the baseline of the next.
+    Candidate what-ifs run incrementally, in a process pool when workers > 1.
+
+    Args:
+        file_ids: Snapshots in chronological order (see schedule_deltas.ordered_snapshots)
+        data_dir: Directory containing P6 CSVs
+        top_n: Candidate tasks tested per window
+        workers: Worker processes for the candidate what-ifs (default: CPU count)
+        output_path: Write the combined attribution table (attribution_table) to this CSV
+        verbose: Print progress messages
+
+    Returns:
+        One DelayAttributionResult per consecutive pair
+    """
+    results = []
+    previous = None
+    for file_id in file_ids:
+        network, calendars, info = load_schedule(file_id, data_dir)
+        whatif = IncrementalCPM(network, calendars, data_date=info.get('data_date'))
+
+        if previous is not None:
+            prev_id, prev_finish, prev_durations = previous
+            result = _marginal_attribution(prev_id, file_id, prev_finish, prev_durations, whatif,
+                                           top_n=top_n, workers=workers)
+            results.append(result)
+            if verbose:
+                print(f"  [{prev_id:3} -> {file_id:3}] slip {result.total_slip_days:6.1f}d, "
+                      f"{len(result.task_contributions)} contributing tasks")
+
+        previous = (file_id, whatif.baseline.project_finish,
+                    {t.task_code: t.duration_hours for t in network.tasks.values()})
+
+    if output_path is not None:
+        attribution_table(results).to_csv(output_path, index=False)
+        if verbose:
+            print(f"Attribution table saved to: {output_path}")
+
+    return results
+
+
+def attribution_table(results: list[DelayAttributionResult]) -> pd.DataFrame:
+    """
+    Flatten attribution results into one table.
+
+    One row per contributing task, with its window's file_ids, finishes and
+    total slip, ranked by contribution within the window.
+    """
+    rows = []
+    for result in results:
+        for rank, contrib in enumerate(result.task_contributions, start=1):
+            rows.append({
+                'baseline_file_id': result.baseline_file_id,
+                'current_file_id': result.current_file_id,
+                'baseline_finish': result.baseline_finish,
+                'current_finish': result.current_finish,
+                'total_slip_hours': result.total_slip_hours,
+                'rank': rank,
+                **asdict(contrib),
+            })
+    columns = ['baseline_file_id', 'current_file_id', 'baseline_finish', 'current_finish',
+               'total_slip_hours', 'rank'] + [f.name for f in fields(TaskContribution)]
+    return pd.DataFrame(rows, columns=columns)
+
+
 def analyze_slip_by_wbs(result: DelayAttributionResult) -> dict[str, float]:
     """
     Aggregate slip attribution by WBS.
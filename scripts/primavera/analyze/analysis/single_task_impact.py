@@ -5,13 +5,22 @@ Analyze the schedule impact of changing a single task's duration.
 Used for what-if scenarios and sensitivity analysis.
 """
 
+import os
+from bisect import insort
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
-from typing import Optional
+from typing import Iterator, Optional
 
 from ..cpm.models import Task, TaskImpactResult
 from ..cpm.calendar import P6Calendar
 from ..cpm.network import TaskNetwork
-from ..cpm.engine import CPMEngine
+from ..cpm.incremental import IncrementalCPM
+
+
+def _check_baseline(network: TaskNetwork, baseline: Optional[IncrementalCPM]) -> None:
+    """Raise ValueError if baseline was calculated on a different network."""
+    if baseline is not None and baseline.network is not network:
+        raise ValueError("baseline was calculated on a different network")
 
 
 def analyze_task_impact(
@@ -21,47 +30,51 @@ def analyze_task_impact(
     duration_delta_hours: float,
     project_start: datetime = None,
     data_date: datetime = None,
+    baseline: IncrementalCPM = None,
 ) -> TaskImpactResult:
     """
     Calculate impact of changing one task's duration.
 
+    The change is recalculated incrementally against the baseline CPM, so
+    only the tasks it reaches are rescheduled.
+
     Args:
-        network: Task network (will not be modified)
+        network: Task network (CPM results are set to the baseline; inputs are not modified)
         calendars: Calendar lookup dict
         task_id: ID of task to modify
         duration_delta_hours: Change in duration (positive = increase)
         project_start: Project start date (auto-detected if None)
         data_date: Schedule status date (P6's "data date")
+        baseline: Baseline CPM of this network to reuse across calls
+            (project_start/data_date are then taken from it)
 
     Returns:
         TaskImpactResult with original vs new finish dates and affected tasks
+
+    Raises:
+        ValueError: If the task is not in the network, or baseline is for another network
     """
+    _check_baseline(network, baseline)
     if task_id not in network.tasks:
         raise ValueError(f"Task {task_id} not found in network")
 
     task = network.tasks[task_id]
 
     # Run baseline CPM
-    baseline_engine = CPMEngine(network, calendars)
-    baseline_result = baseline_engine.run(project_start, data_date=data_date)
+    if baseline is None:
+        baseline = IncrementalCPM(network, calendars, project_start, data_date=data_date)
+    baseline_result = baseline.baseline
 
-    # Clone network and modify task
-    modified_network = network.clone()
+    # Recalculate with the modified duration, then restore the baseline
     new_duration = task.duration_hours + duration_delta_hours
     if new_duration < 0:
         new_duration = 0
-    modified_network.modify_task_duration(task_id, new_duration)
-
-    # Run modified CPM
-    modified_engine = CPMEngine(modified_network, calendars)
-    modified_result = modified_engine.run(project_start, data_date=data_date)
-
-    # Find affected tasks (tasks whose early_finish changed)
-    affected = []
-    for tid, modified_task in modified_network.tasks.items():
-        baseline_task = network.tasks[tid]
-        if modified_task.early_finish != baseline_task.early_finish:
-            affected.append(tid)
+    try:
+        modified_result = baseline.recalculate(durations={task_id: new_duration})
+        # Find affected tasks (tasks whose early_finish changed)
+        affected = baseline.changed_task_ids('early_finish')
+    finally:
+        baseline.revert()
 
     # Calculate slip in work hours
     if calendars:
@@ -102,6 +115,148 @@ def analyze_task_impact(
     )
 
 
+# Baseline held by each sensitivity worker process (set by _init_sensitivity_worker)
+_worker_baseline: Optional[IncrementalCPM] = None
+
+
+def _init_sensitivity_worker(baseline: IncrementalCPM) -> None:
+    global _worker_baseline
+    _worker_baseline = baseline
+
+
+def _sensitivity_chunk(task_ids: list[str], duration_delta_hours: float,
+                       baseline: IncrementalCPM = None) -> list[TaskImpactResult]:
+    """Impact of each task in a chunk against the worker's baseline; failing tasks are skipped."""
+    baseline = baseline or _worker_baseline
+    results = []
+    for task_id in task_ids:
+        try:
+            results.append(analyze_task_impact(
+                baseline.network, baseline.engine.calendars, task_id,
+                duration_delta_hours, baseline=baseline,
+            ))
+        except Exception:
+            # Skip tasks that fail (e.g., orphan tasks)
+            continue
+    return results
+
+
+def _iter_sensitivity_chunks(
+    network: TaskNetwork,
+    calendars: dict[str, P6Calendar],
+    task_ids: Optional[list[str]],
+    duration_delta_hours: float,
+    project_start: Optional[datetime],
+    data_date: Optional[datetime],
+    workers: Optional[int],
+    chunk_size: Optional[int],
+    baseline: Optional[IncrementalCPM],
+) -> Iterator[list[TaskImpactResult]]:
+    """Yield the results of each chunk of tasks as it finishes (see iter_task_sensitivity)."""
+    _check_baseline(network, baseline)
+    if baseline is None:
+        baseline = IncrementalCPM(network, calendars, project_start, data_date=data_date)
+
+    if task_ids is None:
+        # Default: analyze incomplete tasks with non-zero duration
+        task_ids = [
+            t.task_id for t in network.tasks.values()
+            if not t.is_completed() and t.duration_hours > 0
+        ]
+
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, min(50, -(-len(task_ids) // (workers * 4))))
+    chunks = [task_ids[i:i + chunk_size] for i in range(0, len(task_ids), chunk_size)]
+    workers = min(workers, len(chunks))
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield _sensitivity_chunk(chunk, duration_delta_hours, baseline)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_sensitivity_worker,
+                             initargs=(baseline,)) as pool:
+        futures = [pool.submit(_sensitivity_chunk, chunk, duration_delta_hours) for chunk in chunks]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def iter_task_sensitivity(
+    network: TaskNetwork,
+    calendars: dict[str, P6Calendar],
+    task_ids: list[str] = None,
+    duration_delta_hours: float = 40.0,
+    project_start: datetime = None,
+    data_date: datetime = None,
+    workers: int = None,
+    chunk_size: int = None,
+    baseline: IncrementalCPM = None,
+) -> Iterator[TaskImpactResult]:
+    """
+    Yield the impact of increasing each task's duration, as results finish.
+
+    The baseline CPM is calculated once; each task is then an incremental
+    what-if against it. With workers > 1, chunks of tasks are evaluated in a
+    process pool whose workers each receive the baseline once at startup
+    (inherited copy-on-write where processes are forked), so results arrive
+    unranked, in completion order rather than task order. See
+    iter_ranked_sensitivity for the running ranking.
+
+    Args:
+        network: Task network (CPM results are set to the baseline)
+        calendars: Calendar lookup dict
+        task_ids: List of task IDs to analyze (default: all incomplete tasks)
+        duration_delta_hours: Duration increase to test
+        project_start: Project start date
+        data_date: Schedule status date (P6's "data date")
+        workers: Worker processes (default: CPU count; 1 = in this process)
+        chunk_size: Tasks per pool job (default: about four jobs per worker, at most 50)
+        baseline: Baseline CPM of this network to reuse
+
+    Yields:
+        TaskImpactResult for each task that could be analyzed
+    """
+    for results in _iter_sensitivity_chunks(network, calendars, task_ids, duration_delta_hours,
+                                            project_start, data_date, workers, chunk_size, baseline):
+        yield from results
+
+
+def iter_ranked_sensitivity(
+    network: TaskNetwork,
+    calendars: dict[str, P6Calendar],
+    task_ids: list[str] = None,
+    duration_delta_hours: float = 40.0,
+    project_start: datetime = None,
+    data_date: datetime = None,
+    workers: int = None,
+    chunk_size: int = None,
+    baseline: IncrementalCPM = None,
+    top_n: int = None,
+) -> Iterator[list[TaskImpactResult]]:
+    """
+    Yield the sensitivity ranking so far each time a chunk of tasks finishes.
+
+    Arguments are as for iter_task_sensitivity. Each ranking is sorted by
+    slip_hours (descending, ties in completion order); the last one yielded
+    is the final ranking.
+
+    Args:
+        top_n: Keep only the top_n most sensitive tasks in each ranking (None = all)
+
+    Yields:
+        List of TaskImpactResult, most sensitive first
+    """
+    ranking = []
+    for results in _iter_sensitivity_chunks(network, calendars, task_ids, duration_delta_hours,
+                                            project_start, data_date, workers, chunk_size, baseline):
+        for result in results:
+            insort(ranking, result, key=lambda r: -r.slip_hours)
+        if top_n is not None:
+            del ranking[top_n:]
+        yield list(ranking)
+
+
 def analyze_task_sensitivity(
     network: TaskNetwork,
     calendars: dict[str, P6Calendar],
@@ -109,12 +264,15 @@ def analyze_task_sensitivity(
     duration_delta_hours: float = 40.0,  # 5 days default
     project_start: datetime = None,
     data_date: datetime = None,
+    workers: int = 1,
+    baseline: IncrementalCPM = None,
 ) -> list[TaskImpactResult]:
     """
     Analyze sensitivity of multiple tasks.
 
     Tests the impact of increasing each task's duration by the same amount.
     Useful for identifying which tasks have the most schedule risk.
+    See iter_ranked_sensitivity for the ranking as results stream in.
 
     Args:
         network: Task network
@@ -123,31 +281,18 @@ def analyze_task_sensitivity(
         duration_delta_hours: Duration increase to test
         project_start: Project start date
         data_date: Schedule status date (P6's "data date")
+        workers: Worker processes (None = CPU count)
+        baseline: Baseline CPM of this network to reuse
 
     Returns:
         List of TaskImpactResult sorted by slip_hours (descending)
     """
-    if task_ids is None:
-        # Default: analyze incomplete tasks with non-zero duration
-        task_ids = [
-            t.task_id for t in network.tasks.values()
-            if not t.is_completed() and t.duration_hours > 0
-        ]
-
     results = []
-    for task_id in task_ids:
-        try:
-            result = analyze_task_impact(
-                network, calendars, task_id,
-                duration_delta_hours, project_start, data_date
-            )
-            results.append(result)
-        except Exception as e:
-            # Skip tasks that fail (e.g., orphan tasks)
-            continue
-
-    # Sort by slip impact (descending)
-    results.sort(key=lambda r: r.slip_hours, reverse=True)
+    for results in iter_ranked_sensitivity(
+        network, calendars, task_ids, duration_delta_hours,
+        project_start, data_date, workers=workers, baseline=baseline,
+    ):
+        pass
 
     return results
 
@@ -158,6 +303,7 @@ def analyze_critical_task_sensitivity(
     duration_delta_hours: float = 40.0,
     project_start: datetime = None,
     data_date: datetime = None,
+    workers: int = 1,
 ) -> list[TaskImpactResult]:
     """
     Analyze sensitivity of critical path tasks only.
@@ -168,22 +314,23 @@ def analyze_critical_task_sensitivity(
         duration_delta_hours: Duration increase to test
         project_start: Project start date
         data_date: Schedule status date (P6's "data date")
+        workers: Worker processes (None = CPU count)
 
     Returns:
         List of TaskImpactResult for critical tasks
     """
     # Run CPM to identify critical tasks
-    engine = CPMEngine(network, calendars)
-    result = engine.run(project_start, data_date=data_date)
+    baseline = IncrementalCPM(network, calendars, project_start, data_date=data_date)
 
     critical_ids = [
-        tid for tid in result.critical_path
+        tid for tid in baseline.baseline.critical_path
         if not network.tasks[tid].is_completed()
     ]
 
     return analyze_task_sensitivity(
         network, calendars, critical_ids,
-        duration_delta_hours, project_start, data_date
+        duration_delta_hours, project_start, data_date,
+        workers=workers, baseline=baseline,
     )
 
 
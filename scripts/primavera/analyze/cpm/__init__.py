@@ -6,12 +6,26 @@ This module provides:
 - Task network construction with dependency handling
 - Forward/backward pass CPM calculations
 - Float and critical path identification
+- Array-backed CPM engine for large schedules
+- Incremental what-if recalculation against a baseline
+- Monte Carlo schedule risk analysis
 """
 
-from .models import Task, Dependency, CPMResult, TaskImpactResult, DelayAttributionResult, CriticalPathResult
+from .models import (
+    Task,
+    Dependency,
+    CPMResult,
+    TaskImpactResult,
+    DelayAttributionResult,
+    CriticalPathResult,
+    MonteCarloResult,
+)
 from .calendar import P6Calendar
 from .network import TaskNetwork
 from .engine import CPMEngine
+from .array_engine import ArrayCPMEngine
+from .incremental import IncrementalCPM
+from .monte_carlo import MonteCarloCPM, DurationDistribution
 
 __all__ = [
     'Task',
@@ -20,7 +34,12 @@ __all__ = [
     'TaskImpactResult',
     'DelayAttributionResult',
     'CriticalPathResult',
+    'MonteCarloResult',
     'P6Calendar',
     'TaskNetwork',
     'CPMEngine',
+    'ArrayCPMEngine',
+    'IncrementalCPM',
+    'MonteCarloCPM',
+    'DurationDistribution',
 ]
@@ -0,0 +1,882 @@
+"""
+Array-backed CPM Engine.
+
+Compiles a TaskNetwork into integer-indexed arrays and runs the forward and
+backward passes in a tight loop (compiled with numba when it is installed).
+Results are written back to the Task objects and match CPMEngine.
+"""
+
+import math
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime, date, time, timedelta
+from typing import Optional
+
+import numpy as np
+
+from .calendar import (
+    P6Calendar,
+    DAY_US,
+    HOUR_US,
+    EXACT_US,
+    MAX_WORK_DAY_ITERATIONS,
+    MAX_SEARCH_DAYS,
+)
+from .engine import CPMEngine
+from .network import TaskNetwork
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+NUMBA_AVAILABLE = numba is not None
+
+# Kernel status codes
+OK = 0
+OUT_OF_RANGE = 1    # the compiled calendars do not cover the dates; grow them
+NEEDS_PYTHON = 2    # the task needs CPMEngine's calendar methods (irregular days, scan limits)
+
+# Task status codes
+NOT_STARTED = 0
+ACTIVE = 1
+COMPLETE = 2
+
+# Relationship type codes
+REL_FS = 0
+REL_SS = 1
+REL_FF = 2
+REL_SF = 3
+REL_OTHER = 4
+
+RELATIONSHIP_CODES = {'PR_FS': REL_FS, 'PR_SS': REL_SS, 'PR_FF': REL_FF, 'PR_SF': REL_SF}
+
+# Constraint types by the pass that applies them
+START_FLOOR_CONSTRAINTS = ('CS_SNET', 'CS_MSO')
+FINISH_CAP_CONSTRAINTS = ('CS_FNLT', 'CS_MFO', 'CS_MEO', 'CS_MEOB')
+START_CAP_CONSTRAINTS = ('CS_SNLT', 'CS_MSO', 'CS_SEOB')
+
+# Missing constraint date
+NO_DATE = -(2 ** 63)
+
+# Durations and lags beyond this many hours are left to CPMEngine
+MAX_KERNEL_HOURS = 2 ** 40
+
+ONE_US = timedelta(microseconds=1)
+
+
+def _jit(func):
+    """Compile with numba if available."""
+    if numba is None:
+        return func
+    return numba.njit(cache=True)(func)
+
+
+# =============================================================================
+# Work-time kernels
+#
+# Times are integer microseconds from the engine's origin (midnight), and
+# days are counted from the origin's date; work amounts are float hours, as
+# in P6Calendar. ``cal`` is the tuple built by _CompiledCalendars.kernel_args():
+# (starts, ends, day_of, cum, gaps, irregular, work_days, cal_lo, cal_hi,
+# day_lo, day_count, day_ptr, inexact).
+# Calendar c owns intervals cal_lo[c]:cal_hi[c]; the work time before interval
+# k is cum[k + c] and inexact[k + c] counts the intervals before k whose length
+# is not a multiple of EXACT_US. Its index covers day_count[c] days from
+# day_lo[c], with per-day prefix counts irregular/work_days starting at
+# day_ptr[c]. As in WorkTimeIndex, sums of exact amounts use integer
+# arithmetic and anything else replays the day scan's float accumulation, so
+# dates land on the same side of period boundaries as CPMEngine's.
+# Each helper returns (status, value).
+# =============================================================================
+
+@_jit
+def _bisect_left(a, x, lo, hi):
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if a[mid] < x:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+@_jit
+def _bisect_right(a, x, lo, hi):
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if x < a[mid]:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+@_jit
+def _regular(cal, c, day_from, day_to):
+    """OK if every day in [day_from, day_to] is compiled and regular."""
+    first = day_from - cal[9][c]
+    last = day_to - cal[9][c]
+    if first < 0 or last >= cal[10][c]:
+        return OUT_OF_RANGE
+    irregular = cal[5]
+    base = cal[11][c]
+    if irregular[base + last + 1] != irregular[base + first]:
+        return NEEDS_PYTHON
+    return OK
+
+
+@_jit
+def _scan_limits(cal, c, first, last):
+    """OK unless the day scan would hit a safety limit walking intervals first..last."""
+    day_of, gaps, work_days = cal[2], cal[4], cal[6]
+    if gaps[last + c + 1] != gaps[first + c + 1]:
+        return NEEDS_PYTHON
+    lo_day = min(day_of[first], day_of[last]) - cal[9][c]
+    hi_day = max(day_of[first], day_of[last]) - cal[9][c]
+    base = cal[11][c]
+    if work_days[base + hi_day + 1] - work_days[base + lo_day] > MAX_WORK_DAY_ITERATIONS:
+        return NEEDS_PYTHON
+    return OK
+
+
+@_jit
+def _advance(cal, c, t):
+    """P6Calendar.advance_to_work_time."""
+    starts, ends, day_of = cal[0], cal[1], cal[2]
+    hi = cal[8][c]
+    i = _bisect_right(ends, t, cal[7][c], hi)
+    if i == hi:
+        return OUT_OF_RANGE, t
+    day = t // DAY_US
+    if day_of[i] - day >= MAX_SEARCH_DAYS:
+        return NEEDS_PYTHON, t
+    status = _regular(cal, c, day, day_of[i])
+    if status != OK:
+        return status, t
+    return OK, max(t, starts[i])
+
+
+@_jit
+def _retreat(cal, c, t):
+    """P6Calendar._retreat_to_work_time."""
+    starts, ends, day_of = cal[0], cal[1], cal[2]
+    lo = cal[7][c]
+    i = _bisect_left(starts, t, lo, cal[8][c]) - 1
+    if i < lo:
+        return OUT_OF_RANGE, t
+    day = t // DAY_US
+    if day - day_of[i] >= MAX_SEARCH_DAYS:
+        return NEEDS_PYTHON, t
+    status = _regular(cal, c, day_of[i], day)
+    if status != OK:
+        return status, t
+    return OK, min(t, ends[i])
+
+
+@_jit
+def _exact_hours(hours):
+    """True if hours is a multiple of EXACT_US the index adds up exactly."""
+    scaled = hours * 1024
+    return abs(hours) < 2 ** 20 and scaled == math.floor(scaled)
+
+
+@_jit
+def _timedelta_us(hours):
+    """Microseconds of timedelta(hours=hours) for hours >= 0, rounded as CPython rounds them."""
+    whole = math.floor(hours)
+    us = np.int64(whole) * HOUR_US
+    fraction = hours - whole
+    if fraction == 0:
+        return us
+    scaled = fraction * HOUR_US
+    whole = math.floor(scaled)
+    us += np.int64(whole)
+    leftover = scaled - whole
+    # Round half to even
+    if leftover > 0.5 or (leftover == 0.5 and us % 2 == 1):
+        us += 1
+    return us
+
+
+@_jit
+def _add(cal, c, t, hours):
+    """P6Calendar.add_work_hours."""
+    if hours <= 0:
+        return OK, t
+    status, t = _advance(cal, c, t)
+    if status != OK:
+        return status, t
+    starts, ends, cum, inexact = cal[0], cal[1], cal[3], cal[12]
+    lo, hi = cal[7][c], cal[8][c]
+    i = _bisect_right(ends, t, lo, hi)
+    first_us = ends[i] - t
+
+    j, end = hi, t
+    if _exact_hours(hours) and first_us % EXACT_US == 0:
+        target = cum[i + c] + (t - starts[i]) + np.int64(hours * HOUR_US)
+        # Last interval whose preceding work time is below the target
+        j = _bisect_left(cum, target, lo + c, hi + c + 1) - 1 - c
+        if j >= hi:
+            return OUT_OF_RANGE, t
+        if inexact[j + 1 + c] == inexact[i + 1 + c]:
+            end = starts[j] + (target - cum[j + c])
+        else:
+            j = hi
+    if j == hi:
+        # Replay the scan's float loop
+        j, remaining = i, hours
+        available = first_us / 1e6 / 3600
+        while available < remaining:
+            remaining -= available
+            j += 1
+            if j == hi:
+                return OUT_OF_RANGE, t
+            available = (ends[j] - starts[j]) / 1e6 / 3600
+        end = (t if j == i else starts[j]) + _timedelta_us(remaining)
+
+    status = _regular(cal, c, cal[2][i], cal[2][j])
+    if status == OK:
+        status = _scan_limits(cal, c, i, j)
+    return status, end
+
+
+@_jit
+def _subtract(cal, c, t, hours):
+    """P6Calendar.subtract_work_hours."""
+    if hours <= 0:
+        return OK, t
+    status, t = _retreat(cal, c, t)
+    if status != OK:
+        return status, t
+    starts, ends, cum, inexact = cal[0], cal[1], cal[3], cal[12]
+    lo, hi = cal[7][c], cal[8][c]
+    i = _bisect_left(starts, t, lo, hi) - 1
+    first_us = t - starts[i]
+
+    j, end = lo - 1, t
+    if _exact_hours(hours) and first_us % EXACT_US == 0:
+        target = cum[i + c] + first_us - np.int64(hours * HOUR_US)
+        # Last interval whose preceding work time is at most the target
+        j = min(_bisect_right(cum, target, lo + c, hi + c + 1) - 1 - c, i)
+        if j < lo:
+            return OUT_OF_RANGE, t
+        if inexact[i + c] == inexact[j + 1 + c]:
+            end = starts[j] + (target - cum[j + c])
+        else:
+            j = lo - 1
+    if j < lo:
+        # Replay the scan's float loop
+        j, remaining = i, hours
+        available = first_us / 1e6 / 3600
+        while available < remaining:
+            remaining -= available
+            j -= 1
+            if j < lo:
+                return OUT_OF_RANGE, t
+            available = (ends[j] - starts[j]) / 1e6 / 3600
+        end = (t if j == i else ends[j]) - _timedelta_us(remaining)
+
+    status = _regular(cal, c, cal[2][j], cal[2][i])
+    if status == OK:
+        status = _scan_limits(cal, c, j, i)
+    return status, end
+
+
+@_jit
+def _between(cal, c, start, end):
+    """P6Calendar.work_hours_between."""
+    if end <= start:
+        return OK, 0.0
+    status = _regular(cal, c, start // DAY_US, end // DAY_US)
+    if status != OK:
+        return status, 0.0
+    starts, ends, cum, inexact = cal[0], cal[1], cal[3], cal[12]
+    lo, hi = cal[7][c], cal[8][c]
+    i0 = _bisect_right(ends, start, lo, hi)
+    i1 = _bisect_left(starts, end, lo, hi)
+    if i1 <= i0:
+        return OK, 0.0
+
+    first_us = min(end, ends[i0]) - max(start, starts[i0])
+    last_us = min(end, ends[i1 - 1]) - starts[i1 - 1] if i1 - 1 > i0 else 0
+    if first_us % EXACT_US == 0 and last_us % EXACT_US == 0 and inexact[i1 - 1 + c] == inexact[i0 + 1 + c]:
+        middle_us = cum[i1 - 1 + c] - cum[i0 + 1 + c] if i1 - 1 > i0 else 0
+        return OK, (first_us + middle_us + last_us) / HOUR_US
+
+    # Replay the scan's sequential float sum
+    total = first_us / 1e6 / 3600
+    for k in range(i0 + 1, i1 - 1):
+        total += (ends[k] - starts[k]) / 1e6 / 3600
+    if i1 - 1 > i0:
+        total += last_us / 1e6 / 3600
+    return OK, total
+
+
+@_jit
+def _finish_before(cal, c, t):
+    """
+    P6's finish convention for backward-pass dates: a date at the exact
+    start of a work period becomes the end of the previous work period.
+    """
+    day = t // DAY_US
+    status = _regular(cal, c, day, day)
+    if status != OK:
+        return status, t
+    starts, ends, day_of = cal[0], cal[1], cal[2]
+    lo, hi = cal[7][c], cal[8][c]
+    k = _bisect_left(starts, t, lo, hi)
+    if k == hi or starts[k] != t:
+        return OK, t
+    prev = k - 1
+    if prev < lo:
+        return OUT_OF_RANGE, t
+    if day - day_of[prev] >= MAX_SEARCH_DAYS:
+        return NEEDS_PYTHON, t
+    status = _regular(cal, c, day_of[prev], day)
+    return status, ends[prev]
+
+
+# =============================================================================
+# Pass kernels
+#
+# Each processes tasks from position k0 of its order and returns
+# (position, status): len(order) and OK when done, otherwise the task that
+# stopped the pass and why.
+# =============================================================================
+
+@_jit
+def _forward_kernel(k0, order, pred_ptr, pred_task, pred_type, pred_lag, task_cal, status,
+                    duration, remaining, start_floor, python_task, data_date,
+                    early_start, early_finish, cal):
+    for k in range(k0, len(order)):
+        i = order[k]
+        if python_task[i]:
+            return k, NEEDS_PYTHON
+        if status[i] == COMPLETE:
+            early_start[i] = data_date
+            early_finish[i] = data_date
+            continue
+
+        c = task_cal[i]
+        active = status[i] == ACTIVE
+        work = remaining[i] if active else duration[i]
+        es = data_date
+        for e in range(pred_ptr[i], pred_ptr[i + 1]):
+            p = pred_task[e]
+            rel = pred_type[e]
+            lag = pred_lag[e]
+            if (rel == REL_FS or rel == REL_SS) and (
+                    status[p] == COMPLETE or (status[p] == ACTIVE and active)):
+                lag = 0.0
+            if rel == REL_FS:
+                st, driven = _add(cal, c, early_finish[p], lag)
+            elif rel == REL_SS:
+                st, driven = _add(cal, c, early_start[p], lag)
+            elif rel == REL_FF or rel == REL_SF:
+                base = early_finish[p] if rel == REL_FF else early_start[p]
+                st, driven = _add(cal, c, base, lag)
+                if st == OK and work > 0:
+                    st, driven = _subtract(cal, c, driven, work)
+            else:
+                st, driven = OK, early_finish[p]
+            if st != OK:
+                return k, st
+            if driven > es:
+                es = driven
+
+        if start_floor[i] != NO_DATE and start_floor[i] > es:
+            es = start_floor[i]
+
+        if active or work > 0:
+            st, es = _advance(cal, c, es)
+            if st != OK:
+                return k, st
+            st, ef = _add(cal, c, es, work)
+            if st != OK:
+                return k, st
+        else:
+            ef = es
+        early_start[i] = es
+        early_finish[i] = ef
+    return len(order), OK
+
+
+@_jit
+def _backward_kernel(k0, order, succ_ptr, succ_task, succ_type, succ_lag, task_cal, status,
+                     duration, remaining, finish_cap, start_cap, python_task, project_end,
+                     late_start, late_finish, cal):
+    for k in range(k0, len(order)):
+        i = order[k]
+        if python_task[i]:
+            return k, NEEDS_PYTHON
+        if status[i] == COMPLETE:
+            late_start[i] = project_end
+            late_finish[i] = project_end
+            continue
+
+        c = task_cal[i]
+        work = remaining[i] if status[i] == ACTIVE else duration[i]
+        lf = project_end
+        for e in range(succ_ptr[i], succ_ptr[i + 1]):
+            s = succ_task[e]
+            if status[s] == COMPLETE:
+                continue
+            rel = succ_type[e]
+            if rel == REL_FS or rel == REL_FF:
+                base = late_start[s] if rel == REL_FS else late_finish[s]
+                st, driven = _subtract(cal, c, base, succ_lag[e])
+                if st == OK:
+                    st, driven = _finish_before(cal, c, driven)
+            elif rel == REL_SS or rel == REL_SF:
+                base = late_start[s] if rel == REL_SS else late_finish[s]
+                st, driven = _subtract(cal, c, base, succ_lag[e])
+                if st == OK and work > 0:
+                    st, driven = _add(cal, c, driven, work)
+            else:
+                st, driven = OK, late_start[s]
+            if st != OK:
+                return k, st
+            if driven < lf:
+                lf = driven
+
+        if finish_cap[i] != NO_DATE and finish_cap[i] < lf:
+            lf = finish_cap[i]
+        st, ls = _subtract(cal, c, lf, work)
+        if st != OK:
+            return k, st
+        if start_cap[i] != NO_DATE and start_cap[i] < ls:
+            ls = start_cap[i]
+            st, lf = _add(cal, c, ls, work)
+            if st != OK:
+                return k, st
+        late_start[i] = ls
+        late_finish[i] = lf
+    return len(order), OK
+
+
+@_jit
+def _float_kernel(k0, succ_ptr, succ_task, succ_type, succ_lag, task_cal, status, python_task,
+                  early_start, early_finish, late_finish, total_float, free_float, critical, cal):
+    for i in range(k0, len(task_cal)):
+        if python_task[i]:
+            return i, NEEDS_PYTHON
+        if status[i] == COMPLETE:
+            total_float[i] = np.nan
+            free_float[i] = np.nan
+            critical[i] = False
+            continue
+
+        c = task_cal[i]
+        if late_finish[i] >= early_finish[i]:
+            st, tf = _between(cal, c, early_finish[i], late_finish[i])
+        else:
+            st, span = _between(cal, c, late_finish[i], early_finish[i])
+            tf = -span
+        if st != OK:
+            return i, st
+
+        best = np.inf
+        for e in range(succ_ptr[i], succ_ptr[i + 1]):
+            if succ_type[e] != REL_FS:
+                continue
+            st, gap = _between(cal, c, early_finish[i], early_start[succ_task[e]])
+            if st != OK:
+                return i, st
+            best = min(best, gap - succ_lag[e])
+
+        total_float[i] = tf
+        critical[i] = tf <= 0
+        free_float[i] = best
+    return len(task_cal), OK
+
+
+# =============================================================================
+# Compilation
+# =============================================================================
+
+def _work_hours(hours: list) -> tuple[np.ndarray, np.ndarray]:
+    """Hours as a float array (0 where unusable), and a mask of values the kernels can use."""
+    hours = np.asarray(hours, dtype=np.float64)
+    usable = np.isfinite(hours) & (np.abs(hours) < MAX_KERNEL_HOURS)
+    return np.where(usable, hours, 0.0), usable
+
+
+def _kernel_array(values, dtype):
+    """Array for the kernels: numpy for numba, a list for plain Python."""
+    if numba is None:
+        return values.tolist() if isinstance(values, np.ndarray) else list(values)
+    return np.asarray(values, dtype=dtype)
+
+
+@dataclass
+class _NetworkArrays:
+    """Integer-indexed form of a TaskNetwork."""
+
+    task_ids: list
+    order: object             # topological order of task indices
+    pred_ptr: object          # CSR over predecessors of each task
+    pred_task: object
+    pred_type: object
+    pred_lag: object          # lag in hours
+    succ_ptr: object          # CSR over successors of each task
+    succ_task: object
+    succ_type: object
+    succ_lag: object
+    status: object
+    duration: object          # hours
+    remaining: object         # hours
+    task_cal: object          # index into calendars
+    calendars: list
+    python_task: list         # tasks left to CPMEngine
+
+
+class _CompiledCalendars:
+    """
+    Kernel arrays for several calendars, taken from their work-time indexes.
+
+    Each P6Calendar keeps (and grows) its own WorkTimeIndex, so repeated runs
+    against the same calendars reuse them; the indexes may cover different
+    day ranges, which are recorded relative to a shared origin.
+    """
+
+    def __init__(self, calendars: list[P6Calendar], origin_day: date):
+        self.calendars = calendars
+        self.origin_day = origin_day
+        self.origin = datetime.combine(origin_day, time(0, 0))
+        self._origin64 = np.datetime64(self.origin, 'us')
+        self.indexes = [calendar._get_work_index(origin_day) for calendar in calendars]
+        self._build()
+
+    def _build(self) -> None:
+        starts, ends, day_of, cum, gaps, irregular, work_days, inexact = [], [], [], [], [], [], [], []
+        cal_lo, cal_hi, day_lo, day_count, day_ptr = [], [], [], [], []
+        n_intervals = n_day_rows = 0
+        for index in self.indexes:
+            offset = (index.first_day - self.origin_day).days
+            cal_lo.append(n_intervals)
+            n_intervals += len(index.starts)
+            cal_hi.append(n_intervals)
+            day_lo.append(offset)
+            day_count.append(index.n_days)
+            day_ptr.append(n_day_rows)
+            n_day_rows += index.n_days + 1
+            starts.append(np.asarray(index.starts, dtype=np.int64) + offset * DAY_US)
+            ends.append(np.asarray(index.ends, dtype=np.int64) + offset * DAY_US)
+            day_of.append(np.asarray(index.day_of, dtype=np.int64) + offset)
+            cum.append(index.cum_us)
+            gaps.append(index.gaps)
+            irregular.append(index.irregular)
+            work_days.append(index.work_days)
+            inexact.append(index.inexact)
+        self.empty = [lo == hi for lo, hi in zip(cal_lo, cal_hi)]
+
+        concat = lambda parts: np.concatenate([np.asarray(p, dtype=np.int64) for p in parts] or [[]])
+        self._args = tuple(_kernel_array(values, np.int64) for values in (
+            concat(starts), concat(ends), concat(day_of), concat(cum), concat(gaps),
+            concat(irregular), concat(work_days), cal_lo, cal_hi, day_lo, day_count, day_ptr,
+            concat(inexact),
+        ))
+
+    def grow(self) -> bool:
+        """Grow every calendar's index. False if none can grow (MAX_INDEX_DAYS)."""
+        grown = False
+        for c, calendar in enumerate(self.calendars):
+            index = calendar._get_work_index(self.origin_day, grow=True)
+            if index is not None:
+                self.indexes[c] = index
+                grown = True
+        if grown:
+            self._build()
+        return grown
+
+    def kernel_args(self) -> tuple:
+        return self._args
+
+    def position(self, dt: datetime) -> int:
+        """Microseconds from the origin."""
+        return (dt - self.origin) // ONE_US
+
+    def datetimes_at(self, positions) -> list[datetime]:
+        """Datetimes at an array of positions."""
+        return (self._origin64 + np.asarray(positions, dtype=np.int64).astype('timedelta64[us]')).tolist()
+
+
+class ArrayCPMEngine(CPMEngine):
+    """
+    CPM engine over integer-indexed arrays.
+
+    The network is compiled into CSR predecessor/successor lists with
+    relationship types, lags and durations in hours, and each calendar into
+    its sorted work intervals with cumulative work time (the same intervals
+    as the P6Calendar work-time index). Both passes and the float calculation
+    then run over these arrays, compiled with numba when it is installed.
+    Like the work-time index, the kernels add exact amounts (multiples of
+    1/1024 hour) in integer microseconds and replay the day scan's float
+    accumulation for any other duration, lag or period length.
+
+    Tasks the arrays cannot model - calendars with 0-hour curing periods or
+    other irregular days, the day scan's safety limits, non-finite durations
+    or lags - are scheduled with CPMEngine's per-task methods in the same
+    topological position, so results match CPMEngine.
+    """
+
+    def __init__(self, network: TaskNetwork, calendars: dict[str, P6Calendar],
+                 default_calendar_id: str = None):
+        super().__init__(network, calendars, default_calendar_id)
+        self._arrays: Optional[_NetworkArrays] = None
+        self._compiled: Optional[_CompiledCalendars] = None
+        self._early_start = None
+        self._early_finish = None
+        self._late_start = None
+        self._late_finish = None
+
+    # -------------------------------------------------------------------------
+    # Compilation
+    # -------------------------------------------------------------------------
+
+    def compile(self) -> _NetworkArrays:
+        """Compile the network (tasks, relationships, durations) into arrays."""
+        tasks = list(self.network.tasks.values())
+        task_ids = list(self.network.tasks)
+        index = {task_id: i for i, task_id in enumerate(task_ids)}
+
+        calendars, cal_index, task_cal_by_id = [], {}, {}
+        task_cal = []
+        for task in tasks:
+            c = task_cal_by_id.get(task.calendar_id)
+            if c is None:
+                calendar = self.get_calendar(task.calendar_id)
+                c = cal_index.get(id(calendar))
+                if c is None:
+                    c = cal_index[id(calendar)] = len(calendars)
+                    calendars.append(calendar)
+                task_cal_by_id[task.calendar_id] = c
+            task_cal.append(c)
+        status = [COMPLETE if task.is_completed() else ACTIVE if task.is_in_progress() else NOT_STARTED
+                  for task in tasks]
+        duration, duration_ok = _work_hours([task.duration_hours for task in tasks])
+        remaining, remaining_ok = _work_hours([task.remaining_duration_hours for task in tasks])
+        python_task = (~(duration_ok & remaining_ok)).tolist()
+
+        pred_ptr, pred_task, pred_type, pred_lag_hours = [0], [], [], []
+        succ_ptr, succ_task, succ_type, succ_lag_hours = [0], [], [], []
+        for task_id in task_ids:
+            for dep in self.network.get_predecessors(task_id):
+                pred_task.append(index[dep.pred_task_id])
+                pred_type.append(RELATIONSHIP_CODES.get(dep.pred_type, REL_OTHER))
+                pred_lag_hours.append(dep.lag_hours)
+            pred_ptr.append(len(pred_task))
+            for dep in self.network.get_successors(task_id):
+                succ_task.append(index[dep.succ_task_id])
+                succ_type.append(RELATIONSHIP_CODES.get(dep.pred_type, REL_OTHER))
+                succ_lag_hours.append(dep.lag_hours)
+            succ_ptr.append(len(succ_task))
+
+        pred_lag, pred_lag_ok = _work_hours(pred_lag_hours)
+        succ_lag, _ = _work_hours(succ_lag_hours)
+        # Both ends of a relationship with an unusable lag use it in CPMEngine arithmetic
+        for e in np.flatnonzero(~pred_lag_ok):
+            python_task[pred_task[e]] = True
+            python_task[bisect_right(pred_ptr, e) - 1] = True
+
+        # Compact task indices follow network.tasks order, as task_ids do
+        order = self.network.compact().topological_order()
+
+        int64 = np.int64
+        self._arrays = _NetworkArrays(
+            task_ids=task_ids,
+            order=_kernel_array(order, int64),
+            pred_ptr=_kernel_array(pred_ptr, int64),
+            pred_task=_kernel_array(pred_task, int64),
+            pred_type=_kernel_array(pred_type, int64),
+            pred_lag=_kernel_array(pred_lag, np.float64),
+            succ_ptr=_kernel_array(succ_ptr, int64),
+            succ_task=_kernel_array(succ_task, int64),
+            succ_type=_kernel_array(succ_type, int64),
+            succ_lag=_kernel_array(succ_lag, np.float64),
+            status=_kernel_array(status, int64),
+            duration=_kernel_array(duration, np.float64),
+            remaining=_kernel_array(remaining, np.float64),
+            task_cal=_kernel_array(task_cal, int64),
+            calendars=calendars,
+            python_task=python_task,
+        )
+        return self._arrays
+
+    def _run_kernel(self, kernel, build_args, in_python) -> None:
+        """
+        Run a pass kernel to completion.
+
+        build_args() returns the kernel arguments after the start position;
+        it is called again whenever out-of-range stops grow the calendar
+        indexes. Tasks the kernel cannot handle are passed to
+        in_python(position) and skipped.
+        """
+        k = 0
+        args = build_args()
+        while True:
+            k, status = kernel(k, *args)
+            if status == OK:
+                return
+            if status == OUT_OF_RANGE and self._compiled.grow():
+                args = build_args()
+                continue
+            in_python(k)
+            k += 1
+
+    def _positions(self, dates: list[tuple[int, datetime]], n: int):
+        """Array of n positions with the given (task, date) entries, NO_DATE elsewhere."""
+        values = [NO_DATE] * n
+        for i, d in dates:
+            values[i] = self._compiled.position(d)
+        return _kernel_array(values, np.int64)
+
+    def _write_dates(self, tasks: list, names: tuple, arrays: tuple, skip: set) -> None:
+        """Copy date arrays to Task attributes, except tasks scheduled in Python."""
+        columns = [self._compiled.datetimes_at(values) for values in arrays]
+        for i, task in enumerate(tasks):
+            if i not in skip:
+                for name, column in zip(names, columns):
+                    setattr(task, name, column[i])
+
+    # -------------------------------------------------------------------------
+    # Passes
+    # -------------------------------------------------------------------------
+
+    def forward_pass(self, project_start: datetime, data_date: datetime = None) -> None:
+        """Calculate early start and early finish for all tasks (see CPMEngine.forward_pass)."""
+        if data_date is None:
+            data_date = project_start
+
+        arrays = self.compile()
+        tasks = list(self.network.tasks.values())
+        n = len(tasks)
+        floors = [(i, task.constraint_date) for i, task in enumerate(tasks)
+                  if task.constraint_type in START_FLOOR_CONSTRAINTS and task.constraint_date]
+
+        self._compiled = _CompiledCalendars(arrays.calendars, data_date.date())
+        for i, c in enumerate(arrays.task_cal):
+            if self._compiled.empty[c]:
+                arrays.python_task[i] = True
+        python_task = _kernel_array(arrays.python_task, np.bool_)
+
+        self._early_start = _kernel_array(np.zeros(n, dtype=np.int64), np.int64)
+        self._early_finish = _kernel_array(np.zeros(n, dtype=np.int64), np.int64)
+        self._late_start = self._late_finish = None
+        in_python = set()
+
+        def build_args():
+            return (arrays.order, arrays.pred_ptr, arrays.pred_task, arrays.pred_type, arrays.pred_lag,
+                    arrays.task_cal, arrays.status, arrays.duration, arrays.remaining,
+                    self._positions(floors, n), python_task, self._compiled.position(data_date),
+                    self._early_start, self._early_finish, self._compiled.kernel_args())
+
+        def schedule(k):
+            i = arrays.order[k]
+            preds = [arrays.pred_task[e] for e in range(arrays.pred_ptr[i], arrays.pred_ptr[i + 1])]
+            self._write_some(tasks, preds, ('early_start', 'early_finish'),
+                             (self._early_start, self._early_finish), in_python)
+            task = tasks[i]
+            self._forward_task(task, self.get_calendar(task.calendar_id), data_date)
+            self._early_start[i] = self._compiled.position(task.early_start)
+            self._early_finish[i] = self._compiled.position(task.early_finish)
+            in_python.add(i)
+
+        self._run_kernel(_forward_kernel, build_args, schedule)
+        self._write_dates(tasks, ('early_start', 'early_finish'), (self._early_start, self._early_finish), in_python)
+
+    def backward_pass(self, project_end: datetime = None) -> None:
+        """Calculate late start and late finish for all tasks (see CPMEngine.backward_pass)."""
+        if self._early_finish is None:
+            raise ValueError("No tasks have early_finish calculated - run forward_pass first")
+        if project_end is None:
+            project_end = self._get_project_end()
+
+        arrays = self._arrays
+        tasks = list(self.network.tasks.values())
+        n = len(tasks)
+        finish_caps = [(i, task.constraint_date) for i, task in enumerate(tasks)
+                       if task.constraint_type in FINISH_CAP_CONSTRAINTS and task.constraint_date]
+        start_caps = [(i, task.constraint_date) for i, task in enumerate(tasks)
+                      if task.constraint_type in START_CAP_CONSTRAINTS and task.constraint_date]
+        python_task = _kernel_array(arrays.python_task, np.bool_)
+        reverse_order = arrays.order[::-1]
+
+        self._late_start = _kernel_array(np.zeros(n, dtype=np.int64), np.int64)
+        self._late_finish = _kernel_array(np.zeros(n, dtype=np.int64), np.int64)
+        in_python = set()
+
+        def build_args():
+            return (reverse_order, arrays.succ_ptr, arrays.succ_task, arrays.succ_type, arrays.succ_lag,
+                    arrays.task_cal, arrays.status, arrays.duration, arrays.remaining,
+                    self._positions(finish_caps, n), self._positions(start_caps, n), python_task,
+                    self._compiled.position(project_end), self._late_start, self._late_finish,
+                    self._compiled.kernel_args())
+
+        def schedule(k):
+            i = reverse_order[k]
+            succs = [arrays.succ_task[e] for e in range(arrays.succ_ptr[i], arrays.succ_ptr[i + 1])]
+            self._write_some(tasks, succs, ('late_start', 'late_finish'),
+                             (self._late_start, self._late_finish), in_python)
+            task = tasks[i]
+            self._backward_task(task, self.get_calendar(task.calendar_id), project_end)
+            self._late_start[i] = self._compiled.position(task.late_start)
+            self._late_finish[i] = self._compiled.position(task.late_finish)
+            in_python.add(i)
+
+        self._run_kernel(_backward_kernel, build_args, schedule)
+        self._write_dates(tasks, ('late_start', 'late_finish'), (self._late_start, self._late_finish), in_python)
+
+    def calculate_float(self) -> None:
+        """Calculate total float, free float and critical flags (see CPMEngine.calculate_float)."""
+        if self._late_finish is None:
+            raise ValueError("Late dates not calculated - run backward_pass first")
+
+        arrays = self._arrays
+        tasks = list(self.network.tasks.values())
+        n = len(tasks)
+        python_task = _kernel_array(arrays.python_task, np.bool_)
+        total_float = _kernel_array(np.zeros(n), np.float64)
+        free_float = _kernel_array(np.zeros(n), np.float64)
+        critical = _kernel_array(np.zeros(n, dtype=np.bool_), np.bool_)
+        in_python = set()
+
+        def build_args():
+            return (arrays.succ_ptr, arrays.succ_task, arrays.succ_type, arrays.succ_lag,
+                    arrays.task_cal, arrays.status, python_task, self._early_start, self._early_finish,
+                    self._late_finish, total_float, free_float, critical, self._compiled.kernel_args())
+
+        def schedule(i):
+            self._calculate_task_float(tasks[i])
+            in_python.add(i)
+
+        self._run_kernel(_float_kernel, build_args, schedule)
+
+        total_float = np.asarray(total_float, dtype=np.float64)
+        free_float = np.asarray(free_float, dtype=np.float64)
+        total_values = np.where(np.isnan(total_float), None, total_float).tolist()
+        free_values = np.where(np.isnan(free_float), None, np.maximum(free_float, 0)).tolist()
+        has_free = (free_float != np.inf).tolist()
+        critical = np.asarray(critical, dtype=bool).tolist()
+        for i, task in enumerate(tasks):
+            if i in in_python:
+                continue
+            task.total_float_hours = total_values[i]
+            task.is_critical = critical[i]
+            if has_free[i]:
+                task.free_float_hours = free_values[i] if free_values[i] != 0 else 0
+
+    def _write_some(self, tasks: list, indices: list, names: tuple, arrays: tuple, skip: set) -> None:
+        """Copy date arrays to the Task attributes of a few tasks."""
+        for i in indices:
+            if i not in skip:
+                for name, values in zip(names, arrays):
+                    setattr(tasks[i], name, self._compiled.datetimes_at([values[i]])[0])
+
+    def get_critical_path(self) -> list[str]:
+        """Return task IDs on the critical path in execution order."""
+        if self._arrays is None:
+            return super().get_critical_path()
+        task_ids = self._arrays.task_ids
+        return [task_ids[i] for i in self._arrays.order if self.network.tasks[task_ids[i]].is_critical]
@@ -4,15 +4,37 @@ P6 Calendar Parser and Date Arithmetic.
 Parses P6's complex calendar format and provides work-day-aware date calculations.
 """
 
+import math
 import re
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
 from datetime import datetime, date, time, timedelta
-from typing import Optional
+from typing import ClassVar, Optional
+
+import numpy as np
 
 
 # Excel epoch: December 30, 1899
 EXCEL_EPOCH = date(1899, 12, 30)
 
+# Work-time index constants (positions are integer microseconds)
+DAY_US = 86_400_000_000
+HOUR_US = 3_600_000_000
+# 1/1024 hour: durations that are multiples of this are exact in binary floating point
+EXACT_US = 3_515_625
+# Day-scan safety limits mirrored by the index
+MAX_WORK_DAY_ITERATIONS = 365 * 10
+MAX_SEARCH_DAYS = 365
+# Replays over more intervals than this use numpy instead of a Python loop
+REPLAY_LOOP_MAX = 256
+# Curing days (only 0-hour periods) count hours_per_day forward from 08:00 and back from 17:00
+CURING_START_US = 8 * HOUR_US
+CURING_END_US = 17 * HOUR_US
+# Index horizon: initial span around the first query, and the cap before falling back to scans
+INDEX_DAYS_BEFORE = 365 * 3
+INDEX_DAYS_AFTER = 365 * 7
+MAX_INDEX_DAYS = 365 * 200
+
 
 def excel_serial_to_date(serial: int) -> date:
     """Convert Excel serial date number to Python date."""
@@ -41,6 +63,512 @@ class WorkPeriod:
         return self.start <= t < self.finish
 
 
+class _OutOfRange(Exception):
+    """The work-time index does not cover the days a query needs."""
+
+
+class _NeedsScan(Exception):
+    """The query touches days the index does not model; use the day scan."""
+
+
+def _period_offsets(periods: list[WorkPeriod]) -> Optional[list[tuple[int, int]]]:
+    """
+    Microsecond offsets from midnight for a day's work periods.
+
+    Returns None if the day is irregular: 0-hour periods (curing calendars),
+    reversed, overlapping or unsorted periods. Curing days are modelled by
+    WorkTimeIndex separately; the other irregular days keep the day scan.
+    """
+    offsets = []
+    prev_end = -1
+    for p in periods:
+        start = ((p.start.hour * 60 + p.start.minute) * 60 + p.start.second) * 1_000_000 + p.start.microsecond
+        finish = ((p.finish.hour * 60 + p.finish.minute) * 60 + p.finish.second) * 1_000_000 + p.finish.microsecond
+        if p.hours() <= 0 or finish <= start or start < prev_end:
+            return None
+        offsets.append((start, finish))
+        prev_end = finish
+    return offsets
+
+
+class WorkTimeIndex:
+    """
+    Work intervals of a calendar over a range of days.
+
+    Positions are integer microseconds since midnight of ``first_day``. Each
+    work period of each day is one interval, and ``cum_us[i]`` is the work time
+    before interval ``i``, so forward and backward work-time arithmetic is a
+    bisect over the intervals instead of a day-by-day loop.
+
+    Results reproduce the day scan exactly, including its floating-point
+    accumulation: quarter-hour style durations (multiples of 1/1024 hour) are
+    exact in binary and use integer arithmetic; other durations replay the
+    scan's sequential float sums over the relevant intervals with numpy.
+
+    Curing days (00:00-00:00 periods with a positive hours_per_day) have no
+    intervals; the scan counts them as whole days of hours_per_day, and
+    queries crossing them walk runs of regular intervals and curing days in
+    turn. Other irregular days and the scan's safety limits raise _NeedsScan.
+    """
+
+    # Bump when the index layout or results change; pickled indexes are keyed by it
+    VERSION: ClassVar[int] = 2
+
+    def __init__(self, calendar: 'P6Calendar', first_day: date, n_days: int):
+        self.first_day = first_day
+        self.first_ordinal = first_day.toordinal()
+        self.n_days = n_days
+        self.origin = datetime.combine(first_day, time(0, 0))
+        self.hours_per_day = calendar.hours_per_day
+
+        starts, ends, day_of = [], [], []
+        irregular = [0]   # prefix count of irregular days
+        curing = [0]      # prefix count of curing days (a subset of irregular)
+        work_days = [0]   # prefix count of days with intervals
+        templates = {}
+        for k in range(n_days):
+            periods = calendar.get_work_periods(first_day + timedelta(days=k))
+            template = templates.get(id(periods))
+            if template is None:
+                is_curing = bool(periods) and self.hours_per_day > 0 and all(p.hours() == 0 for p in periods)
+                template = templates[id(periods)] = (periods, _period_offsets(periods), is_curing)
+            offsets = template[1]
+
+            if offsets is None:
+                irregular.append(irregular[-1] + 1)
+                curing.append(curing[-1] + (1 if template[2] else 0))
+                work_days.append(work_days[-1])
+                continue
+            irregular.append(irregular[-1])
+            curing.append(curing[-1])
+            work_days.append(work_days[-1] + (1 if offsets else 0))
+
+            base = k * DAY_US
+            for start, finish in offsets:
+                starts.append(base + start)
+                ends.append(base + finish)
+                day_of.append(k)
+
+        self.starts = starts
+        self.ends = ends
+        self.day_of = day_of
+        self.irregular = irregular
+        self.curing = curing
+        self.work_days = work_days
+
+        self.lengths = np.array(ends, dtype=np.int64) - np.array(starts, dtype=np.int64)
+        self.length_list = self.lengths.tolist()
+        self.cum_us = [0] + np.cumsum(self.lengths).tolist()
+        self.inexact = [0] + np.cumsum(self.lengths % EXACT_US != 0).tolist()
+        # gaps[i + 1] counts intervals j <= i more than MAX_SEARCH_DAYS after interval j - 1
+        day_gaps = np.diff(np.array(day_of, dtype=np.int64), prepend=day_of[0] if day_of else 0)
+        self.gaps = [0] + np.cumsum(day_gaps > MAX_SEARCH_DAYS).tolist()
+
+    def covers(self, dt: date) -> bool:
+        """True if the date lies inside the index."""
+        return 0 <= dt.toordinal() - self.first_ordinal < self.n_days
+
+    def position(self, dt: datetime) -> int:
+        """Microseconds from the index origin."""
+        day = dt.toordinal() - self.first_ordinal
+        if not 0 <= day < self.n_days:
+            raise _OutOfRange
+        return (day * DAY_US
+                + ((dt.hour * 60 + dt.minute) * 60 + dt.second) * 1_000_000 + dt.microsecond)
+
+    def datetime_at(self, pos: int) -> datetime:
+        """Datetime at a position."""
+        return self.origin + timedelta(microseconds=pos)
+
+    def _require_regular(self, day_from: int, day_to: int) -> None:
+        """Raise unless every day in [day_from, day_to] is indexed and regular."""
+        if day_from < 0 or day_to >= self.n_days:
+            raise _OutOfRange
+        if self.irregular[day_to + 1] != self.irregular[day_from]:
+            raise _NeedsScan
+
+    def _require_modelled(self, day_from: int, day_to: int) -> None:
+        """Raise unless every day in [day_from, day_to] is indexed and regular or curing."""
+        if day_from < 0 or day_to >= self.n_days:
+            raise _OutOfRange
+        if (self.irregular[day_to + 1] - self.irregular[day_from]
+                != self.curing[day_to + 1] - self.curing[day_from]):
+            raise _NeedsScan
+
+    def _is_curing(self, day: int) -> bool:
+        """True if the day is a curing day."""
+        if not 0 <= day < self.n_days:
+            raise _OutOfRange
+        return self.curing[day + 1] != self.curing[day]
+
+    def _next_irregular(self, day: int) -> int:
+        """First irregular day on or after day; n_days if none."""
+        return bisect_left(self.irregular, self.irregular[day] + 1) - 1
+
+    def _prev_irregular(self, day: int) -> int:
+        """Last irregular day on or before day; -1 if none."""
+        return bisect_left(self.irregular, self.irregular[day + 1]) - 1
+
+    def _require_scan_limits(self, first: int, last: int) -> None:
+        """Raise unless the scan walks intervals first..last without hitting a limit."""
+        if self.gaps[last + 1] != self.gaps[first + 1]:
+            raise _NeedsScan
+        lo, hi = sorted((self.day_of[first], self.day_of[last]))
+        if self.work_days[hi + 1] - self.work_days[lo] > MAX_WORK_DAY_ITERATIONS:
+            raise _NeedsScan
+
+    def _advance(self, t: int) -> int:
+        """Position of advance_to_work_time."""
+        day = t // DAY_US
+        if self._is_curing(day):
+            return max(t, day * DAY_US + CURING_START_US)
+        i = bisect_right(self.ends, t)
+        irregular = self._next_irregular(day)
+        if irregular < min(self.day_of[i] if i < len(self.ends) else self.n_days, day + MAX_SEARCH_DAYS):
+            if self._is_curing(irregular):
+                return irregular * DAY_US + CURING_START_US
+            raise _NeedsScan
+        if i == len(self.ends):
+            raise _OutOfRange
+        if self.day_of[i] - day >= MAX_SEARCH_DAYS:
+            self._require_regular(day, day + MAX_SEARCH_DAYS - 1)
+            raise ValueError(f"Could not find work time within {MAX_SEARCH_DAYS} days")
+        self._require_regular(day, self.day_of[i])
+        return max(t, self.starts[i])
+
+    def _retreat(self, t: int) -> int:
+        """Position of _retreat_to_work_time."""
+        day = t // DAY_US
+        if self._is_curing(day):
+            return min(t, day * DAY_US + CURING_END_US)
+        c = bisect_left(self.starts, t) - 1
+        irregular = self._prev_irregular(day)
+        if irregular > max(self.day_of[c] if c >= 0 else -1, day - MAX_SEARCH_DAYS):
+            if self._is_curing(irregular):
+                return irregular * DAY_US + CURING_END_US
+            raise _NeedsScan
+        if c < 0:
+            raise _OutOfRange
+        if day - self.day_of[c] >= MAX_SEARCH_DAYS:
+            self._require_regular(day - MAX_SEARCH_DAYS + 1, day)
+            raise ValueError(f"Could not find work time within {MAX_SEARCH_DAYS} days")
+        self._require_regular(self.day_of[c], day)
+        return min(t, self.ends[c])
+
+    def advance_to_work_time(self, dt: datetime) -> datetime:
+        t0 = self.position(dt)
+        t = self._advance(t0)
+        return dt if t == t0 else self.datetime_at(t)
+
+    def retreat_to_work_time(self, dt: datetime) -> datetime:
+        t0 = self.position(dt)
+        t = self._retreat(t0)
+        return dt if t == t0 else self.datetime_at(t)
+
+    def add_work_hours(self, start: datetime, hours: float) -> datetime:
+        if not math.isfinite(hours):
+            raise _NeedsScan
+        current = self.advance_to_work_time(start)
+        t = self.position(current)
+        if self._is_curing(t // DAY_US):
+            return self._add_walk(t, hours)
+        try:
+            return self._add_regular(current, t, hours)
+        except _NeedsScan:
+            if not self.curing[-1]:
+                raise
+            return self._add_walk(t, hours)
+
+    def _add_regular(self, current: datetime, t: int, hours: float) -> datetime:
+        """add_work_hours from work time t over regular days only."""
+        i = bisect_right(self.ends, t)
+        first_us = self.ends[i] - t
+        n = len(self.ends)
+
+        # Last interval the scan touches: first where consumed work reaches hours
+        j = max(bisect_left(self.cum_us, math.ceil(hours * HOUR_US) - first_us + self.cum_us[i + 1]) - 1, i)
+        if j >= n:
+            raise _OutOfRange
+
+        if (float(hours * 1024).is_integer() and abs(hours) < 2 ** 20 and first_us % EXACT_US == 0
+                and self.inexact[j + 1] == self.inexact[i + 1]):
+            last = j
+            remaining = hours if j == i else hours - (first_us + self.cum_us[j] - self.cum_us[i + 1]) / HOUR_US
+        else:
+            last, remaining = self._replay(i, first_us, hours, j, forward=True)
+
+        self._require_regular(self.day_of[i], self.day_of[last])
+        self._require_scan_limits(i, last)
+        work_start = current if last == i else self.datetime_at(self.starts[last])
+        return work_start + timedelta(hours=remaining)
+
+    def subtract_work_hours(self, end: datetime, hours: float) -> datetime:
+        if not math.isfinite(hours):
+            raise _NeedsScan
+        current = self.retreat_to_work_time(end)
+        t = self.position(current)
+        if self._is_curing(t // DAY_US):
+            return self._subtract_walk(t, hours)
+        try:
+            return self._subtract_regular(current, t, hours)
+        except _NeedsScan:
+            if not self.curing[-1]:
+                raise
+            return self._subtract_walk(t, hours)
+
+    def _subtract_regular(self, current: datetime, t: int, hours: float) -> datetime:
+        """subtract_work_hours from work time t over regular days only."""
+        c = bisect_left(self.starts, t) - 1
+        first_us = t - self.starts[c]
+
+        # First interval (going back) where consumed work reaches hours
+        j = min(bisect_right(self.cum_us, self.cum_us[c] - math.ceil(hours * HOUR_US) + first_us) - 1, c)
+        if j < 0:
+            raise _OutOfRange
+
+        if (float(hours * 1024).is_integer() and abs(hours) < 2 ** 20 and first_us % EXACT_US == 0
+                and self.inexact[c] == self.inexact[j + 1]):
+            last = j
+            remaining = hours if j == c else hours - (first_us + self.cum_us[c] - self.cum_us[j + 1]) / HOUR_US
+        else:
+            last, remaining = self._replay(c, first_us, hours, j, forward=False)
+
+        self._require_regular(self.day_of[last], self.day_of[c])
+        self._require_scan_limits(last, c)
+        work_end = current if last == c else self.datetime_at(self.ends[last])
+        return work_end - timedelta(hours=remaining)
+
+    def _add_walk(self, t: int, hours: float) -> datetime:
+        """
+        add_work_hours from work time t across curing days.
+
+        Runs of regular days consume their intervals as the scan does; each
+        curing day takes hours_per_day, or finishes the remainder from 08:00.
+        """
+        first_day = prev_day = t // DAY_US
+        remaining = hours
+        while True:
+            day = t // DAY_US
+            if day - prev_day >= MAX_SEARCH_DAYS or day - first_day >= MAX_WORK_DAY_ITERATIONS:
+                raise _NeedsScan
+            if self._is_curing(day):
+                if remaining < self.hours_per_day:
+                    return self.datetime_at(day * DAY_US + CURING_START_US) + timedelta(hours=remaining)
+                remaining -= self.hours_per_day
+                t = (day + 1) * DAY_US + CURING_START_US
+                if remaining <= 0:
+                    return self.datetime_at(t)
+                prev_day = day
+                continue
+
+            # Regular days up to the next irregular one
+            irregular = self._next_irregular(day)
+            i = bisect_right(self.ends, t)
+            stop = bisect_left(self.day_of, irregular)
+            if i < stop:
+                if self.day_of[i] - prev_day >= MAX_SEARCH_DAYS:
+                    raise _NeedsScan
+                work_start = max(t, self.starts[i])
+                j, remaining = self._consume(i, self.ends[i] - work_start, remaining, stop, forward=True)
+                last = stop - 1 if j is None else j
+                if self.gaps[last + 1] != self.gaps[i + 1] or self.day_of[last] - first_day >= MAX_WORK_DAY_ITERATIONS:
+                    raise _NeedsScan
+                if j is not None:
+                    return self.datetime_at(work_start if j == i else self.starts[j]) + timedelta(hours=remaining)
+                prev_day = self.day_of[last]
+            if not self._is_curing(irregular):
+                raise _NeedsScan
+            t = irregular * DAY_US + CURING_START_US
+
+    def _subtract_walk(self, t: int, hours: float) -> datetime:
+        """subtract_work_hours from work time t across curing days (mirror of _add_walk)."""
+        first_day = prev_day = t // DAY_US
+        remaining = hours
+        while True:
+            day = t // DAY_US
+            if prev_day - day >= MAX_SEARCH_DAYS or first_day - day >= MAX_WORK_DAY_ITERATIONS:
+                raise _NeedsScan
+            if self._is_curing(day):
+                if remaining < self.hours_per_day:
+                    return self.datetime_at(day * DAY_US + CURING_END_US) - timedelta(hours=remaining)
+                remaining -= self.hours_per_day
+                t = (day - 1) * DAY_US + CURING_END_US
+                if remaining <= 0:
+                    return self.datetime_at(t)
+                prev_day = day
+                continue
+
+            # Regular days back to the previous irregular one
+            irregular = self._prev_irregular(day)
+            c = bisect_left(self.starts, t) - 1
+            stop = bisect_left(self.day_of, irregular + 1) - 1
+            if c > stop:
+                if prev_day - self.day_of[c] >= MAX_SEARCH_DAYS:
+                    raise _NeedsScan
+                work_end = min(t, self.ends[c])
+                j, remaining = self._consume(c, work_end - self.starts[c], remaining, stop, forward=False)
+                last = stop + 1 if j is None else j
+                if self.gaps[c + 1] != self.gaps[last + 1] or first_day - self.day_of[last] >= MAX_WORK_DAY_ITERATIONS:
+                    raise _NeedsScan
+                if j is not None:
+                    return self.datetime_at(work_end if j == c else self.ends[j]) - timedelta(hours=remaining)
+                prev_day = self.day_of[last]
+            if irregular < 0:
+                raise _OutOfRange
+            if not self._is_curing(irregular):
+                raise _NeedsScan
+            t = irregular * DAY_US + CURING_END_US
+
+    def _consume(self, i: int, first_us: int, hours: float, stop: int, forward: bool) -> tuple[Optional[int], float]:
+        """
+        The scan's float loop over intervals from i up to (not including) stop.
+
+        Returns:
+            tuple: (stopping interval, or None if the intervals run out; remaining hours)
+        """
+        step = 1 if forward else -1
+        if abs(stop - i) < REPLAY_LOOP_MAX:
+            idx, remaining = i, hours
+            available = first_us / 1e6 / 3600
+            while available < remaining:
+                remaining -= available
+                idx += step
+                if idx == stop:
+                    return None, remaining
+                available = self.length_list[idx] / 1e6 / 3600
+            return idx, remaining
+
+        window = self.lengths[i + 1:stop] if forward else self.lengths[stop + 1:i][::-1]
+        available = np.concatenate(([first_us], window)) / 1e6 / 3600
+        remaining = np.subtract.accumulate(np.concatenate(([hours], available)))
+        covered = available >= remaining[:-1]
+        if not covered.any():
+            return None, float(remaining[-1])
+        k = int(np.argmax(covered))
+        return i + step * k, float(remaining[k])
+
+    def _replay(self, i: int, first_us: int, hours: float, estimate: int, forward: bool) -> tuple[int, float]:
+        """
+        Replay the scan's float loop from interval i over a window of intervals.
+
+        The scan subtracts each period's hours from the remaining hours in turn
+        and stops at the first period whose hours cover what remains; this
+        reproduces that sequence with np.subtract.accumulate.
+
+        Returns:
+            tuple: (index of the stopping interval, remaining hours there)
+        """
+        if abs(estimate - i) < REPLAY_LOOP_MAX:
+            step = 1 if forward else -1
+            idx, remaining = i, hours
+            available = first_us / 1e6 / 3600
+            while available < remaining:
+                remaining -= available
+                idx += step
+                if not 0 <= idx < len(self.length_list):
+                    raise _OutOfRange
+                available = self.length_list[idx] / 1e6 / 3600
+            return idx, remaining
+
+        margin = 2
+        while True:
+            if forward:
+                stop = min(estimate + margin + 1, len(self.ends))
+                window = self.lengths[i + 1:stop]
+            else:
+                stop = max(estimate - margin, 0)
+                window = self.lengths[stop:i][::-1]
+            available = np.concatenate(([first_us], window)) / 1e6 / 3600
+            remaining = np.subtract.accumulate(np.concatenate(([hours], available)))
+            covered = available >= remaining[:-1]
+            if covered.any():
+                k = int(np.argmax(covered))
+                return (i + k if forward else i - k), float(remaining[k])
+            if (forward and stop == len(self.ends)) or (not forward and stop == 0):
+                raise _OutOfRange
+            margin *= 4
+
+    def work_hours_between(self, start: datetime, end: datetime) -> float:
+        s = self.position(start)
+        e = self.position(end)
+        if self.irregular[e // DAY_US + 1] != self.irregular[s // DAY_US]:
+            return self._between_walk(s, e)
+
+        i0 = bisect_right(self.ends, s)
+        i1 = bisect_left(self.starts, e)
+        if i1 <= i0:
+            return 0.0
+
+        first_us = min(e, self.ends[i0]) - max(s, self.starts[i0])
+        last_us = min(e, self.ends[i1 - 1]) - self.starts[i1 - 1] if i1 - 1 > i0 else 0
+        if first_us % EXACT_US == 0 and last_us % EXACT_US == 0 and self.inexact[i1 - 1] == self.inexact[i0 + 1]:
+            middle_us = self.cum_us[i1 - 1] - self.cum_us[i0 + 1] if i1 - 1 > i0 else 0
+            return (first_us + middle_us + last_us) / HOUR_US
+
+        # Replay the scan's sequential float sum
+        if i1 - i0 < REPLAY_LOOP_MAX:
+            total = first_us / 1e6 / 3600
+            for length in self.length_list[i0 + 1:i1 - 1]:
+                total += length / 1e6 / 3600
+            if i1 - 1 > i0:
+                total += last_us / 1e6 / 3600
+            return total
+        terms = [[first_us], self.lengths[i0 + 1:i1 - 1]]
+        if i1 - 1 > i0:
+            terms.append([last_us])
+        return float(np.add.accumulate(np.concatenate(terms) / 1e6 / 3600)[-1])
+
+    def _between_walk(self, s: int, e: int) -> float:
+        """work_hours_between over regular and curing days, summed in the scan's order."""
+        first, last = s // DAY_US, e // DAY_US
+        if self.curing[last + 1] == self.curing[first]:
+            raise _NeedsScan
+        terms = []
+        day = first
+        while day <= last:
+            if self._is_curing(day):
+                if first == last:
+                    terms.append(min((e - s) / 1e6 / 3600, self.hours_per_day))
+                elif day == first or day == last:
+                    terms.append(self.hours_per_day * 0.5)
+                else:
+                    terms.append(self.hours_per_day)
+                day += 1
+                continue
+
+            irregular = min(self._next_irregular(day), last + 1)
+            if irregular == day:
+                raise _NeedsScan
+            i0 = max(bisect_right(self.ends, s), bisect_left(self.day_of, day))
+            i1 = min(bisect_left(self.starts, e), bisect_left(self.day_of, irregular))
+            if i1 > i0:
+                overlap = (np.minimum(e, self.ends[i0:i1]) - np.maximum(s, self.starts[i0:i1])) / 1e6 / 3600
+                terms.extend(overlap.tolist())
+            day = irregular
+        return float(np.add.accumulate(terms)[-1]) if terms else 0.0
+
+    def previous_work_period_end(self, dt: datetime) -> Optional[datetime]:
+        t = self.position(dt)
+        c = bisect_right(self.starts, t) - 1
+        prev = c if c >= 0 and self.ends[c] < t else c - 1
+        day = t // DAY_US
+        # Curing days are passed over like days without work
+        if prev < 0 or day - self.day_of[prev] >= MAX_SEARCH_DAYS:
+            self._require_modelled(day - MAX_SEARCH_DAYS + 1, day)
+            return None
+        self._require_modelled(self.day_of[prev], day)
+        return self.datetime_at(self.ends[prev])
+
+
+class _IndexSlot:
+    """Holds a calendar's WorkTimeIndex; shared by calendars interned from the same data."""
+
+    __slots__ = ('index',)
+
+    def __init__(self):
+        self.index: Optional[WorkTimeIndex] = None
+
+
 @dataclass
 class P6Calendar:
     """
@@ -62,6 +590,13 @@ class P6Calendar:
     # Exception dates: date -> work periods (empty list = holiday)
     exceptions: dict[date, list[WorkPeriod]] = field(default_factory=dict)
 
+    # Set False to use the day-by-day scans (e.g. for benchmarking)
+    use_work_index: ClassVar[bool] = True
+
+    # Lazily built over the dates queried; call invalidate_work_index() after
+    # changing work_week or exceptions. Shared with shared_copy() calendars.
+    _index_slot: _IndexSlot = field(default_factory=_IndexSlot, init=False, repr=False, compare=False)
+
     def __post_init__(self):
         """Initialize default work week if not set."""
         if not self.work_week:
@@ -101,6 +636,23 @@ class P6Calendar:
 
         return calendar
 
+    def shared_copy(self, clndr_id: str, clndr_name: str = "") -> 'P6Calendar':
+        """
+        Copy under another ID that shares this calendar's work periods and index.
+
+        Used to intern calendars that are identical across schedule versions.
+        Shared copies must be treated as read-only.
+        """
+        calendar = P6Calendar(
+            clndr_id=clndr_id,
+            clndr_name=clndr_name,
+            hours_per_day=self.hours_per_day,
+            work_week=self.work_week,
+            exceptions=self.exceptions,
+        )
+        calendar._index_slot = self._index_slot
+        return calendar
+
     def _parse_clndr_data(self, data: str) -> None:
         """Parse P6's nested calendar format."""
         # Extract DaysOfWeek section using balanced parentheses
@@ -251,6 +803,55 @@ class P6Calendar:
 
         return hours
 
+    @property
+    def _work_index(self) -> Optional[WorkTimeIndex]:
+        return self._index_slot.index
+
+    @_work_index.setter
+    def _work_index(self, index: Optional[WorkTimeIndex]) -> None:
+        self._index_slot.index = index
+
+    def invalidate_work_index(self) -> None:
+        """Drop the work-time index (needed after editing work_week or exceptions)."""
+        self._work_index = None
+
+    def _get_work_index(self, anchor: date, grow: bool = False) -> Optional[WorkTimeIndex]:
+        """Index covering anchor; grow doubles its span. None if past MAX_INDEX_DAYS."""
+        index = self._work_index
+        if index is not None and index.covers(anchor) and not grow:
+            return index
+
+        if index is None:
+            first = anchor - timedelta(days=INDEX_DAYS_BEFORE)
+            last = anchor + timedelta(days=INDEX_DAYS_AFTER)
+        else:
+            span = timedelta(days=index.n_days)
+            first = min(index.first_day - (span if grow else timedelta(0)), anchor - timedelta(days=INDEX_DAYS_BEFORE))
+            last = max(index.first_day + span * (2 if grow else 1), anchor + timedelta(days=INDEX_DAYS_AFTER))
+
+        n_days = (last - first).days
+        if n_days > MAX_INDEX_DAYS:
+            return None
+        self._work_index = WorkTimeIndex(self, first, n_days)
+        return self._work_index
+
+    def _indexed(self, method: str, scan, *args):
+        """Run a work-time index method, growing the index as needed; scan if unsupported."""
+        dt = args[0]
+        if not self.use_work_index or not isinstance(dt, datetime) or dt.tzinfo is not None \
+                or getattr(dt, 'nanosecond', 0):
+            return scan(*args)
+        try:
+            index = self._get_work_index(dt.date())
+            while index is not None:
+                try:
+                    return getattr(index, method)(*args)
+                except _OutOfRange:
+                    index = self._get_work_index(dt.date(), grow=True)
+        except (_NeedsScan, OverflowError):
+            pass
+        return scan(*args)
+
     def add_work_hours(self, start: datetime, hours: float) -> datetime:
         """
         Add work hours to a datetime, respecting calendar.
@@ -258,6 +859,50 @@ class P6Calendar:
         If hours is 0, returns start unchanged.
         If start is not during work hours, advances to next work period first.
         """
+        if hours <= 0:
+            return start
+        return self._indexed('add_work_hours', self._add_work_hours_scan, start, hours)
+
+    def subtract_work_hours(self, end: datetime, hours: float) -> datetime:
+        """
+        Subtract work hours from a datetime, respecting calendar.
+
+        If hours is 0, returns end unchanged.
+        """
+        if hours <= 0:
+            return end
+        return self._indexed('subtract_work_hours', self._subtract_work_hours_scan, end, hours)
+
+    def work_hours_between(self, start: datetime, end: datetime) -> float:
+        """Calculate work hours between two datetimes."""
+        if end <= start:
+            return 0.0
+        if not isinstance(end, datetime) or end.tzinfo is not None or getattr(end, 'nanosecond', 0):
+            return self._work_hours_between_scan(start, end)
+        return self._indexed('work_hours_between', self._work_hours_between_scan, start, end)
+
+    def advance_to_work_time(self, dt: datetime) -> datetime:
+        """Advance datetime to next work time if not already in one."""
+        return self._indexed('advance_to_work_time', self._advance_to_work_time_scan, dt)
+
+    def _retreat_to_work_time(self, dt: datetime) -> datetime:
+        """Retreat datetime to previous work time if not already in one."""
+        return self._indexed('retreat_to_work_time', self._retreat_to_work_time_scan, dt)
+
+    def get_previous_work_period_end(self, dt: datetime) -> Optional[datetime]:
+        """
+        Get the end of the previous work period.
+
+        If dt is at the start of a work period (e.g., 07:00 Monday),
+        returns the end of the previous work period (e.g., 17:00 Friday).
+
+        Used for FS relationships where predecessor must finish BEFORE
+        successor starts.
+        """
+        return self._indexed('previous_work_period_end', self._get_previous_work_period_end_scan, dt)
+
+    def _add_work_hours_scan(self, start: datetime, hours: float) -> datetime:
+        """Day-by-day add_work_hours; reference for the work-time index."""
         if hours <= 0:
             return start
 
@@ -265,7 +910,7 @@ class P6Calendar:
         remaining = hours
 
         # If starting outside work hours, move to next work period
-        current = self.advance_to_work_time(current)
+        current = self._advance_to_work_time_scan(current)
 
         max_iterations = 365 * 10  # Safety limit
         iteration = 0
@@ -311,16 +956,12 @@ class P6Calendar:
 
             # Move to next day
             current = datetime.combine(current.date() + timedelta(days=1), time(0, 0))
-            current = self.advance_to_work_time(current)
+            current = self._advance_to_work_time_scan(current)
 
         return current
 
-    def subtract_work_hours(self, end: datetime, hours: float) -> datetime:
-        """
-        Subtract work hours from a datetime, respecting calendar.
-
-        If hours is 0, returns end unchanged.
-        """
+    def _subtract_work_hours_scan(self, end: datetime, hours: float) -> datetime:
+        """Day-by-day subtract_work_hours; reference for the work-time index."""
         if hours <= 0:
             return end
 
@@ -328,7 +969,7 @@ class P6Calendar:
         remaining = hours
 
         # If ending outside work hours, move back to previous work period
-        current = self._retreat_to_work_time(current)
+        current = self._retreat_to_work_time_scan(current)
 
         max_iterations = 365 * 10  # Safety limit
         iteration = 0
@@ -373,12 +1014,12 @@ class P6Calendar:
 
             # Move to previous day
             current = datetime.combine(current.date() - timedelta(days=1), time(23, 59, 59))
-            current = self._retreat_to_work_time(current)
+            current = self._retreat_to_work_time_scan(current)
 
         return current
 
-    def work_hours_between(self, start: datetime, end: datetime) -> float:
-        """Calculate work hours between two datetimes."""
+    def _work_hours_between_scan(self, start: datetime, end: datetime) -> float:
+        """Day-by-day work_hours_between; reference for the work-time index."""
         if end <= start:
             return 0.0
 
@@ -423,8 +1064,8 @@ class P6Calendar:
 
         return total_hours
 
-    def advance_to_work_time(self, dt: datetime) -> datetime:
-        """Advance datetime to next work time if not already in one."""
+    def _advance_to_work_time_scan(self, dt: datetime) -> datetime:
+        """Day-by-day advance_to_work_time; reference for the work-time index."""
         max_days = 365  # Safety limit
 
         for _ in range(max_days):
@@ -454,8 +1095,8 @@ class P6Calendar:
 
         raise ValueError(f"Could not find work time within {max_days} days")
 
-    def _retreat_to_work_time(self, dt: datetime) -> datetime:
-        """Retreat datetime to previous work time if not already in one."""
+    def _retreat_to_work_time_scan(self, dt: datetime) -> datetime:
+        """Day-by-day _retreat_to_work_time; reference for the work-time index."""
         max_days = 365  # Safety limit
 
         for _ in range(max_days):
@@ -501,16 +1142,8 @@ class P6Calendar:
         first_period = periods[0]
         return datetime.combine(dt, first_period.start)
 
-    def get_previous_work_period_end(self, dt: datetime) -> Optional[datetime]:
-        """
-        Get the end of the previous work period.
-
-        If dt is at the start of a work period (e.g., 07:00 Monday),
-        returns the end of the previous work period (e.g., 17:00 Friday).
-
-        Used for FS relationships where predecessor must finish BEFORE
-        successor starts.
-        """
+    def _get_previous_work_period_end_scan(self, dt: datetime) -> Optional[datetime]:
+        """Day-by-day get_previous_work_period_end; reference for the work-time index."""
         max_days = 365  # Safety limit
         current = dt
 
@@ -68,55 +68,57 @@ class CPMEngine:
 
         for task_id in task_order:
             task = self.network.tasks[task_id]
-            calendar = self.get_calendar(task.calendar_id)
-
-            # Handle completed tasks - P6 sets early dates to data_date
-            # This ensures successors are driven from data_date, not historical finish
-            if task.is_completed():
-                task.early_start = data_date
-                task.early_finish = data_date
-                continue
-
-            # Calculate early start from predecessors
-            # Start with data_date as minimum for incomplete work
-            early_start = data_date
-            predecessors = self.network.get_predecessors(task_id)
-
-            if predecessors:
-                for dep in predecessors:
-                    pred_task = self.network.tasks[dep.pred_task_id]
-                    driven_date = self._get_driven_early_start(pred_task, dep, task, calendar)
-                    if driven_date and driven_date > early_start:
-                        early_start = driven_date
-
-            # Apply start-no-earlier-than constraint
-            if task.constraint_type in ('CS_SNET', 'CS_MSO') and task.constraint_date:
-                early_start = max(early_start, task.constraint_date)
-
-            # Handle in-progress tasks
-            if task.is_in_progress():
-                # For in-progress tasks, P6 schedules remaining work from data_date
-                # (or later if driven by predecessors), not from actual_start
-                remaining_start = max(data_date, early_start)
-                # Advance to next work period start
-                task.early_start = calendar.advance_to_work_time(remaining_start)
-                duration = task.remaining_duration_hours
-                if duration > 0:
-                    task.early_finish = calendar.add_work_hours(task.early_start, duration)
-                else:
-                    task.early_finish = task.early_start
+            self._forward_task(task, self.get_calendar(task.calendar_id), data_date)
+
+    def _forward_task(self, task: Task, calendar: P6Calendar, data_date: datetime) -> None:
+        """Set early dates of one task; its predecessors must already be scheduled."""
+        # Handle completed tasks - P6 sets early dates to data_date
+        # This ensures successors are driven from data_date, not historical finish
+        if task.is_completed():
+            task.early_start = data_date
+            task.early_finish = data_date
+            return
+
+        # Calculate early start from predecessors
+        # Start with data_date as minimum for incomplete work
+        early_start = data_date
+        predecessors = self.network.get_predecessors(task.task_id)
+
+        if predecessors:
+            for dep in predecessors:
+                pred_task = self.network.tasks[dep.pred_task_id]
+                driven_date = self._get_driven_early_start(pred_task, dep, task, calendar)
+                if driven_date and driven_date > early_start:
+                    early_start = driven_date
+
+        # Apply start-no-earlier-than constraint
+        if task.constraint_type in ('CS_SNET', 'CS_MSO') and task.constraint_date:
+            early_start = max(early_start, task.constraint_date)
+
+        # Handle in-progress tasks
+        if task.is_in_progress():
+            # For in-progress tasks, P6 schedules remaining work from data_date
+            # (or later if driven by predecessors), not from actual_start
+            remaining_start = max(data_date, early_start)
+            # Advance to next work period start
+            task.early_start = calendar.advance_to_work_time(remaining_start)
+            duration = task.remaining_duration_hours
+            if duration > 0:
+                task.early_finish = calendar.add_work_hours(task.early_start, duration)
             else:
-                # Not-started task: starts at calculated early_start (>= data_date)
-                duration = task.duration_hours
-                if duration > 0:
-                    # Regular task: advance to next work period start
-                    task.early_start = calendar.advance_to_work_time(early_start)
-                    task.early_finish = calendar.add_work_hours(task.early_start, duration)
-                else:
-                    # Milestone: can occur at exact driven time (including end of day)
-                    # Don't advance to next work period - milestones are instantaneous
-                    task.early_start = early_start
-                    task.early_finish = early_start
+                task.early_finish = task.early_start
+        else:
+            # Not-started task: starts at calculated early_start (>= data_date)
+            duration = task.duration_hours
+            if duration > 0:
+                # Regular task: advance to next work period start
+                task.early_start = calendar.advance_to_work_time(early_start)
+                task.early_finish = calendar.add_work_hours(task.early_start, duration)
+            else:
+                # Milestone: can occur at exact driven time (including end of day)
+                # Don't advance to next work period - milestones are instantaneous
+                task.early_start = early_start
+                task.early_finish = early_start
 
     def _get_driven_early_start(self, pred: Task, dep: Dependency,
                                  succ: Task, calendar: P6Calendar) -> Optional[datetime]:
@@ -186,61 +188,63 @@ class CPMEngine:
 
         for task_id in task_order:
             task = self.network.tasks[task_id]
-            calendar = self.get_calendar(task.calendar_id)
-
-            # Handle completed tasks - P6 sets late dates to project_end
-            # Completed tasks don't constrain predecessors in backward pass
-            if task.is_completed():
-                task.late_finish = project_end
-                task.late_start = project_end
-                continue
-
-            # Calculate late finish from successors
-            successors = self.network.get_successors(task_id)
-
-            if not successors:
-                # No successors - late finish is project end
-                task.late_finish = project_end
-            else:
-                late_finish = project_end
-                for dep in successors:
-                    succ_task = self.network.tasks[dep.succ_task_id]
-                    # Skip completed successors - they don't constrain predecessors
-                    if succ_task.is_completed():
-                        continue
-                    driven_date = self._get_driven_late_finish(succ_task, dep, task, calendar)
-                    if driven_date and driven_date < late_finish:
-                        late_finish = driven_date
-                task.late_finish = late_finish
-
-            # Apply finish-no-later-than constraint (various P6 constraint types)
-            # CS_FNLT: Finish No Later Than
-            # CS_MFO: Must Finish On
-            # CS_MEO: Must End On
-            # CS_MEOB: Must End On or Before
-            if task.constraint_type in ('CS_FNLT', 'CS_MFO', 'CS_MEO', 'CS_MEOB') and task.constraint_date:
-                task.late_finish = min(task.late_finish, task.constraint_date)
-
-            # Calculate late start
-            duration = task.get_effective_duration()
-            if duration > 0:
-                task.late_start = calendar.subtract_work_hours(task.late_finish, duration)
-            else:
-                # Milestone
-                task.late_start = task.late_finish
-
-            # Apply start-no-later-than constraint (various P6 constraint types)
-            # CS_SNLT: Start No Later Than
-            # CS_MSO: Must Start On
-            # CS_SEOB: Start On or Before
-            if task.constraint_type in ('CS_SNLT', 'CS_MSO', 'CS_SEOB') and task.constraint_date:
-                if task.constraint_date < task.late_start:
-                    task.late_start = task.constraint_date
-                    # Recalculate late_finish based on constrained late_start
-                    if duration > 0:
-                        task.late_finish = calendar.add_work_hours(task.late_start, duration)
-                    else:
-                        task.late_finish = task.late_start
+            self._backward_task(task, self.get_calendar(task.calendar_id), project_end)
+
+    def _backward_task(self, task: Task, calendar: P6Calendar, project_end: datetime) -> None:
+        """Set late dates of one task; its successors must already be scheduled."""
+        # Handle completed tasks - P6 sets late dates to project_end
+        # Completed tasks don't constrain predecessors in backward pass
+        if task.is_completed():
+            task.late_finish = project_end
+            task.late_start = project_end
+            return
+
+        # Calculate late finish from successors
+        successors = self.network.get_successors(task.task_id)
+
+        if not successors:
+            # No successors - late finish is project end
+            task.late_finish = project_end
+        else:
+            late_finish = project_end
+            for dep in successors:
+                succ_task = self.network.tasks[dep.succ_task_id]
+                # Skip completed successors - they don't constrain predecessors
+                if succ_task.is_completed():
+                    continue
+                driven_date = self._get_driven_late_finish(succ_task, dep, task, calendar)
+                if driven_date and driven_date < late_finish:
+                    late_finish = driven_date
+            task.late_finish = late_finish
+
+        # Apply finish-no-later-than constraint (various P6 constraint types)
+        # CS_FNLT: Finish No Later Than
+        # CS_MFO: Must Finish On
+        # CS_MEO: Must End On
+        # CS_MEOB: Must End On or Before
+        if task.constraint_type in ('CS_FNLT', 'CS_MFO', 'CS_MEO', 'CS_MEOB') and task.constraint_date:
+            task.late_finish = min(task.late_finish, task.constraint_date)
+
+        # Calculate late start
+        duration = task.get_effective_duration()
+        if duration > 0:
+            task.late_start = calendar.subtract_work_hours(task.late_finish, duration)
+        else:
+            # Milestone
+            task.late_start = task.late_finish
+
+        # Apply start-no-later-than constraint (various P6 constraint types)
+        # CS_SNLT: Start No Later Than
+        # CS_MSO: Must Start On
+        # CS_SEOB: Start On or Before
+        if task.constraint_type in ('CS_SNLT', 'CS_MSO', 'CS_SEOB') and task.constraint_date:
+            if task.constraint_date < task.late_start:
+                task.late_start = task.constraint_date
+                # Recalculate late_finish based on constrained late_start
+                if duration > 0:
+                    task.late_finish = calendar.add_work_hours(task.late_start, duration)
+                else:
+                    task.late_finish = task.late_start
 
     def _get_driven_late_finish(self, succ: Task, dep: Dependency,
                                  pred: Task, calendar: P6Calendar) -> Optional[datetime]:
@@ -329,46 +333,50 @@ class CPMEngine:
         Note: Completed tasks have no float (their dates are fixed actuals).
         """
         for task in self.network.tasks.values():
-            # Bug fix: Skip completed tasks - their dates are actuals, not calculated
-            if task.is_completed():
-                task.total_float_hours = None
-                task.free_float_hours = None
-                task.is_critical = False  # Completed tasks can't be critical
-                continue
-
-            if task.early_finish is None or task.late_finish is None:
-                continue
-
-            calendar = self.get_calendar(task.calendar_id)
-
-            # Total float
-            if task.late_finish >= task.early_finish:
-                task.total_float_hours = calendar.work_hours_between(
-                    task.early_finish, task.late_finish
-                )
-            else:
-                # Negative float (behind schedule)
-                task.total_float_hours = -calendar.work_hours_between(
-                    task.late_finish, task.early_finish
-                )
-
-            # Mark as critical if float <= 0
-            task.is_critical = task.total_float_hours <= 0
-
-            # Free float (for FS relationships)
-            successors = self.network.get_successors(task.task_id)
-            if successors and task.early_finish:
-                min_free_float = float('inf')
-                for dep in successors:
-                    succ = self.network.tasks[dep.succ_task_id]
-                    if succ.early_start and dep.is_finish_to_start():
-                        # Free float = successor early start - this early finish - lag
-                        gap = calendar.work_hours_between(task.early_finish, succ.early_start)
-                        free_float = gap - dep.lag_hours
-                        min_free_float = min(min_free_float, free_float)
-
-                if min_free_float != float('inf'):
-                    task.free_float_hours = max(0, min_free_float)
+            self._calculate_task_float(task)
+
+    def _calculate_task_float(self, task: Task) -> None:
+        """Set total float, free float and critical flag of one task."""
+        # Bug fix: Skip completed tasks - their dates are actuals, not calculated
+        if task.is_completed():
+            task.total_float_hours = None
+            task.free_float_hours = None
+            task.is_critical = False  # Completed tasks can't be critical
+            return
+
+        if task.early_finish is None or task.late_finish is None:
+            return
+
+        calendar = self.get_calendar(task.calendar_id)
+
+        # Total float
+        if task.late_finish >= task.early_finish:
+            task.total_float_hours = calendar.work_hours_between(
+                task.early_finish, task.late_finish
+            )
+        else:
+            # Negative float (behind schedule)
+            task.total_float_hours = -calendar.work_hours_between(
+                task.late_finish, task.early_finish
+            )
+
+        # Mark as critical if float <= 0
+        task.is_critical = task.total_float_hours <= 0
+
+        # Free float (for FS relationships)
+        successors = self.network.get_successors(task.task_id)
+        if successors and task.early_finish:
+            min_free_float = float('inf')
+            for dep in successors:
+                succ = self.network.tasks[dep.succ_task_id]
+                if succ.early_start and dep.is_finish_to_start():
+                    # Free float = successor early start - this early finish - lag
+                    gap = calendar.work_hours_between(task.early_finish, succ.early_start)
+                    free_float = gap - dep.lag_hours
+                    min_free_float = min(min_free_float, free_float)
+
+            if min_free_float != float('inf'):
+                task.free_float_hours = max(0, min_free_float)
 
     def get_critical_path(self) -> list[str]:
         """
@@ -0,0 +1,266 @@
+"""
+Incremental CPM recalculation.
+
+Runs CPM once for a baseline and then recalculates what-if changes
+(durations, constraints, logic links) by propagating dates only through
+the tasks they affect, instead of cloning the network and rerunning the
+full forward and backward passes.
+"""
+
+import heapq
+from datetime import datetime
+from typing import Iterable, Optional
+
+from .models import Task, Dependency, CPMResult
+from .calendar import P6Calendar
+from .network import TaskNetwork
+from .engine import CPMEngine
+
+# Task attributes saved before a what-if touches a task and restored by revert()
+SAVED_FIELDS = (
+    'duration_hours', 'constraint_type', 'constraint_date',
+    'early_start', 'early_finish', 'late_start', 'late_finish',
+    'total_float_hours', 'free_float_hours', 'is_critical',
+)
+
+
+class IncrementalCPM:
+    """
+    CPM baseline with incremental what-if recalculation.
+
+    The baseline is calculated on the network itself. recalculate() applies
+    changes in place and updates only the tasks they reach:
+
+    - early dates are propagated forward through the successor cone of the
+      changed tasks, stopping wherever a task's early dates are unchanged
+    - late dates are propagated backward through predecessors, likewise
+      stopping where they are unchanged
+    - float is recalculated for tasks whose dates changed and their
+      predecessors
+
+    Results are the same as a full CPMEngine run on the changed network.
+    When the project finish moves and no target finish was given, every
+    late date is relative to the new finish, so the backward pass and float
+    then cover the whole network.
+
+    Changes accumulate across recalculate() calls; revert() restores the
+    baseline (task values, logic links and CPM results).
+
+    Usage:
+        whatif = IncrementalCPM(network, calendars, data_date=data_date)
+        result = whatif.recalculate(durations={'1_123': 80.0})
+        slipped = whatif.changed_task_ids()
+        whatif.revert()
+    """
+
+    def __init__(self, network: TaskNetwork, calendars: dict[str, P6Calendar],
+                 project_start: datetime = None, data_date: datetime = None,
+                 target_finish: datetime = None, default_calendar_id: str = None):
+        """
+        Run the baseline CPM.
+
+        Args:
+            network: Task network (CPM results are written to its tasks)
+            calendars: Dict mapping calendar_id to P6Calendar
+            project_start: Project start date (auto-detected if None)
+            data_date: Schedule status date (P6's "data date")
+            target_finish: Target finish for the backward pass (None = calculated finish)
+            default_calendar_id: Calendar to use for tasks with missing calendar
+        """
+        self.network = network
+        self.engine = CPMEngine(network, calendars, default_calendar_id)
+        self.baseline = self.engine.run(project_start, data_date=data_date, target_finish=target_finish)
+        self.project_start = self.baseline.project_start
+        self.data_date = data_date if data_date is not None else self.project_start
+        self.target_finish = target_finish
+
+        self._project_end = target_finish or self.baseline.project_finish
+        self._set_order(network.topological_sort())
+        self._baseline_order = self._order
+        self._saved: dict[str, tuple] = {}
+        self._saved_links: Optional[tuple] = None
+        self._task_index = {tid: i for i, tid in enumerate(network.tasks)}
+
+    def _set_order(self, order: list[str]) -> None:
+        self._order = order
+        self._position = {tid: i for i, tid in enumerate(order)}
+
+    def _save(self, task: Task) -> None:
+        if task.task_id not in self._saved:
+            self._saved[task.task_id] = tuple(getattr(task, name) for name in SAVED_FIELDS)
+
+    def _save_links(self, task_ids: Iterable[str]) -> None:
+        """Save the dependency lists of tasks whose links are about to change."""
+        if self._saved_links is None:
+            self._saved_links = (list(self.network.dependencies), {}, {})
+        _, successors, predecessors = self._saved_links
+        for tid in task_ids:
+            if tid not in successors:
+                successors[tid] = list(self.network.get_successors(tid))
+                predecessors[tid] = list(self.network.get_predecessors(tid))
+
+    # -------------------------------------------------------------------------
+    # What-if changes
+    # -------------------------------------------------------------------------
+
+    def recalculate(self, durations: dict[str, float] = None,
+                    constraints: dict[str, tuple[Optional[str], Optional[datetime]]] = None,
+                    add_dependencies: list[Dependency] = None,
+                    remove_dependencies: list[tuple[str, str]] = None) -> CPMResult:
+        """
+        Apply changes and recalculate the affected tasks.
+
+        Args:
+            durations: task_id -> new duration_hours
+            constraints: task_id -> (constraint_type, constraint_date); (None, None) clears
+            add_dependencies: Dependencies to add
+            remove_dependencies: (pred_task_id, succ_task_id) pairs whose links are removed
+
+        Returns:
+            CPMResult for the changed network
+
+        Raises:
+            ValueError: If a task is not in the network or new links create a
+                cycle (the network is then reverted to the baseline)
+        """
+        tasks = self.network.tasks
+        forward_seeds, backward_seeds = set(), set()
+
+        for task_id, hours in (durations or {}).items():
+            self._save(self._get_task(task_id))
+            self.network.modify_task_duration(task_id, hours)
+            forward_seeds.add(task_id)
+            backward_seeds.add(task_id)
+
+        for task_id, (constraint_type, constraint_date) in (constraints or {}).items():
+            task = self._get_task(task_id)
+            self._save(task)
+            task.constraint_type, task.constraint_date = constraint_type, constraint_date
+            forward_seeds.add(task_id)
+            backward_seeds.add(task_id)
+
+        if add_dependencies or remove_dependencies:
+            links = [(dep.pred_task_id, dep.succ_task_id) for dep in add_dependencies or []]
+            links += list(remove_dependencies or [])
+            for task_id in {tid for link in links for tid in link}:
+                self._get_task(task_id)
+            self._save_links(tid for link in links for tid in link)
+            for pred_id, succ_id in remove_dependencies or []:
+                for dep in [d for d in self.network.get_successors(pred_id) if d.succ_task_id == succ_id]:
+                    self.network.remove_dependency(dep)
+            for dep in add_dependencies or []:
+                self.network.add_dependency(dep)
+            try:
+                self._set_order(self.network.topological_sort())
+            except ValueError:
+                self.revert()
+                raise
+            for pred_id, succ_id in links:
+                forward_seeds.add(succ_id)
+                backward_seeds.add(pred_id)
+
+        early_changed = self._propagate_forward(forward_seeds)
+
+        project_end = self.target_finish or self.engine._get_project_end()
+        if project_end != self._project_end:
+            self._project_end = project_end
+            self._propagate_backward(self._order)
+            float_tasks = self._order
+        else:
+            late_changed = self._propagate_backward(backward_seeds)
+            float_tasks = set(early_changed) | set(late_changed) | backward_seeds
+            for tid in early_changed:
+                float_tasks.update(dep.pred_task_id for dep in self.network.get_predecessors(tid))
+
+        for tid in float_tasks:
+            task = tasks[tid]
+            self._save(task)
+            self.engine._calculate_task_float(task)
+
+        critical_path = [tid for tid in self._order if tasks[tid].is_critical]
+        return CPMResult(
+            tasks=tasks,
+            critical_path=critical_path,
+            project_start=self.project_start,
+            project_finish=self.engine._get_project_end(),
+            total_duration_hours=sum(tasks[tid].get_effective_duration() for tid in critical_path),
+        )
+
+    def _get_task(self, task_id: str) -> Task:
+        if task_id not in self.network.tasks:
+            raise ValueError(f"Task {task_id} not in network")
+        return self.network.tasks[task_id]
+
+    def _propagate_forward(self, seeds: Iterable[str]) -> list[str]:
+        """Recalculate early dates from the seeds through changed successors."""
+        tasks, position = self.network.tasks, self._position
+        heap = [(position[tid], tid) for tid in set(seeds)]
+        heapq.heapify(heap)
+        queued = set(seeds)
+        changed = []
+
+        while heap:
+            _, task_id = heapq.heappop(heap)
+            task = tasks[task_id]
+            before = (task.early_start, task.early_finish)
+            self._save(task)
+            self.engine._forward_task(task, self.engine.get_calendar(task.calendar_id), self.data_date)
+            if (task.early_start, task.early_finish) == before:
+                continue
+            changed.append(task_id)
+            for dep in self.network.get_successors(task_id):
+                if dep.succ_task_id not in queued:
+                    queued.add(dep.succ_task_id)
+                    heapq.heappush(heap, (position[dep.succ_task_id], dep.succ_task_id))
+        return changed
+
+    def _propagate_backward(self, seeds: Iterable[str]) -> list[str]:
+        """Recalculate late dates from the seeds through changed predecessors."""
+        tasks, position = self.network.tasks, self._position
+        heap = [(-position[tid], tid) for tid in set(seeds)]
+        heapq.heapify(heap)
+        queued = set(seeds)
+        changed = []
+
+        while heap:
+            _, task_id = heapq.heappop(heap)
+            task = tasks[task_id]
+            before = (task.late_start, task.late_finish)
+            self._save(task)
+            self.engine._backward_task(task, self.engine.get_calendar(task.calendar_id), self._project_end)
+            if (task.late_start, task.late_finish) == before:
+                continue
+            changed.append(task_id)
+            for dep in self.network.get_predecessors(task_id):
+                if dep.pred_task_id not in queued:
+                    queued.add(dep.pred_task_id)
+                    heapq.heappush(heap, (-position[dep.pred_task_id], dep.pred_task_id))
+        return changed
+
+    def changed_task_ids(self, field: str = 'early_finish') -> list[str]:
+        """Task IDs whose value of a saved field differs from the baseline, in network order."""
+        i = SAVED_FIELDS.index(field)
+        tasks = self.network.tasks
+        changed = [tid for tid, saved in self._saved.items() if getattr(tasks[tid], field) != saved[i]]
+        return sorted(changed, key=self._task_index.__getitem__)
+
+    def revert(self) -> None:
+        """Restore the baseline task values, logic links and CPM results."""
+        tasks = self.network.tasks
+        for task_id, saved in self._saved.items():
+            task = tasks[task_id]
+            for name, value in zip(SAVED_FIELDS, saved):
+                setattr(task, name, value)
+        self._saved = {}
+
+        if self._saved_links is not None:
+            dependencies, successors, predecessors = self._saved_links
+            self.network.dependencies = dependencies
+            for task_id in successors:
+                self.network._successors[task_id] = successors[task_id]
+                self.network._predecessors[task_id] = predecessors[task_id]
+            self.network.invalidate_cache()
+            self._saved_links = None
+            self._set_order(self._baseline_order)
+
+        self._project_end = self.target_finish or self.baseline.project_finish
@@ -4,6 +4,7 @@ Data models for CPM calculations.
 Defines dataclasses for tasks, dependencies, and analysis results.
 """
 
+import math
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
@@ -210,3 +211,31 @@ class CriticalPathResult:
         near_critical = len(self.near_critical_tasks)
         return (f"{critical} critical tasks, {near_critical} near-critical "
                 f"(<{self.near_critical_threshold_hours/8:.0f} days float)")
+
+
+@dataclass
+class MonteCarloResult:
+    """Results from a Monte Carlo schedule risk analysis."""
+
+    iterations: int
+    deterministic_finish: datetime
+    finish_dates: list[datetime]        # project finish of each iteration
+    p50_finish: datetime
+    p80_finish: datetime
+    criticality: dict[str, float]       # task_id -> fraction of iterations critical
+    sensitivity: dict[str, float]       # task_id -> correlation of sampled duration with finish
+
+    def finish_percentile(self, pct: float) -> datetime:
+        """Finish date met or beaten in pct percent of iterations."""
+        ordered = sorted(self.finish_dates)
+        return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+    def get_tornado(self, n: int = 20) -> list[tuple[str, float]]:
+        """Top N (task_id, correlation) pairs by absolute correlation with the finish."""
+        ranked = sorted(self.sensitivity.items(), key=lambda item: abs(item[1]), reverse=True)
+        return ranked[:n]
+
+    def get_summary(self) -> str:
+        """Get human-readable summary."""
+        return (f"{self.iterations} iterations: P50 {self.p50_finish.date()}, "
+                f"P80 {self.p80_finish.date()} (deterministic {self.deterministic_finish.date()})")
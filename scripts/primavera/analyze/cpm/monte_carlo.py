@@ -0,0 +1,330 @@
+"""
+Monte Carlo schedule risk analysis.
+
+Samples activity durations from per-task or per-category distributions and
+runs CPM for each sample on the compiled arrays of an ArrayCPMEngine, so
+the network and calendars are compiled once for all iterations.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+
+from .models import MonteCarloResult
+from .calendar import P6Calendar, HOUR_US
+from .network import TaskNetwork
+from .array_engine import (
+    ArrayCPMEngine,
+    OK,
+    OUT_OF_RANGE,
+    NO_DATE,
+    START_FLOOR_CONSTRAINTS,
+    FINISH_CAP_CONSTRAINTS,
+    START_CAP_CONSTRAINTS,
+    _jit,
+    _kernel_array,
+    _work_hours,
+    _forward_kernel,
+    _backward_kernel,
+    _float_kernel,
+)
+
+DISTRIBUTION_KINDS = ('triangular', 'pert', 'uniform')
+
+
+@dataclass
+class DurationDistribution:
+    """
+    Duration distribution as multipliers of a task's deterministic duration.
+
+    For example DurationDistribution('triangular', 0.9, 1.0, 1.5) samples
+    between 90% and 150% of the planned (or remaining) duration, most likely
+    100%. 'pert' is the beta-PERT distribution over the same three points;
+    'uniform' ignores mode.
+    """
+
+    kind: str = 'triangular'
+    low: float = 1.0
+    mode: float = 1.0
+    high: float = 1.0
+
+    def __post_init__(self):
+        if self.kind not in DISTRIBUTION_KINDS:
+            raise ValueError(f"Unknown distribution {self.kind!r}; expected one of {DISTRIBUTION_KINDS}")
+        if not 0 <= self.low <= self.mode <= self.high:
+            raise ValueError(f"Expected 0 <= low <= mode <= high, got {self.low}, {self.mode}, {self.high}")
+
+    def sample(self, rng: np.random.Generator, size) -> np.ndarray:
+        """Sample multipliers."""
+        low, mode, high = self.low, self.mode, self.high
+        if high == low:
+            return np.full(size, low)
+        if self.kind == 'uniform':
+            return rng.uniform(low, high, size)
+        if self.kind == 'triangular':
+            return rng.triangular(low, mode, high, size)
+        alpha = 1 + 4 * (mode - low) / (high - low)
+        beta = 1 + 4 * (high - mode) / (high - low)
+        return low + rng.beta(alpha, beta, size) * (high - low)
+
+
+@_jit
+def _sample_kernel(s0, durations, remainings, order, reverse_order,
+                   pred_ptr, pred_task, pred_type, pred_lag,
+                   succ_ptr, succ_task, succ_type, succ_lag,
+                   task_cal, status, start_floor, finish_cap, start_cap, python_task,
+                   data_date, target_finish, early_start, early_finish, late_start, late_finish,
+                   total_float, free_float, critical, finish, critical_count, cal):
+    """Run CPM for samples s0.. and record finish positions and critical counts."""
+    for s in range(s0, len(durations)):
+        duration, remaining = durations[s], remainings[s]
+        k, st = _forward_kernel(0, order, pred_ptr, pred_task, pred_type, pred_lag, task_cal, status,
+                                duration, remaining, start_floor, python_task, data_date,
+                                early_start, early_finish, cal)
+        if st != OK:
+            return s, st
+        project_finish = early_finish[0]
+        for i in range(len(early_finish)):
+            if early_finish[i] > project_finish:
+                project_finish = early_finish[i]
+        project_end = project_finish if target_finish == NO_DATE else target_finish
+        k, st = _backward_kernel(0, reverse_order, succ_ptr, succ_task, succ_type, succ_lag, task_cal,
+                                 status, duration, remaining, finish_cap, start_cap, python_task,
+                                 project_end, late_start, late_finish, cal)
+        if st != OK:
+            return s, st
+        k, st = _float_kernel(0, succ_ptr, succ_task, succ_type, succ_lag, task_cal, status,
+                              python_task, early_start, early_finish, late_finish,
+                              total_float, free_float, critical, cal)
+        if st != OK:
+            return s, st
+        finish[s] = project_finish
+        for i in range(len(critical)):
+            if critical[i]:
+                critical_count[i] += 1
+    return len(durations), OK
+
+
+class MonteCarloCPM:
+    """
+    Monte Carlo CPM over a compiled network.
+
+    The deterministic schedule is calculated once with ArrayCPMEngine; its
+    compiled arrays and calendars are then reused for every sample. Batches
+    of samples run in a single kernel call (compiled with numba when it is
+    installed). Samples the kernels cannot schedule - tasks on curing or
+    irregular calendar days, the day scan's safety limits - are run through
+    the engine with the sampled durations set on the tasks, which is much
+    slower; schedules dominated by such tasks should use fewer iterations.
+
+    Durations of incomplete tasks are sampled as multipliers of their
+    planned duration (not started) or remaining duration (in progress).
+    Completed tasks and tasks without a distribution keep their durations.
+
+    Usage:
+        mc = MonteCarloCPM(network, calendars, data_date=data_date)
+        result = mc.run(1000, default=DurationDistribution('triangular', 0.9, 1.0, 1.4), seed=0)
+        print(result.get_summary())
+    """
+
+    def __init__(self, network: TaskNetwork, calendars: dict[str, P6Calendar],
+                 project_start: datetime = None, data_date: datetime = None,
+                 target_finish: datetime = None, default_calendar_id: str = None):
+        """
+        Run and compile the deterministic schedule.
+
+        Args:
+            network: Task network (CPM results are left at the deterministic schedule)
+            calendars: Dict mapping calendar_id to P6Calendar
+            project_start: Project start date (auto-detected if None)
+            data_date: Schedule status date (P6's "data date")
+            target_finish: Target finish for the backward pass (None = each iteration's finish)
+            default_calendar_id: Calendar to use for tasks with missing calendar
+        """
+        self.network = network
+        self.engine = ArrayCPMEngine(network, calendars, default_calendar_id)
+        self.deterministic = self.engine.run(project_start, data_date=data_date, target_finish=target_finish)
+        self.project_start = self.deterministic.project_start
+        self.data_date = data_date if data_date is not None else self.project_start
+        self.target_finish = target_finish
+
+        self._arrays = self.engine._arrays
+        self._calendars = self.engine._compiled
+        self._tasks = list(network.tasks.values())
+        self._engine_samples = 0
+
+    def task_distributions(self, distributions: dict[str, DurationDistribution] = None,
+                           categories: dict[str, str] = None,
+                           category_distributions: dict[str, DurationDistribution] = None,
+                           default: DurationDistribution = None) -> dict[str, DurationDistribution]:
+        """
+        Resolve the distribution of each incomplete task.
+
+        A task's own entry in distributions wins over its category's entry
+        in category_distributions (categories maps task_id to a category,
+        e.g. a taxonomy trade or scope), which wins over default.
+        """
+        distributions = distributions or {}
+        categories = categories or {}
+        category_distributions = category_distributions or {}
+        resolved = {}
+        for task in self._tasks:
+            if task.is_completed():
+                continue
+            dist = distributions.get(task.task_id)
+            if dist is None and task.task_id in categories:
+                dist = category_distributions.get(categories[task.task_id])
+            if dist is None:
+                dist = default
+            if dist is not None:
+                resolved[task.task_id] = dist
+        return resolved
+
+    def run(self, iterations: int = 1000, distributions: dict[str, DurationDistribution] = None,
+            categories: dict[str, str] = None,
+            category_distributions: dict[str, DurationDistribution] = None,
+            default: DurationDistribution = None, seed: int = None,
+            batch_size: int = 128) -> MonteCarloResult:
+        """
+        Run the Monte Carlo iterations.
+
+        Args:
+            iterations: Number of samples
+            distributions: task_id -> distribution
+            categories: task_id -> category for category_distributions
+            category_distributions: category -> distribution
+            default: Distribution for incomplete tasks not otherwise covered
+            seed: Random seed
+            batch_size: Samples per kernel call (bounds memory use)
+
+        Returns:
+            MonteCarloResult with finish percentiles, criticality index and
+            duration/finish correlations of the sampled tasks
+        """
+        resolved = self.task_distributions(distributions, categories, category_distributions, default)
+        index = {tid: i for i, tid in enumerate(self._arrays.task_ids)}
+        sampled = [index[tid] for tid in resolved]
+        groups = {}
+        for j, tid in enumerate(resolved):
+            groups.setdefault(id(resolved[tid]), (resolved[tid], []))[1].append(j)
+
+        rng = np.random.default_rng(seed)
+        base_duration = np.array([self._tasks[i].duration_hours for i in sampled], dtype=np.float64)
+        base_remaining = np.array([self._tasks[i].remaining_duration_hours for i in sampled], dtype=np.float64)
+        n_tasks = len(self._tasks)
+        finish = np.zeros(iterations, dtype=np.int64)
+        critical_count = np.zeros(n_tasks, dtype=np.int64)
+        # Sums for duration/finish correlations (multiplier - 1, finish hours from deterministic)
+        deterministic = self._calendars.position(self.deterministic.project_finish)
+        sum_x, sum_xx, sum_xy = (np.zeros(len(sampled)) for _ in range(3))
+        sum_y = sum_yy = 0.0
+
+        for start in range(0, iterations, batch_size):
+            size = min(batch_size, iterations - start)
+            multipliers = np.empty((size, len(sampled)))
+            for dist, columns in groups.values():
+                multipliers[:, columns] = dist.sample(rng, (size, len(columns)))
+
+            batch_finish, batch_critical = self._run_batch(sampled, multipliers * base_duration,
+                                                           multipliers * base_remaining)
+            finish[start:start + size] = batch_finish
+            critical_count += batch_critical
+
+            x = multipliers - 1
+            y = (batch_finish - deterministic) / HOUR_US
+            sum_x += x.sum(axis=0)
+            sum_xx += (x * x).sum(axis=0)
+            sum_xy += x.T @ y
+            sum_y += y.sum()
+            sum_yy += (y * y).sum()
+
+        n = iterations
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlation = (n * sum_xy - sum_x * sum_y) / np.sqrt(
+                (n * sum_xx - sum_x ** 2) * (n * sum_yy - sum_y ** 2))
+        correlation = np.nan_to_num(correlation, nan=0.0, posinf=0.0, neginf=0.0)
+
+        if self._engine_samples:
+            # Samples run through the engine leave their dates on the tasks
+            self.engine.run(self.project_start, data_date=self.data_date, target_finish=self.target_finish)
+            self._engine_samples = 0
+
+        finish_dates = self._calendars.datetimes_at(finish)
+        ordered = np.sort(finish)
+        task_ids = self._arrays.task_ids
+        return MonteCarloResult(
+            iterations=iterations,
+            deterministic_finish=self.deterministic.project_finish,
+            finish_dates=finish_dates,
+            p50_finish=self._calendars.datetimes_at([np.quantile(ordered, 0.5, method='inverted_cdf')])[0],
+            p80_finish=self._calendars.datetimes_at([np.quantile(ordered, 0.8, method='inverted_cdf')])[0],
+            criticality={tid: count / n for tid, count in zip(task_ids, critical_count.tolist())},
+            sensitivity={task_ids[i]: float(r) for i, r in zip(sampled, correlation)},
+        )
+
+    def _run_batch(self, sampled: list[int], duration_hours: np.ndarray,
+                   remaining_hours: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Finish positions and critical counts for a batch of sampled durations."""
+        arrays, engine = self._arrays, self.engine
+        size, n = len(duration_hours), len(self._tasks)
+        durations = np.tile(np.asarray(arrays.duration, dtype=np.float64), (size, 1))
+        remainings = np.tile(np.asarray(arrays.remaining, dtype=np.float64), (size, 1))
+        durations[:, sampled] = _work_hours(np.maximum(duration_hours, 0))[0]
+        remainings[:, sampled] = _work_hours(np.maximum(remaining_hours, 0))[0]
+
+        finish = _kernel_array(np.zeros(size, dtype=np.int64), np.int64)
+        critical_count = _kernel_array(np.zeros(n, dtype=np.int64), np.int64)
+        work = [_kernel_array(np.zeros(n, dtype=np.int64), np.int64) for _ in range(4)]
+        total_float = _kernel_array(np.zeros(n), np.float64)
+        free_float = _kernel_array(np.zeros(n), np.float64)
+        critical = _kernel_array(np.zeros(n, dtype=np.bool_), np.bool_)
+        durations, remainings = _kernel_array(durations, np.float64), _kernel_array(remainings, np.float64)
+
+        def constraint_positions(types):
+            return engine._positions([(i, t.constraint_date) for i, t in enumerate(self._tasks)
+                                      if t.constraint_type in types and t.constraint_date], n)
+
+        def build_args():
+            target = NO_DATE if self.target_finish is None else self._calendars.position(self.target_finish)
+            return (durations, remainings, arrays.order, arrays.order[::-1],
+                    arrays.pred_ptr, arrays.pred_task, arrays.pred_type, arrays.pred_lag,
+                    arrays.succ_ptr, arrays.succ_task, arrays.succ_type, arrays.succ_lag,
+                    arrays.task_cal, arrays.status, constraint_positions(START_FLOOR_CONSTRAINTS),
+                    constraint_positions(FINISH_CAP_CONSTRAINTS), constraint_positions(START_CAP_CONSTRAINTS),
+                    _kernel_array(arrays.python_task, np.bool_), self._calendars.position(self.data_date),
+                    target, *work, total_float, free_float, critical, finish, critical_count,
+                    self._calendars.kernel_args())
+
+        s = 0
+        args = build_args()
+        while s < size:
+            s, status = _sample_kernel(s, *args)
+            if status == OK:
+                break
+            if status == OUT_OF_RANGE and self._calendars.grow():
+                args = build_args()
+                continue
+            finish[s], flags = self._run_sample_in_engine(sampled, duration_hours[s], remaining_hours[s])
+            for i in np.flatnonzero(flags):
+                critical_count[i] += 1
+            s += 1
+        return np.asarray(finish, dtype=np.int64), np.asarray(critical_count, dtype=np.int64)
+
+    def _run_sample_in_engine(self, sampled: list[int], duration_hours: np.ndarray,
+                              remaining_hours: np.ndarray) -> tuple[int, np.ndarray]:
+        """Run one sample through the engine with the durations set on the tasks."""
+        self._engine_samples += 1
+        tasks = [self._tasks[i] for i in sampled]
+        saved = [(task.duration_hours, task.remaining_duration_hours) for task in tasks]
+        try:
+            for task, hours, remaining in zip(tasks, duration_hours.tolist(), remaining_hours.tolist()):
+                task.duration_hours = max(hours, 0.0)
+                task.remaining_duration_hours = max(remaining, 0.0)
+            result = self.engine.run(self.project_start, data_date=self.data_date,
+                                     target_finish=self.target_finish)
+            flags = np.array([task.is_critical for task in self._tasks])
+        finally:
+            for task, (hours, remaining) in zip(tasks, saved):
+                task.duration_hours, task.remaining_duration_hours = hours, remaining
+        return self._calendars.position(result.project_finish), flags
@@ -2,16 +2,141 @@
 Task Network for CPM calculations.
 
 Manages tasks and dependencies with support for topological sorting
-and network traversal.
+and network traversal. Traversals run on a cached integer-indexed CSR
+form of the network (CompactNetwork), rebuilt after each mutation.
 """
 
-from collections import defaultdict
+from collections import defaultdict, deque
 from copy import copy
 from typing import Optional
 
+import numpy as np
+
 from .models import Task, Dependency
 
 
+class CompactNetwork:
+    """
+    Read-only integer-indexed form of a TaskNetwork.
+
+    Tasks are numbered in TaskNetwork.tasks order. Adjacency is stored as
+    CSR arrays: the successors of task i are
+    succ_idx[succ_ptr[i]:succ_ptr[i + 1]], in dependency insertion order
+    (likewise pred_ptr/pred_idx). The topological order is computed once.
+    """
+
+    def __init__(self, task_ids: list[str], succ_ptr: np.ndarray, succ_idx: np.ndarray,
+                 pred_ptr: np.ndarray, pred_idx: np.ndarray):
+        self.task_ids = task_ids
+        self.index = {tid: i for i, tid in enumerate(task_ids)}
+        self.succ_ptr = succ_ptr
+        self.succ_idx = succ_idx
+        self.pred_ptr = pred_ptr
+        self.pred_idx = pred_idx
+        # Python lists for traversal loops
+        self._succ = (succ_ptr.tolist(), succ_idx.tolist())
+        self._pred = (pred_ptr.tolist(), pred_idx.tolist())
+        self._order: Optional[list[int]] = None
+        self._descendants: Optional[list[int]] = None
+        self._ancestors: Optional[list[int]] = None
+
+    @classmethod
+    def from_network(cls, network: 'TaskNetwork') -> 'CompactNetwork':
+        task_ids = list(network.tasks)
+        index = {tid: i for i, tid in enumerate(task_ids)}
+        n_deps = len(network.dependencies)
+        pred = np.fromiter((index[d.pred_task_id] for d in network.dependencies), np.int64, n_deps)
+        succ = np.fromiter((index[d.succ_task_id] for d in network.dependencies), np.int64, n_deps)
+
+        # Adjacency lists hold dependencies in insertion order, so a stable
+        # sort of the dependency list by task gives the same CSR order
+        def csr(keys, values):
+            ptr = np.zeros(len(task_ids) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(keys, minlength=len(task_ids)), out=ptr[1:])
+            return ptr, values[np.argsort(keys, kind='stable')]
+
+        return cls(task_ids, *csr(pred, succ), *csr(succ, pred))
+
+    def __len__(self) -> int:
+        return len(self.task_ids)
+
+    def topological_order(self) -> list[int]:
+        """
+        Task indices in topological order (predecessors before successors).
+
+        Uses Kahn's algorithm with a FIFO queue seeded in task order.
+        Raises ValueError if circular dependency detected.
+        """
+        if self._order is None:
+            pred_ptr = self._pred[0]
+            succ_ptr, succ_idx = self._succ
+            in_degree = [pred_ptr[i + 1] - pred_ptr[i] for i in range(len(self))]
+            queue = deque(i for i, degree in enumerate(in_degree) if degree == 0)
+            order = []
+            while queue:
+                i = queue.popleft()
+                order.append(i)
+                for s in succ_idx[succ_ptr[i]:succ_ptr[i + 1]]:
+                    in_degree[s] -= 1
+                    if in_degree[s] == 0:
+                        queue.append(s)
+
+            if len(order) != len(self):
+                # Find tasks involved in cycle
+                remaining = set(self.task_ids) - {self.task_ids[i] for i in order}
+                raise ValueError(f"Circular dependency detected involving {len(remaining)} tasks: "
+                                 f"{list(remaining)[:5]}...")
+            self._order = order
+        return self._order
+
+    def build_reachability_index(self) -> None:
+        """
+        Precompute descendant and ancestor bitsets for every task.
+
+        Bit j of a task's bitset is set if task j is reachable from it.
+        Uses O(n^2 / 8) bytes; requires an acyclic network.
+        """
+        order = self.topological_order()
+        succ_ptr, succ_idx = self._succ
+        pred_ptr, pred_idx = self._pred
+        descendants = [0] * len(self)
+        for i in reversed(order):
+            bits = 0
+            for s in succ_idx[succ_ptr[i]:succ_ptr[i + 1]]:
+                bits |= descendants[s] | (1 << s)
+            descendants[i] = bits
+        ancestors = [0] * len(self)
+        for i in order:
+            bits = 0
+            for p in pred_idx[pred_ptr[i]:pred_ptr[i + 1]]:
+                bits |= ancestors[p] | (1 << p)
+            ancestors[i] = bits
+        self._descendants, self._ancestors = descendants, ancestors
+
+    def reachable(self, i: int, successors: bool = True) -> list[int]:
+        """Indices reachable from task i through successors (or predecessors)."""
+        bitsets = self._descendants if successors else self._ancestors
+        if bitsets is not None:
+            bits, result = bitsets[i], []
+            while bits:
+                low = bits & -bits
+                result.append(low.bit_length() - 1)
+                bits ^= low
+            return result
+
+        ptr, idx = self._succ if successors else self._pred
+        seen = bytearray(len(self))
+        stack, result = [i], []
+        while stack:
+            current = stack.pop()
+            for j in idx[ptr[current]:ptr[current + 1]]:
+                if not seen[j]:
+                    seen[j] = 1
+                    result.append(j)
+                    stack.append(j)
+        return result
+
+
 class TaskNetwork:
     """
     Task dependency network for CPM calculations.
@@ -25,10 +150,24 @@ class TaskNetwork:
         self.dependencies: list[Dependency] = []
         self._successors: dict[str, list[Dependency]] = defaultdict(list)
         self._predecessors: dict[str, list[Dependency]] = defaultdict(list)
+        self._compact: Optional[CompactNetwork] = None
+
+    def compact(self) -> CompactNetwork:
+        """Integer-indexed CSR form of the network, cached until the next mutation."""
+        compact = self._compact
+        if compact is None or len(compact) != len(self.tasks) or \
+                len(compact.succ_idx) != len(self.dependencies):
+            compact = self._compact = CompactNetwork.from_network(self)
+        return compact
+
+    def invalidate_cache(self) -> None:
+        """Drop the cached CompactNetwork; call after editing tasks or adjacency lists directly."""
+        self._compact = None
 
     def add_task(self, task: Task) -> None:
         """Add a task to the network."""
         self.tasks[task.task_id] = task
+        self._compact = None
 
     def add_dependency(self, dep: Dependency) -> None:
         """
@@ -44,6 +183,7 @@ class TaskNetwork:
         self.dependencies.append(dep)
         self._successors[dep.pred_task_id].append(dep)
         self._predecessors[dep.succ_task_id].append(dep)
+        self._compact = None
 
     def add_dependency_safe(self, dep: Dependency) -> bool:
         """
@@ -56,8 +196,34 @@ class TaskNetwork:
         self.dependencies.append(dep)
         self._successors[dep.pred_task_id].append(dep)
         self._predecessors[dep.succ_task_id].append(dep)
+        self._compact = None
         return True
 
+    def remove_dependency(self, dep: Dependency) -> None:
+        """Remove a dependency previously added to the network."""
+        self.dependencies.remove(dep)
+        self._successors[dep.pred_task_id].remove(dep)
+        self._predecessors[dep.succ_task_id].remove(dep)
+        self._compact = None
+
+    def remove_dependencies(self, deps: list[Dependency]) -> None:
+        """Remove several dependencies (by identity) in one pass over the dependency list."""
+        removed = {id(dep) for dep in deps}
+        if not removed:
+            return
+        self.dependencies = [d for d in self.dependencies if id(d) not in removed]
+        for adjacency, task_ids in ((self._successors, {d.pred_task_id for d in deps}),
+                                    (self._predecessors, {d.succ_task_id for d in deps})):
+            for task_id in task_ids & adjacency.keys():
+                adjacency[task_id] = [d for d in adjacency[task_id] if id(d) not in removed]
+        self._compact = None
+
+    def remove_task(self, task_id: str) -> None:
+        """Remove a task and its dependencies."""
+        self.remove_dependencies(self._predecessors.pop(task_id, []) + self._successors.pop(task_id, []))
+        del self.tasks[task_id]
+        self._compact = None
+
     def get_task(self, task_id: str) -> Optional[Task]:
         """Get a task by ID."""
         return self.tasks.get(task_id)
@@ -92,77 +258,43 @@ class TaskNetwork:
         """
         Return task IDs in topological order (predecessors before successors).
 
-        Uses Kahn's algorithm. Raises ValueError if circular dependency detected.
+        Uses Kahn's algorithm; the order is cached until the network changes.
+        Raises ValueError if circular dependency detected.
         """
-        # Calculate in-degree for each task
-        in_degree = {tid: len(self._predecessors.get(tid, [])) for tid in self.tasks}
-
-        # Start with tasks that have no predecessors
-        queue = [tid for tid, deg in in_degree.items() if deg == 0]
-        result = []
-
-        while queue:
-            task_id = queue.pop(0)
-            result.append(task_id)
-
-            # Reduce in-degree for all successors
-            for dep in self._successors.get(task_id, []):
-                in_degree[dep.succ_task_id] -= 1
-                if in_degree[dep.succ_task_id] == 0:
-                    queue.append(dep.succ_task_id)
-
-        if len(result) != len(self.tasks):
-            # Find tasks involved in cycle
-            remaining = set(self.tasks.keys()) - set(result)
-            raise ValueError(f"Circular dependency detected involving {len(remaining)} tasks: "
-                           f"{list(remaining)[:5]}...")
-
-        return result
+        compact = self.compact()
+        task_ids = compact.task_ids
+        return [task_ids[i] for i in compact.topological_order()]
 
     def reverse_topological_sort(self) -> list[str]:
         """Return task IDs in reverse topological order (successors before predecessors)."""
         return list(reversed(self.topological_sort()))
 
-    def get_all_predecessors(self, task_id: str, include_self: bool = False) -> set[str]:
-        """Get all predecessor task IDs (transitive closure)."""
-        result = set()
-        if include_self:
-            result.add(task_id)
-
-        visited = set()
-        queue = [task_id]
-
-        while queue:
-            current = queue.pop(0)
-            if current in visited:
-                continue
-            visited.add(current)
+    def build_reachability_index(self) -> None:
+        """
+        Precompute transitive closures for fast get_all_predecessors/get_all_successors.
 
-            for dep in self._predecessors.get(current, []):
-                result.add(dep.pred_task_id)
-                queue.append(dep.pred_task_id)
+        The index is kept until the network changes. Raises ValueError if
+        circular dependency detected.
+        """
+        self.compact().build_reachability_index()
 
-        return result
+    def get_all_predecessors(self, task_id: str, include_self: bool = False) -> set[str]:
+        """Get all predecessor task IDs (transitive closure)."""
+        return self._reachable(task_id, include_self, successors=False)
 
     def get_all_successors(self, task_id: str, include_self: bool = False) -> set[str]:
         """Get all successor task IDs (transitive closure)."""
+        return self._reachable(task_id, include_self, successors=True)
+
+    def _reachable(self, task_id: str, include_self: bool, successors: bool) -> set[str]:
         result = set()
         if include_self:
             result.add(task_id)
-
-        visited = set()
-        queue = [task_id]
-
-        while queue:
-            current = queue.pop(0)
-            if current in visited:
-                continue
-            visited.add(current)
-
-            for dep in self._successors.get(current, []):
-                result.add(dep.succ_task_id)
-                queue.append(dep.succ_task_id)
-
+        compact = self.compact()
+        if task_id not in compact.index:
+            return result
+        task_ids = compact.task_ids
+        result.update(task_ids[j] for j in compact.reachable(compact.index[task_id], successors))
         return result
 
     def clone(self) -> 'TaskNetwork':
@@ -185,6 +317,9 @@ class TaskNetwork:
             new_network._successors[dep.pred_task_id].append(dep)
             new_network._predecessors[dep.succ_task_id].append(dep)
 
+        # Same structure, so the (read-only) compact form can be shared
+        new_network._compact = self._compact
+
         return new_network
 
     def modify_task_duration(self, task_id: str, new_duration_hours: float) -> None:
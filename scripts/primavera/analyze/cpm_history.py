@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+CPM History Across Schedule Snapshots.
+
+Runs CPM on every snapshot of one schedule type in chronological order, to
+answer questions like "how did the critical path evolve month by month".
+
+Instead of building each version from scratch, one working network is
+carried from snapshot to snapshot. Tasks are keyed by task_code (task_id
+is a per-export key) and calendars by their content hash, so for each new
+snapshot only the delta is applied: tasks and relationships added or
+removed, and tasks whose CPM inputs (durations, status, actuals,
+constraints, calendar) changed. Unchanged structure keeps the network's
+cached compact form and topological order, and calendars keep their
+work-time indexes.
+
+Output Tables:
+- cpm_history_{type}.csv         - One row per (file_id, task): CPM dates, float, criticality
+- cpm_history_{type}.summary.csv - One row per file_id: project finish, critical path, delta counts
+
+Usage:
+    python scripts/primavera/analyze/cpm_history.py --schedule-type YATES
+    python scripts/primavera/analyze/cpm_history.py --schedule-type SECAI --engine array --output history
+"""
+
+import argparse
+import sys
+import time as timer
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config.settings import Settings
+from scripts.primavera.analyze.cpm.engine import CPMEngine
+from scripts.primavera.analyze.cpm.array_engine import ArrayCPMEngine
+from scripts.primavera.analyze.cpm.models import CPMResult, Dependency
+from scripts.primavera.analyze.cpm.network import TaskNetwork
+from scripts.primavera.analyze.schedule_store import (
+    CalendarCache,
+    ScheduleStore,
+    build_tasks,
+    get_schedule_store,
+    _column,
+    _float_or,
+    _str_or,
+)
+from scripts.primavera.process.schedule_deltas import ordered_snapshots
+
+# CPM engines selectable for the history run ('cpm' is the reference and the default)
+ENGINES = {
+    'cpm': CPMEngine,
+    'array': ArrayCPMEngine,
+}
+
+# Task columns that feed CPM; a task is re-read only when one of these changes
+CPM_TASK_COLUMNS = [
+    'task_name', 'target_drtn_hr_cnt', 'remain_drtn_hr_cnt', 'status_code', 'task_type',
+    'cstr_date', 'cstr_type', 'act_start_date', 'act_end_date', 'calendar_key',
+]
+
+RESULT_COLUMNS = [
+    'file_id', 'task_code', 'task_id', 'early_start', 'early_finish',
+    'late_start', 'late_finish', 'total_float_hours', 'is_critical',
+]
+SUMMARY_COLUMNS = [
+    'file_id', 'data_date', 'project_finish', 'tasks', 'relationships', 'critical_tasks',
+    'tasks_added', 'tasks_removed', 'tasks_changed', 'relationships_added', 'relationships_removed',
+]
+
+
+def task_keys(tasks: pd.DataFrame) -> pd.Series:
+    """
+    Keys matching tasks across snapshots.
+
+    task_code where it is present and unique within the snapshot; otherwise
+    the task_id, so such tasks are simply replaced in every snapshot.
+    """
+    codes = tasks['task_code']
+    ambiguous = codes.isna() | codes.duplicated(keep=False)
+    return codes.astype(str).where(~ambiguous, 'id:' + tasks['task_id'].astype(str))
+
+
+class WarmStartCPM:
+    """
+    A working TaskNetwork advanced through schedule snapshots by deltas.
+
+    Task IDs in the working network are task keys (see task_keys) and
+    calendar IDs are CalendarCache content keys, so neither changes between
+    snapshots unless the underlying data does.
+    """
+
+    def __init__(self, store: ScheduleStore, engine: str = 'cpm'):
+        self.store = store
+        self.engine = engine
+        self.network = TaskNetwork()
+        self.calendars: dict = {}
+        self.project_info: dict = {}
+        self.file_id: Optional[int] = None
+        self.task_ids: dict[str, str] = {}          # task key -> task_id of the current snapshot
+        self._inputs: Optional[pd.DataFrame] = None  # CPM inputs of the current snapshot, by key
+        self._dependencies: dict[tuple, Dependency] = {}
+
+    def _load_calendars(self, file_id: int) -> dict[str, str]:
+        """Load the snapshot's calendars by content key; returns clndr_id -> key."""
+        table = self.store.get_table('calendar', file_id)
+        by_id = self.store.load_calendars(file_id)
+        keys = {}
+        self.calendars = {}
+        for clndr_id, clndr_data, day_hr_cnt in zip(
+            _str_or(_column(table, 'clndr_id'), 'nan'),
+            _str_or(_column(table, 'clndr_data'), ''),
+            _float_or(_column(table, 'day_hr_cnt'), 8.0),
+        ):
+            keys[clndr_id] = key = CalendarCache.key(clndr_data, day_hr_cnt)
+            self.calendars.setdefault(key, by_id[clndr_id])
+        return keys
+
+    def advance(self, file_id: int) -> dict:
+        """
+        Move the working network to a snapshot by applying the delta from the current one.
+
+        Returns:
+            Dict of delta counts (tasks_added, tasks_removed, tasks_changed,
+            relationships_added, relationships_removed)
+        """
+        calendar_keys = self._load_calendars(file_id)
+        tasks = self.store.get_table('task', file_id)
+        tasks = tasks.assign(
+            key=task_keys(tasks).values,
+            calendar_key=[calendar_keys.get(c, '') for c in _str_or(_column(tasks, 'clndr_id'), '')],
+        ).drop_duplicates('key', keep='last').set_index('key', drop=False)
+        inputs = tasks.reindex(columns=CPM_TASK_COLUMNS)
+
+        # Task delta
+        prev = self._inputs if self._inputs is not None else inputs.iloc[0:0]
+        added = inputs.index.difference(prev.index, sort=False)
+        removed = prev.index.difference(inputs.index, sort=False)
+        common = inputs.index.intersection(prev.index, sort=False)
+        before, after = prev.loc[common], inputs.loc[common]
+        differ = (before.ne(after) & ~(before.isna() & after.isna())).any(axis=1)
+        changed = common[differ.to_numpy()]
+
+        # Relationship delta (relationships to tasks missing from the snapshot are skipped)
+        preds = self.store.get_table('taskpred', file_id)
+        id_to_key = dict(zip(tasks['task_id'].astype(str), tasks['key']))
+        wanted = {}
+        for succ_id, pred_id, pred_type, lag in zip(
+            _str_or(_column(preds, 'task_id'), 'nan'),
+            _str_or(_column(preds, 'pred_task_id'), 'nan'),
+            _str_or(_column(preds, 'pred_type'), 'PR_FS'),
+            _float_or(_column(preds, 'lag_hr_cnt'), 0.0),
+        ):
+            pred_key, succ_key = id_to_key.get(pred_id), id_to_key.get(succ_id)
+            if pred_key is not None and succ_key is not None:
+                wanted[(pred_key, succ_key, pred_type, lag)] = None
+        # Keys name the tasks, so links of removed tasks are never wanted
+        dropped = [key for key in self._dependencies if key not in wanted]
+        new = [key for key in wanted if key not in self._dependencies]
+
+        # Apply: links first, so removed tasks no longer have any
+        self.network.remove_dependencies([self._dependencies.pop(key) for key in dropped])
+        for key in removed:
+            self.network.remove_task(key)
+
+        reread = tasks.loc[added.append(changed)]
+        rebuilt = build_tasks(reread, include_p6_values=False)
+        for key, calendar_key, task in zip(reread['key'], reread['calendar_key'], rebuilt.values()):
+            task.task_id = key
+            task.calendar_id = calendar_key
+            if key in self.network.tasks:
+                # Same task, new inputs: replacing it keeps the cached structure
+                self.network.tasks[key] = task
+            else:
+                self.network.add_task(task)
+
+        for key in new:
+            dep = Dependency(pred_task_id=key[0], succ_task_id=key[1], pred_type=key[2], lag_hours=key[3])
+            self.network.add_dependency(dep)
+            self._dependencies[key] = dep
+
+        self.file_id = file_id
+        self.task_ids = dict(zip(tasks['key'], tasks['task_id'].astype(str)))
+        self.project_info = self.store.load_project_info(file_id)
+        self._inputs = inputs
+        return {
+            'tasks_added': len(added),
+            'tasks_removed': len(removed),
+            'tasks_changed': len(changed),
+            'relationships_added': len(new),
+            'relationships_removed': len(dropped),
+        }
+
+    def run(self) -> CPMResult:
+        """Run CPM on the working network at the current snapshot's data date."""
+        data_date = self.project_info.get('data_date')
+        return ENGINES[self.engine](self.network, self.calendars).run(
+            data_date=data_date, target_finish=self.project_info.get('target_finish_date'),
+        )
+
+    def result_columns(self) -> dict[str, np.ndarray]:
+        """Per-task CPM results of the last run, as columns (RESULT_COLUMNS)."""
+        tasks = list(self.network.tasks.values())
+        date_column = lambda name: pd.DatetimeIndex([getattr(t, name) for t in tasks]).to_numpy()
+        return {
+            'file_id': np.full(len(tasks), self.file_id, dtype=np.int64),
+            'task_code': np.array([t.task_code for t in tasks], dtype=object),
+            'task_id': np.array([self.task_ids[t.task_id] for t in tasks], dtype=object),
+            'early_start': date_column('early_start'),
+            'early_finish': date_column('early_finish'),
+            'late_start': date_column('late_start'),
+            'late_finish': date_column('late_finish'),
+            'total_float_hours': np.array([np.nan if t.total_float_hours is None else t.total_float_hours
+                                           for t in tasks], dtype=np.float64),
+            'is_critical': np.array([t.is_critical for t in tasks], dtype=bool),
+        }
+
+
+def run_cpm_history(
+    file_ids: list[int],
+    engine: str = 'cpm',
+    data_dir: Path = None,
+    verbose: bool = True,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Run CPM on a sequence of snapshots, warm-starting each from the previous one.
+
+    Args:
+        file_ids: Snapshots in the order to process (chronological, see ordered_snapshots)
+        engine: CPM engine ('cpm' or 'array', see ENGINES)
+        data_dir: Directory containing CSV files (default: PRIMAVERA_PROCESSED_DIR)
+        verbose: Print progress messages
+
+    Returns:
+        Tuple of (per-task results with RESULT_COLUMNS, per-version summary with SUMMARY_COLUMNS)
+    """
+    history = WarmStartCPM(get_schedule_store(data_dir), engine=engine)
+    columns = {name: [] for name in RESULT_COLUMNS}
+    summary = []
+
+    start = timer.perf_counter()
+    for file_id in file_ids:
+        delta = history.advance(file_id)
+        result = history.run()
+        for name, values in history.result_columns().items():
+            columns[name].append(values)
+
+        summary.append({
+            'file_id': file_id,
+            'data_date': history.project_info.get('data_date'),
+            'project_finish': result.project_finish,
+            'tasks': len(history.network.tasks),
+            'relationships': len(history.network.dependencies),
+            'critical_tasks': len(result.critical_path),
+            **delta,
+        })
+        if verbose:
+            print(f"  file_id={file_id:4}: finish {result.project_finish:%Y-%m-%d}, "
+                  f"{len(result.critical_path)} critical | tasks +{delta['tasks_added']} "
+                  f"-{delta['tasks_removed']} ~{delta['tasks_changed']}, relationships "
+                  f"+{delta['relationships_added']} -{delta['relationships_removed']}")
+
+    if verbose:
+        print(f"CPM on {len(file_ids)} snapshots in {timer.perf_counter() - start:.1f}s")
+
+    results = pd.DataFrame({
+        name: np.concatenate(parts) if parts else np.array([]) for name, parts in columns.items()
+    }, columns=RESULT_COLUMNS)
+    return results, pd.DataFrame(summary, columns=SUMMARY_COLUMNS)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Run CPM on every snapshot of a schedule type')
+    parser.add_argument('--data-dir', type=Path, default=Settings.PRIMAVERA_PROCESSED_DIR,
+                        help=f'Processed primavera directory (default: {Settings.PRIMAVERA_PROCESSED_DIR})')
+    parser.add_argument('--schedule-type', default='YATES',
+                        help='Schedule type to process (default: YATES)')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='cpm',
+                        help='CPM engine (default: cpm)')
+    parser.add_argument('--output', '-o', type=str, default=None,
+                        help='Output file path prefix (default: cpm_history_{type} in the data dir)')
+    parser.add_argument('--quiet', '-q', action='store_true', help='Suppress progress messages')
+    args = parser.parse_args()
+
+    files = ordered_snapshots(pd.read_csv(args.data_dir / 'xer_files.csv'), args.schedule_type)
+    if files.empty:
+        print(f"No dated snapshots of schedule type {args.schedule_type}")
+        return 1
+
+    results, summary = run_cpm_history(files['file_id'].astype(int).tolist(), engine=args.engine,
+                                       data_dir=args.data_dir, verbose=not args.quiet)
+
+    prefix = Path(args.output) if args.output else args.data_dir / f'cpm_history_{args.schedule_type.lower()}'
+    results.to_csv(prefix.with_suffix('.csv'), index=False)
+    summary.to_csv(prefix.with_suffix('.summary.csv'), index=False)
+    print(f"✓ {prefix.with_suffix('.csv')} ({len(results):,} rows)")
+    print(f"✓ {prefix.with_suffix('.summary.csv')} ({len(summary):,} rows)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
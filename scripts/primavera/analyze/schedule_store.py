@@ -0,0 +1,546 @@
+"""
+Schedule Store for P6 Schedule Data.
+
+Indexed, per-file_id access to the multi-version P6 CSV exports.
+
+The processed CSVs (task.csv, taskpred.csv, calendar.csv, project.csv) hold
+every schedule version in one table. Reading and filtering the full table
+for each schedule costs seconds; the store instead reads each table once,
+splits it into one partition per file_id on disk, and from then on reads
+only the partition that is asked for. Partitions are rebuilt automatically
+when the source CSV changes (size or mtime).
+
+Built schedules (TaskNetwork, calendars, project info) are kept in an
+in-process LRU so repeated loads of the same version are near-free.
+Calendars are interned by content across versions (see CalendarCache).
+
+Usage:
+    store = get_schedule_store()
+    network, calendars, project_info = store.load_schedule(file_id)
+"""
+
+import hashlib
+import json
+import os
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config.settings import Settings
+from .cpm.models import Task, Dependency
+from .cpm.network import TaskNetwork
+from .cpm.calendar import P6Calendar, WorkTimeIndex
+
+
+# Bump when the partition layout or column selection changes
+STORE_VERSION = 1
+
+CACHE_DIRNAME = '_cache'
+
+# Columns needed per table, and which of them are numeric
+TABLE_COLUMNS = {
+    'task': [
+        'file_id', 'task_id', 'task_code', 'task_name', 'target_drtn_hr_cnt',
+        'clndr_id', 'status_code', 'task_type', 'wbs_id', 'cstr_date', 'cstr_type',
+        'act_start_date', 'act_end_date', 'remain_drtn_hr_cnt',
+        'early_start_date', 'early_end_date', 'late_start_date', 'late_end_date',
+        'total_float_hr_cnt', 'driving_path_flag',
+    ],
+    'taskpred': ['file_id', 'task_id', 'pred_task_id', 'pred_type', 'lag_hr_cnt'],
+    'calendar': ['file_id', 'clndr_id', 'clndr_data', 'day_hr_cnt', 'clndr_name'],
+    'project': [
+        'file_id', 'last_recalc_date', 'plan_start_date', 'plan_end_date',
+        'scd_end_date', 'proj_id', 'proj_short_name',
+    ],
+}
+
+NUMERIC_COLUMNS = {
+    'file_id', 'target_drtn_hr_cnt', 'remain_drtn_hr_cnt', 'total_float_hr_cnt',
+    'lag_hr_cnt', 'day_hr_cnt',
+}
+
+
+# =============================================================================
+# Column helpers
+# =============================================================================
+
+def _column(df: pd.DataFrame, col: str) -> pd.Series:
+    """Get a column, or an all-missing column if the table lacks it."""
+    if col in df.columns:
+        return df[col]
+    return pd.Series(None, index=df.index, dtype=object)
+
+
+def _str_or(series: pd.Series, default) -> list:
+    """Column as list of str, with missing values replaced by default."""
+    return [default if pd.isna(v) else str(v) for v in series]
+
+
+def _float_or(series: pd.Series, default) -> list:
+    """Column as list of float, with missing values replaced by default."""
+    values = pd.to_numeric(series, errors='coerce')
+    return [default if pd.isna(v) else float(v) for v in values]
+
+
+def _parse_date_scalar(val):
+    if pd.isna(val) or val == '':
+        return None
+    try:
+        return pd.to_datetime(val)
+    except Exception:
+        return None
+
+
+def parse_dates(series: pd.Series) -> list:
+    """
+    Parse a date column in vectorized form.
+
+    Values are parsed as ISO-8601 in one pass; anything that fails that
+    format (and is not blank) is retried with the per-value parser, so the
+    result matches parsing each cell with pd.to_datetime. Missing or
+    unparseable values become None.
+    """
+    parsed = pd.to_datetime(series, errors='coerce', format='ISO8601')
+    retry = parsed.isna() & series.notna() & (series.astype(str) != '')
+    if retry.any():
+        parsed = parsed.astype(object)
+        parsed[retry] = [_parse_date_scalar(v) for v in series[retry]]
+    return [None if pd.isna(v) else v for v in parsed]
+
+
+# =============================================================================
+# Object builders (one pass over columns, no iterrows)
+# =============================================================================
+
+def build_calendars(df: pd.DataFrame, cache: 'CalendarCache' = None) -> dict[str, P6Calendar]:
+    """
+    Build P6Calendar objects from calendar rows of one schedule version.
+
+    With a cache, calendars whose data was parsed before (in any version)
+    are shared copies of the interned calendar instead of new parses.
+    """
+    calendars = {}
+    for clndr_id, clndr_data, day_hr_cnt, clndr_name in zip(
+        _str_or(_column(df, 'clndr_id'), 'nan'),
+        _str_or(_column(df, 'clndr_data'), ''),
+        _float_or(_column(df, 'day_hr_cnt'), 8.0),
+        _str_or(_column(df, 'clndr_name'), ''),
+    ):
+        if cache is not None:
+            calendars[clndr_id] = cache.get(clndr_id, clndr_data, day_hr_cnt, clndr_name)
+        else:
+            calendars[clndr_id] = P6Calendar.from_p6_data(
+                clndr_id=clndr_id,
+                clndr_data=clndr_data,
+                day_hr_cnt=day_hr_cnt,
+                clndr_name=clndr_name,
+            )
+    return calendars
+
+
+def build_tasks(df: pd.DataFrame, include_p6_values: bool = True) -> dict[str, Task]:
+    """Build Task objects from task rows of one schedule version."""
+    columns = {
+        'task_id': _str_or(_column(df, 'task_id'), 'nan'),
+        'task_code': _str_or(_column(df, 'task_code'), ''),
+        'task_name': _str_or(_column(df, 'task_name'), ''),
+        'duration_hours': _float_or(_column(df, 'target_drtn_hr_cnt'), 0.0),
+        'calendar_id': _str_or(_column(df, 'clndr_id'), ''),
+        'status': _str_or(_column(df, 'status_code'), 'TK_NotStart'),
+        'task_type': _str_or(_column(df, 'task_type'), 'TT_Task'),
+        'wbs_id': _str_or(_column(df, 'wbs_id'), ''),
+        'constraint_date': parse_dates(_column(df, 'cstr_date')),
+        'constraint_type': _str_or(_column(df, 'cstr_type'), None),
+        'actual_start': parse_dates(_column(df, 'act_start_date')),
+        'actual_finish': parse_dates(_column(df, 'act_end_date')),
+        'remaining_duration_hours': _float_or(_column(df, 'remain_drtn_hr_cnt'), 0.0),
+    }
+    names = list(columns)
+
+    tasks = {}
+    for values in zip(*columns.values()):
+        task = Task(**dict(zip(names, values)))
+        tasks[task.task_id] = task
+
+    # Include P6's calculated values for comparison
+    if include_p6_values:
+        p6_columns = zip(
+            parse_dates(_column(df, 'early_start_date')),
+            parse_dates(_column(df, 'early_end_date')),
+            parse_dates(_column(df, 'late_start_date')),
+            parse_dates(_column(df, 'late_end_date')),
+            _float_or(_column(df, 'total_float_hr_cnt'), None),
+            [str(v) == 'Y' for v in _column(df, 'driving_path_flag')],
+        )
+        for task_id, (es, ef, ls, lf, tf, driving) in zip(columns['task_id'], p6_columns):
+            task = tasks[task_id]
+            task.p6_early_start = es
+            task.p6_early_finish = ef
+            task.p6_late_start = ls
+            task.p6_late_finish = lf
+            task.p6_total_float_hours = tf
+            task.p6_driving_path_flag = driving
+
+    return tasks
+
+
+def build_dependencies(df: pd.DataFrame) -> list[Dependency]:
+    """Build Dependency objects from taskpred rows of one schedule version."""
+    return [
+        Dependency(
+            pred_task_id=pred_task_id,
+            succ_task_id=succ_task_id,
+            pred_type=pred_type,
+            lag_hours=lag_hours,
+        )
+        for pred_task_id, succ_task_id, pred_type, lag_hours in zip(
+            _str_or(_column(df, 'pred_task_id'), 'nan'),
+            _str_or(_column(df, 'task_id'), 'nan'),
+            _str_or(_column(df, 'pred_type'), 'PR_FS'),
+            _float_or(_column(df, 'lag_hr_cnt'), 0.0),
+        )
+    ]
+
+
+def build_project_info(df: pd.DataFrame) -> dict:
+    """Build the project info dict from project rows of one schedule version."""
+    if len(df) == 0:
+        return {}
+
+    row = df.iloc[[0]]
+    first = lambda col: parse_dates(_column(row, col))[0]
+    return {
+        'data_date': first('last_recalc_date'),
+        'plan_start_date': first('plan_start_date'),
+        'plan_end_date': first('plan_end_date'),
+        'target_finish_date': first('scd_end_date'),
+        'proj_id': str(row['proj_id'].iloc[0]) if 'proj_id' in row.columns else '',
+        'proj_short_name': str(row['proj_short_name'].iloc[0]) if 'proj_short_name' in row.columns else '',
+    }
+
+
+def build_network(tasks: dict[str, Task], dependencies: list[Dependency]) -> tuple[TaskNetwork, int]:
+    """Build a TaskNetwork. Returns (network, number of skipped dependencies)."""
+    network = TaskNetwork()
+    for task in tasks.values():
+        network.add_task(task)
+
+    skipped = 0
+    for dep in dependencies:
+        if not network.add_dependency_safe(dep):
+            skipped += 1
+
+    return network, skipped
+
+
+# =============================================================================
+# Calendar Cache
+# =============================================================================
+
+class CalendarCache:
+    """
+    Parsed calendars interned by a hash of their clndr_data.
+
+    Most calendars are identical across schedule versions and differ only in
+    clndr_id. Each distinct calendar is parsed once; every version gets a
+    shared_copy() of it, so the work-time index built for one version serves
+    all of them. Interned calendars (with their index) are pickled to
+    ``cache_dir`` so other processes and later runs skip the parse too.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._calendars: dict[str, P6Calendar] = {}
+        self._saved_days: dict[str, int] = {}   # index span on disk, -1 = no index
+        self.parsed = 0
+
+    @staticmethod
+    def key(clndr_data: str, day_hr_cnt: float) -> str:
+        """Hash identifying a calendar's content and the index implementation."""
+        text = f'{STORE_VERSION}|{WorkTimeIndex.VERSION}|{day_hr_cnt!r}|{clndr_data}'
+        return hashlib.sha1(text.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f'{key}.pkl'
+
+    def _load(self, key: str) -> Optional[P6Calendar]:
+        if self.cache_dir is None or not self._path(key).exists():
+            return None
+        try:
+            calendar = pd.read_pickle(self._path(key))
+        except Exception:
+            return None
+        self._saved_days[key] = self._index_days(calendar)
+        return calendar
+
+    @staticmethod
+    def _index_days(calendar: P6Calendar) -> int:
+        index = calendar._work_index
+        return -1 if index is None else index.n_days
+
+    def get(self, clndr_id: str, clndr_data: str, day_hr_cnt: float = 8.0,
+            clndr_name: str = "") -> P6Calendar:
+        """Get a calendar, parsing its data only if it was not seen before."""
+        key = self.key(clndr_data, day_hr_cnt)
+        interned = self._calendars.get(key)
+        if interned is None:
+            interned = self._load(key)
+            if interned is None:
+                interned = P6Calendar.from_p6_data('', clndr_data, day_hr_cnt)
+                self.parsed += 1
+            self._calendars[key] = interned
+        return interned.shared_copy(clndr_id, clndr_name)
+
+    def save(self) -> int:
+        """Persist calendars that are new or whose index grew. Returns number written."""
+        if self.cache_dir is None:
+            return 0
+        written = 0
+        for key, calendar in self._calendars.items():
+            days = self._index_days(calendar)
+            if self._saved_days.get(key, -2) >= days:
+                continue
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so concurrent workers never read a partial file
+            tmp = self._path(key).with_suffix(f'.{os.getpid()}.tmp')
+            pd.to_pickle(calendar, tmp)
+            os.replace(tmp, self._path(key))
+            self._saved_days[key] = days
+            written += 1
+        return written
+
+    def clear(self) -> None:
+        """Drop interned calendars from memory (files on disk are kept)."""
+        self._calendars.clear()
+        self._saved_days.clear()
+
+
+# =============================================================================
+# Schedule Store
+# =============================================================================
+
+class ScheduleStore:
+    """
+    Per-file_id partitioned access to the P6 tables with an LRU of schedules.
+
+    Partitions live under ``{data_dir}/_cache/schedule_store/{table}/`` as one
+    pickle per file_id plus a manifest recording the source CSV signature.
+    """
+
+    def __init__(self, data_dir: Path = None, cache_dir: Path = None,
+                 max_cached_schedules: int = 8):
+        """
+        Initialize the store.
+
+        Args:
+            data_dir: Directory containing CSV files (default: PRIMAVERA_PROCESSED_DIR)
+            cache_dir: Partition directory (default: {data_dir}/_cache/schedule_store)
+            max_cached_schedules: Number of built schedules kept in memory
+        """
+        self.data_dir = Path(data_dir) if data_dir is not None else Settings.PRIMAVERA_PROCESSED_DIR
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else (
+            self.data_dir / CACHE_DIRNAME / 'schedule_store'
+        )
+        self.max_cached_schedules = max_cached_schedules
+        self.calendars = CalendarCache(self.cache_dir / 'calendars')
+        self._schedules: OrderedDict = OrderedDict()
+        self._manifests: dict[str, dict] = {}
+
+    # -------------------------------------------------------------------------
+    # Partitions
+    # -------------------------------------------------------------------------
+
+    def _source_signature(self, table: str) -> dict:
+        stat = (self.data_dir / f'{table}.csv').stat()
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'version': STORE_VERSION}
+
+    def _manifest_path(self, table: str) -> Path:
+        return self.cache_dir / table / 'manifest.json'
+
+    def _partition_path(self, table: str, file_id: int) -> Path:
+        return self.cache_dir / table / f'{int(file_id)}.pkl'
+
+    def _load_manifest(self, table: str) -> Optional[dict]:
+        path = self._manifest_path(table)
+        if not path.exists():
+            return None
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def read_full_table(self, table: str) -> pd.DataFrame:
+        """Read a full multi-version table with column pruning."""
+        wanted = set(TABLE_COLUMNS[table])
+        dtypes = {col: (float if col in NUMERIC_COLUMNS else str) for col in wanted}
+        dtypes['file_id'] = 'int64'
+        return pd.read_csv(
+            self.data_dir / f'{table}.csv',
+            usecols=lambda c: c in wanted,
+            dtype=dtypes,
+            keep_default_na=True,
+        )
+
+    def build_partitions(self, table: str) -> dict:
+        """Split a table into one partition per file_id and write the manifest."""
+        signature = self._source_signature(table)
+        df = self.read_full_table(table)
+
+        table_dir = self.cache_dir / table
+        table_dir.mkdir(parents=True, exist_ok=True)
+        for stale in table_dir.glob('*.pkl'):
+            stale.unlink()
+
+        counts = {}
+        for file_id, part in df.groupby('file_id', sort=True):
+            part.reset_index(drop=True).to_pickle(self._partition_path(table, file_id))
+            counts[str(int(file_id))] = len(part)
+
+        manifest = {**signature, 'columns': list(df.columns), 'file_ids': counts}
+        with open(self._manifest_path(table), 'w') as f:
+            json.dump(manifest, f)
+
+        self._manifests[table] = manifest
+        return manifest
+
+    def manifest(self, table: str) -> dict:
+        """Get the up-to-date partition manifest for a table, building it if stale."""
+        signature = self._source_signature(table)
+        manifest = self._manifests.get(table) or self._load_manifest(table)
+        if manifest is None or any(manifest.get(k) != v for k, v in signature.items()):
+            manifest = self.build_partitions(table)
+        self._manifests[table] = manifest
+        return manifest
+
+    def file_ids(self, table: str = 'task') -> list[int]:
+        """List file_ids present in a table."""
+        return sorted(int(fid) for fid in self.manifest(table)['file_ids'])
+
+    def get_table(self, table: str, file_id: int) -> pd.DataFrame:
+        """Read the rows of one table for one schedule version."""
+        manifest = self.manifest(table)
+        if str(int(file_id)) not in manifest['file_ids']:
+            return pd.DataFrame(columns=manifest['columns'])
+        return pd.read_pickle(self._partition_path(table, file_id))
+
+    def partition_fingerprint(self, file_id: int, tables=tuple(TABLE_COLUMNS)) -> str:
+        """
+        Content hash of one schedule version's partitions.
+
+        Unlike the manifest signature this is unchanged when a table is
+        re-partitioned because other versions were added, so it identifies
+        snapshots whose own data changed.
+        """
+        digest = hashlib.sha1()
+        for table in tables:
+            digest.update(table.encode())
+            if str(int(file_id)) in self.manifest(table)['file_ids']:
+                digest.update(self._partition_path(table, file_id).read_bytes())
+        return digest.hexdigest()
+
+    # -------------------------------------------------------------------------
+    # Model objects
+    # -------------------------------------------------------------------------
+
+    def load_calendars(self, file_id: int) -> dict[str, P6Calendar]:
+        """Load calendars for a schedule version (interned across versions)."""
+        return build_calendars(self.get_table('calendar', file_id), self.calendars)
+
+    def load_tasks(self, file_id: int, include_p6_values: bool = True) -> dict[str, Task]:
+        """Load tasks for a schedule version."""
+        return build_tasks(self.get_table('task', file_id), include_p6_values)
+
+    def load_dependencies(self, file_id: int) -> list[Dependency]:
+        """Load dependencies for a schedule version."""
+        return build_dependencies(self.get_table('taskpred', file_id))
+
+    def load_project_info(self, file_id: int) -> dict:
+        """Load project-level information including data date."""
+        return build_project_info(self.get_table('project', file_id))
+
+    def load_schedule(
+        self,
+        file_id: int,
+        include_p6_values: bool = True,
+        verbose: bool = False,
+    ) -> tuple[TaskNetwork, dict[str, P6Calendar], dict]:
+        """
+        Load a complete schedule version, served from the LRU when possible.
+
+        The returned network is a clone of the cached one, so callers may run
+        CPM or modify durations without affecting later loads. Calendars are
+        shared (read-only).
+
+        Returns:
+            Tuple of (TaskNetwork, calendars dict, project_info dict)
+        """
+        key = (int(file_id), include_p6_values)
+        cached = self._schedules.get(key)
+
+        if cached is None:
+            if verbose:
+                print(f"Loading schedule file_id={file_id} from {self.data_dir}")
+
+            project_info = self.load_project_info(file_id)
+            calendars = self.load_calendars(file_id)
+            tasks = self.load_tasks(file_id, include_p6_values)
+            dependencies = self.load_dependencies(file_id)
+            network, skipped = build_network(tasks, dependencies)
+
+            # Build the shared work-time indexes around the data date, then
+            # persist new calendars so later loads and other processes reuse both
+            data_date = project_info.get('data_date')
+            if data_date is not None and P6Calendar.use_work_index:
+                for calendar in calendars.values():
+                    calendar._get_work_index(data_date.date())
+            self.calendars.save()
+
+            if verbose:
+                if project_info.get('data_date'):
+                    print(f"  Data date: {project_info['data_date']}")
+                print(f"  Loaded {len(calendars)} calendars")
+                print(f"  Loaded {len(tasks)} tasks")
+                print(f"  Loaded {len(dependencies)} dependencies")
+                if skipped > 0:
+                    print(f"  Skipped {skipped} dependencies (missing tasks)")
+                stats = network.get_statistics()
+                print(f"  Network: {stats['total_tasks']} tasks, {stats['total_dependencies']} deps")
+                print(f"  Start tasks: {stats['start_tasks']}, End tasks: {stats['end_tasks']}")
+
+            cached = (network, calendars, project_info)
+            self._schedules[key] = cached
+            while len(self._schedules) > self.max_cached_schedules:
+                self._schedules.popitem(last=False)
+        else:
+            self._schedules.move_to_end(key)
+            if verbose:
+                print(f"Loaded schedule file_id={file_id} from cache")
+
+        network, calendars, project_info = cached
+        return network.clone(), calendars, dict(project_info)
+
+    def clear(self) -> None:
+        """Drop in-memory caches (partitions and calendars on disk are kept)."""
+        self._schedules.clear()
+        self._manifests.clear()
+        self.calendars.clear()
+
+
+_STORES: dict[Path, ScheduleStore] = {}
+
+
+def get_schedule_store(data_dir: Path = None) -> ScheduleStore:
+    """Get the shared ScheduleStore for a data directory."""
+    data_dir = Path(data_dir) if data_dir is not None else Settings.PRIMAVERA_PROCESSED_DIR
+    key = data_dir.resolve()
+    if key not in _STORES:
+        _STORES[key] = ScheduleStore(data_dir)
+    return _STORES[key]
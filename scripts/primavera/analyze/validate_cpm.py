@@ -6,12 +6,16 @@ Compares CPM calculations against P6's stored values to validate accuracy.
 Produces a detailed report highlighting matches and mismatches.
 
 Usage:
-    python scripts/primavera/analyze/validate_cpm.py [--file-id N] [--output FILE]
+    python scripts/primavera/analyze/validate_cpm.py [--file-id N] [--output FILE] [--engine array]
+    python scripts/primavera/analyze/validate_cpm.py --all [--workers N] [--output FILE]
     python scripts/primavera/analyze/validate_cpm.py --help
 """
 
 import argparse
+import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
 from collections import defaultdict
@@ -27,7 +31,27 @@ from scripts.primavera.analyze.data_loader import (
     get_latest_file_id,
     list_schedule_versions,
 )
+from scripts.primavera.analyze.schedule_store import CACHE_DIRNAME, get_schedule_store
 from scripts.primavera.analyze.cpm.engine import CPMEngine
+from scripts.primavera.analyze.cpm.array_engine import ArrayCPMEngine
+
+# CPM engines selectable for validation
+ENGINES = {
+    'cpm': CPMEngine,
+    'array': ArrayCPMEngine,
+}
+
+# Bump an engine's version when its calculations change, so cached
+# validation results for every schedule version are recomputed
+ENGINE_VERSIONS = {
+    'cpm': 1,
+    'array': 1,
+}
+
+# Columns of the all-versions summary (cpm_validation_all_schedules.csv)
+SUMMARY_COLUMNS = ['file_id', 'date', 'total', 'compared', 'es%', 'ef%', 'ls%', 'lf%', 'fl%', 'overall%']
+
+DATE_FIELDS = ['early_start', 'early_finish', 'late_start', 'late_finish']
 
 
 class CPMValidationResult:
@@ -127,14 +151,39 @@ class CPMValidationResult:
 
         return df
 
+    def get_overall_rate(self) -> float:
+        """Get the match rate across all date fields as percentage."""
+        matches = sum(len(self.field_results[f]['matches']) for f in DATE_FIELDS)
+        total = sum(len(self.field_results[f]['matches']) + len(self.field_results[f]['mismatches'])
+                    for f in DATE_FIELDS)
+        return (matches / total * 100) if total > 0 else 0.0
+
+    def get_summary_row(self) -> dict:
+        """Get the one-line summary used in the all-versions report."""
+        return {
+            'file_id': self.file_id,
+            'date': self.data_date.strftime('%Y-%m-%d') if self.data_date else '',
+            'total': self.total_tasks,
+            'compared': self.compared_tasks,
+            'es%': self.get_match_rate('early_start'),
+            'ef%': self.get_match_rate('early_finish'),
+            'ls%': self.get_match_rate('late_start'),
+            'lf%': self.get_match_rate('late_finish'),
+            'fl%': self.get_match_rate('total_float'),
+            'overall%': self.get_overall_rate(),
+        }
+
 
-def validate_cpm(file_id: int, verbose: bool = True) -> CPMValidationResult:
+def validate_cpm(file_id: int, verbose: bool = True, engine: str = 'cpm',
+                 data_dir: Path = None) -> CPMValidationResult:
     """
     Validate CPM calculations against P6 stored values.
 
     Args:
         file_id: Schedule version to validate
         verbose: Print progress messages
+        engine: CPM engine to validate ('cpm' or 'array', see ENGINES)
+        data_dir: Directory containing CSV files (default: PRIMAVERA_PROCESSED_DIR)
 
     Returns:
         CPMValidationResult with detailed comparison data
@@ -149,7 +198,7 @@ def validate_cpm(file_id: int, verbose: bool = True) -> CPMValidationResult:
         print(f"{'='*80}")
         print(f"\nLoading schedule file_id={file_id}...")
 
-    network, calendars, project_info = load_schedule(file_id, verbose=verbose)
+    network, calendars, project_info = load_schedule(file_id, data_dir=data_dir, verbose=verbose)
     result.data_date = project_info.get('data_date')
     result.total_tasks = len(network.tasks)
 
@@ -181,8 +230,8 @@ def validate_cpm(file_id: int, verbose: bool = True) -> CPMValidationResult:
     if verbose and target_finish:
         print(f"  Target Finish: {target_finish}")
 
-    engine = CPMEngine(network, calendars)
-    cpm_result = engine.run(data_date=result.data_date, target_finish=target_finish)
+    cpm_engine = ENGINES[engine](network, calendars)
+    cpm_result = cpm_engine.run(data_date=result.data_date, target_finish=target_finish)
 
     if verbose:
         print(f"  Project Start: {cpm_result.project_start}")
@@ -222,6 +271,108 @@ def validate_cpm(file_id: int, verbose: bool = True) -> CPMValidationResult:
     return result
 
 
+def _validation_cache_path(data_dir: Path, engine: str) -> Path:
+    store = get_schedule_store(data_dir)
+    return store.data_dir / CACHE_DIRNAME / 'cpm_validation' / f'{engine}.json'
+
+
+def _load_validation_cache(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _validate_summary_row(file_id: int, engine: str, data_dir: Path) -> dict:
+    """Validate one schedule version in a worker and return only its summary row."""
+    return validate_cpm(file_id, verbose=False, engine=engine, data_dir=data_dir).get_summary_row()
+
+
+def validate_all(
+    file_ids: list[int] = None,
+    engine: str = 'cpm',
+    workers: int = None,
+    data_dir: Path = None,
+    use_cache: bool = True,
+    verbose: bool = True,
+) -> pd.DataFrame:
+    """
+    Validate every schedule version and combine the per-version summaries.
+
+    Versions are validated in a process pool; each worker loads only its
+    version's partitions from the ScheduleStore. Summary rows are cached
+    under the store's cache directory, keyed by file_id, engine version and
+    a content hash of the version's partitions, so a rerun only validates
+    versions that are new or whose data changed.
+
+    Args:
+        file_ids: Schedule versions to validate (default: all in task.csv)
+        engine: CPM engine to validate ('cpm' or 'array', see ENGINES)
+        workers: Worker processes (default: CPU count; 1 = in this process)
+        data_dir: Directory containing CSV files (default: PRIMAVERA_PROCESSED_DIR)
+        use_cache: Reuse cached rows for unchanged versions
+        verbose: Print progress messages
+
+    Returns:
+        DataFrame with SUMMARY_COLUMNS, one row per file_id
+    """
+    store = get_schedule_store(data_dir)
+    if file_ids is None:
+        file_ids = store.file_ids('task')
+
+    # Fingerprinting also brings every partition up to date before workers start
+    fingerprints = {fid: store.partition_fingerprint(fid) for fid in file_ids}
+    cache_path = _validation_cache_path(store.data_dir, engine)
+    cache = _load_validation_cache(cache_path) if use_cache else {}
+
+    rows = {}
+    for fid in file_ids:
+        entry = cache.get(str(fid))
+        if entry and entry['engine_version'] == ENGINE_VERSIONS[engine] \
+                and entry['fingerprint'] == fingerprints[fid]:
+            rows[fid] = entry['row']
+    pending = [fid for fid in file_ids if fid not in rows]
+
+    if verbose:
+        print(f"Validating {len(pending)} of {len(file_ids)} schedule versions "
+              f"({len(rows)} cached, engine={engine})")
+
+    def record(fid: int, row: dict) -> None:
+        rows[fid] = row
+        cache[str(fid)] = {
+            'engine_version': ENGINE_VERSIONS[engine],
+            'fingerprint': fingerprints[fid],
+            'row': row,
+        }
+        if verbose:
+            print(f"  file_id={fid}: early finish {row['ef%']:.1f}%, overall {row['overall%']:.1f}%")
+
+    workers = min(workers or os.cpu_count() or 1, max(1, len(pending)))
+    try:
+        if workers <= 1:
+            for fid in pending:
+                record(fid, _validate_summary_row(fid, engine, store.data_dir))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(_validate_summary_row, fid, engine, store.data_dir): fid
+                    for fid in pending
+                }
+                for future in as_completed(futures):
+                    record(futures[future], future.result())
+    finally:
+        # Keep finished versions even if a later one fails
+        if pending:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_path, 'w') as f:
+                json.dump(cache, f)
+
+    return pd.DataFrame([rows[fid] for fid in file_ids], columns=SUMMARY_COLUMNS)
+
+
 def print_report(result: CPMValidationResult, show_mismatches: int = 20):
     """Print validation report to console."""
 
@@ -245,13 +396,10 @@ def print_report(result: CPMValidationResult, show_mismatches: int = 20):
     print(f"\n{summary.to_string(index=False)}")
 
     # Overall accuracy
-    total_matches = sum(len(result.field_results[f]['matches'])
-                       for f in ['early_start', 'early_finish', 'late_start', 'late_finish'])
     total_comparisons = sum(len(result.field_results[f]['matches']) + len(result.field_results[f]['mismatches'])
-                           for f in ['early_start', 'early_finish', 'late_start', 'late_finish'])
-    overall_rate = (total_matches / total_comparisons * 100) if total_comparisons > 0 else 0
+                           for f in DATE_FIELDS)
 
-    print(f"\nOverall Date Match Rate: {overall_rate:.1f}%")
+    print(f"\nOverall Date Match Rate: {result.get_overall_rate():.1f}%")
     print(f"Total Comparisons: {total_comparisons}")
 
     # Mismatch analysis
@@ -382,6 +530,8 @@ Examples:
   python validate_cpm.py --file-id 64       # Validate specific schedule
   python validate_cpm.py --list-schedules   # List available schedules
   python validate_cpm.py --output report    # Save report to files
+  python validate_cpm.py --engine array     # Validate the array-backed engine
+  python validate_cpm.py --all --workers 8  # Validate every version (cached)
         """
     )
 
@@ -395,6 +545,14 @@ Examples:
                         help='Number of sample mismatches to show (default: 20)')
     parser.add_argument('--quiet', '-q', action='store_true',
                         help='Minimal output')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='cpm',
+                        help='CPM engine to validate (default: cpm)')
+    parser.add_argument('--all', action='store_true',
+                        help='Validate all schedule versions and write a combined summary CSV')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes for --all (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Revalidate every version with --all instead of reusing cached results')
 
     args = parser.parse_args()
 
@@ -405,11 +563,27 @@ Examples:
         print(versions.to_string())
         return 0
 
+    # Validate all versions
+    if args.all:
+        summary = validate_all(engine=args.engine, workers=args.workers,
+                               use_cache=not args.no_cache, verbose=not args.quiet)
+        output_path = (Path(args.output).with_suffix('.csv') if args.output
+                       else Path(__file__).parent / 'cpm_validation_all_schedules.csv')
+        summary.to_csv(output_path, index=False)
+        print(f"\nSummary of {len(summary)} versions saved to: {output_path}")
+
+        below = summary[summary['ef%'] < 95.0]
+        if below.empty:
+            print("\n[PASS] Early finish match rate >= 95% for all versions")
+            return 0
+        print(f"\n[WARN] Early finish match rate < 95% for {len(below)} of {len(summary)} versions")
+        return 1
+
     # Get file_id
     file_id = args.file_id or get_latest_file_id()
 
     # Run validation
-    result = validate_cpm(file_id, verbose=not args.quiet)
+    result = validate_cpm(file_id, verbose=not args.quiet, engine=args.engine)
 
     # Print report
     if not args.quiet:
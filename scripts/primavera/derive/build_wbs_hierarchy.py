@@ -18,6 +18,7 @@ Usage:
 import argparse
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 
@@ -122,47 +123,132 @@ def calculate_depth(wbs_id: str, tree: dict) -> int:
     return len(ancestors) - 1  # -1 because root is depth 0
 
 
-def build_tier_columns(wbs_df: pd.DataFrame, num_tiers: int = 6) -> pd.DataFrame:
+# Ancestor chains are capped at this many nodes (guards against cycles)
+MAX_ANCESTORS = 10
+
+
+def get_tier_labels(wbs_df: pd.DataFrame) -> np.ndarray:
+    """
+    Vectorized get_tier_label() for every row of a WBS DataFrame.
+
+    Returns:
+        Object array of labels aligned with wbs_df rows
+    """
+    name = wbs_df['wbs_name'].astype(str)
+    short = wbs_df['wbs_short_name'].astype(str)
+
+    use_short = (
+        (name == '') | (name == short)
+        | name.str.startswith('SAMSUNG') | name.str.startswith('Yates T FAB1')
+    )
+    truncated = name.where(name.str.len() <= 50, name.str[:47] + '...')
+
+    return np.where(use_short, short, truncated).astype(object)
+
+
+def resolve_ancestors(wbs_df: pd.DataFrame, max_ancestors: int = MAX_ANCESTORS) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Resolve ancestor chains for all WBS nodes of all files at once.
+
+    Nodes are integer-encoded by (file_id, wbs_id) - the last row wins for
+    duplicate ids, as in build_hierarchy_tree() - and each node's parent is
+    resolved to a node index within the same file. Ancestor chains are then
+    built by jumping parent pointers one level at a time for every node in
+    parallel, which matches get_ancestors() including its depth cap.
+
+    Returns:
+        Tuple of (chains, node_of_row):
+            chains: int array (n_nodes, max_ancestors) of row positions from
+                    the node upwards, padded with -1
+            node_of_row: node index for every row of wbs_df
+    """
+    keys = pd.MultiIndex.from_arrays([wbs_df['file_id'].to_numpy(), wbs_df['wbs_id'].to_numpy()])
+    is_node = ~keys.duplicated(keep='last')
+    nodes = keys[is_node]
+    node_rows = np.flatnonzero(is_node)
+
+    node_of_row = nodes.get_indexer(keys)
+    parent_keys = pd.MultiIndex.from_arrays([
+        wbs_df['file_id'].to_numpy()[is_node],
+        wbs_df['parent_wbs_id'].to_numpy()[is_node],
+    ])
+    parent = nodes.get_indexer(parent_keys)  # -1 when missing or outside the file
+
+    chains = np.full((len(nodes), max_ancestors), -1, dtype=np.int64)
+    current = np.arange(len(nodes))
+    for level in range(max_ancestors):
+        alive = current >= 0
+        chains[alive, level] = node_rows[current[alive]]
+        current = np.where(alive, parent[np.maximum(current, 0)], -1)
+
+    return chains, node_of_row
+
+
+def build_tier_columns(wbs_df: pd.DataFrame, num_tiers: int = 6, verbose: bool = True) -> pd.DataFrame:
     """
     Build tier columns for WBS nodes.
 
+    Works on any number of files in one pass (hierarchies are resolved
+    within each file_id).
+
     Args:
-        wbs_df: WBS DataFrame with wbs_id, parent_wbs_id, wbs_short_name, wbs_name
+        wbs_df: WBS DataFrame with file_id, wbs_id, parent_wbs_id, wbs_short_name, wbs_name
         num_tiers: Number of tier columns to create (default 6)
+        verbose: Print progress messages
 
     Returns:
-        DataFrame with wbs_id, depth, and tier_1 through tier_N columns
+        DataFrame with wbs_id, depth, and tier_1 through tier_N columns,
+        one row per input row, grouped by file_id in order of appearance
     """
-    tree = build_hierarchy_tree(wbs_df)
-    roots = find_roots(wbs_df, tree)
+    wbs_df = wbs_df.reset_index(drop=True)
+    chains, node_of_row = resolve_ancestors(wbs_df)
+    labels = get_tier_labels(wbs_df)
+
+    row_chains = chains[node_of_row]
+    lengths = (row_chains >= 0).sum(axis=1)
+    depth = lengths - 1
 
-    print(f"Building hierarchy for {len(wbs_df)} WBS nodes...")
-    print(f"Found {len(roots)} root node(s)")
+    if verbose:
+        print(f"Building hierarchy for {len(wbs_df)} WBS nodes...")
+        print(f"Found {int((depth[np.unique(node_of_row, return_index=True)[1]] == 0).sum())} root node(s)")
 
-    results = []
+    result = {'wbs_id': wbs_df['wbs_id'].to_numpy(), 'depth': depth}
+    rows = np.arange(len(wbs_df))
+    for i in range(num_tiers):
+        # Tiers run root -> leaf, chains run leaf -> root
+        has_tier = i < lengths
+        column = np.full(len(wbs_df), None, dtype=object)
+        column[has_tier] = labels[row_chains[rows[has_tier], lengths[has_tier] - 1 - i]]
+        result[f'tier_{i + 1}'] = column
 
-    for _, row in wbs_df.iterrows():
-        wbs_id = row['wbs_id']
-        ancestors = get_ancestors(wbs_id, tree)
-        depth = len(ancestors) - 1
+    tier_df = pd.DataFrame(result)
 
-        # Build result row with just wbs_id, depth, and tier columns
-        result = {
-            'wbs_id': wbs_id,
-            'depth': depth,
-        }
+    # Group rows by file in order of first appearance (same order as a per-file loop)
+    file_rank = pd.factorize(wbs_df['file_id'])[0]
+    order = np.argsort(file_rank, kind='stable')
+    return tier_df.iloc[order].reset_index(drop=True)
 
-        # Add tier label columns only (no IDs)
-        for i in range(num_tiers):
-            tier_num = i + 1
-            if i < len(ancestors):
-                result[f'tier_{tier_num}'] = get_tier_label(ancestors[i])
-            else:
-                result[f'tier_{tier_num}'] = None
 
-        results.append(result)
+def add_tier_columns(wbs_df: pd.DataFrame, num_tiers: int = 6, verbose: bool = False) -> pd.DataFrame:
+    """
+    Add depth and tier_1..tier_N columns to a (multi-file) WBS DataFrame.
+
+    Existing tier/depth columns are replaced. Original columns keep their
+    order, followed by depth and the tier columns.
+    """
+    tier_cols = [f'tier_{i}' for i in range(1, num_tiers + 1)]
+    cols_to_drop = [c for c in tier_cols + ['depth'] if c in wbs_df.columns]
+    if cols_to_drop:
+        wbs_df = wbs_df.drop(columns=cols_to_drop)
+
+    if len(wbs_df) == 0:
+        return wbs_df
 
-    return pd.DataFrame(results)
+    tier_data = build_tier_columns(wbs_df, num_tiers=num_tiers, verbose=verbose)
+    result_df = wbs_df.merge(tier_data, on='wbs_id', how='left')
+
+    original_cols = [c for c in wbs_df.columns if c not in tier_cols and c != 'depth']
+    return result_df[original_cols + ['depth'] + tier_cols]
 
 
 def print_hierarchy_summary(df: pd.DataFrame, num_tiers: int = 6):
@@ -243,38 +329,11 @@ def main():
 
     print(f"Loaded {len(wbs)} WBS nodes from {len(wbs['file_id'].unique())} files")
 
-    # Check if tier columns already exist
+    # Build tier columns for all files in one pass (hierarchy is file-specific)
     tier_cols = [f'tier_{i}' for i in range(1, args.num_tiers + 1)]
-    existing_tier_cols = [c for c in tier_cols if c in wbs.columns]
-    if existing_tier_cols:
-        print(f"Removing existing tier columns: {existing_tier_cols}")
-        wbs = wbs.drop(columns=existing_tier_cols + ['depth'] if 'depth' in wbs.columns else existing_tier_cols)
-
-    # Process each file_id separately (hierarchy is file-specific)
-    all_tier_dfs = []
     file_ids = wbs['file_id'].unique()
-
-    for file_id in file_ids:
-        file_wbs = wbs[wbs['file_id'] == file_id].copy()
-
-        if len(file_wbs) == 0:
-            continue
-
-        # Build tier columns for this file
-        tier_df = build_tier_columns(file_wbs, num_tiers=args.num_tiers)
-        all_tier_dfs.append(tier_df)
-
-    # Combine all tier data
-    tier_data = pd.concat(all_tier_dfs, ignore_index=True)
-    print(f"\nBuilt tier columns for {len(tier_data)} WBS nodes")
-
-    # Merge tier columns back to original WBS data
-    result_df = wbs.merge(tier_data, on='wbs_id', how='left')
-
-    # Reorder columns: original columns first, then depth, then tier columns at the end
-    original_cols = [c for c in wbs.columns if c not in tier_cols and c != 'depth']
-    new_cols = ['depth'] + tier_cols
-    result_df = result_df[original_cols + new_cols]
+    result_df = add_tier_columns(wbs, num_tiers=args.num_tiers, verbose=True)
+    print(f"\nBuilt tier columns for {len(result_df)} WBS nodes")
 
     # Print summary for a sample file
     sample_file_id = xer_files[xer_files['is_current'] == True]['file_id'].values
@@ -14,10 +14,25 @@ Source Tracking:
 - Each field has a corresponding _source column showing how it was derived
 - Values: 'activity_code', 'wbs', 'inferred', or None
 
+Tasks repeat across schedule versions; inference runs once per distinct task
+context and results are kept in processed/primavera/_cache/task_taxonomy/,
+so a rebuild only infers task contexts not seen by an earlier run. New task
+contexts can be inferred on a process pool (--workers). The output tables
+are generated and written --chunk-size rows at a time, and the printed
+summary is counted chunk by chunk. The task context and the inference
+result of every distinct context stay in memory for the whole run.
+
+With --incremental, only schedule versions (file_ids) not yet in the output
+are processed and their rows appended. The output is rebuilt in full when it
+was generated with other inference rules (INFERENCE_VERSION), was written by
+another step since, or covers a file_id that no longer refers to the same
+XER file. The covered versions are recorded in p6_task_taxonomy_state.json.
+
 Output: processed/primavera/p6_task_taxonomy.csv
 
 Usage:
-    python scripts/primavera/derive/generate_task_taxonomy.py [--latest-only]
+    python scripts/primavera/derive/generate_task_taxonomy.py [--latest-only] [--no-memo]
+        [--workers N] [--chunk-size N] [--incremental]
 """
 
 import argparse
@@ -35,8 +50,24 @@ derive_dir = Path(__file__).parent
 sys.path.insert(0, str(derive_dir))
 
 from src.config.settings import Settings
-from task_taxonomy import build_task_context, infer_all_fields
-from scripts.shared.pipeline_utils import get_output_path, write_fact_and_quality
+from task_taxonomy import build_task_context, INFERENCE_VERSION, InferenceMemo, infer_taxonomy, iter_taxonomy
+from scripts.shared.pipeline_utils import (
+    get_output_path,
+    read_output_state,
+    write_fact_and_quality,
+    write_output_state,
+)
+
+
+# Persisted inference results (see task_taxonomy.memo)
+INFERENCE_MEMO_PATH = Settings.PRIMAVERA_PROCESSED_DIR / '_cache' / 'task_taxonomy' / 'inference_memo.pkl'
+
+# Taxonomy rows generated and written at a time by write_taxonomy()
+TAXONOMY_CHUNK_SIZE = 100_000
+
+# Columns counted by summary_counts() for print_summary()
+CSI_SUMMARY_COLUMNS = ['dim_csi_section_id', 'csi_section', 'csi_title']
+COVERAGE_SUMMARY_COLUMNS = ['area', 'room', 'sub_contractor']
 
 
 # =============================================================================
@@ -117,24 +148,13 @@ def load_yates_data(latest_only: bool = False) -> tuple:
     return tasks, wbs, yates_files, taskactv, actvcode, actvtype
 
 
-def generate_taxonomy(context: pd.DataFrame, verbose: bool = True) -> pd.DataFrame:
+def source_statistics(taxonomy: pd.DataFrame) -> dict:
     """
-    Generate taxonomy by inferring all fields for each task.
-
-    Args:
-        context: Combined task context from build_task_context()
-        verbose: Print progress messages
+    Count how each field was derived.
 
     Returns:
-        DataFrame with taxonomy columns and source tracking
+        Dict: field -> {source: task count}
     """
-    if verbose:
-        print(f"Generating taxonomy for {len(context):,} tasks...")
-
-    results = []
-    total = len(context)
-
-    # Track statistics for each field's source
     # Note: trade stats removed - dim_trade superseded by dim_csi_section
     stats = {
         'building': {'activity_code': 0, 'task_code': 0, 'wbs': 0, 'inferred': 0, 'none': 0},
@@ -148,34 +168,295 @@ def generate_taxonomy(context: pd.DataFrame, verbose: bool = True) -> pd.DataFra
         'impact': {'inferred': 0, 'none': 0},
         'csi_section': {'keyword': 0, 'none': 0},
     }
+    stat_columns = {
+        'building': 'building_source',
+        'level': 'level_source',
+        'area': 'area_source',
+        'room': 'room_source',
+        'sub_contractor': 'sub_source',
+        'sub_trade': 'sub_trade_source',
+        'phase': 'phase_source',
+        'location_type': 'location_type',
+        'impact': 'impact_source',
+        'csi_section': 'csi_inference_source',
+    }
+    if len(taxonomy) > 0:
+        for field, column in stat_columns.items():
+            for source, count in taxonomy[column].fillna('none').value_counts(sort=False).items():
+                stats[field][source] = stats[field].get(source, 0) + count
+    return stats
+
+
+def summary_counts(taxonomy: pd.DataFrame) -> dict:
+    """
+    Count the distributions print_summary() reports.
+
+    Counts of consecutive chunks are combined with add_summary_counts().
+
+    Returns:
+        Dict with the task count ('tasks'), building/level value counts,
+        non-null counts of COVERAGE_SUMMARY_COLUMNS and (when present)
+        dim_location_id, and the CSI section sizes ('csi_sections') and
+        unmapped count ('csi_unmapped') when the CSI columns are present
+    """
+    counts = {
+        'tasks': len(taxonomy),
+        'building': taxonomy['building'].value_counts(dropna=False),
+        'level': taxonomy['level'].value_counts(dropna=False),
+    }
+    for column in COVERAGE_SUMMARY_COLUMNS:
+        counts[column] = int(taxonomy[column].notna().sum())
+    if 'dim_location_id' in taxonomy.columns:
+        counts['dim_location_id'] = int(taxonomy['dim_location_id'].notna().sum())
+    if 'dim_csi_section_id' in taxonomy.columns:
+        counts['csi_sections'] = taxonomy.groupby(CSI_SUMMARY_COLUMNS).size()
+        counts['csi_unmapped'] = int(taxonomy['dim_csi_section_id'].isna().sum())
+    return counts
+
+
+def add_summary_counts(total: dict | None, counts: dict) -> dict:
+    """Combine the summary_counts() of two chunks (total is updated in place; None starts a total)."""
+    if total is None:
+        return counts
+    for key, value in counts.items():
+        if isinstance(value, pd.Series):
+            total[key] = total[key].add(value, fill_value=0).astype(int)
+        else:
+            total[key] += value
+    return total
+
+
+def generate_taxonomy(context: pd.DataFrame, verbose: bool = True,
+                      memo: InferenceMemo | None = None, workers: int = 1) -> pd.DataFrame:
+    """
+    Generate taxonomy by inferring all fields for each task.
+
+    Tasks repeat across schedule versions, so inference runs once per distinct
+    set of inference inputs and is broadcast to every task sharing it (see
+    task_taxonomy.memo).
 
-    for idx, (_, row) in enumerate(context.iterrows()):
-        if verbose and idx % 10000 == 0 and idx > 0:
-            print(f"  Processed {idx:,}/{total:,} ({idx/total*100:.1f}%)")
-
-        result = infer_all_fields(row)
-        results.append(result)
-
-        # Update stats for each field
-        stats['building'][result['building_source'] or 'none'] += 1
-        stats['level'][result['level_source'] or 'none'] += 1
-        stats['area'][result['area_source'] or 'none'] += 1
-        stats['room'][result['room_source'] or 'none'] += 1
-        stats['sub_contractor'][result['sub_source'] or 'none'] += 1
-        stats['sub_trade'][result['sub_trade_source'] or 'none'] += 1
-        stats['phase'][result['phase_source'] or 'none'] += 1
-        stats['location_type'][result['location_type'] or 'none'] += 1
-        stats['impact'][result['impact_source'] or 'none'] += 1
-        stats['csi_section'][result['csi_inference_source'] or 'none'] += 1
+    Args:
+        context: Combined task context from build_task_context()
+        verbose: Print progress messages
+        memo: Inference results persisted by earlier runs (default: in-memory only)
+        workers: Inference worker processes (1 = in-process)
 
+    Returns:
+        DataFrame with taxonomy columns and source tracking
+    """
     if verbose:
-        print(f"  Processed {total:,}/{total:,} (100%)")
+        print(f"Generating taxonomy for {len(context):,} tasks...")
+
+    taxonomy = infer_taxonomy(context, memo=memo, verbose=verbose, workers=workers)
 
     # Print statistics
     if verbose:
-        print_statistics(stats, total)
+        print_statistics(source_statistics(taxonomy), len(taxonomy))
+
+    return taxonomy
+
+
+def write_taxonomy(
+    context: pd.DataFrame,
+    fact_path: Path,
+    quality_path: Path,
+    memo: InferenceMemo | None = None,
+    workers: int = 1,
+    chunk_size: int = TAXONOMY_CHUNK_SIZE,
+    add_location_id: bool = True,
+    append: bool = False,
+    verbose: bool = True,
+) -> tuple[pd.DataFrame, dict]:
+    """
+    Generate the taxonomy and write its fact and data quality tables chunk by chunk.
+
+    The files are the same as writing generate_taxonomy()'s table in one go,
+    but the full taxonomy table is never built: each chunk is written and
+    counted (source statistics and summary_counts) before the next one is
+    generated. The context and the inference result of every distinct input
+    still cover all tasks.
+
+    With append=True the rows are added to existing tables under their
+    current headers; columns added by later steps (the CSI columns of
+    add_csi_to_p6_tasks) are left empty for them.
+
+    Args:
+        context: Combined task context from build_task_context()
+        fact_path: Fact table CSV
+        quality_path: Data quality table CSV
+        memo: Inference results persisted by earlier runs (default: in-memory only)
+        workers: Inference worker processes (1 = in-process)
+        chunk_size: Taxonomy rows per written chunk
+        add_location_id: Add the dim_location_id column (see add_dim_location_id)
+        append: Append to the existing fact and data quality tables
+        verbose: Print progress messages
+
+    Returns:
+        Tuple of (summary_counts of all written rows for print_summary, source statistics)
+    """
+    if verbose:
+        print(f"Generating taxonomy for {len(context):,} tasks...")
+
+    if append:
+        fact_columns = pd.read_csv(fact_path, nrows=0).columns
+        quality_columns = pd.read_csv(quality_path, nrows=0).columns
 
-    return pd.DataFrame(results)
+    stats = summary = None
+    for i, taxonomy in enumerate(iter_taxonomy(context, memo=memo, verbose=verbose,
+                                               workers=workers, chunk_size=chunk_size)):
+        if add_location_id:
+            # dim_location is reloaded once per run, not once per chunk
+            taxonomy = add_dim_location_id(taxonomy, verbose=False, reset=i == 0)
+
+        if append:
+            taxonomy.reindex(columns=fact_columns).to_csv(fact_path, index=False, mode='a', header=False)
+            taxonomy.reindex(columns=quality_columns).to_csv(quality_path, index=False, mode='a', header=False)
+        else:
+            write_fact_and_quality(
+                df=taxonomy,
+                primary_key='task_id',
+                quality_columns=P6_TAXONOMY_DATA_QUALITY_COLUMNS,
+                fact_path=fact_path,
+                quality_path=quality_path,
+                append=i > 0,
+            )
+
+        chunk_stats = source_statistics(taxonomy)
+        if stats is None:
+            stats = chunk_stats
+        else:
+            for field, sources in chunk_stats.items():
+                for source, count in sources.items():
+                    stats[field][source] = stats[field].get(source, 0) + count
+        summary = add_summary_counts(summary, summary_counts(taxonomy))
+        if verbose:
+            print(f"  Wrote {summary['tasks']:,}/{len(context):,} tasks")
+
+    if verbose:
+        print_statistics(stats, summary['tasks'])
+    return summary, stats
+
+
+def taxonomy_files(files: pd.DataFrame) -> dict[str, str]:
+    """file_id -> XER filename of the schedule versions in files (as recorded in the output state)."""
+    return {str(int(file_id)): filename for file_id, filename in zip(files['file_id'], files['filename'])}
+
+
+def new_file_ids(files: pd.DataFrame, fact_path: Path, quality_path: Path,
+                 add_location_id: bool = True) -> list[int] | None:
+    """
+    Schedule versions in files that an existing taxonomy output does not cover yet.
+
+    Args:
+        files: Schedule versions to cover (xer_files rows)
+        fact_path: Fact table CSV
+        quality_path: Data quality table CSV
+        add_location_id: Whether the output should have dim_location_id
+
+    Returns:
+        Sorted file_ids to append, or None if the output must be rebuilt: it is
+        missing or was written since its state was recorded, it was generated
+        with other inference rules or dim_location_id setting, or it covers a
+        file_id that is not in files or now refers to another XER file
+    """
+    state = read_output_state(fact_path).get('taxonomy')
+    if (
+        state is None
+        or not quality_path.exists()
+        or state['inference_version'] != INFERENCE_VERSION
+        or state['location_id'] != add_location_id
+    ):
+        return None
+
+    wanted = taxonomy_files(files)
+    if any(wanted.get(file_id) != filename for file_id, filename in state['files'].items()):
+        return None
+    return sorted(int(file_id) for file_id in wanted if file_id not in state['files'])
+
+
+def update_taxonomy(
+    tasks: pd.DataFrame,
+    wbs: pd.DataFrame,
+    files: pd.DataFrame,
+    taskactv: pd.DataFrame,
+    actvcode: pd.DataFrame,
+    actvtype: pd.DataFrame,
+    fact_path: Path,
+    quality_path: Path,
+    memo: InferenceMemo | None = None,
+    workers: int = 1,
+    chunk_size: int = TAXONOMY_CHUNK_SIZE,
+    add_location_id: bool = True,
+    incremental: bool = False,
+    verbose: bool = True,
+) -> tuple[pd.DataFrame, dict] | None:
+    """
+    Write the taxonomy of the given schedule versions and record its state.
+
+    In incremental mode only the versions not yet in the output (see
+    new_file_ids) are processed and appended; otherwise, or when the output
+    cannot be extended, it is rebuilt from all versions.
+
+    Args:
+        tasks, wbs, files, taskactv, actvcode, actvtype: Tables from load_yates_data()
+        fact_path: Fact table CSV
+        quality_path: Data quality table CSV
+        memo, workers, chunk_size, add_location_id: See write_taxonomy()
+        incremental: Only process schedule versions missing from the output
+        verbose: Print progress messages
+
+    Returns:
+        write_taxonomy() result for the written rows, or None if the output
+        already covers every version
+    """
+    state = {}
+    append = False
+    if incremental:
+        new_ids = new_file_ids(files, fact_path, quality_path, add_location_id=add_location_id)
+        if new_ids is None:
+            if verbose:
+                print("Incremental: existing taxonomy cannot be extended, rebuilding all versions")
+        elif not new_ids:
+            if verbose:
+                print(f"Incremental: taxonomy already covers all {len(files)} schedule versions")
+            return None
+        else:
+            if verbose:
+                print(f"Incremental: appending {len(new_ids)} new schedule version(s): {new_ids}")
+            state = read_output_state(fact_path)
+            tasks, wbs, taskactv, actvcode, actvtype = (
+                df[df['file_id'].isin(new_ids)] for df in (tasks, wbs, taskactv, actvcode, actvtype)
+            )
+            append = True
+
+    context = build_task_context(
+        tasks_df=tasks,
+        wbs_df=wbs,
+        taskactv_df=taskactv,
+        actvcode_df=actvcode,
+        actvtype_df=actvtype,
+        verbose=verbose,
+    )
+    result = write_taxonomy(
+        context,
+        fact_path=fact_path,
+        quality_path=quality_path,
+        memo=memo,
+        workers=workers,
+        chunk_size=chunk_size,
+        add_location_id=add_location_id,
+        append=append,
+        verbose=verbose,
+    )
+
+    # A rebuild drops columns and state of later steps (CSI); an append keeps them
+    state['taxonomy'] = {
+        'inference_version': INFERENCE_VERSION,
+        'location_id': add_location_id,
+        'files': taxonomy_files(files),
+    }
+    write_output_state(fact_path, state)
+    return result
 
 
 def print_statistics(stats: dict, total: int) -> None:
@@ -192,39 +473,40 @@ def print_statistics(stats: dict, total: int) -> None:
                 print(f"  {source:15s}: {count:,} ({pct:.1f}%)")
 
 
-def print_summary(df: pd.DataFrame) -> None:
-    """Print classification summary."""
+def print_summary(counts: dict) -> None:
+    """Print classification summary from summary_counts()."""
+    total = counts['tasks']
     print("\n" + "=" * 60)
     print("CLASSIFICATION SUMMARY")
     print("=" * 60)
 
     # CSI Section distribution (replaces trade distribution)
     print("\n--- CSI Section Distribution (Top 15) ---")
-    if 'dim_csi_section_id' in df.columns:
-        csi_dist = df.groupby(['dim_csi_section_id', 'csi_section', 'csi_title']).size().sort_values(ascending=False).head(15)
+    if 'csi_sections' in counts:
+        csi_dist = counts['csi_sections'].sort_values(ascending=False).head(15)
         for (csi_id, section, title), count in csi_dist.items():
             if pd.notna(csi_id):
-                pct = count / len(df) * 100
+                pct = count / total * 100
                 print(f"  {section} {title}: {count:,} ({pct:.1f}%)")
-        unmapped = df['dim_csi_section_id'].isna().sum()
+        unmapped = counts['csi_unmapped']
         if unmapped > 0:
-            print(f"  -- UNMAPPED: {unmapped:,} ({unmapped/len(df)*100:.1f}%)")
+            print(f"  -- UNMAPPED: {unmapped:,} ({unmapped/total*100:.1f}%)")
     else:
         print("  (CSI section columns not yet added - run add_csi_to_p6_tasks.py)")
 
     # Building distribution
     print("\n--- Building Distribution ---")
-    bldg_dist = df['building'].value_counts(dropna=False)
+    bldg_dist = counts['building'].sort_values(ascending=False)
     for bldg, count in bldg_dist.items():
-        pct = count / len(df) * 100
+        pct = count / total * 100
         bldg_display = bldg if pd.notna(bldg) else '(none)'
         print(f"  {bldg_display}: {count:,} ({pct:.1f}%)")
 
     # Level distribution
     print("\n--- Level Distribution ---")
-    level_dist = df['level'].value_counts(dropna=False).sort_index()
+    level_dist = counts['level'].sort_index()
     for lvl, count in level_dist.items():
-        pct = count / len(df) * 100
+        pct = count / total * 100
         if pd.isna(lvl):
             lvl_display = '(none)'
         elif lvl in ('GEN', 'MULTI', 'UNK'):
@@ -235,18 +517,18 @@ def print_summary(df: pd.DataFrame) -> None:
 
     # Area/Room coverage
     print("\n--- Area/Room Coverage ---")
-    has_area = df['area'].notna().sum()
-    has_room = df['room'].notna().sum()
-    print(f"  Tasks with area: {has_area:,} ({has_area/len(df)*100:.1f}%)")
-    print(f"  Tasks with room: {has_room:,} ({has_room/len(df)*100:.1f}%)")
+    has_area = counts['area']
+    has_room = counts['room']
+    print(f"  Tasks with area: {has_area:,} ({has_area/total*100:.1f}%)")
+    print(f"  Tasks with room: {has_room:,} ({has_room/total*100:.1f}%)")
 
     # Subcontractor coverage
-    has_sub = df['sub_contractor'].notna().sum()
+    has_sub = counts['sub_contractor']
     print(f"\n--- Subcontractor Coverage ---")
-    print(f"  Tasks with Z-SUB: {has_sub:,} ({has_sub/len(df)*100:.1f}%)")
+    print(f"  Tasks with Z-SUB: {has_sub:,} ({has_sub/total*100:.1f}%)")
 
 
-def add_dim_location_id(taxonomy: pd.DataFrame) -> pd.DataFrame:
+def add_dim_location_id(taxonomy: pd.DataFrame, verbose: bool = True, reset: bool = True) -> pd.DataFrame:
     """
     Add dim_location_id column by looking up location in dim_location.
 
@@ -259,6 +541,8 @@ def add_dim_location_id(taxonomy: pd.DataFrame) -> pd.DataFrame:
 
     Args:
         taxonomy: DataFrame with 'location_code', 'building', and 'level' columns
+        verbose: Print coverage
+        reset: Reload dim_location first (False reuses the lookup cache)
 
     Returns:
         DataFrame with 'dim_location_id' column added (Int64, nullable)
@@ -267,9 +551,11 @@ def add_dim_location_id(taxonomy: pd.DataFrame) -> pd.DataFrame:
     from scripts.shared.dimension_lookup import get_location_id, get_location_id_by_code, reset_cache
 
     # Reset cache to ensure we pick up latest dim_location
-    reset_cache()
+    if reset:
+        reset_cache()
 
-    print("\nAdding dim_location_id column...")
+    if verbose:
+        print("\nAdding dim_location_id column...")
 
     matched_by_code = 0
     matched_by_building_level = 0
@@ -297,11 +583,12 @@ def add_dim_location_id(taxonomy: pd.DataFrame) -> pd.DataFrame:
     taxonomy['dim_location_id'] = taxonomy['dim_location_id'].astype('Int64')
 
     # Report coverage
-    matched = taxonomy['dim_location_id'].notna().sum()
-    total = len(taxonomy)
-    print(f"  dim_location_id coverage: {matched:,}/{total:,} ({100*matched/total:.1f}%)")
-    print(f"    - matched by location_code: {matched_by_code:,}")
-    print(f"    - matched by building+level: {matched_by_building_level:,}")
+    if verbose:
+        matched = taxonomy['dim_location_id'].notna().sum()
+        total = len(taxonomy)
+        print(f"  dim_location_id coverage: {matched:,}/{total:,} ({100*matched/total:.1f}%)")
+        print(f"    - matched by location_code: {matched_by_code:,}")
+        print(f"    - matched by building+level: {matched_by_building_level:,}")
 
     return taxonomy
 
@@ -326,12 +613,34 @@ def main():
         action='store_true',
         help='Skip adding dim_location_id column'
     )
+    parser.add_argument(
+        '--no-memo',
+        action='store_true',
+        help='Infer every task context again instead of reusing earlier results'
+    )
     parser.add_argument(
         '--staging-dir',
         type=Path,
         default=None,
         help='Write outputs to staging directory instead of final location'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Inference worker processes (default: 1 = in-process)'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=TAXONOMY_CHUNK_SIZE,
+        help=f'Taxonomy rows generated and written at a time (default: {TAXONOMY_CHUNK_SIZE:,})'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only process schedule versions not yet in the output and append their rows'
+    )
     args = parser.parse_args()
 
     # Load data
@@ -339,25 +648,6 @@ def main():
         latest_only=args.latest_only
     )
 
-    # Build combined context
-    context = build_task_context(
-        tasks_df=tasks,
-        wbs_df=wbs,
-        taskactv_df=taskactv,
-        actvcode_df=actvcode,
-        actvtype_df=actvtype,
-    )
-
-    # Generate taxonomy
-    taxonomy = generate_taxonomy(context)
-
-    # Add dim_location_id for Power BI integration
-    if not args.skip_location_id:
-        taxonomy = add_dim_location_id(taxonomy)
-
-    # Print summary
-    print_summary(taxonomy)
-
     # Determine output paths
     if args.output:
         fact_path = Path(args.output)
@@ -366,22 +656,37 @@ def main():
         fact_path = get_output_path('primavera/p6_task_taxonomy.csv', args.staging_dir)
         quality_path = get_output_path('primavera/p6_task_taxonomy_data_quality.csv', args.staging_dir)
 
-    # Write fact and data quality tables
+    # Generate taxonomy and write fact and data quality tables chunk by chunk
+    # (dim_location_id added per chunk for Power BI integration)
     print(f"\nWriting fact table to: {fact_path}")
     print(f"Writing data quality table to: {quality_path}")
-    fact_rows, quality_cols = write_fact_and_quality(
-        df=taxonomy,
-        primary_key='task_id',
-        quality_columns=P6_TAXONOMY_DATA_QUALITY_COLUMNS,
+    memo = InferenceMemo(None if args.no_memo else INFERENCE_MEMO_PATH)
+    result = update_taxonomy(
+        tasks, wbs, files, taskactv, actvcode, actvtype,
         fact_path=fact_path,
         quality_path=quality_path,
+        memo=memo,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        add_location_id=not args.skip_location_id,
+        incremental=args.incremental,
     )
+    if result is None:
+        return
+    summary, _ = result
+
+    # Print summary
+    if 'dim_location_id' in summary:
+        matched = summary['dim_location_id']
+        print(f"\n  dim_location_id coverage: {matched:,}/{summary['tasks']:,} ({100*matched/summary['tasks']:.1f}%)")
+    print_summary(summary)
 
+    quality_cols = len(pd.read_csv(quality_path, nrows=0).columns) - 1
     print(f"\n{'='*60}")
     print(f"Saved taxonomy:")
     print(f"  Fact table: {fact_path}")
     print(f"  Data quality: {quality_path}")
-    print(f"Total records: {len(taxonomy):,}")
+    print(f"Records written: {summary['tasks']:,}")
     print(f"Moved {quality_cols} columns to data quality table")
 
 
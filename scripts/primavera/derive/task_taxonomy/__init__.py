@@ -8,12 +8,20 @@ Note: dim_trade has been superseded by dim_csi_section. Trade-related exports
 
 Usage:
     from task_taxonomy import build_task_context, infer_all_fields, generate_taxonomy
+    from task_taxonomy import InferenceMemo, infer_taxonomy, iter_taxonomy
 
     # Build combined context
     context = build_task_context(tasks_df, wbs_df, taskactv_df, actvcode_df, actvtype_df)
 
     # Generate taxonomy
     taxonomy = generate_taxonomy(context)
+
+    # Or infer directly, reusing results persisted by earlier runs
+    taxonomy = infer_taxonomy(context, memo=InferenceMemo(memo_path))
+
+    # Large contexts: infer on 4 processes, consume the table in row chunks
+    for chunk in iter_taxonomy(context, memo=InferenceMemo(memo_path), workers=4, chunk_size=100_000):
+        ...
 """
 
 from .context import build_task_context, build_activity_code_lookup
@@ -30,6 +38,13 @@ from .inference import (
     infer_csi_section,
     infer_all_fields,
 )
+from .memo import (
+    INFERENCE_VERSION,
+    InferenceMemo,
+    inference_keys,
+    infer_taxonomy,
+    iter_taxonomy,
+)
 from .mappings import (
     Z_BLDG_TO_CODE,
 )
@@ -80,6 +95,12 @@ __all__ = [
     'infer_impact',
     'infer_csi_section',
     'infer_all_fields',
+    # Deduplicated, memoized inference
+    'INFERENCE_VERSION',
+    'InferenceMemo',
+    'inference_keys',
+    'infer_taxonomy',
+    'iter_taxonomy',
     # Mappings
     'Z_BLDG_TO_CODE',
     # Extractors
@@ -6,6 +6,10 @@ Builds a combined DataFrame with all columns needed for field inference:
 - WBS hierarchy (tier_2 through tier_6, wbs_name)
 - Activity codes (z_trade, z_bldg, z_level, z_sub_contractor)
 - TaskClassifier inference (scope, phase, building, level, impact fields)
+
+Assembly is column-wise (maps over deduplicated lookups, classify_tasks), so
+it scales with the number of tasks and activity code assignments rather
+than with per-row Python work.
 """
 
 import sys
@@ -20,6 +24,54 @@ sys.path.insert(0, str(project_root))
 from scripts.primavera.task_classifier import TaskClassifier
 
 
+# Activity code types used for inference -> context column
+ACTIVITY_CODE_COLUMNS = {
+    'Z-TRADE': 'z_trade',
+    'Z-BLDG': 'z_bldg',
+    'Z-LEVEL': 'z_level',
+    'Z-SUB CONTRACTOR': 'z_sub_contractor',
+    'Z-AREA': 'z_area',
+}
+
+
+def activity_code_assignments(
+    taskactv_df: pd.DataFrame,
+    actvcode_df: pd.DataFrame,
+    actvtype_df: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    Activity code values of the ACTIVITY_CODE_COLUMNS types assigned to tasks.
+
+    Assignments with an empty code value are skipped; when a task has several
+    codes of one type, the last assignment wins.
+
+    Returns:
+        DataFrame with columns task_id, code_type, code_value (one row per
+        task and code type, in taskactv order of the winning assignment)
+    """
+    # actv_code_type_id -> actv_code_type
+    type_ids = actvtype_df.drop_duplicates('actv_code_type_id', keep='last')
+    type_lookup = pd.Series(type_ids['actv_code_type'].to_numpy(), index=type_ids['actv_code_type_id'])
+
+    # actv_code_id -> actv_code_name, and -> actv_code_type (codes of known types only)
+    codes = actvcode_df[actvcode_df['actv_code_id'].notna()]
+    named = codes.drop_duplicates('actv_code_id', keep='last')
+    code_lookup = pd.Series(named['actv_code_name'].to_numpy(), index=named['actv_code_id'])
+    typed = codes[codes['actv_code_type_id'].isin(type_lookup.index)].drop_duplicates('actv_code_id', keep='last')
+    code_to_type = pd.Series(typed['actv_code_type_id'].map(type_lookup).to_numpy(), index=typed['actv_code_id'])
+
+    assignments = taskactv_df.loc[taskactv_df['actv_code_id'].notna(), ['task_id', 'actv_code_id']]
+    code_ids = assignments['actv_code_id']
+    assignments = pd.DataFrame({
+        'task_id': assignments['task_id'].to_numpy(),
+        'code_type': code_ids.map(code_to_type).to_numpy(),
+        'code_value': code_ids.map(code_lookup).to_numpy(),
+    })
+    has_value = code_ids.isin(code_lookup.index).to_numpy() & assignments['code_value'].map(bool).to_numpy()
+    assignments = assignments[assignments['code_type'].isin(ACTIVITY_CODE_COLUMNS) & has_value]
+    return assignments.drop_duplicates(['task_id', 'code_type'], keep='last').reset_index(drop=True)
+
+
 def build_activity_code_lookup(
     taskactv_df: pd.DataFrame,
     actvcode_df: pd.DataFrame,
@@ -37,37 +89,10 @@ def build_activity_code_lookup(
             'Z-AREA': value,
         }
     """
-    # Build actvtype lookup: actv_code_type_id -> actv_code_type
-    type_lookup = dict(zip(actvtype_df['actv_code_type_id'], actvtype_df['actv_code_type']))
-
-    # Build actvcode lookup: actv_code_id -> actv_code_name
-    code_lookup = dict(zip(actvcode_df['actv_code_id'], actvcode_df['actv_code_name']))
-
-    # Build actvcode to type lookup: actv_code_id -> actv_code_type
-    code_to_type = {}
-    for _, row in actvcode_df.iterrows():
-        actv_code_id = row['actv_code_id']
-        type_id = row['actv_code_type_id']
-        if type_id in type_lookup:
-            code_to_type[actv_code_id] = type_lookup[type_id]
-
-    # Build task -> activity codes lookup
     task_actv_lookup = {}
-    code_types_of_interest = {'Z-TRADE', 'Z-BLDG', 'Z-LEVEL', 'Z-SUB CONTRACTOR', 'Z-AREA'}
-
-    for _, row in taskactv_df.iterrows():
-        task_id = row['task_id']
-        actv_code_id = row['actv_code_id']
-
-        # Get the code type and value
-        code_type = code_to_type.get(actv_code_id)
-        code_value = code_lookup.get(actv_code_id)
-
-        if code_type in code_types_of_interest and code_value:
-            if task_id not in task_actv_lookup:
-                task_actv_lookup[task_id] = {}
-            task_actv_lookup[task_id][code_type] = code_value
-
+    assignments = activity_code_assignments(taskactv_df, actvcode_df, actvtype_df)
+    for task_id, code_type, code_value in assignments.itertuples(index=False):
+        task_actv_lookup.setdefault(task_id, {})[code_type] = code_value
     return task_actv_lookup
 
 
@@ -111,22 +136,15 @@ def build_task_context(
     if verbose:
         print("Building task context...")
 
-    # Build activity code lookup
+    # Build activity code assignments
     if verbose:
         print("  Building activity code lookups...")
-    task_actv_lookup = build_activity_code_lookup(taskactv_df, actvcode_df, actvtype_df)
+    assignments = activity_code_assignments(taskactv_df, actvcode_df, actvtype_df)
 
     if verbose:
-        has_trade = sum(1 for v in task_actv_lookup.values() if 'Z-TRADE' in v)
-        has_bldg = sum(1 for v in task_actv_lookup.values() if 'Z-BLDG' in v)
-        has_level = sum(1 for v in task_actv_lookup.values() if 'Z-LEVEL' in v)
-        has_sub = sum(1 for v in task_actv_lookup.values() if 'Z-SUB CONTRACTOR' in v)
-        has_area = sum(1 for v in task_actv_lookup.values() if 'Z-AREA' in v)
-        print(f"    Z-TRADE: {has_trade:,} tasks")
-        print(f"    Z-BLDG: {has_bldg:,} tasks")
-        print(f"    Z-LEVEL: {has_level:,} tasks")
-        print(f"    Z-SUB CONTRACTOR: {has_sub:,} tasks")
-        print(f"    Z-AREA: {has_area:,} tasks")
+        counts = assignments['code_type'].value_counts()
+        for code_type in ACTIVITY_CODE_COLUMNS:
+            print(f"    {code_type}: {counts.get(code_type, 0):,} tasks")
 
     # Prepare WBS columns
     wbs_cols = ['wbs_id', 'wbs_name', 'tier_2', 'tier_3', 'tier_4', 'tier_5', 'tier_6']
@@ -148,21 +166,13 @@ def build_task_context(
     # Add activity codes as columns
     if verbose:
         print("  Adding activity codes...")
-    context['z_trade'] = context['task_id'].map(
-        lambda x: task_actv_lookup.get(x, {}).get('Z-TRADE')
-    )
-    context['z_bldg'] = context['task_id'].map(
-        lambda x: task_actv_lookup.get(x, {}).get('Z-BLDG')
-    )
-    context['z_level'] = context['task_id'].map(
-        lambda x: task_actv_lookup.get(x, {}).get('Z-LEVEL')
-    )
-    context['z_sub_contractor'] = context['task_id'].map(
-        lambda x: task_actv_lookup.get(x, {}).get('Z-SUB CONTRACTOR')
-    )
-    context['z_area'] = context['task_id'].map(
-        lambda x: task_actv_lookup.get(x, {}).get('Z-AREA')
-    )
+    for code_type, column in ACTIVITY_CODE_COLUMNS.items():
+        values = assignments[assignments['code_type'] == code_type]
+        values = pd.Series(values['code_value'].to_numpy(), index=values['task_id'])
+        # Tasks without an assignment get None
+        context[column] = context['task_id'].map(values).astype(object).where(
+            context['task_id'].isin(values.index), None
+        )
 
     # Run TaskClassifier on all tasks
     if verbose:
@@ -172,22 +182,13 @@ def build_task_context(
     # Get WBS name lookup for classification context
     wbs_names = wbs_df.set_index('wbs_id')['wbs_name'].to_dict()
 
-    classifications = []
-    total = len(context)
-    for idx, row in context.iterrows():
-        if verbose and idx % 10000 == 0 and idx > 0:
-            print(f"    Processed {idx:,}/{total:,} ({idx/total*100:.1f}%)")
-
-        task_name = str(row.get('task_name', ''))
-        wbs_name = wbs_names.get(row['wbs_id'], '')
-        classification = classifier.classify_task(task_name, wbs_name)
-        classifications.append(classification)
+    task_names = context['task_name'] if 'task_name' in context.columns else [''] * len(context)
+    classification_df = classifier.classify_tasks(
+        task_names, [wbs_names.get(wbs_id, '') for wbs_id in context['wbs_id']]
+    )
 
     if verbose:
-        print(f"    Processed {total:,}/{total:,} (100%)")
-
-    # Add classification columns
-    classification_df = pd.DataFrame(classifications)
+        print(f"    Classified {len(context):,} tasks")
 
     # Rename building/level to avoid collision with final output
     classification_df = classification_df.rename(columns={
@@ -13,6 +13,7 @@ Location extraction now uses the centralized module at:
     scripts/integrated_analysis/location/
 """
 
+import re
 import sys
 from pathlib import Path
 
@@ -354,6 +355,246 @@ def infer_impact(row: pd.Series) -> dict:
     }
 
 
+# Design phase patterns (infer_work_phase)
+DESIGN_PATTERNS = [
+    r'\bDESIGN\b',
+    r'\bREDESIGN',
+    r'\bEOR\b',           # Engineer of Record
+    r'\bSHOP\s*DWG',
+    r'\bSHOP\s*DRAWING',
+    r'\bIFC\b',           # Issued for Construction
+    r'\bRFI\b',           # Request for Information
+    r'\bRFA\b',           # Request for Approval
+    r'\bSUBMITTAL',
+    r'\bSUBMIT\b',
+    r'\bAPPROVAL',
+    r'\bAPPROVE\b',
+    r'\bENGINEER',
+    r'\bCOORDINAT',       # Coordination
+    r'\bBID\b',           # Bidding
+    r'\bBIDDING',
+    r'\bLEVELING\b',      # Bid leveling
+    r'\bBUYOUT',          # Buyout
+    r'\bREVIEW\b',        # Review
+    r'\bRESPONSE',        # Responses
+    r'\bIOCC\b',          # Internal Owner Change Condition
+    r'\bCCD\b',           # Contract Change Directive
+]
+
+# Fabrication phase patterns
+# Note: Avoid \bFAB\b alone - matches "FAB" building name and "fab side"
+FABRICATION_PATTERNS = [
+    r'\bFABRICAT',
+    r'\bREFABRICAT',
+    r'\bRE-FABRICAT',
+    r'\bCASTING\b',
+    r'\bCAST\b(?!.*IN.*PLACE)',  # CAST but not CAST-IN-PLACE
+    r'\bMANUFACTUR',
+    r'\bPROCURE',
+    r'\bPURCHASE',
+]
+
+# Delivery phase patterns
+DELIVERY_PATTERNS = [
+    r'\bDELIVER',
+    r'\bSHIP\b',
+    r'\bTRANSPORT',
+    r'\bRECEIV',  # Receive materials
+    r'\bOFFLOAD',
+    r'\bARRIV',
+]
+
+# Erection/Installation phase patterns
+ERECTION_PATTERNS = [
+    # Core installation verbs
+    r'\bERECT',
+    r'\bINSTALL',
+    r'\bSET\b',
+    r'\bSETTING\b',
+    r'\bPLACE\b',
+    r'\bPLACEMENT\b',
+    r'\bPOUR\b',
+    r'\bMOUNT',
+    r'\bHANG\b',
+    r'\bHANGING\b',
+    r'\bASSEMBL',
+    r'\bCONSTRUCT',
+    r'\bBUILD\b',
+    r'\bLAY\b',           # Laying (tile, flooring)
+    r'\bLAYING\b',
+    # Connection/finishing work
+    r'\bGROUT',           # Grouting after setting precast/steel
+    r'\bWELD',            # Welding connections
+    r'\bFRAMING\b',       # Framing installation
+    r'\bBOLT\b',          # Bolting connections
+    r'\bTORQUE',          # Torquing bolts
+    r'\bANCHOR',          # Anchor bolts
+    r'\bCONNECT',         # Connections
+    r'\bTIE\b',           # Tie-ins
+    # Finishing trades
+    r'\bTAPE\b',          # Drywall tape
+    r'\bPAINT',           # Painting
+    r'\bCOAT\b',          # Coating (base coat, top coat)
+    r'\bCOATING',         # Coating application
+    r'\bPATCH',           # Patching
+    r'\bREPAIR',          # Repair work
+    r'\bCAULK',           # Caulking
+    r'\bSEAL\b',          # Sealing
+    r'\bSEALANT',         # Sealant application
+    r'\bDRYWALL',         # Drywall installation
+    r'\bGLAZING',         # Glazing
+    r'\bFLOORING',        # Flooring
+    r'\bCEILING',         # Ceiling work
+    r'\bROOFING',         # Roofing
+    r'\bFLASHING',        # Flashing
+    # Specialty trades
+    r'\bFIREPROOF',       # Fireproofing
+    r'\bFIRESTOP',        # Firestopping
+    r'\bSFRM\b',          # Spray fireproofing
+    r'\bINSULAT',         # Insulation
+    r'\bWATERPROOF',      # Waterproofing
+    r'\bFRP\b',           # Fiberglass reinforced plastic
+    # Concrete/masonry work
+    r'\bCURE\b',          # Curing concrete
+    r'\bTOPPING',         # Topping slab
+    r'\bDECKING\b',       # Decking installation
+    r'\bSLAB\b',          # Slab work
+    r'\bCURB',            # Curbs
+    r'\bREBAR',           # Rebar placement
+    r'\bFORM\b',          # Formwork
+    r'\bFORMS\b',         # Formwork
+    r'\bSTRIP\b',         # Strip forms
+    # Doors/openings
+    r'\bDOOR\b',          # Door installation
+    r'\bDOORS\b',
+    r'\bHARDWARE',        # Hardware installation
+    # Site work
+    r'\bDEMO\b',          # Demolition
+    r'\bEXCAVAT',         # Excavation
+    r'\bBACKFILL',        # Backfilling
+    r'\bUNDERGROUND',     # Underground work
+    r'\bTRENCH',          # Trenching
+    # MEP
+    r'\bROUGH\s*IN',      # Rough-in (MEP)
+    r'\bROUGH-IN',        # Rough-in alternate
+    r'\bMEP\b',           # MEP work
+    # Complete/finish activities
+    r'\bCOMPLETE\b',      # Complete work
+    r'\bFINISH\b',        # Finish work
+    r'\bREMEDY\b',        # Remedy work
+    # Inspection (part of installation)
+    r'\bINSPECT',         # Inspection
+    # Additional construction activities
+    r'\bWALL\b',          # Wall construction
+    r'\bPARAPET',         # Parapet
+    r'\bSCAFFOLD',        # Scaffolding
+    r'\bDRILL',           # Drilling
+    r'\bGRIND',           # Grinding
+    r'\bSCRAP',           # Scraping
+    r'\bPROTECT',         # Protection
+    r'\bSTRIP',           # Striping/stripping
+    r'\bLAYER',           # Layer (roof layer)
+    r'\bBEAM\b',          # Beam work
+    r'\bCOLUMN',          # Column work
+    r'\bFLANGE',          # Flange work
+    r'\bPIPE\b',          # Pipe work
+    r'\bDUCT\b',          # Duct work
+    r'\bCIP\b',           # Cast-in-place
+    r'\bCAST.IN.PLACE',   # Cast-in-place
+    r'\bSOG\b',           # Slab on grade
+    r'\bPAD\b',           # Equipment pads
+    r'\bPADS\b',
+    r'\bSTAIR\b',         # Stair work
+    r'\bSTAIRS\b',
+    r'\bLANDING',         # Landings
+    r'\bRAILING',         # Railings
+    r'\bHANDRAIL',        # Handrails
+    r'\bCLEAN\b',         # Cleaning
+    r'\bCLEANING\b',
+    r'\bPUNCH',           # Punch list
+    # Additional patterns
+    r'\bWATER\s*PROOF',   # Water proof (with space)
+    r'\bFOAM\b',          # Spray foam
+    r'\bCANOPY',          # Canopy
+    r'\bSOFT?FIT',        # Soffit (with typo variation)
+    r'\bTILE',            # Tile work
+    r'\bCERAMIC',         # Ceramic tiles
+    r'\bTERRAZZO',        # Terrazzo
+    r'\bEPOXY',           # Epoxy
+    r'\bINTUMESCENT',     # Intumescent coating
+    r'\bCLADDING',        # Cladding
+    r'\bSHEATH',          # Sheathing
+    r'\bPLASTER',         # Plastering
+    r'\bSTUCCO',          # Stucco
+    r'\bDRAIN',           # Drainage
+    r'\bFRENCH\s*DRAIN',  # French drain
+    r'\bTURNOVER',        # Turnover activities
+    r'\bMEASURE',         # Field measurement
+    r'\bSURVEY',          # Survey
+    r'\bLAYOUT',          # Layout
+    r'\bMARK',            # Marking
+    r'\bSPRAY\b',         # Spray application
+    r'\bAPPLY\b',         # Apply (coatings, etc.)
+    r'\bCOVER',           # Cover/covering
+    r'\bWRAP',            # Wrapping
+    r'\bTEST\b',          # Testing
+    r'\bFLUSH',           # Flushing
+    r'\bCHARGE',          # Charging (MEP)
+    r'\bSTART\s*UP',      # Start-up
+    r'\bCOMMISSION',      # Commissioning
+    # More edge cases
+    r'\bCRC\b',           # Chemical Resistant Coating
+    r'\bSEALER',          # Sealer application
+    r'\bGRATING',         # Grating installation
+    r'\bDISMANTL',        # Dismantling
+    r'\bSOMD\b',          # SOMD (material application)
+    r'\bEDGE\s*METAL',    # Edge metal
+    r'\bCOPING',          # Coping
+    r'\bCRICKET',         # Roof cricket
+    r'\bPRIMER',          # Primer application
+    r'\bPRIME\b',         # Prime
+    r'\bFRP\b',           # Fiberglass (if not already caught)
+    r'\bSOG\b',           # Slab on grade
+    r'\bEQUIPMENT',       # Equipment
+    r'\bEQPT\b',          # Equipment abbrev
+    r'\bPENETRAT',        # Penetrations
+    r'\bOPENING',         # Openings
+    r'\bLEAVE\s*OUT',     # Leave-outs
+    r'\bBLOCK\s*OUT',     # Block-outs
+    r'\bEMBED',           # Embeds
+    r'\bSLEEVE',          # Sleeves
+    r'\bCONDUIT',         # Conduit
+    r'\bCONDENSATE',      # Condensate
+    r'\bCHILLER',         # Chiller
+    r'\bAHU\b',           # Air handling unit
+    r'\bVAV\b',           # Variable air volume
+    r'\bDIFFUSER',        # Diffusers
+    r'\bGRILLE',          # Grilles
+    r'\bLOUVER',          # Louvers
+    r'\bDAMPER',          # Dampers
+    r'\bVALVE',           # Valves
+    r'\bPUMP\b',          # Pumps
+    r'\bFAN\b',           # Fans
+    r'\bMOTOR',           # Motors
+    r'\bPANEL\b',         # Panels
+    r'\bTRANSFORMER',     # Transformers
+    r'\bSWITCH',          # Switches
+    r'\bBREAKER',         # Breakers
+    r'\bCONTROL',         # Controls
+    r'\bSENSOR',          # Sensors
+    r'\bDETECTOR',        # Detectors
+    r'\bALARM',           # Alarms
+    r'\bSPRINKLER',       # Sprinklers
+    r'\bEXTINGUISH',      # Fire extinguishers
+]
+
+# Each pattern list compiled once into one alternation (matches iff any pattern does)
+_DESIGN_REGEX = re.compile('|'.join(f'(?:{p})' for p in DESIGN_PATTERNS))
+_FABRICATION_REGEX = re.compile('|'.join(f'(?:{p})' for p in FABRICATION_PATTERNS))
+_DELIVERY_REGEX = re.compile('|'.join(f'(?:{p})' for p in DELIVERY_PATTERNS))
+_ERECTION_REGEX = re.compile('|'.join(f'(?:{p})' for p in ERECTION_PATTERNS))
+
+
 def infer_work_phase(row: pd.Series) -> tuple[str | None, str | None]:
     """
     Infer work phase from task name keywords.
@@ -372,247 +613,12 @@ def infer_work_phase(row: pd.Series) -> tuple[str | None, str | None]:
         work_phase: DESIGN, FABRICATION, DELIVERY, ERECTION, or None
         work_phase_source: 'inferred' if matched, None otherwise
     """
-    import re
-
     task_name = row.get('task_name', '')
     if not task_name or pd.isna(task_name):
         return (None, None)
 
     name_upper = str(task_name).upper()
 
-    # Design phase patterns
-    design_patterns = [
-        r'\bDESIGN\b',
-        r'\bREDESIGN',
-        r'\bEOR\b',           # Engineer of Record
-        r'\bSHOP\s*DWG',
-        r'\bSHOP\s*DRAWING',
-        r'\bIFC\b',           # Issued for Construction
-        r'\bRFI\b',           # Request for Information
-        r'\bRFA\b',           # Request for Approval
-        r'\bSUBMITTAL',
-        r'\bSUBMIT\b',
-        r'\bAPPROVAL',
-        r'\bAPPROVE\b',
-        r'\bENGINEER',
-        r'\bCOORDINAT',       # Coordination
-        r'\bBID\b',           # Bidding
-        r'\bBIDDING',
-        r'\bLEVELING\b',      # Bid leveling
-        r'\bBUYOUT',          # Buyout
-        r'\bREVIEW\b',        # Review
-        r'\bRESPONSE',        # Responses
-        r'\bIOCC\b',          # Internal Owner Change Condition
-        r'\bCCD\b',           # Contract Change Directive
-    ]
-
-    # Fabrication phase patterns
-    # Note: Avoid \bFAB\b alone - matches "FAB" building name and "fab side"
-    fab_patterns = [
-        r'\bFABRICAT',
-        r'\bREFABRICAT',
-        r'\bRE-FABRICAT',
-        r'\bCASTING\b',
-        r'\bCAST\b(?!.*IN.*PLACE)',  # CAST but not CAST-IN-PLACE
-        r'\bMANUFACTUR',
-        r'\bPROCURE',
-        r'\bPURCHASE',
-    ]
-
-    # Delivery phase patterns
-    delivery_patterns = [
-        r'\bDELIVER',
-        r'\bSHIP\b',
-        r'\bTRANSPORT',
-        r'\bRECEIV',  # Receive materials
-        r'\bOFFLOAD',
-        r'\bARRIV',
-    ]
-
-    # Erection/Installation phase patterns
-    erection_patterns = [
-        # Core installation verbs
-        r'\bERECT',
-        r'\bINSTALL',
-        r'\bSET\b',
-        r'\bSETTING\b',
-        r'\bPLACE\b',
-        r'\bPLACEMENT\b',
-        r'\bPOUR\b',
-        r'\bMOUNT',
-        r'\bHANG\b',
-        r'\bHANGING\b',
-        r'\bASSEMBL',
-        r'\bCONSTRUCT',
-        r'\bBUILD\b',
-        r'\bLAY\b',           # Laying (tile, flooring)
-        r'\bLAYING\b',
-        # Connection/finishing work
-        r'\bGROUT',           # Grouting after setting precast/steel
-        r'\bWELD',            # Welding connections
-        r'\bFRAMING\b',       # Framing installation
-        r'\bBOLT\b',          # Bolting connections
-        r'\bTORQUE',          # Torquing bolts
-        r'\bANCHOR',          # Anchor bolts
-        r'\bCONNECT',         # Connections
-        r'\bTIE\b',           # Tie-ins
-        # Finishing trades
-        r'\bTAPE\b',          # Drywall tape
-        r'\bPAINT',           # Painting
-        r'\bCOAT\b',          # Coating (base coat, top coat)
-        r'\bCOATING',         # Coating application
-        r'\bPATCH',           # Patching
-        r'\bREPAIR',          # Repair work
-        r'\bCAULK',           # Caulking
-        r'\bSEAL\b',          # Sealing
-        r'\bSEALANT',         # Sealant application
-        r'\bDRYWALL',         # Drywall installation
-        r'\bGLAZING',         # Glazing
-        r'\bFLOORING',        # Flooring
-        r'\bCEILING',         # Ceiling work
-        r'\bROOFING',         # Roofing
-        r'\bFLASHING',        # Flashing
-        # Specialty trades
-        r'\bFIREPROOF',       # Fireproofing
-        r'\bFIRESTOP',        # Firestopping
-        r'\bSFRM\b',          # Spray fireproofing
-        r'\bINSULAT',         # Insulation
-        r'\bWATERPROOF',      # Waterproofing
-        r'\bFRP\b',           # Fiberglass reinforced plastic
-        # Concrete/masonry work
-        r'\bCURE\b',          # Curing concrete
-        r'\bTOPPING',         # Topping slab
-        r'\bDECKING\b',       # Decking installation
-        r'\bSLAB\b',          # Slab work
-        r'\bCURB',            # Curbs
-        r'\bREBAR',           # Rebar placement
-        r'\bFORM\b',          # Formwork
-        r'\bFORMS\b',         # Formwork
-        r'\bSTRIP\b',         # Strip forms
-        # Doors/openings
-        r'\bDOOR\b',          # Door installation
-        r'\bDOORS\b',
-        r'\bHARDWARE',        # Hardware installation
-        # Site work
-        r'\bDEMO\b',          # Demolition
-        r'\bEXCAVAT',         # Excavation
-        r'\bBACKFILL',        # Backfilling
-        r'\bUNDERGROUND',     # Underground work
-        r'\bTRENCH',          # Trenching
-        # MEP
-        r'\bROUGH\s*IN',      # Rough-in (MEP)
-        r'\bROUGH-IN',        # Rough-in alternate
-        r'\bMEP\b',           # MEP work
-        # Complete/finish activities
-        r'\bCOMPLETE\b',      # Complete work
-        r'\bFINISH\b',        # Finish work
-        r'\bREMEDY\b',        # Remedy work
-        # Inspection (part of installation)
-        r'\bINSPECT',         # Inspection
-        # Additional construction activities
-        r'\bWALL\b',          # Wall construction
-        r'\bPARAPET',         # Parapet
-        r'\bSCAFFOLD',        # Scaffolding
-        r'\bDRILL',           # Drilling
-        r'\bGRIND',           # Grinding
-        r'\bSCRAP',           # Scraping
-        r'\bPROTECT',         # Protection
-        r'\bSTRIP',           # Striping/stripping
-        r'\bLAYER',           # Layer (roof layer)
-        r'\bBEAM\b',          # Beam work
-        r'\bCOLUMN',          # Column work
-        r'\bFLANGE',          # Flange work
-        r'\bPIPE\b',          # Pipe work
-        r'\bDUCT\b',          # Duct work
-        r'\bCIP\b',           # Cast-in-place
-        r'\bCAST.IN.PLACE',   # Cast-in-place
-        r'\bSOG\b',           # Slab on grade
-        r'\bPAD\b',           # Equipment pads
-        r'\bPADS\b',
-        r'\bSTAIR\b',         # Stair work
-        r'\bSTAIRS\b',
-        r'\bLANDING',         # Landings
-        r'\bRAILING',         # Railings
-        r'\bHANDRAIL',        # Handrails
-        r'\bCLEAN\b',         # Cleaning
-        r'\bCLEANING\b',
-        r'\bPUNCH',           # Punch list
-        # Additional patterns
-        r'\bWATER\s*PROOF',   # Water proof (with space)
-        r'\bFOAM\b',          # Spray foam
-        r'\bCANOPY',          # Canopy
-        r'\bSOFT?FIT',        # Soffit (with typo variation)
-        r'\bTILE',            # Tile work
-        r'\bCERAMIC',         # Ceramic tiles
-        r'\bTERRAZZO',        # Terrazzo
-        r'\bEPOXY',           # Epoxy
-        r'\bINTUMESCENT',     # Intumescent coating
-        r'\bCLADDING',        # Cladding
-        r'\bSHEATH',          # Sheathing
-        r'\bPLASTER',         # Plastering
-        r'\bSTUCCO',          # Stucco
-        r'\bDRAIN',           # Drainage
-        r'\bFRENCH\s*DRAIN',  # French drain
-        r'\bTURNOVER',        # Turnover activities
-        r'\bMEASURE',         # Field measurement
-        r'\bSURVEY',          # Survey
-        r'\bLAYOUT',          # Layout
-        r'\bMARK',            # Marking
-        r'\bSPRAY\b',         # Spray application
-        r'\bAPPLY\b',         # Apply (coatings, etc.)
-        r'\bCOVER',           # Cover/covering
-        r'\bWRAP',            # Wrapping
-        r'\bTEST\b',          # Testing
-        r'\bFLUSH',           # Flushing
-        r'\bCHARGE',          # Charging (MEP)
-        r'\bSTART\s*UP',      # Start-up
-        r'\bCOMMISSION',      # Commissioning
-        # More edge cases
-        r'\bCRC\b',           # Chemical Resistant Coating
-        r'\bSEALER',          # Sealer application
-        r'\bGRATING',         # Grating installation
-        r'\bDISMANTL',        # Dismantling
-        r'\bSOMD\b',          # SOMD (material application)
-        r'\bEDGE\s*METAL',    # Edge metal
-        r'\bCOPING',          # Coping
-        r'\bCRICKET',         # Roof cricket
-        r'\bPRIMER',          # Primer application
-        r'\bPRIME\b',         # Prime
-        r'\bFRP\b',           # Fiberglass (if not already caught)
-        r'\bSOG\b',           # Slab on grade
-        r'\bEQUIPMENT',       # Equipment
-        r'\bEQPT\b',          # Equipment abbrev
-        r'\bPENETRAT',        # Penetrations
-        r'\bOPENING',         # Openings
-        r'\bLEAVE\s*OUT',     # Leave-outs
-        r'\bBLOCK\s*OUT',     # Block-outs
-        r'\bEMBED',           # Embeds
-        r'\bSLEEVE',          # Sleeves
-        r'\bCONDUIT',         # Conduit
-        r'\bCONDENSATE',      # Condensate
-        r'\bCHILLER',         # Chiller
-        r'\bAHU\b',           # Air handling unit
-        r'\bVAV\b',           # Variable air volume
-        r'\bDIFFUSER',        # Diffusers
-        r'\bGRILLE',          # Grilles
-        r'\bLOUVER',          # Louvers
-        r'\bDAMPER',          # Dampers
-        r'\bVALVE',           # Valves
-        r'\bPUMP\b',          # Pumps
-        r'\bFAN\b',           # Fans
-        r'\bMOTOR',           # Motors
-        r'\bPANEL\b',         # Panels
-        r'\bTRANSFORMER',     # Transformers
-        r'\bSWITCH',          # Switches
-        r'\bBREAKER',         # Breakers
-        r'\bCONTROL',         # Controls
-        r'\bSENSOR',          # Sensors
-        r'\bDETECTOR',        # Detectors
-        r'\bALARM',           # Alarms
-        r'\bSPRINKLER',       # Sprinklers
-        r'\bEXTINGUISH',      # Fire extinguishers
-    ]
-
     # Check patterns in priority order
     # Priority: ERECTION > DELIVERY > FABRICATION > DESIGN
     # Rationale: If task mentions "INSTALL", that's the primary activity even if
@@ -620,10 +626,10 @@ def infer_work_phase(row: pd.Series) -> tuple[str | None, str | None]:
     # that's the earlier/driving activity.
 
     # Check for erection keywords first - these take priority
-    has_erection = any(re.search(p, name_upper) for p in erection_patterns)
-    has_delivery = any(re.search(p, name_upper) for p in delivery_patterns)
-    has_fab = any(re.search(p, name_upper) for p in fab_patterns)
-    has_design = any(re.search(p, name_upper) for p in design_patterns)
+    has_erection = _ERECTION_REGEX.search(name_upper) is not None
+    has_delivery = _DELIVERY_REGEX.search(name_upper) is not None
+    has_fab = _FABRICATION_REGEX.search(name_upper) is not None
+    has_design = _DESIGN_REGEX.search(name_upper) is not None
 
     # ERECTION takes priority - if it says INSTALL, it's an installation task
     if has_erection:
@@ -0,0 +1,276 @@
+"""
+Deduplicated, Memoized Taxonomy Inference
+
+The same task (task_code, name, WBS context and activity codes) appears in
+every schedule version, so most context rows are repeats of a row already
+seen. infer_all_fields() only reads the INFERENCE_INPUT_COLUMNS of a row (and
+passes task_id through), so each row is keyed by a 64-bit hash of those
+columns:
+
+    - each distinct key is inferred once and the result broadcast to all
+      rows sharing it
+    - results are persisted in an InferenceMemo, so a later run only infers
+      keys it has not seen before
+    - keys not in the memo are inferred in chunks, on a process pool when
+      more than one worker is requested
+    - iter_taxonomy() yields the result in row chunks, so callers can write
+      the table incrementally instead of holding all of it
+
+INFERENCE_VERSION is part of the memo identity; bump it whenever inference
+rules (here, in TaskClassifier or in the location extractors) change.
+"""
+
+import hashlib
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from .inference import infer_all_fields
+from gridline_mapping import DEFAULT_MAPPING_PATH  # on sys.path via .inference
+
+# Bump when inference rules change (invalidates persisted memos)
+INFERENCE_VERSION = 1
+
+# Context columns read by infer_all_fields() (task_id is only passed through)
+INFERENCE_INPUT_COLUMNS = [
+    'task_name', 'task_code', 'wbs_name', 'tier_3', 'tier_4', 'tier_5',
+    'z_bldg', 'z_level', 'z_area', 'z_sub_contractor',
+    # TaskClassifier output
+    'phase', 'phase_desc', 'scope', 'scope_desc',
+    'building_inferred', 'building_desc', 'level_inferred', 'level_desc',
+    'loc_type', 'loc_type_desc', 'loc_id', 'label',
+    'impact_code', 'impact_type', 'impact_type_desc',
+    'attributed_to', 'attributed_to_desc', 'root_cause', 'root_cause_desc',
+]
+
+
+def inference_keys(context: pd.DataFrame) -> np.ndarray:
+    """
+    Inference key per context row (uint64 hash of its inference inputs).
+
+    Rows with equal keys get equal infer_all_fields() results, apart from
+    task_id. Input columns missing from the context are left out of the hash.
+    """
+    columns = [c for c in INFERENCE_INPUT_COLUMNS if c in context.columns]
+    return pd.util.hash_pandas_object(context[columns], index=False).to_numpy()
+
+
+def _mapping_signature(gridline_mapping) -> str:
+    """Identity of the gridline mapping file, whose bounds end up in results."""
+    path = Path(getattr(gridline_mapping, 'mapping_path', DEFAULT_MAPPING_PATH))
+    if not path.exists():
+        return f'{path}|missing'
+    stat = path.stat()
+    return f'{path}|{stat.st_size}|{stat.st_mtime_ns}'
+
+
+class InferenceMemo:
+    """
+    infer_all_fields() results by inference key, persisted as one pickle.
+
+    The memo is only valid for one INFERENCE_VERSION, one set of context
+    columns and one gridline mapping file; load() starts empty otherwise.
+    """
+
+    def __init__(self, path: Path | None = None):
+        """
+        Args:
+            path: Pickle file for persisted results (None = in-memory only)
+        """
+        self.path = Path(path) if path is not None else None
+        self.signature = None
+        self.fields: list[str] | None = None
+        self.results: dict[int, tuple] = {}
+        self._saved = 0
+
+    def load(self, signature: str) -> 'InferenceMemo':
+        """Load persisted results recorded under the same signature."""
+        if signature == self.signature:
+            return self
+        self.signature = signature
+        self.fields, self.results, self._saved = None, {}, 0
+        if self.path is None or not self.path.exists():
+            return self
+        try:
+            with open(self.path, 'rb') as f:
+                data = pickle.load(f)
+        except Exception:
+            return self
+        if data.get('signature') == signature:
+            self.fields, self.results = data['fields'], data['results']
+            self._saved = len(self.results)
+        return self
+
+    def save(self) -> int:
+        """Persist the memo if it gained results. Returns number of new results."""
+        new = len(self.results) - self._saved
+        if self.path is None or new == 0:
+            return 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so concurrent runs never read a partial file
+        tmp = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp, 'wb') as f:
+            pickle.dump({'signature': self.signature, 'fields': self.fields, 'results': self.results}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path)
+        self._saved = len(self.results)
+        return new
+
+
+def memo_signature(context: pd.DataFrame, gridline_mapping=None) -> str:
+    """Memo identity for a context: rule version, input columns and mapping file."""
+    columns = [c for c in INFERENCE_INPUT_COLUMNS if c in context.columns]
+    text = f"{INFERENCE_VERSION}|{','.join(columns)}|{_mapping_signature(gridline_mapping)}"
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+# Inference inputs sent to one worker task
+INFERENCE_CHUNK_SIZE = 2000
+
+# Gridline mapping of each inference worker process (set by _init_inference_worker)
+_worker_gridline_mapping = None
+
+
+def _init_inference_worker(gridline_mapping):
+    global _worker_gridline_mapping
+    _worker_gridline_mapping = gridline_mapping
+
+
+def _infer_rows(rows: pd.DataFrame, gridline_mapping=None) -> tuple[list[str], list[tuple]]:
+    """
+    infer_all_fields() for each context row, without task_id.
+
+    Returns:
+        Tuple of (field names, one result tuple per row)
+    """
+    gridline_mapping = gridline_mapping or _worker_gridline_mapping
+    fields, results = [], []
+    for _, row in rows.iterrows():
+        result = infer_all_fields(row, gridline_mapping=gridline_mapping)
+        result.pop('task_id')
+        fields = list(result)
+        results.append(tuple(result.values()))
+    return fields, results
+
+
+def _infer_missing(
+    rows: pd.DataFrame,
+    keys: list[int],
+    memo: InferenceMemo,
+    gridline_mapping=None,
+    workers: int = 1,
+    verbose: bool = True,
+) -> None:
+    """Infer one context row per key not in the memo, on a process pool if workers > 1."""
+    chunks = [
+        (rows.iloc[start:start + INFERENCE_CHUNK_SIZE], keys[start:start + INFERENCE_CHUNK_SIZE])
+        for start in range(0, len(keys), INFERENCE_CHUNK_SIZE)
+    ]
+
+    def store(fields, results, chunk_keys):
+        memo.fields = memo.fields or fields
+        memo.results.update(zip(chunk_keys, results))
+        if verbose and len(chunks) > 1:
+            print(f"  Inferred {len(memo.results) - done_before:,}/{len(keys):,}")
+
+    done_before = len(memo.results)
+    if workers == 1 or len(chunks) <= 1:
+        for chunk_rows, chunk_keys in chunks:
+            store(*_infer_rows(chunk_rows, gridline_mapping), chunk_keys)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_inference_worker,
+                             initargs=(gridline_mapping,)) as pool:
+        futures = {pool.submit(_infer_rows, chunk_rows): chunk_keys for chunk_rows, chunk_keys in chunks}
+        for future in as_completed(futures):
+            store(*future.result(), futures[future])
+
+
+def iter_taxonomy(
+    context: pd.DataFrame,
+    memo: InferenceMemo | None = None,
+    gridline_mapping=None,
+    verbose: bool = True,
+    workers: int = 1,
+    chunk_size: int | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    infer_all_fields() for every context row, inferring each distinct key once.
+
+    Keys not in the memo are inferred first (in chunks on a process pool when
+    workers > 1) and the memo is saved. The taxonomy is then yielded in
+    consecutive row chunks, each cast to the dtypes the full table would
+    have, so writing the chunks one after another gives the same file as
+    writing the concatenated table. The context and the result of every
+    distinct key are held throughout; only the taxonomy rows are chunked.
+
+    Args:
+        context: Combined task context from build_task_context()
+        memo: Results of earlier runs (loaded, extended and saved here)
+        gridline_mapping: Passed to infer_all_fields()
+        verbose: Print progress messages
+        workers: Inference worker processes (1 = in-process)
+        chunk_size: Context rows per yielded chunk (default: all rows in one chunk)
+
+    Yields:
+        DataFrames whose concatenation equals
+        pd.DataFrame([infer_all_fields(row) for each row])
+    """
+    memo = memo if memo is not None else InferenceMemo()
+    memo.load(memo_signature(context, gridline_mapping))
+
+    codes, keys = pd.factorize(inference_keys(context))
+    first_rows = np.unique(codes, return_index=True)[1]
+
+    missing = [i for i, key in enumerate(keys.tolist()) if key not in memo.results]
+    if verbose:
+        print(f"  {len(context):,} tasks, {len(keys):,} distinct inference inputs, "
+              f"{len(missing):,} not inferred before")
+
+    _infer_missing(context.iloc[first_rows[missing]], [int(keys[i]) for i in missing], memo,
+                   gridline_mapping=gridline_mapping, workers=workers, verbose=verbose)
+    memo.save()
+
+    fields = memo.fields or []
+    by_code = [memo.results[key] for key in keys.tolist()]
+    # Dtypes depend only on which values occur, so the distinct results give the full table's
+    dtypes = pd.DataFrame.from_records(by_code, columns=fields).dtypes
+
+    task_ids = context['task_id'].to_numpy(dtype=object)
+    chunk_size = chunk_size or max(len(context), 1)
+    for start in range(0, max(len(context), 1), chunk_size):
+        chunk_codes = codes[start:start + chunk_size]
+        taxonomy = pd.DataFrame.from_records([by_code[code] for code in chunk_codes], columns=fields)
+        taxonomy = taxonomy.astype(dtypes) if len(taxonomy) else taxonomy
+        taxonomy.index = pd.RangeIndex(start, start + len(taxonomy))
+        taxonomy.insert(0, 'task_id', task_ids[start:start + chunk_size])
+        yield taxonomy
+
+
+def infer_taxonomy(
+    context: pd.DataFrame,
+    memo: InferenceMemo | None = None,
+    gridline_mapping=None,
+    verbose: bool = True,
+    workers: int = 1,
+) -> pd.DataFrame:
+    """
+    infer_all_fields() for every context row, inferring each distinct key once.
+
+    Args:
+        context: Combined task context from build_task_context()
+        memo: Results of earlier runs (loaded, extended and saved here)
+        gridline_mapping: Passed to infer_all_fields()
+        verbose: Print progress messages
+        workers: Inference worker processes (1 = in-process)
+
+    Returns:
+        DataFrame equal to pd.DataFrame([infer_all_fields(row) for each row])
+    """
+    return next(iter_taxonomy(context, memo=memo, gridline_mapping=gridline_mapping,
+                              verbose=verbose, workers=workers))
@@ -29,10 +29,21 @@ Task Taxonomy Generation:
 - p6_task_taxonomy.csv is automatically generated with phase, scope, location classifications
 - Saved to processed/primavera/ directory alongside other processed data
 
+Schedule Deltas:
+- schedule_delta_pairs.csv, task_delta.csv and taskpred_delta.csv record what changed
+  between consecutive snapshots of each schedule type, keyed by task_code
+- In incremental mode only the pairs involving new files are computed
+
 Incremental Mode:
 - Use --incremental to only process new XER files not already in xer_files.csv
 - New data is appended to existing output files with continuing file_ids
 
+Duplicate Detection:
+- xer_files.csv records a content hash and a normalized-content hash (ignoring the
+  ERMHDR export header) for each file
+- Files matching an already ingested file (or an earlier file in the same run) are
+  not reprocessed; they are recorded in xer_file_aliases.csv with the original file_id
+
 Output Tables (all with file_id and prefixed IDs):
 - xer_files.csv        - Metadata about each XER file (auto-discovered)
 - task.csv             - Tasks (activities)
@@ -63,8 +74,10 @@ Usage:
 import sys
 import json
 import time
+import hashlib
 from pathlib import Path
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
 # Add project root to path (scripts/primavera/process -> scripts/primavera -> scripts -> project_root)
@@ -82,6 +95,8 @@ from src.config.settings import Settings
 from scripts.primavera.task_classifier import TaskClassifier
 from task_taxonomy import build_task_context, infer_all_fields, get_default_mapping
 from scripts.primavera.process.add_task_versions import add_task_code_versions
+from scripts.primavera.derive.build_wbs_hierarchy import add_tier_columns
+from scripts.primavera.process.schedule_deltas import update_schedule_deltas
 
 # Paths - use Settings for proper WINDOWS_DATA_DIR support
 XER_DIR = Settings.PRIMAVERA_RAW_DIR
@@ -96,6 +111,12 @@ DEFAULT_SCHEDULE_TYPE = SCHEDULE_YATES
 # WBS hierarchy configuration
 DEFAULT_NUM_TIERS = 6
 
+# Content-hash registry (identical re-exports are aliased, not reprocessed)
+HASH_CHUNK_SIZE = 1024 * 1024
+ALIASES_FILENAME = 'xer_file_aliases.csv'
+MATCH_CONTENT = 'content'
+MATCH_NORMALIZED = 'normalized'
+
 
 def classify_schedule_from_filename(filename: str) -> str:
     """
@@ -184,6 +205,12 @@ def get_processed_files(output_dir: Path) -> tuple[set, int]:
         df = pd.read_csv(files_csv)
         processed = set(df['filename'].tolist())
         max_id = df['file_id'].max() if len(df) > 0 else 0
+
+        # Files aliased to an existing file_id count as processed too
+        aliases_csv = output_dir / ALIASES_FILENAME
+        if aliases_csv.exists():
+            processed |= set(pd.read_csv(aliases_csv)['filename'].tolist())
+
         return processed, int(max_id)
     except Exception as e:
         print(f"  Warning: Could not read {files_csv}: {e}")
@@ -255,83 +282,169 @@ def discover_xer_files(xer_dir: Path, verbose: bool = True) -> pd.DataFrame:
 
 
 # =============================================================================
-# WBS Hierarchy Functions
+# XER Content Hash Registry
 # =============================================================================
 
-def _build_hierarchy_tree(wbs_df: pd.DataFrame) -> dict:
-    """Build lookup structures for WBS hierarchy traversal."""
-    id_to_row = {row['wbs_id']: row.to_dict() for _, row in wbs_df.iterrows()}
-    id_to_parent = dict(zip(wbs_df['wbs_id'], wbs_df['parent_wbs_id']))
-
-    id_to_children = {wbs_id: [] for wbs_id in id_to_row}
-    for wbs_id, parent_id in id_to_parent.items():
-        if pd.notna(parent_id) and parent_id in id_to_children:
-            id_to_children[parent_id].append(wbs_id)
-
-    return {
-        'id_to_row': id_to_row,
-        'id_to_parent': id_to_parent,
-        'id_to_children': id_to_children,
-    }
-
-
-def _get_ancestors(wbs_id: str, tree: dict, max_depth: int = 10) -> list[dict]:
-    """Get list of ancestors from root to this node (inclusive)."""
-    ancestors = []
-    current_id = wbs_id
-    depth = 0
-
-    while depth < max_depth and current_id in tree['id_to_row']:
-        row = tree['id_to_row'][current_id]
-        ancestors.append({
-            'wbs_id': current_id,
-            'wbs_short_name': row['wbs_short_name'],
-            'wbs_name': row['wbs_name'],
-        })
-        parent_id = tree['id_to_parent'].get(current_id)
-        if pd.isna(parent_id) or parent_id not in tree['id_to_row']:
-            break
-        current_id = parent_id
-        depth += 1
+def compute_xer_hashes(xer_path: Path) -> tuple[str, str]:
+    """
+    Compute the content hash and normalized-content hash of an XER file.
+
+    The content hash covers the raw bytes. The normalized hash ignores the
+    ERMHDR line (export date, user, database) plus line endings and trailing
+    whitespace, so the same schedule re-exported later hashes the same.
 
-    return list(reversed(ancestors))
+    Returns:
+        tuple: (content_hash, normalized_hash) as "sha256:<hexdigest>"
+    """
+    content = hashlib.sha256()
+    normalized = hashlib.sha256()
 
+    with open(xer_path, 'rb') as f:
+        for line in f:
+            content.update(line)
+            if line.startswith(b'ERMHDR'):
+                continue
+            line = line.rstrip()
+            if line:
+                normalized.update(line)
+                normalized.update(b'\n')
 
-def _get_tier_label(node: dict) -> str:
-    """Get human-friendly label for a WBS node."""
-    name = str(node.get('wbs_name', ''))
-    short = str(node.get('wbs_short_name', ''))
+    return f"sha256:{content.hexdigest()}", f"sha256:{normalized.hexdigest()}"
 
-    if not name or name == short:
-        return short
-    if name.startswith('SAMSUNG') or name.startswith('Yates T FAB1'):
-        return short
-    if len(name) > 50:
-        name = name[:47] + '...'
-    return name
 
+def add_xer_hashes(files_df: pd.DataFrame, xer_dir: Path, verbose: bool = True) -> pd.DataFrame:
+    """
+    Fill content_hash/normalized_hash columns for files that lack them.
 
-def _build_tier_columns_for_file(wbs_df: pd.DataFrame, num_tiers: int = 6) -> pd.DataFrame:
-    """Build tier columns for WBS nodes in a single file."""
-    tree = _build_hierarchy_tree(wbs_df)
-    results = []
+    Files missing from xer_dir keep empty hashes and are never matched.
+    """
+    files_df = files_df.copy()
+    for col in ('content_hash', 'normalized_hash'):
+        if col not in files_df.columns:
+            files_df[col] = None
+        files_df[col] = files_df[col].astype(object)
 
-    for _, row in wbs_df.iterrows():
-        wbs_id = row['wbs_id']
-        ancestors = _get_ancestors(wbs_id, tree)
-        depth = len(ancestors) - 1
+    missing = files_df['content_hash'].isna() | files_df['normalized_hash'].isna()
+    if verbose and missing.any():
+        print(f"Hashing {missing.sum()} XER file(s)...")
 
-        result = {'wbs_id': wbs_id, 'depth': depth}
-        for i in range(num_tiers):
-            tier_num = i + 1
-            if i < len(ancestors):
-                result[f'tier_{tier_num}'] = _get_tier_label(ancestors[i])
-            else:
-                result[f'tier_{tier_num}'] = None
-        results.append(result)
+    for idx in files_df.index[missing]:
+        xer_path = xer_dir / files_df.at[idx, 'filename']
+        if xer_path.exists():
+            files_df.at[idx, 'content_hash'], files_df.at[idx, 'normalized_hash'] = compute_xer_hashes(xer_path)
+
+    return files_df
+
+
+def load_known_xer_files(output_dir: Path, xer_dir: Path, persist: bool = True,
+                         verbose: bool = True) -> pd.DataFrame:
+    """
+    Read xer_files.csv, filling in the hashes of rows that lack them.
+
+    Backfilled hashes are written back to xer_files.csv (unless persist is
+    False), so legacy rows are hashed once even by runs that ingest nothing.
+    """
+    files_csv = output_dir / 'xer_files.csv'
+    known_files = pd.read_csv(files_csv)
+    hashed = add_xer_hashes(known_files, xer_dir, verbose=verbose)
+
+    hash_columns = ['content_hash', 'normalized_hash']
+    backfilled = hashed[hash_columns].notna().to_numpy().sum() \
+        > known_files.reindex(columns=hash_columns).notna().to_numpy().sum()
+    if persist and backfilled:
+        hashed.to_csv(files_csv, index=False)
+    return hashed
+
+
+def split_duplicate_xer_files(
+    files_df: pd.DataFrame,
+    known_files: pd.DataFrame | None = None,
+    verbose: bool = True
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Separate XER files whose content was already ingested.
 
-    return pd.DataFrame(results)
+    A file is a duplicate when its content hash (identical bytes) or its
+    normalized hash (same schedule, different export header) matches a file
+    in known_files or an earlier file in files_df.
 
+    Args:
+        files_df: Candidate files with content_hash/normalized_hash columns
+        known_files: Already processed xer_files rows (with file_id and hashes)
+        verbose: Print each alias
+
+    Returns:
+        tuple: (unique files, aliases). Aliases have columns filename, date,
+            schedule_type, alias_of (filename of the original), file_id (the
+            original's file_id if already known, else NaN), match_type,
+            content_hash, normalized_hash.
+    """
+    by_content: dict[str, tuple[str, object]] = {}
+    by_normalized: dict[str, tuple[str, object]] = {}
+    if known_files is not None:
+        for row in known_files.itertuples(index=False):
+            if isinstance(row.content_hash, str):
+                by_content.setdefault(row.content_hash, (row.filename, row.file_id))
+                by_normalized.setdefault(row.normalized_hash, (row.filename, row.file_id))
+
+    keep = []
+    aliases = []
+    for idx, row in zip(files_df.index, files_df.itertuples(index=False)):
+        if not isinstance(row.content_hash, str):
+            keep.append(idx)
+            continue
+
+        if row.content_hash in by_content:
+            (alias_of, file_id), match_type = by_content[row.content_hash], MATCH_CONTENT
+        elif row.normalized_hash in by_normalized:
+            (alias_of, file_id), match_type = by_normalized[row.normalized_hash], MATCH_NORMALIZED
+        else:
+            by_content[row.content_hash] = (row.filename, np.nan)
+            by_normalized[row.normalized_hash] = (row.filename, np.nan)
+            keep.append(idx)
+            continue
+
+        aliases.append({
+            'filename': row.filename,
+            'date': row.date,
+            'schedule_type': row.schedule_type,
+            'alias_of': alias_of,
+            'file_id': file_id,
+            'match_type': match_type,
+            'content_hash': row.content_hash,
+            'normalized_hash': row.normalized_hash,
+        })
+        if verbose:
+            print(f"  ↺ {row.filename} is identical to {alias_of} ({match_type} hash) - skipped")
+
+    columns = ['filename', 'date', 'schedule_type', 'alias_of', 'file_id',
+               'match_type', 'content_hash', 'normalized_hash']
+    return files_df.loc[keep], pd.DataFrame(aliases, columns=columns)
+
+
+def save_xer_aliases(output_dir: Path, aliases: pd.DataFrame, append: bool = False) -> Path:
+    """
+    Write aliased XER files to xer_file_aliases.csv.
+
+    Args:
+        output_dir: Output directory
+        aliases: Alias rows from split_duplicate_xer_files (file_id filled in)
+        append: Append to the existing aliases file instead of replacing it
+
+    Returns:
+        Path to the aliases file
+    """
+    aliases_path = output_dir / ALIASES_FILENAME
+    aliases = aliases.astype({'file_id': int})
+    if append and aliases_path.exists():
+        aliases = pd.concat([pd.read_csv(aliases_path), aliases], ignore_index=True)
+    aliases.to_csv(aliases_path, index=False)
+    return aliases_path
+
+
+# =============================================================================
+# WBS Hierarchy Functions
+# =============================================================================
 
 def enhance_wbs_with_hierarchy(wbs_df: pd.DataFrame, num_tiers: int = DEFAULT_NUM_TIERS,
                                 verbose: bool = True) -> pd.DataFrame:
@@ -352,33 +465,9 @@ def enhance_wbs_with_hierarchy(wbs_df: pd.DataFrame, num_tiers: int = DEFAULT_NU
     if verbose:
         print(f"  Enhancing WBS with {num_tiers} tier columns...")
 
-    # Remove existing tier columns if present
+    # All files are resolved in one vectorized pass (hierarchy is file-specific)
     tier_cols = [f'tier_{i}' for i in range(1, num_tiers + 1)]
-    cols_to_drop = [c for c in tier_cols + ['depth'] if c in wbs_df.columns]
-    if cols_to_drop:
-        wbs_df = wbs_df.drop(columns=cols_to_drop)
-
-    # Process each file_id separately (hierarchy is file-specific)
-    all_tier_dfs = []
-    file_ids = wbs_df['file_id'].unique()
-
-    for file_id in file_ids:
-        file_wbs = wbs_df[wbs_df['file_id'] == file_id].copy()
-        if len(file_wbs) > 0:
-            tier_df = _build_tier_columns_for_file(file_wbs, num_tiers=num_tiers)
-            all_tier_dfs.append(tier_df)
-
-    if not all_tier_dfs:
-        return wbs_df
-
-    # Combine and merge
-    tier_data = pd.concat(all_tier_dfs, ignore_index=True)
-    result_df = wbs_df.merge(tier_data, on='wbs_id', how='left')
-
-    # Reorder columns: original columns first, then depth, then tier columns
-    original_cols = [c for c in wbs_df.columns if c not in tier_cols and c != 'depth']
-    new_cols = ['depth'] + tier_cols
-    result_df = result_df[original_cols + new_cols]
+    result_df = add_tier_columns(wbs_df, num_tiers=num_tiers)
 
     if verbose:
         print(f"    Added columns: depth, {', '.join(tier_cols)}")
@@ -477,47 +566,110 @@ def generate_task_taxonomy(
         classifier = TaskClassifier()
         wbs_names = wbs_df.set_index('wbs_id')['wbs_name'].to_dict()
 
-        results = []
-        total = len(tasks_df)
+        task_names = tasks_df['task_name'] if 'task_name' in tasks_df.columns else [''] * len(tasks_df)
+        wbs_ids = tasks_df['wbs_id'] if 'wbs_id' in tasks_df.columns else [None] * len(tasks_df)
+        classification = classifier.classify_tasks(task_names, [wbs_names.get(wbs_id, '') for wbs_id in wbs_ids])
 
-        for idx, (_, row) in enumerate(tasks_df.iterrows()):
-            if verbose and idx % 50000 == 0 and idx > 0:
-                print(f"    Processed {idx:,}/{total:,} ({idx/total*100:.1f}%)")
-
-            task_name = str(row.get('task_name', ''))
-            wbs_id = row.get('wbs_id')
-            wbs_name = wbs_names.get(wbs_id, '')
-
-            classification = classifier.classify_task(task_name, wbs_name)
-
-            result = {
-                'task_id': row.get('task_id'),
-                'phase': classification['phase'],
-                'phase_desc': classification['phase_desc'],
-                'scope': classification['scope'],
-                'scope_desc': classification['scope_desc'],
-                'loc_type': classification['loc_type'],
-                'loc_type_desc': classification['loc_type_desc'],
-                'loc_id': classification['loc_id'],
-                'building': classification['building'],
-                'building_desc': classification['building_desc'],
-                'level': classification['level'],
-                'level_desc': classification['level_desc'],
-                'label': classification['label'],
-                'impact_code': classification.get('impact_code'),
-                'impact_type': classification.get('impact_type'),
-                'impact_type_desc': classification.get('impact_type_desc'),
-                'attributed_to': classification.get('attributed_to'),
-                'attributed_to_desc': classification.get('attributed_to_desc'),
-                'root_cause': classification.get('root_cause'),
-                'root_cause_desc': classification.get('root_cause_desc'),
-            }
-            results.append(result)
+        results = classification[[
+            'phase', 'phase_desc', 'scope', 'scope_desc',
+            'loc_type', 'loc_type_desc', 'loc_id',
+            'building', 'building_desc', 'level', 'level_desc', 'label',
+            'impact_code', 'impact_type', 'impact_type_desc',
+            'attributed_to', 'attributed_to_desc', 'root_cause', 'root_cause_desc',
+        ]]
+        results.insert(0, 'task_id', tasks_df['task_id'].to_numpy() if 'task_id' in tasks_df.columns else None)
 
         if verbose:
-            print(f"    Classified {total:,} tasks")
+            print(f"    Classified {len(results):,} tasks")
 
-        return pd.DataFrame(results)
+        return results
+
+
+# Digit strings up to this length round-trip exactly through int(float(x)),
+# so the vectorized path can use them verbatim
+_MAX_EXACT_ID_DIGITS = 15
+_MAX_EXACT_FLOAT_INT = 2 ** 53
+
+
+def _transform_id(x, file_id: int) -> str:
+    """Transform a single ID value with file_id prefix (reference scalar rule)."""
+    if pd.isna(x) or str(x).strip() == '':
+        return ''
+
+    # Try to convert to int for clean numeric IDs
+    try:
+        return f"{file_id}_{int(float(x))}"
+    except (ValueError, TypeError):
+        # For non-numeric values, still prefix but keep original value
+        return f"{file_id}_{x}"
+
+
+def _prefix_id_series(series: pd.Series, file_id: int) -> pd.Series:
+    """
+    Vectorized equivalent of ``series.apply(_transform_id)``.
+
+    Clean values (ASCII digit strings, integers, finite floats) are handled
+    with column operations; anything else falls back to the scalar rule so
+    the output is byte-identical to the row-wise implementation.
+    """
+    prefix = f"{file_id}_"
+    dtype = series.dtype
+
+    if len(series) == 0 or isinstance(dtype, pd.api.extensions.ExtensionDtype):
+        return series.apply(_transform_id, args=(file_id,))
+
+    if pd.api.types.is_bool_dtype(dtype):
+        return series.apply(_transform_id, args=(file_id,))
+
+    if pd.api.types.is_integer_dtype(dtype):
+        if series.abs().max() >= _MAX_EXACT_FLOAT_INT:
+            return series.apply(_transform_id, args=(file_id,))
+        return prefix + series.astype(str)
+
+    if pd.api.types.is_float_dtype(dtype):
+        values = series.to_numpy()
+        na = np.isnan(values)
+        if not np.all(na | (np.abs(values) < 2 ** 63)):
+            # inf/huge values: let the scalar rule raise/format exactly as before
+            return series.apply(_transform_id, args=(file_id,))
+        out = np.full(len(values), '', dtype=object)
+        ints = np.trunc(values[~na]).astype(np.int64).astype(str).astype(object)
+        out[~na] = prefix + ints
+        return pd.Series(out, index=series.index, name=series.name)
+
+    if dtype != object or pd.api.types.infer_dtype(series, skipna=True) not in ('string', 'empty'):
+        return series.apply(_transform_id, args=(file_id,))
+
+    # Pure-string object column (the XER parser case). The masks below use
+    # C-level str methods instead of a per-cell Python function.
+    values = series.to_numpy(dtype=object)
+    na = pd.isna(values)
+    present = values[~na]
+    count = len(present)
+    lengths = np.fromiter(map(len, present), dtype=np.int64, count=count)
+    is_ascii = np.fromiter(map(str.isascii, present), dtype=bool, count=count)
+    is_digit = np.fromiter(map(str.isdigit, present), dtype=bool, count=count)
+
+    # ASCII digit strings without a leading zero are already int(float(x))
+    # verbatim; a digit string starts with '0' exactly when it sorts below '1'
+    digits = np.zeros(len(values), dtype=bool)
+    digits[~na] = (
+        is_ascii & is_digit & (lengths <= _MAX_EXACT_ID_DIGITS)
+        & ((present >= '1') | (lengths == 1))
+    )
+    empty = np.zeros(len(values), dtype=bool)
+    empty[~na] = lengths == 0
+    # Zero-padded, whitespace-only, signed, decimal and free-text values
+    # keep the scalar rule
+    other = ~(na | digits | empty)
+
+    out = np.full(len(values), '', dtype=object)
+    if digits.any():
+        out[digits] = prefix + values[digits]
+    if other.any():
+        out[other] = [_transform_id(x, file_id) for x in values[other]]
+
+    return pd.Series(out, index=series.index, name=series.name)
 
 
 def prefix_id_columns(df: pd.DataFrame, file_id: int) -> pd.DataFrame:
@@ -533,6 +685,9 @@ def prefix_id_columns(df: pd.DataFrame, file_id: int) -> pd.DataFrame:
     For non-numeric values (data issues in some XER files), the value is
     preserved as-is with the file_id prefix.
 
+    The transformation is vectorized per column and the input frame is not
+    modified; untouched columns are shared with the input rather than copied.
+
     Args:
         df: DataFrame to transform
         file_id: The file_id to use as prefix
@@ -540,19 +695,8 @@ def prefix_id_columns(df: pd.DataFrame, file_id: int) -> pd.DataFrame:
     Returns:
         DataFrame with transformed ID columns
     """
-    df = df.copy()
-
-    def transform_id(x, file_id):
-        """Transform a single ID value with file_id prefix"""
-        if pd.isna(x) or str(x).strip() == '':
-            return ''
-
-        # Try to convert to int for clean numeric IDs
-        try:
-            return f"{file_id}_{int(float(x))}"
-        except (ValueError, TypeError):
-            # For non-numeric values, still prefix but keep original value
-            return f"{file_id}_{x}"
+    # Shallow copy: replacing a column below never writes into df's arrays
+    df = df.copy(deep=False)
 
     for col in df.columns:
         # Skip file_id itself - it stays as the numeric file identifier
@@ -561,7 +705,7 @@ def prefix_id_columns(df: pd.DataFrame, file_id: int) -> pd.DataFrame:
 
         # Transform columns ending with _id
         if col.endswith('_id'):
-            df[col] = df[col].apply(lambda x: transform_id(x, file_id))
+            df[col] = _prefix_id_series(df[col], file_id)
 
     return df
 
@@ -596,12 +740,11 @@ def process_single_xer(xer_path: Path, file_id: int, verbose: bool = True) -> di
         if df is None or len(df) == 0:
             continue
 
-        # Add file_id as first column
-        df_with_id = df.copy()
-        df_with_id.insert(0, 'file_id', file_id)
+        # Add file_id as first column (the parser's frames are ours to modify)
+        df.insert(0, 'file_id', file_id)
 
         # Prefix all ID columns with file_id for uniqueness across files
-        df_with_id = prefix_id_columns(df_with_id, file_id)
+        df_with_id = prefix_id_columns(df, file_id)
 
         # Use lowercase table names for output files
         result[table_name.lower()] = df_with_id
@@ -700,7 +843,10 @@ def batch_process(
             print("Filter: All schedule types")
 
     # In incremental mode, filter out already processed files
+    known_files = None
     if incremental and processed_files:
+        # Hash legacy rows first, so the backfill is kept even if nothing new is ingested
+        known_files = load_known_xer_files(output_dir, XER_DIR, persist=not dry_run, verbose=verbose)
         original_count = len(files_to_process)
         files_to_process = files_to_process[~files_to_process['filename'].isin(processed_files)]
         if verbose:
@@ -722,8 +868,32 @@ def batch_process(
             )
             return {}
 
+    # Skip files whose content was already ingested (re-exports under a new name)
+    files_to_process = add_xer_hashes(files_to_process, XER_DIR, verbose=verbose)
+    files_to_process, aliases = split_duplicate_xer_files(files_to_process, known_files, verbose=verbose)
+    files_skipped += len(aliases)
+
+    if incremental and processed_files and len(files_to_process) == 0:
+        print(f"\nNo new files to process ({len(aliases)} identical re-export(s) aliased).")
+        if not dry_run:
+            save_xer_aliases(output_dir, aliases, append=True)
+        SyncLog.log(
+            pipeline="primavera",
+            sync_type=SyncType.DRY_RUN if dry_run else SyncType.INCREMENTAL,
+            files_processed=0,
+            files_skipped=files_skipped,
+            records_before=records_before,
+            records_after=records_before,
+            duration_seconds=time.time() - start_time,
+            status="no_change",
+            message=f"{len(aliases)} identical re-exports aliased"
+        )
+        return {}
+
     if verbose:
         print(f"Files to process: {len(files_to_process)}")
+        if len(aliases) > 0:
+            print(f"Aliased (identical content): {len(aliases)}")
 
     # Reassign sequential file_ids after filtering
     # In incremental mode, continue from max existing file_id
@@ -737,6 +907,10 @@ def batch_process(
         if verbose:
             print(f"Assigned file_ids: 1-{len(files_to_process)}")
 
+    # Duplicates within this batch point at the file_id just assigned to their original
+    new_ids = dict(zip(files_to_process['filename'], files_to_process['file_id']))
+    aliases['file_id'] = aliases['file_id'].fillna(aliases['alias_of'].map(new_ids))
+
     if verbose:
         print()
 
@@ -748,6 +922,8 @@ def batch_process(
             print(f"  [{row['file_id']:3}] {row['filename']} ({row['date']}) - {row['schedule_type']}")
         print("-" * 60)
         print(f"Total: {len(files_to_process)} files")
+        for _, row in aliases.iterrows():
+            print(f"  [alias of {int(row['file_id']):3}] {row['filename']} ({row['match_type']} hash)")
 
         # Log the dry run
         SyncLog.log(
@@ -806,23 +982,30 @@ def batch_process(
     files_output = output_dir / "xer_files.csv"
     if incremental and processed_files and files_output.exists():
         # Append to existing xer_files.csv
-        existing_files = pd.read_csv(files_output)
-        combined_files = pd.concat([existing_files, files_to_process], ignore_index=True)
+        combined_files = pd.concat([known_files, files_to_process], ignore_index=True)
         combined_files.to_csv(files_output, index=False)
+        all_files = combined_files
         if verbose:
             print(f"Saving {len(all_tables) + 1} tables (incremental append)...")
             print("-" * 60)
             print(f"✓ xer_files.csv ({len(combined_files)} rows, +{len(files_to_process)} new)")
     else:
         files_to_process.to_csv(files_output, index=False)
+        all_files = files_to_process
         if verbose:
             print(f"Saving {len(all_tables) + 1} tables...")
             print("-" * 60)
             print(f"✓ xer_files.csv ({len(files_to_process)} rows)")
     output_files['xer_files'] = files_output
+    output_files['xer_file_aliases'] = save_xer_aliases(
+        output_dir, aliases, append=bool(incremental and processed_files)
+    )
+    if verbose and len(aliases) > 0:
+        print(f"✓ {ALIASES_FILENAME} (+{len(aliases)} aliased re-exports)")
 
     # 2. Save all other tables (keep tables needed for taxonomy generation)
     tasks_combined = None
+    taskpred_combined = None
     wbs_combined = None
     taskactv_combined = None
     actvcode_combined = None
@@ -848,6 +1031,8 @@ def batch_process(
             # Keep tables for taxonomy generation
             if table_name == 'task':
                 tasks_combined = combined
+            elif table_name == 'taskpred':
+                taskpred_combined = combined
             elif table_name == 'taskactv':
                 taskactv_combined = combined
             elif table_name == 'actvcode':
@@ -883,7 +1068,21 @@ def batch_process(
         if verbose:
             print(f"✓ p6_task_taxonomy.csv ({len(taxonomy_df):,} rows) -> {Settings.PRIMAVERA_PROCESSED_DIR}")
 
-    # 4. Add task code versions (tracks task evolution across schedule versions)
+    # 4. Materialize snapshot-to-snapshot deltas (only new pairs in incremental mode)
+    if tasks_combined is not None and taskpred_combined is not None:
+        if verbose:
+            print()
+        delta_files = update_schedule_deltas(
+            output_dir,
+            all_files,
+            tasks_combined,
+            taskpred_combined,
+            rebuild=not (incremental and processed_files),
+            verbose=verbose
+        )
+        output_files.update(delta_files)
+
+    # 5. Add task code versions (tracks task evolution across schedule versions)
     if 'task' in output_files:
         if verbose:
             print()
@@ -125,6 +125,10 @@ case "${1:-help}" in
         echo "Taxonomy Options (passed to generate_task_taxonomy.py):"
         echo "  --latest-only       Only process the latest YATES schedule"
         echo "  --skip-location-id  Skip adding dim_location_id column"
+        echo "  --incremental       Only add schedule versions not yet in the taxonomy"
+        echo ""
+        echo "CSI Options (passed to add_csi_to_p6_tasks.py):"
+        echo "  --incremental       Only infer CSI sections for newly added versions"
         echo ""
         echo "Output Files:"
         echo "  processed/primavera/p6_task_taxonomy.csv - Final taxonomy with:"
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Snapshot-to-Snapshot Schedule Delta Tables
+
+Materializes the differences between consecutive XER snapshots of the same
+schedule type so that consumers comparing schedule versions can look up a
+precomputed diff instead of rebuilding it from task.csv/taskpred.csv.
+
+Tasks are matched across snapshots by task_code (task_id is a per-export
+database key and changes between files).
+
+Output Tables (in the processed primavera directory):
+- schedule_delta_pairs.csv - One row per consecutive snapshot pair with change counts
+- task_delta.csv           - Tasks added, removed, or changed (with changed field names)
+- taskpred_delta.csv       - Relationships added or removed, as (pred_task_code, task_code, pred_type)
+
+Snapshots are ordered by (date, file_id) within each schedule_type; files
+without a date are skipped. In incremental mode only pairs that are new or no
+longer consecutive are recomputed; existing pairs are kept as-is.
+
+Usage:
+    python scripts/primavera/process/schedule_deltas.py            # Update deltas
+    python scripts/primavera/process/schedule_deltas.py --rebuild  # Recompute all pairs
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config.settings import Settings
+
+PAIRS_FILENAME = 'schedule_delta_pairs.csv'
+TASK_DELTA_FILENAME = 'task_delta.csv'
+TASKPRED_DELTA_FILENAME = 'taskpred_delta.csv'
+
+# Task fields compared between snapshots. ID columns (wbs_id, clndr_id, ...)
+# are file-prefixed and always differ, so they are not compared.
+TASK_DELTA_FIELDS = [
+    'task_name', 'status_code', 'task_type', 'phys_complete_pct',
+    'early_start_date', 'early_end_date', 'late_start_date', 'late_end_date',
+    'target_start_date', 'target_end_date', 'act_start_date', 'act_end_date',
+    'total_float_hr_cnt', 'free_float_hr_cnt', 'remain_drtn_hr_cnt',
+    'target_drtn_hr_cnt', 'driving_path_flag', 'cstr_type', 'cstr_date',
+]
+
+PAIR_COLUMNS = [
+    'schedule_type', 'file_id_prev', 'file_id_curr',
+    'tasks_added', 'tasks_removed', 'tasks_changed',
+    'relationships_added', 'relationships_removed',
+]
+TASK_DELTA_COLUMNS = [
+    'file_id_prev', 'file_id_curr', 'task_code', 'change_type', 'changed_fields',
+    'task_id_prev', 'task_id_curr',
+]
+TASKPRED_DELTA_COLUMNS = [
+    'file_id_prev', 'file_id_curr', 'pred_task_code', 'task_code', 'pred_type', 'change_type',
+]
+
+
+def ordered_snapshots(files_df: pd.DataFrame, schedule_type: str | None = None) -> pd.DataFrame:
+    """
+    Snapshots in chronological order, by (schedule_type, date, file_id).
+
+    Args:
+        files_df: xer_files table (file_id, date, schedule_type)
+        schedule_type: Keep only this schedule type (default: all)
+
+    Returns:
+        DataFrame with columns file_id, date, schedule_type, snapshot_date;
+        files without a date are dropped
+    """
+    files = files_df[['file_id', 'date', 'schedule_type']].copy()
+    if schedule_type is not None:
+        files = files[files['schedule_type'] == schedule_type]
+    files['snapshot_date'] = pd.to_datetime(files['date'], format='mixed', errors='coerce')
+    files = files[files['snapshot_date'].notna()]
+    return files.sort_values(['schedule_type', 'snapshot_date', 'file_id'])
+
+
+def consecutive_pairs(files_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pair each snapshot with the previous snapshot of the same schedule type.
+
+    Args:
+        files_df: xer_files table (file_id, date, schedule_type)
+
+    Returns:
+        DataFrame with columns schedule_type, file_id_prev, file_id_curr
+    """
+    files = ordered_snapshots(files_df)
+    files['file_id_prev'] = files.groupby('schedule_type')['file_id'].shift()
+    pairs = files[files['file_id_prev'].notna()]
+
+    return pd.DataFrame({
+        'schedule_type': pairs['schedule_type'].values,
+        'file_id_prev': pairs['file_id_prev'].astype(int).values,
+        'file_id_curr': pairs['file_id'].astype(int).values,
+    })
+
+
+def _task_codes(tasks: pd.DataFrame) -> pd.DataFrame:
+    """Tasks keyed by task_code; rows without a code are dropped, first duplicate wins."""
+    tasks = tasks[tasks['task_code'].notna()].copy()
+    tasks['task_code'] = tasks['task_code'].astype(str)
+    return tasks.drop_duplicates('task_code')
+
+
+def _is_missing(values: pd.Series) -> pd.Series:
+    """NaN and empty strings are both missing (parser output vs. CSV round trip)."""
+    return values.isna() | (values.astype(str) == '')
+
+
+def _values_differ(prev: pd.Series, curr: pd.Series) -> np.ndarray:
+    """
+    Compare one field across matched tasks.
+
+    Values may come from XERParser (strings) or from a CSV round trip (numbers),
+    so numeric values are compared as numbers and everything else as strings.
+    """
+    missing_prev = _is_missing(prev).to_numpy()
+    missing_curr = _is_missing(curr).to_numpy()
+
+    num_prev = pd.to_numeric(prev, errors='coerce').to_numpy(dtype=float)
+    num_curr = pd.to_numeric(curr, errors='coerce').to_numpy(dtype=float)
+    both_numeric = ~np.isnan(num_prev) & ~np.isnan(num_curr)
+
+    differ = np.where(
+        both_numeric,
+        num_prev != num_curr,
+        prev.astype(str).to_numpy() != curr.astype(str).to_numpy(),
+    )
+    return np.where(missing_prev | missing_curr, missing_prev != missing_curr, differ)
+
+
+def diff_tasks(tasks_prev: pd.DataFrame, tasks_curr: pd.DataFrame,
+               fields: list[str] | None = None) -> pd.DataFrame:
+    """
+    Diff the tasks of two snapshots by task_code.
+
+    Args:
+        tasks_prev: Task rows of the earlier snapshot
+        tasks_curr: Task rows of the later snapshot
+        fields: Fields to compare (default: TASK_DELTA_FIELDS present in both)
+
+    Returns:
+        DataFrame with columns task_code, change_type ('added', 'removed',
+        'changed'), changed_fields (';'-separated, changed rows only),
+        task_id_prev, task_id_curr. Unchanged tasks are omitted.
+    """
+    if fields is None:
+        fields = TASK_DELTA_FIELDS
+    fields = [f for f in fields if f in tasks_prev.columns and f in tasks_curr.columns]
+
+    cols = ['task_code', 'task_id'] + fields
+    merged = pd.merge(
+        _task_codes(tasks_prev)[cols],
+        _task_codes(tasks_curr)[cols],
+        on='task_code',
+        suffixes=('_prev', '_curr'),
+        how='outer',
+        indicator=True,
+    )
+
+    both = merged['_merge'] == 'both'
+    common = merged[both]
+    changed_fields = pd.Series('', index=common.index, dtype=object)
+    for field in fields:
+        differ = _values_differ(common[f'{field}_prev'], common[f'{field}_curr'])
+        changed_fields = changed_fields.where(~differ, changed_fields + field + ';')
+    changed_fields = changed_fields.str.rstrip(';')
+
+    change_type = pd.Series(
+        np.select(
+            [merged['_merge'] == 'right_only', merged['_merge'] == 'left_only'],
+            ['added', 'removed'],
+            default='changed',
+        ),
+        index=merged.index,
+    )
+    result = pd.DataFrame({
+        'task_code': merged['task_code'],
+        'change_type': change_type,
+        'changed_fields': changed_fields.reindex(merged.index, fill_value=''),
+        'task_id_prev': merged['task_id_prev'],
+        'task_id_curr': merged['task_id_curr'],
+    })
+    keep = ~both | (result['changed_fields'] != '')
+    return result[keep].sort_values('task_code').reset_index(drop=True)
+
+
+def relationship_keys(taskpred: pd.DataFrame, tasks: pd.DataFrame) -> pd.DataFrame:
+    """
+    Translate one snapshot's relationships to task_code keys.
+
+    Returns:
+        Distinct (pred_task_code, task_code, pred_type) rows; relationships
+        whose tasks have no task_code are dropped.
+    """
+    coded = tasks[tasks['task_code'].notna()]
+    id_to_code = pd.Series(coded['task_code'].astype(str).values, index=coded['task_id'].astype(str).values)
+    id_to_code = id_to_code[~id_to_code.index.duplicated(keep='last')]
+
+    rels = pd.DataFrame({
+        'pred_task_code': taskpred['pred_task_id'].astype(str).map(id_to_code),
+        'task_code': taskpred['task_id'].astype(str).map(id_to_code),
+        'pred_type': taskpred['pred_type'],
+    })
+    rels = rels[rels['pred_task_code'].notna() & rels['task_code'].notna()]
+    return rels.drop_duplicates().reset_index(drop=True)
+
+
+def diff_relationships(taskpred_prev: pd.DataFrame, tasks_prev: pd.DataFrame,
+                       taskpred_curr: pd.DataFrame, tasks_curr: pd.DataFrame) -> pd.DataFrame:
+    """
+    Diff the relationships of two snapshots by task_code.
+
+    Returns:
+        DataFrame with columns pred_task_code, task_code, pred_type,
+        change_type ('added' or 'removed')
+    """
+    keys = ['pred_task_code', 'task_code', 'pred_type']
+    merged = pd.merge(
+        relationship_keys(taskpred_prev, tasks_prev),
+        relationship_keys(taskpred_curr, tasks_curr),
+        on=keys,
+        how='outer',
+        indicator=True,
+    )
+    merged = merged[merged['_merge'] != 'both']
+    merged['change_type'] = np.where(merged['_merge'] == 'right_only', 'added', 'removed')
+    return merged[keys + ['change_type']].sort_values(keys).reset_index(drop=True)
+
+
+def build_schedule_deltas(
+    pairs: pd.DataFrame,
+    tasks_df: pd.DataFrame,
+    taskpred_df: pd.DataFrame,
+    verbose: bool = True
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Compute delta tables for the given snapshot pairs.
+
+    Args:
+        pairs: DataFrame with schedule_type, file_id_prev, file_id_curr
+        tasks_df: Task table covering every file_id in pairs
+        taskpred_df: Relationship table covering every file_id in pairs
+
+    Returns:
+        Tuple of (pairs with change counts, task delta, taskpred delta)
+    """
+    needed = set(pairs['file_id_prev']) | set(pairs['file_id_curr'])
+    tasks_by_file = {
+        int(fid): group for fid, group in tasks_df[tasks_df['file_id'].isin(needed)].groupby('file_id')
+    }
+    preds_by_file = {
+        int(fid): group for fid, group in taskpred_df[taskpred_df['file_id'].isin(needed)].groupby('file_id')
+    }
+    empty_tasks = tasks_df.iloc[0:0]
+    empty_preds = taskpred_df.iloc[0:0]
+
+    pair_rows, task_deltas, pred_deltas = [], [], []
+    for pair in pairs.itertuples(index=False):
+        prev, curr = int(pair.file_id_prev), int(pair.file_id_curr)
+        tasks_prev = tasks_by_file.get(prev, empty_tasks)
+        tasks_curr = tasks_by_file.get(curr, empty_tasks)
+
+        task_delta = diff_tasks(tasks_prev, tasks_curr)
+        pred_delta = diff_relationships(
+            preds_by_file.get(prev, empty_preds), tasks_prev,
+            preds_by_file.get(curr, empty_preds), tasks_curr,
+        )
+        task_delta.insert(0, 'file_id_curr', curr)
+        task_delta.insert(0, 'file_id_prev', prev)
+        pred_delta.insert(0, 'file_id_curr', curr)
+        pred_delta.insert(0, 'file_id_prev', prev)
+
+        task_counts = task_delta['change_type'].value_counts()
+        pred_counts = pred_delta['change_type'].value_counts()
+        pair_rows.append({
+            'schedule_type': pair.schedule_type,
+            'file_id_prev': prev,
+            'file_id_curr': curr,
+            'tasks_added': int(task_counts.get('added', 0)),
+            'tasks_removed': int(task_counts.get('removed', 0)),
+            'tasks_changed': int(task_counts.get('changed', 0)),
+            'relationships_added': int(pred_counts.get('added', 0)),
+            'relationships_removed': int(pred_counts.get('removed', 0)),
+        })
+        task_deltas.append(task_delta)
+        pred_deltas.append(pred_delta)
+
+        if verbose:
+            print(f"  [{prev:3} -> {curr:3}] tasks +{pair_rows[-1]['tasks_added']} "
+                  f"-{pair_rows[-1]['tasks_removed']} ~{pair_rows[-1]['tasks_changed']}, "
+                  f"relationships +{pair_rows[-1]['relationships_added']} "
+                  f"-{pair_rows[-1]['relationships_removed']}")
+
+    return (
+        pd.DataFrame(pair_rows, columns=PAIR_COLUMNS),
+        pd.concat(task_deltas, ignore_index=True) if task_deltas else pd.DataFrame(columns=TASK_DELTA_COLUMNS),
+        pd.concat(pred_deltas, ignore_index=True) if pred_deltas else pd.DataFrame(columns=TASKPRED_DELTA_COLUMNS),
+    )
+
+
+def _read_existing(path: Path, columns: list[str]) -> pd.DataFrame:
+    """Read an existing delta table, or an empty frame if missing."""
+    if not path.exists():
+        return pd.DataFrame(columns=columns)
+    return pd.read_csv(path, dtype={'task_code': str, 'pred_task_code': str, 'changed_fields': str},
+                       keep_default_na=False, na_values={'task_id_prev': [''], 'task_id_curr': ['']})
+
+
+def _keep_pairs(df: pd.DataFrame, pairs: pd.DataFrame) -> pd.DataFrame:
+    """Rows of a delta table whose (file_id_prev, file_id_curr) is in pairs."""
+    keys = pd.MultiIndex.from_frame(pairs[['file_id_prev', 'file_id_curr']])
+    mask = pd.MultiIndex.from_frame(df[['file_id_prev', 'file_id_curr']].astype(int)).isin(keys)
+    return df[mask]
+
+
+def update_schedule_deltas(
+    output_dir: Path,
+    files_df: pd.DataFrame,
+    tasks_df: pd.DataFrame,
+    taskpred_df: pd.DataFrame,
+    rebuild: bool = False,
+    verbose: bool = True
+) -> dict[str, Path]:
+    """
+    Bring the delta tables in output_dir up to date with files_df.
+
+    Pairs already present in schedule_delta_pairs.csv that are still
+    consecutive are kept; only new pairs (e.g. from a newly ingested XER) are
+    computed. Pairs that are no longer consecutive are dropped.
+
+    Args:
+        output_dir: Processed primavera directory
+        files_df: Full xer_files table (existing + new files)
+        tasks_df: Full task table
+        taskpred_df: Full taskpred table
+        rebuild: Recompute every pair (use after file_ids are reassigned)
+        verbose: Print progress messages
+
+    Returns:
+        Dict mapping delta table name to output file path
+    """
+    output_dir = Path(output_dir)
+    paths = {
+        'schedule_delta_pairs': output_dir / PAIRS_FILENAME,
+        'task_delta': output_dir / TASK_DELTA_FILENAME,
+        'taskpred_delta': output_dir / TASKPRED_DELTA_FILENAME,
+    }
+
+    wanted = consecutive_pairs(files_df)
+    if rebuild or not all(p.exists() for p in paths.values()):
+        existing_pairs = pd.DataFrame(columns=PAIR_COLUMNS)
+        existing_tasks = pd.DataFrame(columns=TASK_DELTA_COLUMNS)
+        existing_preds = pd.DataFrame(columns=TASKPRED_DELTA_COLUMNS)
+    else:
+        existing_pairs = _keep_pairs(pd.read_csv(paths['schedule_delta_pairs']), wanted)
+        existing_tasks = _keep_pairs(_read_existing(paths['task_delta'], TASK_DELTA_COLUMNS), existing_pairs)
+        existing_preds = _keep_pairs(_read_existing(paths['taskpred_delta'], TASKPRED_DELTA_COLUMNS), existing_pairs)
+
+    todo = wanted[~pd.MultiIndex.from_frame(wanted[['file_id_prev', 'file_id_curr']]).isin(
+        pd.MultiIndex.from_frame(existing_pairs[['file_id_prev', 'file_id_curr']].astype(int))
+    )]
+
+    if verbose:
+        print(f"Schedule deltas: {len(wanted)} consecutive pairs, "
+              f"{len(existing_pairs)} up to date, {len(todo)} to compute")
+
+    new_pairs, new_tasks, new_preds = build_schedule_deltas(todo, tasks_df, taskpred_df, verbose=verbose)
+
+    sort_keys = ['schedule_type', 'file_id_curr']
+    pairs_out = pd.concat([existing_pairs, new_pairs], ignore_index=True).sort_values(sort_keys)
+    order = {fid: i for i, fid in enumerate(pairs_out['file_id_curr'])}
+
+    tables = {
+        'schedule_delta_pairs': pairs_out,
+        'task_delta': pd.concat([existing_tasks, new_tasks], ignore_index=True),
+        'taskpred_delta': pd.concat([existing_preds, new_preds], ignore_index=True),
+    }
+    for name in ('task_delta', 'taskpred_delta'):
+        table = tables[name]
+        rank = table['file_id_curr'].astype(int).map(order)
+        tables[name] = table.iloc[np.argsort(rank.to_numpy(), kind='stable')]
+
+    for name, table in tables.items():
+        table.to_csv(paths[name], index=False)
+        if verbose:
+            print(f"✓ {paths[name].name} ({len(table):,} rows)")
+
+    return paths
+
+
+def load_schedule_deltas(data_dir: Path | None = None) -> dict[str, pd.DataFrame] | None:
+    """
+    Load the delta tables written by update_schedule_deltas.
+
+    Returns:
+        Dict with 'pairs', 'task_delta' and 'taskpred_delta' DataFrames,
+        or None if the tables have not been generated.
+    """
+    data_dir = Path(data_dir) if data_dir is not None else Settings.PRIMAVERA_PROCESSED_DIR
+    paths = [data_dir / PAIRS_FILENAME, data_dir / TASK_DELTA_FILENAME, data_dir / TASKPRED_DELTA_FILENAME]
+    if not all(p.exists() for p in paths):
+        return None
+
+    return {
+        'pairs': pd.read_csv(paths[0]),
+        'task_delta': _read_existing(paths[1], TASK_DELTA_COLUMNS),
+        'taskpred_delta': _read_existing(paths[2], TASKPRED_DELTA_COLUMNS),
+    }
+
+
+def relationship_changes(deltas: dict[str, pd.DataFrame] | None,
+                         file_id_prev: int, file_id_curr: int) -> dict | None:
+    """
+    Look up the relationship changes between two snapshots.
+
+    Returns:
+        dict in the format of ScheduleSlippageAnalyzer._compare_relationships,
+        or None if the pair is not in the delta tables.
+    """
+    if deltas is None:
+        return None
+    pairs = deltas['pairs']
+    if not ((pairs['file_id_prev'] == file_id_prev) & (pairs['file_id_curr'] == file_id_curr)).any():
+        return None
+
+    rels = deltas['taskpred_delta']
+    rels = rels[(rels['file_id_prev'] == file_id_prev) & (rels['file_id_curr'] == file_id_curr)]
+    added = rels[rels['change_type'] == 'added']
+    removed = rels[rels['change_type'] == 'removed']
+
+    return {
+        'added_relationships': list(zip(added['pred_task_code'], added['task_code'], added['pred_type'])),
+        'removed_relationships': list(zip(removed['pred_task_code'], removed['task_code'], removed['pred_type'])),
+        'tasks_with_new_preds': set(added['task_code']),
+        'tasks_with_removed_preds': set(removed['task_code']),
+        'new_pred_count': added['task_code'].value_counts().to_dict(),
+    }
+
+
+def main():
+    """Main entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Build snapshot-to-snapshot schedule delta tables')
+    parser.add_argument('--data-dir', type=Path, default=Settings.PRIMAVERA_PROCESSED_DIR,
+                        help=f'Processed primavera directory (default: {Settings.PRIMAVERA_PROCESSED_DIR})')
+    parser.add_argument('--rebuild', action='store_true', help='Recompute all snapshot pairs')
+    parser.add_argument('--quiet', '-q', action='store_true', help='Suppress progress messages')
+    args = parser.parse_args()
+
+    files_df = pd.read_csv(args.data_dir / 'xer_files.csv')
+    tasks_df = pd.read_csv(args.data_dir / 'task.csv', low_memory=False)
+    taskpred_df = pd.read_csv(args.data_dir / 'taskpred.csv', low_memory=False)
+
+    update_schedule_deltas(args.data_dir, files_df, tasks_df, taskpred_df,
+                           rebuild=args.rebuild, verbose=not args.quiet)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -10,11 +10,62 @@ Usage:
     classifier = TaskClassifier()
     result = classifier.classify_task(task_name, wbs_name)
     # Returns: {'phase': 'INT', 'scope': 'DRY', 'loc_type': 'RM', 'loc_id': 'FAB146103', 'label': 'INT-DRY|RM:FAB146103'}
+
+    # Whole columns: one row per task, same keys as classify_task()
+    df = classifier.classify_tasks(tasks['task_name'], wbs_names)
+
+Rules are ordered tables (PHASE_SCOPE_PATTERNS, LOCATION_PATTERNS, ...) compiled
+once per class; the first rule found wins.
 """
 
 import re
 from typing import Dict, Optional, Tuple
 
+import numpy as np
+import pandas as pd
+
+
+class RuleCascade:
+    """
+    Ordered (pattern, value) rules, compiled once; the first rule found wins.
+
+    first() is the precompiled form of a loop of re.search calls in rule
+    order. indices() applies the same cascade to a whole Series: each rule
+    runs as one vectorized str.contains over the texts no earlier rule matched.
+
+    Example:
+        >>> cascade = RuleCascade([(r'CRANE|HOIST', 'CRANE'), (r'HOLD\\b', 'HOLD')])
+        >>> cascade.first('WAITING ON HOIST')
+        'CRANE'
+    """
+
+    def __init__(self, rules: list):
+        """
+        Args:
+            rules: (regex_pattern, value) pairs in priority order
+        """
+        self.regexes = [re.compile(pattern) for pattern, _ in rules]
+        self.values = [value for _, value in rules]
+
+    def first(self, text: str, default=None):
+        """Value of the first rule found in text, or default."""
+        for regex, value in zip(self.regexes, self.values):
+            if regex.search(text):
+                return value
+        return default
+
+    def indices(self, texts: pd.Series) -> np.ndarray:
+        """Position of the first rule found in each text (-1 if none), as an int array."""
+        found = np.full(len(texts), -1, dtype=np.int64)
+        pending = np.arange(len(texts))
+        for i, regex in enumerate(self.regexes):
+            if len(pending) == 0:
+                break
+            matched = texts.iloc[pending].str.contains(regex).to_numpy(dtype=bool)
+            found[pending[matched]] = i
+            pending = pending[~matched]
+        return found
+
 
 class TaskClassifier:
     """Classifier for YATES schedule tasks based on WBS taxonomy."""
@@ -152,6 +203,74 @@ class TaskClassifier:
         'OTHER': 'Other/Unclassified',
     }
 
+    # Primary phase/scope patterns, checked in order against the task name
+    # Format: (regex_pattern, (phase, scope)); the first pattern found wins.
+    # Rules with an exclusion are anchored at the start of the name so their
+    # lookaheads see the whole name.
+    PHASE_SCOPE_PATTERNS = [
+        # ============ PRE-CONSTRUCTION ============
+        (r'SUBCONTRACT|AWARD|BUYOUT|BID(?:DING)?\b|EXECUTE.*CONTRACT|CONTRACT AGREEMENT', ('PRE', 'PRO')),  # Procurement
+        (r'SHOP DRAWING|SUBMITTAL|RFA\b|APPROV|REVIEW|JACOBS|RFI|FIELD MEASURE|RESPONSE|ARCHITECTURAL SET', ('PRE', 'SUB')),  # Submittals
+        (r'FABRICAT|LEAD TIME|DELIVER(?!Y)|CONSOLIDATED SET|MOCKUP|FAB &|MATERIAL.*ORDER|^ORDER\s', ('PRE', 'FAB')),  # Fabrication
+        (r'DESIGN|ENGINEER|RESOLVE.*ISSUE|RELEASE FOR FAB|IF[CR]\b|ISSUED FOR|DWG ISSUED|MATERIAL SCHEDULE', ('PRE', 'DES')),  # Design
+
+        # ============ STRUCTURE ============
+        (r'PIER|DRILL|CAISSON', ('STR', 'PIR')),  # Piers
+        (r'FOUNDATION|FOOTING|GRADE BEAM', ('STR', 'FND')),  # Foundations
+        (r'UNDERGROUND|U/G\b|FRENCH DRAIN|EXCAVATE|BACKFILL|LOADING DOCK.*FILL', ('STR', 'UGD')),  # Underground
+        (r'SLAB|POUR\b|CURE\b|SOMD|FRP\b|CONCRETE|WAFFLE|CURB|EQPT PAD|F/R/P|CIP\b|KNEE WALL|GROUT|PATCH|OAC PAD|VIBRATION\s*PAD', ('STR', 'CIP')),  # Cast-in-Place
+        (r'COLUMN.*(?:PRIME|COAT|GRIND)|(?:PRIME|COAT|GRIND).*COLUMN|SEALER|DENSIFIER|CRC\b', ('STR', 'CTG')),  # Structural Coating
+        (r'DECKING|DECK\b|DS/AD|DETAILING|DETAINING|GIRDER|TRUSS|ERECT.*STEEL|ANCHOR BOLT|GOAL POST|CLIP|EMBED|HEADER|BASE.?PLATE|MODIFY.*PATRIOT|FLANGE EXTENSION', ('STR', 'STL')),  # Structural Steel
+        (r'BEAM|JOIST|PURLIN|GIRT|BRACING|BRIDGING', ('STR', 'STL')),  # Structural Steel - beams and supports
+        (r'SUPPORT\s*STEEL|MISC\.?\s*STEEL|ADD(?:ITIONAL)?\s*STEEL', ('STR', 'MSC')),  # Misc Steel
+        (r'^(?![\s\S]*(?:STUD|STAIR))[\s\S]*STEEL', ('STR', 'STL')),  # Structural Steel (catch-all, not studs/stairs)
+        (r'PRECAST|PC\b.*ERECT', ('STR', 'PRC')),  # Precast
+        (r'GRATING|PLATFORM(?!.*SCAFFOLD)|RAMP(?!.*CRANE)', ('STR', 'MSC')),  # Misc Steel
+        (r'PIPE\s*RACK|PIPERACK', ('STR', 'MSC')),  # Misc Steel - pipe rack structures
+
+        # ============ ENCLOSURE ============
+        (r'ROOF(?!.*DECK)|ROOFING|MEMBRANE|PARAPET', ('ENC', 'ROF')),  # Roofing
+        (r'METAL PANEL|IMP\b|INSULATED PANEL|SHEATHING|CANOPY|ACM PANEL|CLADDING', ('ENC', 'PNL')),  # Panels
+        (r'WATERPROOF|DAMPPROOF|DRAIN MAT|WEEP TUBE', ('ENC', 'WPF')),  # Waterproofing
+        (r'WINDOW|GLAZING|CURTAIN WALL|STOREFRONT', ('ENC', 'GLZ')),  # Glazing
+        (r'EXTERIOR.*(?:COAT|PAINT)|(?:COAT|PAINT).*EXTERIOR|PRIME.*COAT|COAT.*TOP', ('ENC', 'CTG')),  # Exterior Coating
+        (r'LOUVER|PENTHOUSE|BREEZEWAY|AWNING', ('ENC', 'MSC')),  # Misc Enclosure
+
+        # ============ INTERIOR ============
+        (r'METAL STUD|FRAMING|STUD FRAME', ('INT', 'FRM')),  # Framing
+        (r'DRYWALL|TAPE.*FINISH|GYPSUM|BOARD\b|SHEETROCK|TAPE\s*&\s*FLOAT', ('INT', 'DRY')),  # Drywall
+        (r'^(?![\s\S]*(?:FIRE|UNDERGROUND))[\s\S]*?(?:MEP|ROUGH.?IN|CONDUIT|ELECTRICAL|PLUMB(?!ING.*UNDER))', ('INT', 'MEP')),  # MEP Rough-in
+        (r'FIRE(?!PROOF)|SPRINKLER|CAULK|FIRESTOP|SMOKE', ('INT', 'FIR')),  # Fire Protection
+        (r'PAINT(?!.*COLUMN)|TILE\b|FLOORING|CEILING(?!.*SYSTEM)|FINISH(?!.*DRYWALL)|CONTROL JOINT|EPOXY|VCT|ACCESS FLOOR|FLOOR STRIP|STRIPING|JOINT SEALANT|ALUMINIUM COVER|EMSEAL|EXPANSION JOINT', ('INT', 'FIN')),  # Finishes
+        (r'DOOR|FRAME(?!.*STUD)|HARDWARE|HOLLOW METAL|DOCK LOCK|DOCK GUARDIAN', ('INT', 'DOR')),  # Doors & Hardware
+        (r'WALL PROTECTION|CORNER GUARD|ACCESSORI|TOILET PARTITION|SIGNAGE|EXPANSION.*CONTROL|DOCK LEVELER|PEDESTAL.*LAM|DIV\s*10|SPECIALIT|PVC\s*ANGLE', ('INT', 'SPE')),  # Specialties
+        (r'INSULATION|INSUL\b', ('INT', 'INS')),  # Insulation
+        (r'ELEVATOR(?!.*STEEL)|ELEV\b', ('INT', 'ELV')),  # Elevators
+        # Stair patterns: catch metal stairs, but exclude pure steel erection tasks
+        (r'METAL\s*STAIR|STAIR.*INSTALL|INSTALL.*STAIR', ('INT', 'STR')),  # Interior Stairs (metal stair installation)
+        (r'STAIR(?!.*ERECT)(?!.*STEEL\s*TRUSS)', ('INT', 'STR')),  # Stairs (but not stair steel erection)
+        # Special rooms: finishing work in them is Finishes, anything else Misc Interior
+        (r'^(?=[\s\S]*?(?:VESTIBULE|BATHROOM|TOILET|RESTROOM|CLEAN ROOM|DUCT SHAFT|AIR.?LOCK|BUNKER|I/?O\s*R[O]?M))'
+         r'[\s\S]*?(?:CONTROL JOINT|FINISH|INSPECT|TAPE|FLOAT)', ('INT', 'FIN')),
+        (r'VESTIBULE|BATHROOM|TOILET|RESTROOM|CLEAN ROOM|DUCT SHAFT|AIR.?LOCK|BUNKER|I/?O\s*R[O]?M', ('INT', 'MSC')),
+
+        # ============ COMMISSIONING ============
+        (r'TEST(?!ING.*IMPACT)|COMMISSION|ENERGIZE|START.?UP|PUNCH|INPSECTION|INSPECTION', ('COM', 'TST')),  # Testing
+        (r'TURNOVER|SUBSTANTIAL|HANDOVER|BENEFICIAL', ('COM', 'TRN')),  # Turnover
+
+        # ============ ADMINISTRATIVE ============
+        (r'^OWNER|^SECAI|^GC\s|^YATES', ('ADM', 'OWN')),  # Owner Activities
+        (r'PROPOSAL|NEGOTIAT|SETTLEMENT|CLAIM|DISPUTE|RESOLUTION|MEDIAT', ('ADM', 'OWN')),  # Owner Activities - commercial/contractual
+        (r'IMPACT|DELAY|HOLD\b|WAITING|REWORK|REMEDIATION|REMIDIATION|PENDING', ('ADM', 'IMP')),  # Impacts/Delays
+        (r'MILESTONE|COMPLETE$|TARGET', ('ADM', 'MIL')),  # Milestones
+        (r'PRIORITY|REMOBIL|OUT.?OF.?SEQUENCE|FRAGNET|IOCC|CATCH.?UP', ('ADM', 'TRK')),  # Tracking/Recovery
+        (r'^OPEN\s|^CLOSE\s|^RESOLVE\s|^SUBMIT\s(?!.*TAL)', ('ADM', 'TRK')),  # Tracking/Administrative actions
+        (r'SCAFFOLD|TEMP\b|TEMPORARY|PROTECTION|BARRICADE|HOIST|CRANE RAMP|TOWER CRANE', ('ADM', 'TMP')),  # Temporary Works
+
+        # ============ CATCH-ALL (Primary) ============
+        (r'^INSTALL\b', ('INT', 'MSC')),
+    ]
+
     # Typo patterns - checked as fallback when main patterns don't match
     # Format: (regex_pattern, (phase, scope))
     TYPO_PATTERNS = [
@@ -197,6 +316,92 @@ class TaskClassifier:
         (r'SUBMITTAL|SHOP\s*DRAWING', ('PRE', 'SUB')),
     ]
 
+    # Generic action words - last resort when neither task name nor WBS match
+    ACTION_PATTERNS = [
+        # Generic installation defaults to interior misc
+        (r'^(?:INSTALL|ERECT|SET|PLACE|LAY|HANG|MOUNT|ATTACH)\b', ('INT', 'MSC')),
+        (r'^(?:COMPLETE|FINISH|FINAL|CLOSE.?OUT)\b', ('COM', 'TST')),  # Completion activities → Commissioning
+        (r'^(?:COORDINATE|SCHEDULE|PLAN|MANAGE|TRACK)\b', ('ADM', 'TRK')),  # Coordination → Administrative tracking
+    ]
+
+    # Building codes from task/WBS text, checked in order
+    # Word boundaries avoid matching inside words like "SUPPORT"
+    BUILDING_TEXT_PATTERNS = [
+        (r'\bWSUP\b|\bW[\-\s]?SUP\b|\bSUW\b', 'SUW'),
+        (r'\bESUP\b|\bE[\-\s]?SUP\b|\bSUE\b', 'SUE'),
+        (r'\bFIZ\b', 'FIZ'),
+        (r'\bCUB\b', 'CUB'),
+        (r'\bFAB\b', 'FAB'),
+        (r'\bGCS[\-\s]?A\b', 'GCSA'),
+        (r'\bGCS[\-\s]?B\b', 'GCSB'),
+        (r'\bGCS\b', 'GCS'),
+    ]
+
+    # Root cause of IMPACT tasks, checked in order (no match = OTHER)
+    ROOT_CAUSE_PATTERNS = [
+        (r'SCAFFOLD', 'SCAFFOLD'),
+        (r'CRANE|HOIST', 'CRANE'),
+        (r'CABLE\s*TRAY|CABLE.*OBSTRUCT', 'CABLE'),
+        (r'PIPE\s*RACK|PIPERACK', 'PIPERACK'),
+        (r'MATERIAL.*WAY|IN\s*THE\s*WAY', 'MATERIAL'),
+        (r'CCD|CHANGE\s*ORDER|ADDED\s*SCOPE', 'CHANGE'),
+        (r'REWORK|REMEDIAT|FIX(?:ES)?\b|REPAIR', 'REWORK'),
+        (r'STOP\s*WORK|ON\s*HOLD|HOLD\b', 'HOLD'),
+        (r'WAITING|AWAIT|PENDING', 'WAIT'),
+        (r'DESIGN|DRAWING|DWG|DETAIL', 'DESIGN'),
+        (r'BLOCK|OBSTRUCT|LEAVEOUT|EGRESS', 'OBSTRUCTION'),
+        (r'ACCESS|BLOCKED', 'ACCESS'),
+        (r'OUT.*SEQUENCE|SEQUENCE', 'SEQUENCE'),
+        (r'DEFECT|QUALITY|INSPECT', 'QUALITY'),
+    ]
+
+    # Location patterns in priority order: (text, pattern, loc_type, loc_id from groups)
+    # text is 'wbs', 'task' or 'combined' ("{task} {wbs}"). WBS FAB codes take
+    # precedence over task FAB codes (WBS structure is customer-facing).
+    LOCATION_PATTERNS = [
+        # 1. FAB Room Code (highest precision)
+        ('wbs', r'FAB1?(\d{5,6})', 'RM', lambda g: f"FAB1{g[0]}"),
+        ('task', r'FAB1?(\d{5,6})', 'RM', lambda g: f"FAB1{g[0]}"),
+        # 2. Elevator code - format as FAB1-EL## for consistency with WBS naming
+        ('combined', r'EL(?:EV(?:ATOR)?)?[\s\-]*(\d{1,2})', 'EL', lambda g: f"FAB1-EL{g[0].zfill(2)}"),
+        # 3. Stair code - format as FAB1-ST## for consistency with WBS naming
+        ('combined', r'ST(?:AIR)?[\s\-#]*(\d{1,2})', 'ST', lambda g: f"FAB1-ST{g[0].zfill(2)}"),
+        # 4. Gridline patterns
+        # Range: "GL 14-17", "17-18"
+        ('combined', r'GL[\s\-]*(\d+[\s\-]+\d+)', 'GL', lambda g: 'GL' + re.sub(r'\s+', '-', g[0])),
+        # Single: "GL 33", "GL5"
+        ('combined', r'\bGL[\s\-]?(\d{1,2})\b', 'GL', lambda g: f"GL{g[0]}"),
+        # Letter line: "A LINE", "B LINE"
+        ('combined', r'\b([A-N])\s*LINE\b', 'GL', lambda g: f"GL-{g[0]}"),
+        # Numeric range: "17-18", "13-9"
+        ('combined', r'\b(\d{1,2})[\s\-]+(\d{1,2})\b', 'GL', lambda g: f"GL{g[0]}-{g[1]}"),
+        # 5. Area patterns
+        # Penthouse: NE/NW/SE/SW PENTHOUSE
+        ('combined', r'\b(N[EW]|S[EW])\s*PENTHOUSE\b', 'AR', lambda g: f"PENT-{g[0]}"),
+        # Milestone areas: A1, B2, etc.
+        ('combined', r'\b([AB][\-\s]?[1-5])\b', 'AR', lambda g: g[0].replace(' ', '').replace('-', '')),
+        # Support zones: SEA1, SWA1, SWB1, SEB1 (with optional hyphen)
+        ('combined', r'\b(S[EW][AB])[\-]?(\d)\b', 'AR', lambda g: f"{g[0]}{g[1]}"),
+        # Trade Impact Areas: TIA-1, E.TIA-1
+        ('combined', r'TIA[\-]?(\d)', 'AR', lambda g: f"TIA{g[0]}"),
+    ]
+
+    # Compiled forms of the rule tables above
+    _PRIMARY_CASCADE = RuleCascade(PHASE_SCOPE_PATTERNS + TYPO_PATTERNS)
+    _WBS_CASCADE = RuleCascade(WBS_INFERENCE_PATTERNS)
+    _ACTION_CASCADE = RuleCascade(ACTION_PATTERNS)
+    _BUILDING_CASCADE = RuleCascade(BUILDING_TEXT_PATTERNS)
+    _ROOT_CAUSE_CASCADE = RuleCascade(ROOT_CAUSE_PATTERNS)
+    _PARTY_CASCADE = RuleCascade([(rf'\b{re.escape(party)}\b', party) for party in KNOWN_PARTIES])
+    _LOCATION_RULES = [(text, re.compile(pattern), loc_type, fmt)
+                       for text, pattern, loc_type, fmt in LOCATION_PATTERNS]
+    _FAB_ROOM = re.compile(r'FAB1(\d)(\d)')
+    _AREA_ZONE = re.compile(r'\b(S[EW][AB])\d')
+    _LEVEL = re.compile(r'\bL(\d)\b|\b([B]?\d)F\b')
+    _IMPACT = re.compile(r'\bIMPACT\b')
+    _IMPACT_CODE = re.compile(r'\[([A-Z]\.?[A-Z]*[\-]?\d+(?:\s*/\s*[A-Z]\.?[A-Z]*[\-]?\d+)*)\]')
+    _SECAI_MENTION = re.compile(r'OWNER|BY SECAI|AWAIT.*SECAI|SECAI.*BLOCK|SECAI.*HOLD')
+
     def __init__(self):
         """Initialize the classifier."""
         pass
@@ -219,139 +424,19 @@ class TaskClassifier:
         """
         t = str(task_name).upper()
 
-        # ============ PRE-CONSTRUCTION ============
-        if re.search(r'SUBCONTRACT|AWARD|BUYOUT|BID(?:DING)?\b|EXECUTE.*CONTRACT|CONTRACT AGREEMENT', t):
-            return 'PRE', 'PRO'  # Procurement
-        if re.search(r'SHOP DRAWING|SUBMITTAL|RFA\b|APPROV|REVIEW|JACOBS|RFI|FIELD MEASURE|RESPONSE|ARCHITECTURAL SET', t):
-            return 'PRE', 'SUB'  # Submittals
-        if re.search(r'FABRICAT|LEAD TIME|DELIVER(?!Y)|CONSOLIDATED SET|MOCKUP|FAB &|MATERIAL.*ORDER|^ORDER\s', t):
-            return 'PRE', 'FAB'  # Fabrication
-        if re.search(r'DESIGN|ENGINEER|RESOLVE.*ISSUE|RELEASE FOR FAB|IF[CR]\b|ISSUED FOR|DWG ISSUED|MATERIAL SCHEDULE', t):
-            return 'PRE', 'DES'  # Design
-
-        # ============ STRUCTURE ============
-        if re.search(r'PIER|DRILL|CAISSON', t):
-            return 'STR', 'PIR'  # Piers
-        if re.search(r'FOUNDATION|FOOTING|GRADE BEAM', t):
-            return 'STR', 'FND'  # Foundations
-        if re.search(r'UNDERGROUND|U/G\b|FRENCH DRAIN|EXCAVATE|BACKFILL|LOADING DOCK.*FILL', t):
-            return 'STR', 'UGD'  # Underground
-        if re.search(r'SLAB|POUR\b|CURE\b|SOMD|FRP\b|CONCRETE|WAFFLE|CURB|EQPT PAD|F/R/P|CIP\b|KNEE WALL|GROUT|PATCH|OAC PAD|VIBRATION\s*PAD', t):
-            return 'STR', 'CIP'  # Cast-in-Place
-        if re.search(r'COLUMN.*(?:PRIME|COAT|GRIND)|(?:PRIME|COAT|GRIND).*COLUMN|SEALER|DENSIFIER|CRC\b', t):
-            return 'STR', 'CTG'  # Structural Coating
-        if re.search(r'DECKING|DECK\b|DS/AD|DETAILING|DETAINING|GIRDER|TRUSS|ERECT.*STEEL|ANCHOR BOLT|GOAL POST|CLIP|EMBED|HEADER|BASE.?PLATE|MODIFY.*PATRIOT|FLANGE EXTENSION', t):
-            return 'STR', 'STL'  # Structural Steel
-        if re.search(r'BEAM|JOIST|PURLIN|GIRT|BRACING|BRIDGING', t):
-            return 'STR', 'STL'  # Structural Steel - beams and supports
-        if re.search(r'SUPPORT\s*STEEL|MISC\.?\s*STEEL|ADD(?:ITIONAL)?\s*STEEL', t):
-            return 'STR', 'MSC'  # Misc Steel
-        if re.search(r'STEEL', t) and not re.search(r'STUD|STAIR', t):
-            return 'STR', 'STL'  # Structural Steel (catch-all)
-        if re.search(r'PRECAST|PC\b.*ERECT', t):
-            return 'STR', 'PRC'  # Precast
-        if re.search(r'GRATING|PLATFORM(?!.*SCAFFOLD)|RAMP(?!.*CRANE)', t):
-            return 'STR', 'MSC'  # Misc Steel
-        if re.search(r'PIPE\s*RACK|PIPERACK', t):
-            return 'STR', 'MSC'  # Misc Steel - pipe rack structures
-
-        # ============ ENCLOSURE ============
-        if re.search(r'ROOF(?!.*DECK)|ROOFING|MEMBRANE|PARAPET', t):
-            return 'ENC', 'ROF'  # Roofing
-        if re.search(r'METAL PANEL|IMP\b|INSULATED PANEL|SHEATHING|CANOPY|ACM PANEL|CLADDING', t):
-            return 'ENC', 'PNL'  # Panels
-        if re.search(r'WATERPROOF|DAMPPROOF|DRAIN MAT|WEEP TUBE', t):
-            return 'ENC', 'WPF'  # Waterproofing
-        if re.search(r'WINDOW|GLAZING|CURTAIN WALL|STOREFRONT', t):
-            return 'ENC', 'GLZ'  # Glazing
-        if re.search(r'EXTERIOR.*(?:COAT|PAINT)|(?:COAT|PAINT).*EXTERIOR|PRIME.*COAT|COAT.*TOP', t):
-            return 'ENC', 'CTG'  # Exterior Coating
-        if re.search(r'LOUVER|PENTHOUSE|BREEZEWAY|AWNING', t):
-            return 'ENC', 'MSC'  # Misc Enclosure
-
-        # ============ INTERIOR ============
-        if re.search(r'METAL STUD|FRAMING|STUD FRAME', t):
-            return 'INT', 'FRM'  # Framing
-        if re.search(r'DRYWALL|TAPE.*FINISH|GYPSUM|BOARD\b|SHEETROCK|TAPE\s*&\s*FLOAT', t):
-            return 'INT', 'DRY'  # Drywall
-        if re.search(r'MEP|ROUGH.?IN|CONDUIT|ELECTRICAL|PLUMB(?!ING.*UNDER)', t) and not re.search(r'FIRE|UNDERGROUND', t):
-            return 'INT', 'MEP'  # MEP Rough-in
-        if re.search(r'FIRE(?!PROOF)|SPRINKLER|CAULK|FIRESTOP|SMOKE', t):
-            return 'INT', 'FIR'  # Fire Protection
-        if re.search(r'PAINT(?!.*COLUMN)|TILE\b|FLOORING|CEILING(?!.*SYSTEM)|FINISH(?!.*DRYWALL)|CONTROL JOINT|EPOXY|VCT|ACCESS FLOOR|FLOOR STRIP|STRIPING|JOINT SEALANT|ALUMINIUM COVER|EMSEAL|EXPANSION JOINT', t):
-            return 'INT', 'FIN'  # Finishes
-        if re.search(r'DOOR|FRAME(?!.*STUD)|HARDWARE|HOLLOW METAL|DOCK LOCK|DOCK GUARDIAN', t):
-            return 'INT', 'DOR'  # Doors & Hardware
-        if re.search(r'WALL PROTECTION|CORNER GUARD|ACCESSORI|TOILET PARTITION|SIGNAGE|EXPANSION.*CONTROL|DOCK LEVELER|PEDESTAL.*LAM|DIV\s*10|SPECIALIT|PVC\s*ANGLE', t):
-            return 'INT', 'SPE'  # Specialties
-        if re.search(r'INSULATION|INSUL\b', t):
-            return 'INT', 'INS'  # Insulation
-        if re.search(r'ELEVATOR(?!.*STEEL)|ELEV\b', t):
-            return 'INT', 'ELV'  # Elevators
-        # Stair patterns: catch metal stairs, but exclude pure steel erection tasks
-        if re.search(r'METAL\s*STAIR|STAIR.*INSTALL|INSTALL.*STAIR', t):
-            return 'INT', 'STR'  # Interior Stairs (metal stair installation)
-        if re.search(r'STAIR(?!.*ERECT)(?!.*STEEL\s*TRUSS)', t):
-            return 'INT', 'STR'  # Stairs (but not stair steel erection)
-        if re.search(r'VESTIBULE|BATHROOM|TOILET|RESTROOM|CLEAN ROOM|DUCT SHAFT|AIR.?LOCK|BUNKER|I/?O\s*R[O]?M', t):
-            if re.search(r'CONTROL JOINT|FINISH|INSPECT|TAPE|FLOAT', t):
-                return 'INT', 'FIN'
-            return 'INT', 'MSC'
-
-        # ============ COMMISSIONING ============
-        if re.search(r'TEST(?!ING.*IMPACT)|COMMISSION|ENERGIZE|START.?UP|PUNCH|INPSECTION|INSPECTION', t):
-            return 'COM', 'TST'  # Testing
-        if re.search(r'TURNOVER|SUBSTANTIAL|HANDOVER|BENEFICIAL', t):
-            return 'COM', 'TRN'  # Turnover
-
-        # ============ ADMINISTRATIVE ============
-        if re.search(r'^OWNER|^SECAI|^GC\s|^YATES', t):
-            return 'ADM', 'OWN'  # Owner Activities
-        if re.search(r'PROPOSAL|NEGOTIAT|SETTLEMENT|CLAIM|DISPUTE|RESOLUTION|MEDIAT', t):
-            return 'ADM', 'OWN'  # Owner Activities - commercial/contractual
-        if re.search(r'IMPACT|DELAY|HOLD\b|WAITING|REWORK|REMEDIATION|REMIDIATION|PENDING', t):
-            return 'ADM', 'IMP'  # Impacts/Delays
-        if re.search(r'MILESTONE|COMPLETE$|TARGET', t):
-            return 'ADM', 'MIL'  # Milestones
-        if re.search(r'PRIORITY|REMOBIL|OUT.?OF.?SEQUENCE|FRAGNET|IOCC|CATCH.?UP', t):
-            return 'ADM', 'TRK'  # Tracking/Recovery
-        if re.search(r'^OPEN\s|^CLOSE\s|^RESOLVE\s|^SUBMIT\s(?!.*TAL)', t):
-            return 'ADM', 'TRK'  # Tracking/Administrative actions
-        if re.search(r'SCAFFOLD|TEMP\b|TEMPORARY|PROTECTION|BARRICADE|HOIST|CRANE RAMP|TOWER CRANE', t):
-            return 'ADM', 'TMP'  # Temporary Works
-
-        # ============ CATCH-ALL (Primary) ============
-        if re.search(r'^INSTALL\b', t):
-            return 'INT', 'MSC'
-
-        # ============ FALLBACK 1: Typo Tolerance ============
-        for pattern, classification in self.TYPO_PATTERNS:
-            if re.search(pattern, t):
-                return classification
+        # Primary patterns, then typo tolerance (PHASE_SCOPE_PATTERNS + TYPO_PATTERNS)
+        classification = self._PRIMARY_CASCADE.first(t)
+        if classification:
+            return classification
 
-        # ============ FALLBACK 2: WBS-Based Inference ============
+        # WBS-based inference
         if wbs_name:
             wbs_result = self._infer_from_wbs(wbs_name)
             if wbs_result[0] != 'UNK':
                 return wbs_result
 
-        # ============ FALLBACK 3: Generic Action Words ============
-        # If task starts with an action verb, try to infer from context
-        if re.search(r'^(?:INSTALL|ERECT|SET|PLACE|LAY|HANG|MOUNT|ATTACH)\b', t):
-            # Generic installation - check WBS again or default to interior misc
-            if wbs_name:
-                wbs_result = self._infer_from_wbs(wbs_name)
-                if wbs_result[0] != 'UNK':
-                    return wbs_result
-            return 'INT', 'MSC'  # Default installation to interior misc
-
-        if re.search(r'^(?:COMPLETE|FINISH|FINAL|CLOSE.?OUT)\b', t):
-            return 'COM', 'TST'  # Completion activities → Commissioning
-
-        if re.search(r'^(?:COORDINATE|SCHEDULE|PLAN|MANAGE|TRACK)\b', t):
-            return 'ADM', 'TRK'  # Coordination → Administrative tracking
-
-        return 'UNK', 'UNK'
+        # Generic action words
+        return self._ACTION_CASCADE.first(t, ('UNK', 'UNK'))
 
     def _infer_from_wbs(self, wbs_name: str) -> Tuple[str, str]:
         """
@@ -363,13 +448,7 @@ class TaskClassifier:
         Returns:
             Tuple of (phase_code, scope_code), or ('UNK', 'UNK') if no match
         """
-        w = str(wbs_name).upper()
-
-        for pattern, classification in self.WBS_INFERENCE_PATTERNS:
-            if re.search(pattern, w):
-                return classification
-
-        return 'UNK', 'UNK'
+        return self._WBS_CASCADE.first(str(wbs_name).upper(), ('UNK', 'UNK'))
 
     def extract_building_level(self, task_name: str, wbs_name: str = None,
                                 loc_type: str = None, loc_id: str = None) -> Tuple[Optional[str], Optional[str]]:
@@ -399,7 +478,7 @@ class TaskClassifier:
 
         # 1. Extract from FAB room code: FAB1{level}{building_digit}{room}
         if loc_type == 'RM' and loc_id:
-            fab_match = re.match(r'FAB1(\d)(\d)', loc_id)
+            fab_match = self._FAB_ROOM.match(loc_id)
             if fab_match:
                 level = fab_match.group(1)
                 building_digit = fab_match.group(2)
@@ -413,32 +492,19 @@ class TaskClassifier:
 
         # 3. Extract from area zone pattern in text (SEA1, SWA2, etc.) if not from loc_id
         if not building:
-            zone_match = re.search(r'\b(S[EW][AB])\d', combined)
+            zone_match = self._AREA_ZONE.search(combined)
             if zone_match:
                 zone_prefix = zone_match.group(1)
                 building = self.AREA_BUILDING_MAP.get(zone_prefix)
 
         # 4. Extract building from text patterns (if not yet found)
         if not building:
-            # Use word boundaries to avoid matching inside words like "SUPPORT"
-            for bldg, pattern in [
-                ('SUW', r'\bWSUP\b|\bW[\-\s]?SUP\b|\bSUW\b'),
-                ('SUE', r'\bESUP\b|\bE[\-\s]?SUP\b|\bSUE\b'),
-                ('FIZ', r'\bFIZ\b'),
-                ('CUB', r'\bCUB\b'),
-                ('FAB', r'\bFAB\b'),
-                ('GCSA', r'\bGCS[\-\s]?A\b'),
-                ('GCSB', r'\bGCS[\-\s]?B\b'),
-                ('GCS', r'\bGCS\b'),
-            ]:
-                if re.search(pattern, combined):
-                    building = bldg
-                    break
+            building = self._BUILDING_CASCADE.first(combined)
 
         # 5. Extract level from text (if not from FAB code)
         if not level:
             # Patterns: L1, L2, 1F, 2F, B1, B1F, -4F-, etc.
-            level_match = re.search(r'\bL(\d)\b|\b([B]?\d)F\b', combined)
+            level_match = self._LEVEL.search(combined)
             if level_match:
                 level = level_match.group(1) or level_match.group(2)
 
@@ -492,11 +558,11 @@ class TaskClassifier:
         }
 
         # Only process IMPACT tasks
-        if not re.search(r'\bIMPACT\b', t):
+        if not self._IMPACT.search(t):
             return result
 
         # 1. Extract impact code from brackets [S.TIA-135], [D22], [D25 / D26], etc.
-        code_match = re.search(r'\[([A-Z]\.?[A-Z]*[\-]?\d+(?:\s*/\s*[A-Z]\.?[A-Z]*[\-]?\d+)*)\]', t)
+        code_match = self._IMPACT_CODE.search(t)
         if code_match:
             result['impact_code'] = code_match.group(1)
 
@@ -510,52 +576,22 @@ class TaskClassifier:
 
         # 2. Extract attribution (who caused the impact)
         # Check for explicit party mentions
-        for party, desc in self.KNOWN_PARTIES.items():
-            if re.search(rf'\b{re.escape(party)}\b', t):
-                result['attributed_to'] = party
-                result['attributed_to_desc'] = desc
-                break
+        party = self._PARTY_CASCADE.first(t)
+        if party:
+            result['attributed_to'] = party
+            result['attributed_to_desc'] = self.KNOWN_PARTIES[party]
 
         # If no explicit party but has S.TIA or mentions SECAI patterns, attribute to SECAI
         if not result['attributed_to']:
             if result['impact_type'] in ('S.TIA', 'S', 'ES', 'E.TIA'):
                 result['attributed_to'] = 'SECAI'
                 result['attributed_to_desc'] = 'SECAI (Owner Engineering)'
-            elif re.search(r'OWNER|BY SECAI|AWAIT.*SECAI|SECAI.*BLOCK|SECAI.*HOLD', t):
+            elif self._SECAI_MENTION.search(t):
                 result['attributed_to'] = 'SECAI'
                 result['attributed_to_desc'] = 'SECAI (Owner Engineering)'
 
         # 3. Determine root cause category
-        if re.search(r'SCAFFOLD', t):
-            result['root_cause'] = 'SCAFFOLD'
-        elif re.search(r'CRANE|HOIST', t):
-            result['root_cause'] = 'CRANE'
-        elif re.search(r'CABLE\s*TRAY|CABLE.*OBSTRUCT', t):
-            result['root_cause'] = 'CABLE'
-        elif re.search(r'PIPE\s*RACK|PIPERACK', t):
-            result['root_cause'] = 'PIPERACK'
-        elif re.search(r'MATERIAL.*WAY|IN\s*THE\s*WAY', t):
-            result['root_cause'] = 'MATERIAL'
-        elif re.search(r'CCD|CHANGE\s*ORDER|ADDED\s*SCOPE', t):
-            result['root_cause'] = 'CHANGE'
-        elif re.search(r'REWORK|REMEDIAT|FIX(?:ES)?\b|REPAIR', t):
-            result['root_cause'] = 'REWORK'
-        elif re.search(r'STOP\s*WORK|ON\s*HOLD|HOLD\b', t):
-            result['root_cause'] = 'HOLD'
-        elif re.search(r'WAITING|AWAIT|PENDING', t):
-            result['root_cause'] = 'WAIT'
-        elif re.search(r'DESIGN|DRAWING|DWG|DETAIL', t):
-            result['root_cause'] = 'DESIGN'
-        elif re.search(r'BLOCK|OBSTRUCT|LEAVEOUT|EGRESS', t):
-            result['root_cause'] = 'OBSTRUCTION'
-        elif re.search(r'ACCESS|BLOCKED', t):
-            result['root_cause'] = 'ACCESS'
-        elif re.search(r'OUT.*SEQUENCE|SEQUENCE', t):
-            result['root_cause'] = 'SEQUENCE'
-        elif re.search(r'DEFECT|QUALITY|INSPECT', t):
-            result['root_cause'] = 'QUALITY'
-        else:
-            result['root_cause'] = 'OTHER'
+        result['root_cause'] = self._ROOT_CAUSE_CASCADE.first(t, 'OTHER')
 
         # Add root cause description
         if result['root_cause']:
@@ -581,70 +617,13 @@ class TaskClassifier:
         wbs_upper = str(wbs_name or '').upper()
         combined = f"{task_upper} {wbs_upper}"
 
-        # 1. FAB Room Code (highest precision)
-        # Priority: WBS FAB code > Task FAB code (WBS structure is customer-facing)
-        wbs_fab_match = re.search(r'FAB1?(\d{5,6})', wbs_upper) if wbs_name else None
-        task_fab_match = re.search(r'FAB1?(\d{5,6})', task_upper)
-
-        fab_match = wbs_fab_match or task_fab_match
-        if fab_match:
-            return 'RM', f"FAB1{fab_match.group(1)}"
-
-        # 2. Elevator code - format as FAB1-EL## for consistency with WBS naming
-        el_match = re.search(r'EL(?:EV(?:ATOR)?)?[\s\-]*(\d{1,2})', combined)
-        if el_match:
-            return 'EL', f"FAB1-EL{el_match.group(1).zfill(2)}"
-
-        # 3. Stair code - format as FAB1-ST## for consistency with WBS naming
-        st_match = re.search(r'ST(?:AIR)?[\s\-#]*(\d{1,2})', combined)
-        if st_match:
-            return 'ST', f"FAB1-ST{st_match.group(1).zfill(2)}"
-
-        # 4. Gridline patterns
-        # Range: "GL 14-17", "17-18"
-        gl_match = re.search(r'GL[\s\-]*(\d+[\s\-]+\d+)', combined)
-        if gl_match:
-            gl_id = re.sub(r'\s+', '-', gl_match.group(1))
-            return 'GL', f"GL{gl_id}"
-
-        # Single: "GL 33", "GL5"
-        gl_single = re.search(r'\bGL[\s\-]?(\d{1,2})\b', combined)
-        if gl_single:
-            return 'GL', f"GL{gl_single.group(1)}"
-
-        # Letter line: "A LINE", "B LINE"
-        line_match = re.search(r'\b([A-N])\s*LINE\b', combined)
-        if line_match:
-            return 'GL', f"GL-{line_match.group(1)}"
+        texts = {'task': task_upper, 'wbs': wbs_upper, 'combined': combined}
+        for text, regex, loc_type, loc_id in self._LOCATION_RULES:
+            match = regex.search(texts[text])
+            if match:
+                return loc_type, loc_id(match.groups())
 
-        # Numeric range: "17-18", "13-9"
-        gridline_match = re.search(r'\b(\d{1,2})[\s\-]+(\d{1,2})\b', combined)
-        if gridline_match:
-            g1, g2 = gridline_match.groups()
-            return 'GL', f"GL{g1}-{g2}"
-
-        # 5. Area patterns
-        # Penthouse: NE/NW/SE/SW PENTHOUSE
-        pent_match = re.search(r'\b(N[EW]|S[EW])\s*PENTHOUSE\b', combined)
-        if pent_match:
-            return 'AR', f"PENT-{pent_match.group(1)}"
-
-        # Milestone areas: A1, B2, etc.
-        area_match = re.search(r'\b([AB][\-\s]?[1-5])\b', combined)
-        if area_match:
-            return 'AR', area_match.group(1).replace(' ', '').replace('-', '')
-
-        # Support zones: SEA1, SWA1, SWB1, SEB1 (with optional hyphen)
-        zone_match = re.search(r'\b(S[EW][AB])[\-]?(\d)\b', combined)
-        if zone_match:
-            return 'AR', f"{zone_match.group(1)}{zone_match.group(2)}"
-
-        # Trade Impact Areas: TIA-1, E.TIA-1
-        tia_match = re.search(r'TIA[\-]?(\d)', combined)
-        if tia_match:
-            return 'AR', f"TIA{tia_match.group(1)}"
-
-        # 6. General/Project-Wide (no specific location identifier found)
+        # General/Project-Wide (no specific location identifier found)
         return 'GEN', None
 
     def classify_task(self, task_name: str, wbs_name: str = None) -> Dict[str, Optional[str]]:
@@ -689,6 +668,153 @@ class TaskClassifier:
 
         return result
 
+    def classify_tasks(self, task_names, wbs_names=None) -> pd.DataFrame:
+        """
+        Full classification of a column of tasks.
+
+        Equivalent to classify_task() on every (task_name, wbs_name) pair, but
+        each distinct pair is classified once and the rule cascades run as
+        pandas string operations over all distinct pairs at a time.
+
+        Args:
+            task_names: Task names (any iterable; values are str()-ed as in classify_task)
+            wbs_names: Optional WBS names, aligned with task_names
+
+        Returns:
+            DataFrame with one row per task (RangeIndex) and the classify_task() keys as columns
+        """
+        task_upper = [str(t).upper() for t in task_names]
+        if wbs_names is None:
+            wbs_upper = [''] * len(task_upper)
+        else:
+            wbs_upper = [str(w or '').upper() for w in wbs_names]
+
+        # Classification only depends on the upper-cased pair; an empty WBS
+        # behaves like a missing one
+        name_codes, names = pd.factorize(pd.Series(task_upper, dtype=object))
+        wbs_codes, wbs = pd.factorize(pd.Series(wbs_upper, dtype=object))
+        codes, pairs = pd.factorize(name_codes.astype(np.int64) * max(len(wbs), 1) + wbs_codes)
+        t = pd.Series(names.take(pairs // max(len(wbs), 1)), dtype=object)
+        w = pd.Series(wbs.take(pairs % max(len(wbs), 1)), dtype=object)
+        combined = t + ' ' + w
+
+        phase, scope = self._classify_phase_scope_column(t, w)
+        loc_type, loc_id = self._extract_location_column(t, w, combined)
+        building, level = self._extract_building_level_column(combined, loc_type, loc_id)
+
+        columns = {
+            'phase': phase,
+            'scope': scope,
+            'loc_type': loc_type,
+            'loc_id': loc_id,
+            'building': building,
+            'level': level,
+        }
+        columns['label'] = np.where(
+            pd.notna(loc_id),
+            phase + '-' + scope + '|' + loc_type + ':' + pd.Series(loc_id, dtype=object).fillna('').to_numpy(),
+            phase + '-' + scope + '|' + loc_type,
+        ).astype(object)
+        columns['phase_desc'] = np.array([self.PHASES.get(p, 'Unknown') for p in phase], dtype=object)
+        columns['scope_desc'] = np.array(
+            [self.SCOPES.get(p, {}).get(s, 'Unknown') for p, s in zip(phase, scope)], dtype=object)
+        columns['loc_type_desc'] = np.array([self.LOC_TYPES.get(lt, 'Unknown') for lt in loc_type], dtype=object)
+        columns['building_desc'] = np.array([self.BUILDINGS.get(b, 'Unknown') for b in building], dtype=object)
+        columns['level_desc'] = np.array(
+            [self.LEVELS.get(lv, f'Level {lv}' if lv and lv.isdigit() else 'Unknown') for lv in level],
+            dtype=object)
+
+        # Impact fields are only set for the few IMPACT tasks
+        for col in self.extract_impact_info(''):
+            columns[col] = np.full(len(t), None, dtype=object)
+        for row in np.flatnonzero(t.str.contains(self._IMPACT).to_numpy()):
+            for col, value in self.extract_impact_info(t[row]).items():
+                columns[col][row] = value
+
+        return pd.DataFrame({col: values[codes] for col, values in columns.items()})
+
+    def _classify_phase_scope_column(self, t: pd.Series, w: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """classify_phase_scope() over upper-cased task and WBS name columns."""
+        phase = np.full(len(t), 'UNK', dtype=object)
+        scope = np.full(len(t), 'UNK', dtype=object)
+        pending = np.ones(len(t), dtype=bool)
+
+        # Primary/typo patterns on the name, then WBS inference, then action words
+        for cascade, texts in ((self._PRIMARY_CASCADE, t), (self._WBS_CASCADE, w), (self._ACTION_CASCADE, t)):
+            rows = np.flatnonzero(pending)
+            found = cascade.indices(texts.iloc[rows])
+            matched = rows[found >= 0]
+            for row, i in zip(matched, found[found >= 0]):
+                phase[row], scope[row] = cascade.values[i]
+            pending[matched] = False
+
+        return phase, scope
+
+    def _extract_location_column(self, t: pd.Series, w: pd.Series,
+                                 combined: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """extract_location() over upper-cased task, WBS and combined columns."""
+        texts = {'task': t, 'wbs': w, 'combined': combined}
+        loc_type = np.full(len(t), 'GEN', dtype=object)
+        loc_id = np.full(len(t), None, dtype=object)
+        pending = np.ones(len(t), dtype=bool)
+
+        for text, regex, rule_type, rule_id in self._LOCATION_RULES:
+            rows = np.flatnonzero(pending)
+            if len(rows) == 0:
+                break
+            groups = texts[text].iloc[rows].str.extract(regex)
+            found = groups[0].notna().to_numpy()
+            matched = rows[found]
+            loc_type[matched] = rule_type
+            loc_id[matched] = [rule_id(g) for g in groups[found].itertuples(index=False)]
+            pending[matched] = False
+
+        return loc_type, loc_id
+
+    def _extract_building_level_column(self, combined: pd.Series, loc_type: np.ndarray,
+                                       loc_id: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """extract_building_level() over combined text and extracted location columns."""
+        loc_id = pd.Series(loc_id, dtype=object)
+        building = pd.Series(None, index=loc_id.index, dtype=object)
+        level = pd.Series(None, index=loc_id.index, dtype=object)
+
+        # 1. FAB room code: FAB1{level}{building_digit}{room}
+        is_room = (loc_type == 'RM') & loc_id.notna().to_numpy()
+        if is_room.any():
+            fab = loc_id[is_room].str.extract(r'^FAB1(\d)(\d)')
+            level[is_room] = fab[0]
+            building[is_room] = fab[1].map(self.FAB_BUILDING_MAP)
+
+        # 2. Area zone prefix in loc_id (SWA, SEA, etc.)
+        zone = loc_id.str[:3].map(self.AREA_BUILDING_MAP)
+        building = building.mask(zone.notna(), zone)
+
+        # 3. Area zone pattern in text (SEA1, SWA2, etc.)
+        missing = building.isna()
+        if missing.any():
+            zone = combined[missing].str.extract(self._AREA_ZONE)[0].map(self.AREA_BUILDING_MAP)
+            building[missing] = zone
+
+        # 4. Building text patterns
+        missing = building.isna().to_numpy()
+        if missing.any():
+            found = self._BUILDING_CASCADE.indices(combined[missing])
+            values = np.array(self._BUILDING_CASCADE.values + [None], dtype=object)
+            building[missing] = values[found]
+
+        # 5. Level from text
+        missing = level.isna()
+        if missing.any():
+            levels = combined[missing].str.extract(self._LEVEL)
+            level[missing] = levels[0].fillna(levels[1])
+
+        # 6. Fallbacks for missing building/level
+        building = building.where(building.notna(), np.select(
+            [loc_type == 'GEN', np.isin(loc_type, ('GL', 'AR'))], ['GEN', 'MULTI'], 'UNK').astype(object))
+        level = level.where(level.notna(), np.select(
+            [loc_type == 'GEN', np.isin(loc_type, ('GL', 'AR', 'EL', 'ST'))], ['GEN', 'MULTI'], 'UNK').astype(object))
+        return building.to_numpy(dtype=object), level.to_numpy(dtype=object)
+
     def get_phase_description(self, phase: str) -> str:
         """Get description for a phase code."""
         return self.PHASES.get(phase, 'Unknown')
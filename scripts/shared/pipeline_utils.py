@@ -5,9 +5,11 @@ Pipeline Utilities - Shared functions for staging and fact/quality table splitti
 Provides:
 - get_output_path(): Resolve output paths (staging or final)
 - write_fact_and_quality(): Split DataFrame and write both tables
+- read_output_state()/write_output_state(): Incremental-update state of an output file
 - StagingContext: Context manager for staging directory operations
 """
 
+import json
 import os
 import shutil
 from pathlib import Path
@@ -69,6 +71,7 @@ def write_fact_and_quality(
     fact_path: Path,
     quality_path: Optional[Path] = None,
     column_renames: Optional[dict[str, str]] = None,
+    append: bool = False,
 ) -> tuple[int, int]:
     """
     Split DataFrame into fact and data quality tables and write both.
@@ -84,6 +87,8 @@ def write_fact_and_quality(
         fact_path: Path to write fact table
         quality_path: Path to write quality table (if None, quality columns are kept in fact)
         column_renames: Optional dict of {old_name: new_name} for fact table
+        append: Append rows (without header) to existing files, to write a
+                table in chunks; the first chunk is written with append=False
 
     Returns:
         Tuple of (fact_row_count, quality_column_count)
@@ -111,8 +116,8 @@ def write_fact_and_quality(
         quality_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Write both tables
-        df_fact.to_csv(fact_path, index=False)
-        df_quality.to_csv(quality_path, index=False)
+        df_fact.to_csv(fact_path, index=False, mode='a' if append else 'w', header=not append)
+        df_quality.to_csv(quality_path, index=False, mode='a' if append else 'w', header=not append)
 
         return len(df_fact), len(existing_quality_cols)
     else:
@@ -126,11 +131,68 @@ def write_fact_and_quality(
                 df_fact = df_fact.rename(columns=cols_to_rename)
 
         fact_path.parent.mkdir(parents=True, exist_ok=True)
-        df_fact.to_csv(fact_path, index=False)
+        df_fact.to_csv(fact_path, index=False, mode='a' if append else 'w', header=not append)
 
         return len(df_fact), 0
 
 
+def output_state_path(path: Path) -> Path:
+    """Sidecar JSON holding the incremental-update state of an output file."""
+    path = Path(path)
+    return path.with_name(f"{path.stem}_state.json")
+
+
+def _file_signature(path: Path) -> Optional[str]:
+    if not path.exists():
+        return None
+    stat = path.stat()
+    return f"{stat.st_size}|{stat.st_mtime_ns}"
+
+
+def read_output_state(path: Path) -> dict:
+    """
+    State recorded by write_output_state() for an output file.
+
+    The state is only valid for the exact file it was recorded with; if the
+    file is missing or was written since (another script, an interrupted
+    append), an empty dict is returned so callers fall back to a full rebuild.
+
+    Args:
+        path: Output file the state describes
+
+    Returns:
+        Recorded state, or {} if none is valid
+    """
+    state_path = output_state_path(path)
+    signature = _file_signature(Path(path))
+    if signature is None or not state_path.exists():
+        return {}
+    try:
+        with open(state_path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('signature') != signature:
+        return {}
+    return data.get('state', {})
+
+
+def write_output_state(path: Path, state: dict) -> None:
+    """
+    Record incremental-update state for an output file as it is now.
+
+    Call right after writing the file; any later write to it invalidates
+    the state (see read_output_state()).
+
+    Args:
+        path: Output file the state describes
+        state: JSON-serializable state
+    """
+    state_path = output_state_path(path)
+    with open(state_path, 'w') as f:
+        json.dump({'signature': _file_signature(Path(path)), 'state': state}, f, indent=2)
+
+
 class StagingContext:
     """
     Context manager for staging directory operations.
@@ -56,3 +56,262 @@ def mock_database_connection():
     conn.commit.return_value = None
     conn.close.return_value = None
     return conn
+
+
+# =============================================================================
+# Primavera P6 fixtures
+# =============================================================================
+
+def _p6_clndr_data(work_days: dict, exceptions: dict = None) -> str:
+    """Build a P6 clndr_data string. work_days maps P6 day (1=Sun) to [(start, finish)]."""
+    def periods(spans):
+        return ''.join(f'(0||{i}(s|{s}|f|{f})())' for i, (s, f) in enumerate(spans))
+
+    days = ''.join(f'(0||{d}()({periods(work_days.get(d, []))}))' for d in range(1, 8))
+    exc = ''.join(
+        f'(0||{i}(d|{serial})({periods(spans)}))'
+        for i, (serial, spans) in enumerate((exceptions or {}).items())
+    )
+    return f'(0||CalendarData()((0||DaysOfWeek()({days}))(0||VIEW(ShowTotal|Y)())(0||Exceptions()({exc}))))'
+
+
+P6_CALENDARS = {
+    # Mon-Fri 08-12, 13-17 with two holidays
+    'std': (_p6_clndr_data(
+        {d: [('08:00', '12:00'), ('13:00', '17:00')] for d in range(2, 7)},
+        {45292: [], 45341: []},
+    ), 8.0),
+    # Mon-Sat 07-17 single shift
+    'six': (_p6_clndr_data({d: [('07:00', '17:00')] for d in range(2, 8)}), 10.0),
+    # Curing calendar: every day has a 00:00-00:00 period
+    'cure': (_p6_clndr_data({d: [('00:00', '00:00')] for d in range(1, 8)}), 24.0),
+}
+
+
+def make_p6_tables(n_tasks: int = 60, file_ids=(1, 2, 3), seed: int = 0) -> dict:
+    """
+    Build synthetic multi-version P6 tables (task, taskpred, calendar, project).
+
+    Each version is a random acyclic network over the same task codes with
+    mixed relationship types, lags, statuses, constraints and calendars.
+    IDs are prefixed with file_id as in batch_process_xer output.
+    """
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    tasks, preds, cals, projects = [], [], [], []
+    data_date = pd.Timestamp('2024-03-04 08:00')
+
+    for version, file_id in enumerate(file_ids):
+        cal_ids = {}
+        for j, (name, (data, hrs)) in enumerate(P6_CALENDARS.items()):
+            cal_ids[name] = f'{file_id}_{100 + j}'
+            cals.append({'file_id': file_id, 'clndr_id': cal_ids[name], 'clndr_name': name,
+                         'day_hr_cnt': hrs, 'clndr_data': data})
+
+        dd = data_date + pd.Timedelta(days=7 * version)
+        projects.append({'file_id': file_id, 'proj_id': f'{file_id}_1', 'proj_short_name': 'SAMSUNG-TFAB1',
+                         'last_recalc_date': dd.strftime('%Y-%m-%d %H:%M'),
+                         'plan_start_date': '2024-01-02 08:00', 'plan_end_date': '',
+                         'scd_end_date': ''})
+
+        n = n_tasks + version  # later versions add tasks
+        for i in range(n):
+            status = rng.choice(['TK_Complete', 'TK_Active', 'TK_NotStart'], p=[0.2, 0.1, 0.7])
+            duration = float(rng.choice([0, 8, 16, 40, 80, 12.5]))
+            cal = rng.choice(['std', 'std', 'six', 'cure'])
+            act_start = (dd - pd.Timedelta(days=int(rng.integers(5, 30)))) if status != 'TK_NotStart' else None
+            act_end = (dd - pd.Timedelta(days=int(rng.integers(1, 5)))) if status == 'TK_Complete' else None
+            cstr_type, cstr_date = '', None
+            if rng.random() < 0.1:
+                cstr_type = rng.choice(['CS_SNET', 'CS_FNLT', 'CS_MSO', 'CS_SNLT'])
+                cstr_date = dd + pd.Timedelta(days=int(rng.integers(0, 60)), hours=int(rng.integers(0, 9)))
+            fmt = lambda ts: ts.strftime('%Y-%m-%d %H:%M') if ts is not None else ''
+            tasks.append({
+                'file_id': file_id,
+                'task_id': f'{file_id}_{1000 + i}',
+                'task_code': f'CN.T{i:04d}',
+                'task_name': f'Task {i}',
+                'target_drtn_hr_cnt': duration + (8 * version if i % 7 == 0 else 0),
+                'remain_drtn_hr_cnt': duration / 2 if status == 'TK_Active' else duration,
+                'clndr_id': cal_ids[cal],
+                'status_code': status,
+                'task_type': 'TT_Mile' if duration == 0 else 'TT_Task',
+                'wbs_id': f'{file_id}_{i % 5}',
+                'cstr_type': cstr_type,
+                'cstr_date': fmt(cstr_date),
+                'act_start_date': fmt(act_start),
+                'act_end_date': fmt(act_end),
+                'early_start_date': fmt(dd + pd.Timedelta(days=i)),
+                'early_end_date': fmt(dd + pd.Timedelta(days=i + 1)),
+                'late_start_date': fmt(dd + pd.Timedelta(days=i + 2)),
+                'late_end_date': fmt(dd + pd.Timedelta(days=i + 3)),
+                'total_float_hr_cnt': float(16 * (i % 3)),
+                'driving_path_flag': 'Y' if i % 4 == 0 else 'N',
+            })
+            # Predecessors only from lower indices keeps the network acyclic
+            for p in rng.choice(i, size=min(i, int(rng.integers(0, 3))), replace=False) if i else []:
+                preds.append({
+                    'file_id': file_id,
+                    'task_pred_id': f'{file_id}_{len(preds)}',
+                    'task_id': f'{file_id}_{1000 + i}',
+                    'pred_task_id': f'{file_id}_{1000 + int(p)}',
+                    'pred_type': rng.choice(['PR_FS', 'PR_FS', 'PR_SS', 'PR_FF', 'PR_SF']),
+                    'lag_hr_cnt': float(rng.choice([0, 0, 4, 8, 24])),
+                })
+
+    return {
+        'task': pd.DataFrame(tasks),
+        'taskpred': pd.DataFrame(preds),
+        'calendar': pd.DataFrame(cals),
+        'project': pd.DataFrame(projects),
+    }
+
+
+@pytest.fixture
+def p6_data_dir(tmp_path):
+    """Directory of synthetic processed P6 CSVs (3 schedule versions)."""
+    for table, df in make_p6_tables().items():
+        df.to_csv(tmp_path / f'{table}.csv', index=False)
+    return tmp_path
+
+
+@pytest.fixture
+def slippage_data_dir(tmp_path):
+    """p6_data_dir plus the target dates and xer_files.csv used by ScheduleSlippageAnalyzer."""
+    import numpy as np
+    import pandas as pd
+
+    tables = make_p6_tables(n_tasks=200)
+    task = tables['task']
+    task['target_start_date'] = task['early_start_date']
+    task['target_end_date'] = task['early_end_date']
+    # Spread float so comparisons see float erosion and recovery
+    task['total_float_hr_cnt'] = np.random.default_rng(3).integers(-80, 200, len(task)).astype(float)
+    for table, df in tables.items():
+        df.to_csv(tmp_path / f'{table}.csv', index=False)
+    pd.DataFrame({
+        'file_id': [1, 2, 3],
+        'filename': ['yates_0304.xer', 'yates_0311.xer', 'yates_0318.xer'],
+        # Monthly view: Feb -> (1, 2); Mar has no snapshot, so Mar and Apr -> (2, 3)
+        'date': ['2024-01-15', '2024-02-12', '2024-04-08'],
+        'schedule_type': ['YATES'] * 3,
+    }).to_csv(tmp_path / 'xer_files.csv', index=False)
+    return tmp_path
+
+
+# =============================================================================
+# Task taxonomy fixtures
+# =============================================================================
+
+TAXONOMY_VERBS = ['INSTALL', 'ERECT', 'POUR', 'FABRICATE & DELIVER', 'SUBMITTAL -', 'REVIEW', 'TEST',
+                  'PAINT', 'Complete', 'PH1-ERECT', 'Execute Subcontract -', 'OWNER -', '']
+TAXONOMY_OBJECTS = [
+    'DRYWALL', 'METAL STUD FRAMING', 'STEEL TRUSSES', 'SLAB ON METAL DECK', 'ROOFING MEMBRANE',
+    'DOOR FRAMES', 'SPRINKLER PIPING', 'ELECTRICAL CONDUIT', 'PRECAST PANELS', 'FIREPROOFING',
+    'INSULATION', 'ELEVATOR 3', 'STAIR #5', 'CURTAIN WALL', 'PIPNG', 'DRYWAL', 'CONC',
+    'IMPACT [S.TIA-135] SCAFFOLD OBSTRUCTION BY SECAI', 'IMPACT [D22] WAITING ON DESIGN',
+    'TEMPORARY POWER', 'Toilet Accessories', 'MILESTONE', 'EPOXY FLOORING', 'GROUT BASE PLATES',
+]
+TAXONOMY_LOCATIONS = ['', ' - SEA3 - GL 13-9 - L1', ' FAB146103', ' - A1 - 17-18', ' 3F SUE',
+                      ' - GL 33', ' AREA B2', ' WSUP L2', ' FIZ']
+TAXONOMY_WBS = [
+    # (wbs_name, tier_3, tier_4, tier_5)
+    ('Duct Shaft-4F-SUE-FAB146103', 'SUPPORT BUILDING - EAST', 'SUE - CONCRETE', 'FAB146103'),
+    ('STRUCTURAL STEEL', 'FAB BUILDING (Phase 1)', 'STRUCTURAL STEEL', None),
+    ('INTERIOR', 'LEVEL 2', 'L2 SUW', 'ROOM A'),
+    ('SEA - 1', 'SUPPORT BUILDING - EAST', 'SEA - 1', None),
+    ('Area FIZ1 (West Inner)', 'Data Center Bldg', 'Area FIZ1 (West Inner)', None),
+    ('ROOFING', 'SUPPORT BUILDING - WEST', 'SUW - ROOFING', None),
+]
+TAXONOMY_ACTIVITY_CODES = {
+    'Z-BLDG': ['FAB Building', 'East Support Building', 'west support building', 'Key Milestones'],
+    'Z-LEVEL': ['LEVEL 1', 'DRYWALL', 'STAIR 5 (WEST)', 'ROOF', 'L3'],
+    'Z-AREA': ['SEA-1', 'FIZ1', 'SWB-4'],
+    'Z-SUB CONTRACTOR': ['MAREK', 'BAKER'],
+    'Z-TRADE': ['DRYWALL', 'CONCRETE'],
+}
+
+
+def make_taxonomy_tables(n_tasks: int = 200, file_ids=(1, 2, 3), seed: int = 0) -> dict:
+    """
+    Build synthetic multi-version tables read by task taxonomy generation.
+
+    Returns task, projwbs, taskactv, actvcode, actvtype and xer_files frames.
+    The same task codes recur in every version with mostly unchanged names,
+    WBS and activity codes (a few are renamed or recoded per version), and
+    IDs are prefixed with file_id as in batch_process_xer output.
+    """
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    names = [
+        f'{rng.choice(TAXONOMY_VERBS)} {rng.choice(TAXONOMY_OBJECTS)}{rng.choice(TAXONOMY_LOCATIONS)}'.strip()
+        for _ in range(n_tasks)
+    ]
+    wbs_of = rng.integers(0, len(TAXONOMY_WBS), n_tasks)
+    code_types = list(TAXONOMY_ACTIVITY_CODES)
+    assignments = [
+        [(t, int(rng.integers(0, len(TAXONOMY_ACTIVITY_CODES[t])))) for t in code_types if rng.random() < 0.4]
+        for _ in range(n_tasks)
+    ]
+    prefixes = ['CN.SWA5', 'CN.SEB2', 'CN.FAB', 'CN.T']
+
+    tables = {name: [] for name in ('task', 'projwbs', 'taskactv', 'actvcode', 'actvtype')}
+    for version, file_id in enumerate(file_ids):
+        for k, (wbs_name, tier_3, tier_4, tier_5) in enumerate(TAXONOMY_WBS):
+            tables['projwbs'].append({
+                'file_id': file_id, 'wbs_id': f'{file_id}_{k}', 'wbs_name': wbs_name,
+                'tier_2': 'CONSTRUCTION', 'tier_3': tier_3, 'tier_4': tier_4, 'tier_5': tier_5, 'tier_6': None,
+            })
+        code_ids = {}
+        for j, code_type in enumerate(code_types):
+            tables['actvtype'].append({'file_id': file_id, 'actv_code_type_id': f'{file_id}_{j}',
+                                       'actv_code_type': code_type})
+            for v, value in enumerate(TAXONOMY_ACTIVITY_CODES[code_type]):
+                code_ids[code_type, v] = f'{file_id}_{j}{v:02d}'
+                tables['actvcode'].append({'file_id': file_id, 'actv_code_id': code_ids[code_type, v],
+                                           'actv_code_type_id': f'{file_id}_{j}', 'actv_code_name': value})
+
+        for i in range(n_tasks + version):  # later versions add tasks
+            i_name = names[i % n_tasks] if i < n_tasks else f'INSTALL DRYWALL ADDED {i}'
+            if version and rng.random() < 0.03:
+                i_name = f'{i_name} REV{version}'
+            task_id = f'{file_id}_{1000 + i}'
+            tables['task'].append({
+                'file_id': file_id, 'task_id': task_id, 'task_code': f'{prefixes[i % 4]}.{i:04d}',
+                'task_name': i_name, 'wbs_id': f'{file_id}_{wbs_of[i % n_tasks]}',
+            })
+            for code_type, value in assignments[i % n_tasks]:
+                tables['taskactv'].append({'file_id': file_id, 'task_id': task_id,
+                                           'actv_code_id': code_ids[code_type, value]})
+
+    tables = {name: pd.DataFrame(rows) for name, rows in tables.items()}
+    tables['xer_files'] = pd.DataFrame({
+        'file_id': list(file_ids),
+        'filename': [f'yates_{file_id}.xer' for file_id in file_ids],
+        'date': [f'2024-{m:02d}-01' for m in range(1, len(file_ids) + 1)],
+        'schedule_type': 'YATES',
+        'is_current': [file_id == file_ids[-1] for file_id in file_ids],
+    })
+    return tables
+
+
+@pytest.fixture
+def gridline_mapping(monkeypatch):
+    """Default gridline mapping replaced by a small in-memory one (no Excel file)."""
+    from scripts.primavera.derive import generate_task_taxonomy  # noqa: F401 - puts gridline_mapping on sys.path
+    import gridline_mapping as module
+
+    mapping = module.GridlineMapping()
+    mapping._lookup = {
+        'FAB146103': {'row_min': 'D', 'row_max': 'F', 'col_min': 12, 'col_max': 14,
+                      'floor': '4F', 'room_name': 'DUCT SHAFT'},
+        'FAB1-EL03': {'row_min': 'B', 'row_max': 'B', 'col_min': 5, 'col_max': 5,
+                      'floor': 'ALL', 'room_name': 'ELEVATOR 3'},
+    }
+    mapping._loaded = True
+    monkeypatch.setattr(module, '_default_mapping', mapping)
+    return mapping
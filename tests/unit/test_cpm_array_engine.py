@@ -0,0 +1,173 @@
+"""Tests for the array-backed CPM engine."""
+
+import time as timer
+from dataclasses import asdict
+from datetime import date, datetime, time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.primavera.analyze.cpm.array_engine import ArrayCPMEngine
+from scripts.primavera.analyze.cpm.calendar import P6Calendar, WorkPeriod
+from scripts.primavera.analyze.cpm.engine import CPMEngine
+from scripts.primavera.analyze.cpm.models import Dependency, Task
+from scripts.primavera.analyze.cpm.network import TaskNetwork
+from scripts.primavera.analyze.schedule_store import (
+    ScheduleStore,
+    build_calendars,
+    build_dependencies,
+    build_network,
+    build_tasks,
+)
+from tests.conftest import P6_CALENDARS, _p6_clndr_data, make_p6_tables
+
+FLOAT_FIELDS = ('total_float_hours', 'free_float_hours')
+
+
+def run_both(load, **run_kwargs):
+    """Run CPMEngine and ArrayCPMEngine on fresh copies of a schedule."""
+    results = []
+    for engine_cls in (CPMEngine, ArrayCPMEngine):
+        network, calendars = load()
+        engine = engine_cls(network, calendars)
+        result = engine.run(**run_kwargs)
+        results.append((network, result, engine.compare_with_p6()))
+    return results
+
+
+def assert_same_results(expected, actual):
+    (net_a, result_a, p6_a), (net_b, result_b, p6_b) = expected, actual
+    for task_id, task in net_a.tasks.items():
+        a, b = asdict(task), asdict(net_b.tasks[task_id])
+        for name in FLOAT_FIELDS:
+            assert b.pop(name) == pytest.approx(a.pop(name), abs=1e-9), (task_id, name)
+        assert a == b, task_id
+    assert result_b.critical_path == result_a.critical_path
+    assert result_b.project_finish == result_a.project_finish
+    assert p6_b == p6_a
+
+
+@pytest.mark.parametrize('file_id', [1, 2, 3])
+def test_matches_cpm_engine(p6_data_dir, file_id):
+    store = ScheduleStore(p6_data_dir)
+    data_date = store.load_project_info(file_id)['data_date']
+
+    def load():
+        network, calendars, _ = store.load_schedule(file_id)
+        return network, calendars
+
+    expected, actual = run_both(load, data_date=data_date)
+
+    assert_same_results(expected, actual)
+    assert actual[1].critical_path
+
+
+def test_matches_with_odd_durations_constraints_and_target_finish():
+    tables = make_p6_tables(n_tasks=150, file_ids=(1,), seed=3)
+    tasks, preds = tables['task'], tables['taskpred']
+    tasks['target_drtn_hr_cnt'] = [[0, 7.3, 1 / 3, 13.25, 40][i % 5] for i in range(len(tasks))]
+    tasks['remain_drtn_hr_cnt'] = tasks['target_drtn_hr_cnt'] * 0.37
+    tasks['cstr_type'] = ['', 'CS_MEOB', '', 'CS_SEOB', 'CS_MFO', 'CS_SNET'] * (len(tasks) // 6) + [''] * (len(tasks) % 6)
+    tasks['cstr_date'] = [f'2024-04-{1 + i % 28:02d} {7 + i % 11:02d}:{i % 60:02d}' for i in range(len(tasks))]
+    preds['lag_hr_cnt'] = [[0, 2.7, -8, 0.25][i % 4] for i in range(len(preds))]
+    preds['pred_type'] = [['PR_FS', 'PR_SS', 'PR_FF', 'PR_SF', 'PR_XX'][i % 5] for i in range(len(preds))]
+
+    def load():
+        network, _ = build_network(build_tasks(tasks), build_dependencies(preds))
+        return network, build_calendars(tables['calendar'])
+
+    expected, actual = run_both(load, data_date=pd.Timestamp('2024-03-04 08:00'),
+                                target_finish=pd.Timestamp('2024-05-01 17:00'))
+
+    assert_same_results(expected, actual)
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_matches_with_random_durations_and_lags(seed):
+    """Hours that are not multiples of 1/1024 land on the same side of period boundaries."""
+    tables = make_p6_tables(n_tasks=120, file_ids=(1,), seed=seed)
+    tasks, preds, cals = tables['task'], tables['taskpred'], tables['calendar']
+    # Period lengths that are not exact in binary floating point either
+    cals.loc[cals['clndr_name'] == 'six', 'clndr_data'] = _p6_clndr_data(
+        {d: [('07:10', '11:50'), ('12:20', '16:40')] for d in range(2, 8)})
+    rng = np.random.default_rng(seed)
+
+    def hours(n, high):
+        return np.where(rng.random(n) < 0.5, rng.choice([7.3, 1 / 3, 2.7, 0.25, 4.19, 8.0], n),
+                        rng.uniform(0, high, n))
+
+    tasks['target_drtn_hr_cnt'] = hours(len(tasks), 60)
+    tasks['remain_drtn_hr_cnt'] = hours(len(tasks), 30)
+    preds['lag_hr_cnt'] = hours(len(preds), 20) - np.where(rng.random(len(preds)) < 0.2, 10, 0)
+
+    def load():
+        network, _ = build_network(build_tasks(tasks), build_dependencies(preds))
+        return network, build_calendars(cals)
+
+    expected, actual = run_both(load, data_date=pd.Timestamp('2024-03-04 10:07'))
+
+    assert_same_results(expected, actual)
+
+
+def chain_network() -> TaskNetwork:
+    """A -> B -> C on calendar 'std' with a far-future start constraint on C."""
+    network = TaskNetwork()
+    for code, hours in (('A', 16.0), ('B', 24.0), ('C', 8.0)):
+        network.add_task(Task(task_id=code, task_code=code, task_name=code, duration_hours=hours,
+                              calendar_id='std', status='TK_NotStart', task_type='TT_Task', wbs_id=''))
+    network.add_dependency(Dependency('A', 'B', 'PR_FS', 0.0))
+    network.add_dependency(Dependency('B', 'C', 'PR_FF', float('nan')))
+    network.tasks['C'].constraint_type = 'CS_SNET'
+    network.tasks['C'].constraint_date = datetime(2045, 6, 5, 9, 0)
+    return network
+
+
+def test_irregular_days_far_dates_and_nan_lags_fall_back_to_cpm_engine():
+    def load():
+        std = P6Calendar.from_p6_data('std', *P6_CALENDARS['std'])
+        # A curing-style 0-hour day inside the schedule keeps those tasks on CPMEngine's methods
+        std.exceptions[date(2024, 3, 6)] = [WorkPeriod(time(0, 0), time(0, 0))]
+        return chain_network(), {'std': std}
+
+    expected, actual = run_both(load, data_date=datetime(2024, 3, 4, 8, 0))
+
+    assert_same_results(expected, actual)
+    assert actual[0].tasks['C'].early_start == datetime(2045, 6, 5, 9, 0)
+
+
+def test_circular_dependency_raises():
+    network = chain_network()
+    network.add_dependency(Dependency('C', 'A', 'PR_FS', 0.0))
+    calendars = {'std': P6Calendar.from_p6_data('std', *P6_CALENDARS['std'])}
+
+    with pytest.raises(ValueError, match='Circular dependency'):
+        ArrayCPMEngine(network, calendars).run(data_date=datetime(2024, 3, 4, 8, 0))
+
+
+@pytest.mark.slow
+def test_array_engine_benchmark(tmp_path):
+    """Benchmark: full-schedule CPM with the array engine vs. CPMEngine."""
+    tables = make_p6_tables(n_tasks=5000, file_ids=(1, 2))
+    # Version 2 has no curing-calendar tasks, which stay on CPMEngine's methods
+    tasks = tables['task']
+    tasks.loc[tasks['clndr_id'] == '2_102', 'clndr_id'] = '2_100'
+    for table, df in tables.items():
+        df.to_csv(tmp_path / f'{table}.csv', index=False)
+    store = ScheduleStore(tmp_path)
+
+    def run(engine_cls, file_id):
+        network, calendars, info = store.load_schedule(file_id)
+        start = timer.perf_counter()
+        engine_cls(network, calendars).run(data_date=info['data_date'])
+        return timer.perf_counter() - start
+
+    run(ArrayCPMEngine, 1)  # numba compilation / cache load
+    timings = {(cls, fid): run(cls, fid) for cls in (CPMEngine, ArrayCPMEngine) for fid in (1, 2)}
+    speedup = {fid: timings[CPMEngine, fid] / timings[ArrayCPMEngine, fid] for fid in (1, 2)}
+
+    print(f"\nCPM run: with curing calendar {speedup[1]:.1f}x "
+          f"({timings[CPMEngine, 1]:.2f}s -> {timings[ArrayCPMEngine, 1]:.2f}s), "
+          f"without {speedup[2]:.1f}x ({timings[CPMEngine, 2]:.2f}s -> {timings[ArrayCPMEngine, 2]:.2f}s)")
+    assert speedup[1] > 1
+    assert speedup[2] > 3
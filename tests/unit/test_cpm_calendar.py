@@ -0,0 +1,177 @@
+"""Tests for P6Calendar work-time arithmetic and its precomputed index."""
+
+import random
+import time as timer
+from dataclasses import asdict
+from datetime import date, datetime, time, timedelta
+
+import pandas as pd
+import pytest
+
+from scripts.primavera.analyze.cpm.calendar import P6Calendar, WorkPeriod
+from scripts.primavera.analyze.cpm.engine import CPMEngine
+from scripts.primavera.analyze.schedule_store import ScheduleStore
+from tests.conftest import P6_CALENDARS, make_p6_tables
+
+
+def wp(start: str, finish: str) -> WorkPeriod:
+    return WorkPeriod(time.fromisoformat(start), time.fromisoformat(finish))
+
+
+def odd_calendar() -> P6Calendar:
+    """Calendar with non-quarter-hour periods, adjacent periods, a curing day and irregular exception days."""
+    cal = P6Calendar('odd', work_week={
+        1: [],
+        2: [wp('07:20', '11:50'), wp('11:50', '15:07')],
+        3: [wp('06:00', '10:00'), wp('10:30', '16:45')],
+        4: [wp('00:00', '08:00'), wp('16:00', '23:59')],
+        5: [wp('08:00', '08:01')],
+        6: [wp('07:00', '17:00')],
+        7: [],
+    })
+    cal.exceptions[date(2024, 3, 13)] = [wp('09:00', '10:00')]
+    cal.exceptions[date(2024, 3, 20)] = []
+    cal.exceptions[date(2024, 4, 3)] = [wp('00:00', '00:00')]
+    cal.exceptions[date(2024, 4, 10)] = [wp('10:00', '09:00')]
+    return cal
+
+
+def curing_exception_calendar() -> P6Calendar:
+    """Two-shift weekdays with weekly curing days, a curing fortnight and an odd hours_per_day."""
+    data, _ = P6_CALENDARS['std']
+    cal = P6Calendar.from_p6_data('curing', data, 7.3, 'curing')
+    for k in range(0, 90, 7):
+        cal.exceptions[date(2024, 3, 1) + timedelta(days=k)] = [wp('00:00', '00:00')]
+    for k in range(14):
+        cal.exceptions[date(2024, 4, 10) + timedelta(days=k)] = [wp('00:00', '00:00')]
+    return cal
+
+
+def calendars() -> list[P6Calendar]:
+    parsed = [P6Calendar.from_p6_data(name, data, hours, name) for name, (data, hours) in P6_CALENDARS.items()]
+    return parsed + [odd_calendar(), curing_exception_calendar()]
+
+
+def scan_and_index(cal: P6Calendar, method: str, scan: str, *args):
+    """Call a method through the index and through the day scan."""
+    def call(func):
+        try:
+            return 'ok', func(*args)
+        except ValueError as e:
+            return 'error', str(e)
+    return call(getattr(cal, method)), call(getattr(cal, scan))
+
+
+@pytest.mark.parametrize('cal', calendars(), ids=lambda c: c.clndr_id)
+def test_index_matches_day_scan(cal):
+    rng = random.Random(0)
+    methods = [
+        ('add_work_hours', '_add_work_hours_scan'),
+        ('subtract_work_hours', '_subtract_work_hours_scan'),
+        ('advance_to_work_time', '_advance_to_work_time_scan'),
+        ('_retreat_to_work_time', '_retreat_to_work_time_scan'),
+        ('get_previous_work_period_end', '_get_previous_work_period_end_scan'),
+    ]
+
+    def random_dt():
+        base = datetime(2024, 3, 1) + timedelta(days=rng.randint(-30, 60))
+        return rng.choice([
+            base + timedelta(hours=rng.choice([0, 8, 12, 13, 17])),
+            base + timedelta(hours=23, minutes=59, seconds=59),
+            base + timedelta(microseconds=rng.randint(0, 86_400_000_000 - 1)),
+            pd.Timestamp(base + timedelta(minutes=rng.randint(0, 1439))),
+        ])
+
+    for _ in range(300):
+        dt = random_dt()
+        hours = rng.choice([8.0, 12.5, 40.0, 400.0, 10.3, 1 / 3, round(rng.uniform(0, 200), 1), rng.uniform(0, 200)])
+        for method, scan in methods:
+            args = (dt, hours) if 'hours' in method else (dt,)
+            indexed, scanned = scan_and_index(cal, method, scan, *args)
+            assert indexed == scanned, (method, dt, hours)
+            assert type(indexed[1]) is type(scanned[1]), (method, dt, hours)
+
+        end = random_dt()
+        indexed, scanned = scan_and_index(cal, 'work_hours_between', '_work_hours_between_scan', dt, end)
+        assert indexed == scanned, (dt, end)
+
+
+@pytest.mark.parametrize('cal', [
+    P6Calendar.from_p6_data('cure', *P6_CALENDARS['cure']), curing_exception_calendar(),
+], ids=lambda c: c.clndr_id)
+def test_curing_days_use_the_index(cal, monkeypatch):
+    start = datetime(2024, 3, 1, 10, 30)
+    calls = [(name, (start, hours)) for hours in (3.0, 7.3, 30.0, 250.0)
+             for name in ('add_work_hours', 'subtract_work_hours')]
+    calls += [('work_hours_between', (start, start + timedelta(days=days))) for days in (0.25, 3, 40)]
+    calls += [(name, (start + timedelta(days=days),)) for days in (0, 7, 40)
+              for name in ('advance_to_work_time', '_retreat_to_work_time', 'get_previous_work_period_end')]
+    scans = {name: f'_{name.lstrip("_")}_scan' for name, _ in calls}
+    expected = [getattr(cal, scans[name])(*args) for name, args in calls]
+
+    for scan in scans.values():
+        monkeypatch.setattr(cal, scan, None)
+
+    assert [getattr(cal, name)(*args) for name, args in calls] == expected
+
+
+def test_no_work_time_raises_like_scan():
+    cal = P6Calendar('none', work_week={day: [] for day in range(1, 8)})
+    cal.exceptions[date(2024, 1, 2)] = [wp('08:00', '12:00')]
+
+    indexed, scanned = scan_and_index(cal, 'add_work_hours', '_add_work_hours_scan', datetime(2024, 1, 3), 8.0)
+
+    assert indexed == scanned == ('error', 'Could not find work time within 365 days')
+    assert cal.get_previous_work_period_end(datetime(2025, 6, 1)) is None
+
+
+def test_invalidate_after_editing_exceptions():
+    cal = P6Calendar.from_p6_data('std', *P6_CALENDARS['std'])
+    monday = datetime(2024, 3, 4, 8, 0)
+    assert cal.add_work_hours(monday, 8) == datetime(2024, 3, 4, 17, 0)
+
+    cal.exceptions[monday.date()] = []
+    cal.invalidate_work_index()
+
+    assert cal.add_work_hours(monday, 8) == datetime(2024, 3, 5, 17, 0)
+
+
+@pytest.mark.slow
+def test_work_time_index_benchmark(tmp_path):
+    """Benchmark: full-schedule CPM with the work-time index vs. day scans."""
+    for table, df in make_p6_tables(n_tasks=1500, file_ids=(1,)).items():
+        df.to_csv(tmp_path / f'{table}.csv', index=False)
+    store = ScheduleStore(tmp_path)
+
+    def run(use_index):
+        P6Calendar.use_work_index = use_index
+        try:
+            network, cals, info = store.load_schedule(1)
+            for cal in cals.values():
+                cal.invalidate_work_index()
+            start = timer.perf_counter()
+            CPMEngine(network, cals).run(data_date=info['data_date'])
+            elapsed = timer.perf_counter() - start
+        finally:
+            P6Calendar.use_work_index = True
+        return elapsed, {task_id: asdict(task) for task_id, task in network.tasks.items()}
+
+    scan_time, scan_tasks = run(False)
+    index_time, index_tasks = run(True)
+
+    std = P6Calendar.from_p6_data('std', *P6_CALENDARS['std'])
+    span_start, span_end = datetime(2024, 3, 4, 9, 30), datetime(2024, 9, 2, 14, 0)
+    timings = {}
+    for use_index in (False, True):
+        P6Calendar.use_work_index = use_index
+        start = timer.perf_counter()
+        for _ in range(200):
+            std.work_hours_between(span_start, span_end)
+            std.add_work_hours(span_start, 400)
+        timings[use_index] = timer.perf_counter() - start
+    P6Calendar.use_work_index = True
+
+    print(f"\nCPM run: scan {scan_time:.2f}s, index {index_time:.2f}s ({scan_time / index_time:.1f}x); "
+          f"6-month spans: {timings[False] / timings[True]:.0f}x")
+    assert index_tasks == scan_tasks
+    assert index_time < scan_time
@@ -0,0 +1,124 @@
+"""Tests for warm-started CPM over a sequence of schedule snapshots."""
+
+import time as timer
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.primavera.analyze.cpm.array_engine import ArrayCPMEngine
+from scripts.primavera.analyze.cpm.engine import CPMEngine
+from scripts.primavera.analyze.cpm_history import WarmStartCPM, run_cpm_history
+from scripts.primavera.analyze.schedule_store import ScheduleStore
+from tests.conftest import make_p6_tables
+
+
+def fresh_results(data_dir, file_id, engine) -> pd.DataFrame:
+    """CPM on a schedule loaded from scratch, keyed by task_code."""
+    network, calendars, info = ScheduleStore(data_dir).load_schedule(file_id, include_p6_values=False)
+    engine(network, calendars).run(data_date=info['data_date'], target_finish=info.get('target_finish_date'))
+    tasks = list(network.tasks.values())
+    return pd.DataFrame({
+        'task_code': [t.task_code for t in tasks],
+        'task_id': [t.task_id for t in tasks],
+        'early_start': pd.to_datetime([t.early_start for t in tasks]),
+        'early_finish': pd.to_datetime([t.early_finish for t in tasks]),
+        'late_start': pd.to_datetime([t.late_start for t in tasks]),
+        'late_finish': pd.to_datetime([t.late_finish for t in tasks]),
+        'total_float_hours': [t.total_float_hours for t in tasks],
+        'is_critical': [t.is_critical for t in tasks],
+    }).set_index('task_code').sort_index()
+
+
+@pytest.mark.parametrize('engine', ['cpm', 'array'])
+def test_history_matches_cpm_from_scratch(p6_data_dir, engine):
+    # 3 -> 1 -> 2 -> 2: out of order, and a repeat with an empty delta
+    file_ids = [3, 1, 2, 2]
+
+    results, summary = run_cpm_history(file_ids, engine=engine, data_dir=p6_data_dir, verbose=False)
+
+    engine_cls = {'cpm': CPMEngine, 'array': ArrayCPMEngine}[engine]
+    for position, file_id in enumerate(file_ids):
+        expected = fresh_results(p6_data_dir, file_id, engine_cls)
+        start = sum(summary['tasks'].iloc[:position])
+        actual = results.iloc[start:start + summary['tasks'].iloc[position]]
+        actual = actual.drop(columns='file_id').set_index('task_code').sort_index()
+        assert (results['file_id'].iloc[start:start + len(actual)] == file_id).all()
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+    assert summary['file_id'].tolist() == file_ids
+    assert summary.iloc[-1][['tasks_added', 'tasks_removed', 'tasks_changed',
+                             'relationships_added', 'relationships_removed']].sum() == 0
+    assert summary['tasks_added'].iloc[0] == summary['tasks'].iloc[0]
+
+
+def test_unchanged_structure_keeps_compiled_network(p6_data_dir):
+    history = WarmStartCPM(ScheduleStore(p6_data_dir))
+    history.advance(1)
+    history.run()
+    compact = history.network.compact()
+
+    tasks = pd.read_csv(p6_data_dir / 'task.csv')
+    tasks.loc[tasks['file_id'] == 1, 'target_drtn_hr_cnt'] += 8
+    tasks.to_csv(p6_data_dir / 'task.csv', index=False)
+    history.store.clear()
+    delta = history.advance(1)
+
+    assert delta['tasks_changed'] == (tasks['file_id'] == 1).sum()
+    assert delta['tasks_added'] == delta['relationships_added'] == delta['relationships_removed'] == 0
+    assert history.network.compact() is compact
+
+
+def make_snapshot_history(tmp_path, n_tasks: int, n_versions: int):
+    """One schedule updated weekly: durations drift and a few links change (no curing calendar)."""
+    base = make_p6_tables(n_tasks=n_tasks, file_ids=(1,))
+    base['task']['clndr_id'] = base['task']['clndr_id'].replace('1_102', '1_100')
+    rng = np.random.default_rng(1)
+    tables = {name: [] for name in base}
+    for version in range(n_versions):
+        file_id = version + 1
+        prefix = lambda col: col.str.replace(r'^1_', f'{file_id}_', regex=True)
+        task = base['task'].copy()
+        slip = rng.random(len(task)) < 0.05
+        task.loc[slip, 'target_drtn_hr_cnt'] += 8 * version
+        task['file_id'] = file_id
+        for col in ('task_id', 'clndr_id', 'wbs_id'):
+            task[col] = prefix(task[col])
+        pred = base['taskpred'].copy()
+        pred = pred[rng.random(len(pred)) > 0.01]
+        pred['file_id'] = file_id
+        for col in ('task_id', 'pred_task_id'):
+            pred[col] = prefix(pred[col])
+        calendar = base['calendar'].assign(file_id=file_id, clndr_id=prefix(base['calendar']['clndr_id']))
+        project = base['project'].assign(
+            file_id=file_id,
+            last_recalc_date=(pd.Timestamp('2024-03-04 08:00') + pd.Timedelta(days=7 * version))
+            .strftime('%Y-%m-%d %H:%M'),
+        )
+        for name, df in (('task', task), ('taskpred', pred), ('calendar', calendar), ('project', project)):
+            tables[name].append(df)
+    for name, parts in tables.items():
+        pd.concat(parts).to_csv(tmp_path / f'{name}.csv', index=False)
+
+
+@pytest.mark.slow
+def test_cpm_history_benchmark(tmp_path):
+    """Benchmark: CPM on 20 weekly snapshots of 3,000 tasks, from scratch vs. warm-started."""
+    make_snapshot_history(tmp_path, n_tasks=3000, n_versions=20)
+    file_ids = list(range(1, 21))
+    ScheduleStore(tmp_path).file_ids()  # partition once for both runs
+
+    start = timer.perf_counter()
+    for file_id in file_ids:
+        store = ScheduleStore(tmp_path)
+        network, calendars, info = store.load_schedule(file_id, include_p6_values=False)
+        ArrayCPMEngine(network, calendars).run(data_date=info['data_date'])
+    scratch_time = timer.perf_counter() - start
+
+    start = timer.perf_counter()
+    results, summary = run_cpm_history(file_ids, engine='array', data_dir=tmp_path, verbose=False)
+    warm_time = timer.perf_counter() - start
+
+    print(f"\n20 snapshots x 3,000 tasks: from scratch {scratch_time:.2f}s, warm-started {warm_time:.2f}s")
+    assert len(results) == summary['tasks'].sum()
+    assert warm_time < scratch_time
@@ -0,0 +1,151 @@
+"""Tests for incremental CPM what-if recalculation."""
+
+import random
+import time as timer
+from dataclasses import asdict
+
+import pandas as pd
+import pytest
+
+from scripts.primavera.analyze.analysis.single_task_impact import analyze_task_impact
+from scripts.primavera.analyze.cpm.engine import CPMEngine
+from scripts.primavera.analyze.cpm.incremental import IncrementalCPM
+from scripts.primavera.analyze.cpm.models import Dependency
+from scripts.primavera.analyze.schedule_store import ScheduleStore
+from tests.conftest import make_p6_tables
+
+
+def task_state(network) -> dict:
+    return {tid: asdict(task) for tid, task in network.tasks.items()}
+
+
+def full_rerun(network, calendars, data_date, changes: dict):
+    """Clone-and-rerun reference for a what-if."""
+    modified = network.clone()
+    for task_id, hours in changes.get('durations', {}).items():
+        modified.modify_task_duration(task_id, hours)
+    for task_id, (constraint_type, constraint_date) in changes.get('constraints', {}).items():
+        modified.tasks[task_id].constraint_type = constraint_type
+        modified.tasks[task_id].constraint_date = constraint_date
+    for pred_id, succ_id in changes.get('remove_dependencies', []):
+        for dep in [d for d in modified.get_successors(pred_id) if d.succ_task_id == succ_id]:
+            modified.remove_dependency(dep)
+    for dep in changes.get('add_dependencies', []):
+        modified.add_dependency(Dependency(dep.pred_task_id, dep.succ_task_id, dep.pred_type, dep.lag_hours))
+    result = CPMEngine(modified, calendars).run(data_date=data_date)
+    return modified, result
+
+
+def random_changes(rng: random.Random, network) -> dict:
+    task_ids = list(network.tasks)
+    kind = rng.choice(['durations', 'constraints', 'links'])
+    if kind == 'durations':
+        return {'durations': {tid: rng.choice([0.0, 4.0, 40.0, 400.0])
+                              for tid in rng.sample(task_ids, rng.randint(1, 3))}}
+    if kind == 'constraints':
+        task_id = rng.choice(task_ids)
+        date = pd.Timestamp('2024-03-04 08:00') + pd.Timedelta(days=rng.randint(0, 120))
+        return {'constraints': {task_id: (rng.choice(['CS_SNET', 'CS_FNLT', 'CS_MSO', None]), date)}}
+    dep = rng.choice(network.dependencies)
+    return {
+        'remove_dependencies': [(dep.pred_task_id, dep.succ_task_id)],
+        # A shortcut between tasks already linked downstream of the removed link cannot form a cycle
+        'add_dependencies': [Dependency(dep.pred_task_id, dep.succ_task_id, 'PR_SS', 16.0)],
+    }
+
+
+@pytest.fixture
+def schedule(p6_data_dir):
+    store = ScheduleStore(p6_data_dir)
+    network, calendars, info = store.load_schedule(1)
+    return network, calendars, info['data_date']
+
+
+def test_recalculate_matches_full_rerun_and_reverts(schedule):
+    network, calendars, data_date = schedule
+    whatif = IncrementalCPM(network, calendars, data_date=data_date)
+    baseline_state = task_state(network)
+    rng = random.Random(7)
+
+    for _ in range(25):
+        changes = random_changes(rng, network)
+        expected_network, expected = full_rerun(network, calendars, data_date, changes)
+
+        result = whatif.recalculate(**changes)
+
+        assert task_state(network) == task_state(expected_network), changes
+        assert result.critical_path == expected.critical_path
+        assert result.project_finish == expected.project_finish
+        assert result.total_duration_hours == expected.total_duration_hours
+
+        whatif.revert()
+        assert task_state(network) == baseline_state
+
+
+def test_changes_accumulate_until_revert(schedule):
+    network, calendars, data_date = schedule
+    whatif = IncrementalCPM(network, calendars, data_date=data_date)
+    first, second = list(network.tasks)[3], list(network.tasks)[10]
+
+    whatif.recalculate(durations={first: 200.0})
+    whatif.recalculate(durations={second: 120.0})
+    expected_network, _ = full_rerun(network, calendars, data_date, {})
+
+    assert task_state(network) == task_state(expected_network)
+    assert network.tasks[first].duration_hours == 200.0
+
+
+def test_cycle_raises_and_reverts(schedule):
+    network, calendars, data_date = schedule
+    whatif = IncrementalCPM(network, calendars, data_date=data_date)
+    baseline_state = task_state(network)
+    dep = network.dependencies[0]
+
+    with pytest.raises(ValueError, match='Circular dependency'):
+        whatif.recalculate(add_dependencies=[Dependency(dep.succ_task_id, dep.pred_task_id, 'PR_FS', 0.0)])
+
+    assert task_state(network) == baseline_state
+    assert len(network.dependencies) == len(network.clone().dependencies)
+
+
+def test_analyze_task_impact_matches_full_rerun(schedule):
+    network, calendars, data_date = schedule
+    CPMEngine(network, calendars).run(data_date=data_date)
+    task_id = next(tid for tid in network.topological_sort() if network.tasks[tid].is_critical
+                   and network.tasks[tid].is_not_started())
+    hours = network.tasks[task_id].duration_hours + 80
+    expected_network, expected = full_rerun(network, calendars, data_date, {'durations': {task_id: hours}})
+
+    impact = analyze_task_impact(network, calendars, task_id, 80, data_date=data_date)
+
+    assert impact.new_finish == expected.project_finish > impact.original_finish
+    assert impact.new_critical_path == expected.critical_path
+    assert impact.affected_task_ids == [tid for tid, task in expected_network.tasks.items()
+                                        if task.early_finish != network.tasks[tid].early_finish]
+    assert network.tasks[task_id].duration_hours == hours - 80
+
+
+@pytest.mark.slow
+def test_incremental_what_if_benchmark(tmp_path):
+    """Benchmark: single-task what-ifs, incremental vs. clone and full CPM."""
+    for table, df in make_p6_tables(n_tasks=3000, file_ids=(1,)).items():
+        df.to_csv(tmp_path / f'{table}.csv', index=False)
+    network, calendars, info = ScheduleStore(tmp_path).load_schedule(1)
+    data_date = info['data_date']
+    whatif = IncrementalCPM(network, calendars, data_date=data_date)
+    task_ids = random.Random(0).sample([t.task_id for t in network.tasks.values() if t.is_not_started()], 20)
+
+    start = timer.perf_counter()
+    for task_id in task_ids:
+        full_rerun(network, calendars, data_date, {'durations': {task_id: 400.0}})
+    full_time = timer.perf_counter() - start
+
+    start = timer.perf_counter()
+    for task_id in task_ids:
+        whatif.recalculate(durations={task_id: 400.0})
+        whatif.revert()
+    incremental_time = timer.perf_counter() - start
+
+    print(f"\n20 what-ifs: full {full_time:.2f}s, incremental {incremental_time:.2f}s "
+          f"({full_time / incremental_time:.1f}x)")
+    assert incremental_time < full_time
@@ -0,0 +1,95 @@
+"""Tests for Monte Carlo schedule risk analysis."""
+
+import time as timer
+from dataclasses import asdict
+
+import pytest
+
+from scripts.primavera.analyze.cpm.engine import CPMEngine
+from scripts.primavera.analyze.cpm.monte_carlo import DurationDistribution, MonteCarloCPM
+from scripts.primavera.analyze.schedule_store import ScheduleStore
+from tests.conftest import make_p6_tables
+
+
+def load(data_dir, file_id=1, curing=True):
+    network, calendars, info = ScheduleStore(data_dir).load_schedule(file_id)
+    if not curing:
+        for task in network.tasks.values():
+            if task.calendar_id.endswith('_102'):
+                task.calendar_id = task.calendar_id[:-3] + '100'
+    return network, calendars, info['data_date']
+
+
+@pytest.mark.parametrize('curing', [False, True], ids=['kernel', 'engine-fallback'])
+def test_fixed_multiplier_matches_cpm_engine(p6_data_dir, curing):
+    network, calendars, data_date = load(p6_data_dir, curing=curing)
+    scaled = network.clone()
+    for task in scaled.tasks.values():
+        if not task.is_completed():
+            task.duration_hours *= 1.25
+            task.remaining_duration_hours *= 1.25
+    expected = CPMEngine(scaled, calendars).run(data_date=data_date)
+    mc = MonteCarloCPM(network, calendars, data_date=data_date)
+    before = {tid: asdict(task) for tid, task in network.tasks.items()}
+
+    result = mc.run(3, default=DurationDistribution('uniform', 1.25, 1.25, 1.25))
+
+    assert result.finish_dates == [expected.project_finish] * 3
+    assert result.p50_finish == result.p80_finish == expected.project_finish
+    assert result.criticality == {tid: float(task.is_critical) for tid, task in scaled.tasks.items()}
+    assert {tid: asdict(task) for tid, task in network.tasks.items()} == before
+
+
+def test_distributions_percentiles_and_tornado(p6_data_dir):
+    network, calendars, data_date = load(p6_data_dir, curing=False)
+    mc = MonteCarloCPM(network, calendars, data_date=data_date)
+    driver = next(tid for tid in mc.deterministic.critical_path if network.tasks[tid].is_not_started()
+                  and network.tasks[tid].duration_hours > 0)
+    categories = {tid: 'A' if i % 2 else 'B' for i, tid in enumerate(network.tasks)}
+
+    run = lambda seed: mc.run(
+        300, seed=seed,
+        distributions={driver: DurationDistribution('pert', 1.0, 2.0, 6.0)},
+        categories=categories,
+        category_distributions={'A': DurationDistribution('triangular', 0.95, 1.0, 1.1)},
+        default=DurationDistribution('uniform', 1.0, 1.0, 1.05),
+    )
+    result = run(seed=4)
+
+    assert result == run(seed=4)
+    assert mc.deterministic.project_finish <= result.p50_finish <= result.p80_finish
+    assert result.finish_percentile(80) == result.p80_finish
+    assert result.get_tornado(1)[0][0] == driver
+    assert result.criticality[driver] > 0
+    assert all(0 <= value <= 1 for value in result.criticality.values())
+    completed = [tid for tid, task in network.tasks.items() if task.is_completed()]
+    assert not set(completed) & set(result.sensitivity)
+
+
+def test_invalid_distribution():
+    with pytest.raises(ValueError, match='Unknown distribution'):
+        DurationDistribution('normal', 1, 1, 2)
+    with pytest.raises(ValueError, match='low <= mode <= high'):
+        DurationDistribution('triangular', 1.2, 1.0, 2.0)
+
+
+@pytest.mark.slow
+def test_monte_carlo_benchmark(tmp_path):
+    """Benchmark: Monte Carlo iterations per minute on a 5,000-task schedule."""
+    for table, df in make_p6_tables(n_tasks=5000, file_ids=(1,)).items():
+        df.to_csv(tmp_path / f'{table}.csv', index=False)
+    network, calendars, data_date = load(tmp_path, curing=False)
+    mc = MonteCarloCPM(network, calendars, data_date=data_date)
+    dist = DurationDistribution('triangular', 0.9, 1.0, 1.5)
+    mc.run(2, default=dist)  # numba compilation / cache load
+
+    start = timer.perf_counter()
+    mc.run(500, default=dist, seed=0)
+    per_minute = 500 / (timer.perf_counter() - start) * 60
+
+    start = timer.perf_counter()
+    CPMEngine(network.clone(), calendars).run(data_date=data_date)
+    cpm_per_minute = 60 / (timer.perf_counter() - start)
+
+    print(f"\nMonte Carlo: {per_minute:.0f} iterations/min (CPMEngine runs: {cpm_per_minute:.0f}/min)")
+    assert per_minute > 1000
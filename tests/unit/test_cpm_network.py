@@ -0,0 +1,130 @@
+"""Tests for TaskNetwork's compact CSR form, cached order and reachability."""
+
+import random
+import time as timer
+
+import pytest
+
+from scripts.primavera.analyze.cpm.models import Dependency, Task
+from scripts.primavera.analyze.cpm.network import TaskNetwork
+
+
+def make_network(n_tasks: int, n_deps: int, seed: int = 0) -> TaskNetwork:
+    """Random DAG; tasks are inserted shuffled so dict order differs from the order."""
+    rng = random.Random(seed)
+    ranks = list(range(n_tasks))
+    rng.shuffle(ranks)
+    network = TaskNetwork()
+    for rank in ranks:
+        network.add_task(Task(task_id=f't{rank}', task_code=f'T{rank}', task_name='', duration_hours=8.0,
+                              calendar_id='std', status='TK_NotStart', task_type='TT_Task', wbs_id=''))
+    for _ in range(n_deps):
+        a, b = sorted(rng.sample(range(n_tasks), 2))
+        network.add_dependency(Dependency(f't{a}', f't{b}', 'PR_FS', 0.0))
+    return network
+
+
+def reference_topological_sort(network: TaskNetwork) -> list[str]:
+    """The original list-based Kahn's algorithm."""
+    in_degree = {tid: len(network.get_predecessors(tid)) for tid in network.tasks}
+    queue = [tid for tid, deg in in_degree.items() if deg == 0]
+    result = []
+    while queue:
+        task_id = queue.pop(0)
+        result.append(task_id)
+        for dep in network.get_successors(task_id):
+            in_degree[dep.succ_task_id] -= 1
+            if in_degree[dep.succ_task_id] == 0:
+                queue.append(dep.succ_task_id)
+    return result
+
+
+def reference_closure(network: TaskNetwork, task_id: str, successors: bool) -> set[str]:
+    result, queue = set(), [task_id]
+    while queue:
+        current = queue.pop()
+        deps = network.get_successors(current) if successors else network.get_predecessors(current)
+        for dep in deps:
+            nxt = dep.succ_task_id if successors else dep.pred_task_id
+            if nxt not in result:
+                result.add(nxt)
+                queue.append(nxt)
+    return result
+
+
+def test_topological_sort_matches_reference_and_is_cached():
+    network = make_network(300, 900)
+
+    order = network.topological_sort()
+
+    assert order == reference_topological_sort(network)
+    assert network.reverse_topological_sort() == order[::-1]
+    assert network.compact() is network.compact()
+    assert network.clone().compact() is network.compact()
+
+
+def test_mutation_invalidates_cached_order():
+    network = make_network(50, 100)
+    first = network.topological_sort()
+    last = first[-1]
+
+    network.add_dependency(Dependency(last, first[0], 'PR_FS', 0.0))
+    with pytest.raises(ValueError, match='Circular dependency'):
+        network.topological_sort()
+
+    network.remove_dependency(network.get_successors(last)[-1])
+    assert network.topological_sort() == first
+
+    network.add_task(Task(task_id='new', task_code='NEW', task_name='', duration_hours=0.0,
+                          calendar_id='std', status='TK_NotStart', task_type='TT_Mile', wbs_id=''))
+    assert network.topological_sort() == reference_topological_sort(network)
+
+
+def test_remove_task_and_dependencies():
+    network = make_network(60, 150, seed=2)
+    task_id = network.topological_sort()[30]
+    links = network.get_predecessors(task_id) + network.get_successors(task_id)
+    others = network.dependencies[:5]
+
+    network.remove_task(task_id)
+    network.remove_dependencies([d for d in others if all(d is not link for link in links)])
+
+    assert task_id not in network.tasks
+    remaining = {id(d) for d in network.dependencies}
+    assert not any(task_id in (d.pred_task_id, d.succ_task_id) for d in network.dependencies)
+    assert not remaining & {id(d) for d in links + others}
+    assert sum(len(network.get_successors(t)) for t in network.tasks) == len(remaining)
+    assert network.topological_sort() == reference_topological_sort(network)
+
+
+@pytest.mark.parametrize('indexed', [False, True])
+def test_transitive_closures_match_reference(indexed):
+    network = make_network(200, 500, seed=1)
+    if indexed:
+        network.build_reachability_index()
+
+    for task_id in list(network.tasks)[::7]:
+        assert network.get_all_successors(task_id) == reference_closure(network, task_id, True)
+        assert network.get_all_predecessors(task_id) == reference_closure(network, task_id, False)
+        assert network.get_all_successors(task_id, include_self=True) == \
+            reference_closure(network, task_id, True) | {task_id}
+
+    assert network.get_all_successors('missing') == set()
+
+
+@pytest.mark.slow
+def test_network_traversal_benchmark():
+    """Benchmark: list-based Kahn's algorithm vs. cached CSR order."""
+    network = make_network(20000, 60000)
+
+    start = timer.perf_counter()
+    reference_topological_sort(network)
+    reference_time = timer.perf_counter() - start
+
+    start = timer.perf_counter()
+    for _ in range(3):  # forward pass, backward pass, critical path
+        network.topological_sort()
+    cached_time = timer.perf_counter() - start
+
+    print(f"\nTopological sort x3 on 20k tasks: reference {3 * reference_time:.2f}s, cached {cached_time:.2f}s")
+    assert cached_time < 3 * reference_time
@@ -0,0 +1,79 @@
+"""Tests for marginal delay attribution over snapshot windows."""
+
+import time as timer
+
+import pytest
+
+from scripts.primavera.analyze.analysis.delay_attribution import (
+    attribute_delays_marginal,
+    attribute_delays_windows,
+    attribution_table,
+)
+from scripts.primavera.analyze.cpm.engine import CPMEngine
+from scripts.primavera.analyze.schedule_store import ScheduleStore
+from tests.conftest import make_p6_tables
+
+
+def reference_impacts(data_dir, baseline_file_id, current_file_id, task_codes) -> dict:
+    """Clone-and-rerun marginal impact (project finish) of reverting each task."""
+    store = ScheduleStore(data_dir)
+    baseline, _, _ = store.load_schedule(baseline_file_id)
+    current, calendars, info = store.load_schedule(current_file_id)
+    baseline_hours = {t.task_code: t.duration_hours for t in baseline.tasks.values()}
+    finishes = {}
+    for task in list(current.tasks.values()):
+        if task.task_code in task_codes:
+            test = current.clone()
+            test.modify_task_duration(task.task_id, baseline_hours[task.task_code])
+            finishes[task.task_code] = CPMEngine(test, calendars).run(data_date=info['data_date']).project_finish
+    return finishes
+
+
+def test_marginal_impacts_match_full_rerun(p6_data_dir):
+    result = attribute_delays_marginal(2, 3, data_dir=p6_data_dir, top_n=100)
+
+    assert result.task_contributions
+    calendar = next(iter(ScheduleStore(p6_data_dir).load_calendars(3).values()))
+    expected = reference_impacts(p6_data_dir, 2, 3, {c.task_code for c in result.task_contributions})
+    for contrib in result.task_contributions:
+        assert contrib.slip_contribution_hours == \
+            calendar.work_hours_between(expected[contrib.task_code], result.current_finish)
+    assert sum(c.slip_contribution_pct for c in result.task_contributions) == pytest.approx(100)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_windows_match_pairwise_attribution(p6_data_dir, tmp_path, workers):
+    expected = [attribute_delays_marginal(1, 2, data_dir=p6_data_dir),
+                attribute_delays_marginal(2, 3, data_dir=p6_data_dir)]
+
+    results = attribute_delays_windows([1, 2, 3], data_dir=p6_data_dir, workers=workers,
+                                       output_path=tmp_path / 'attribution.csv')
+
+    for result, reference in zip(results, expected):
+        assert sorted(result.new_tasks) == sorted(reference.new_tasks)
+        result.new_tasks, result.removed_tasks = reference.new_tasks, reference.removed_tasks
+        assert result == reference
+    table = attribution_table(results)
+    assert len(table) == sum(len(r.task_contributions) for r in results)
+    assert (table.groupby('current_file_id')['rank'].min() == 1).all()
+    assert (tmp_path / 'attribution.csv').exists()
+
+
+@pytest.mark.slow
+def test_marginal_attribution_benchmark(tmp_path):
+    """Benchmark: one pair's 50 candidate what-ifs, clone + full CPM vs. incremental."""
+    for table, df in make_p6_tables(n_tasks=1500, file_ids=(1, 2)).items():
+        df.to_csv(tmp_path / f'{table}.csv', index=False)
+    network, _, _ = ScheduleStore(tmp_path).load_schedule(2)
+    codes = {t.task_code for t in list(network.tasks.values())[:1500:150]}
+
+    start = timer.perf_counter()
+    reference_impacts(tmp_path, 1, 2, codes)
+    per_task = (timer.perf_counter() - start) / len(codes)
+
+    start = timer.perf_counter()
+    attribute_delays_marginal(1, 2, data_dir=tmp_path, top_n=50)
+    incremental_time = timer.perf_counter() - start
+
+    print(f"\n50 candidates: clone + full CPM ~{50 * per_task:.2f}s, incremental {incremental_time:.2f}s")
+    assert incremental_time < 50 * per_task
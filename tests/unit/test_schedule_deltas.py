@@ -0,0 +1,115 @@
+"""Tests for snapshot-to-snapshot schedule delta tables."""
+
+import pandas as pd
+
+from scripts.primavera.process.schedule_deltas import (
+    consecutive_pairs,
+    diff_tasks,
+    load_schedule_deltas,
+    relationship_changes,
+    update_schedule_deltas,
+)
+from tests.conftest import make_p6_tables
+
+
+def make_files(file_ids=(1, 2, 3, 4)) -> pd.DataFrame:
+    """xer_files rows: odd file_ids are YATES, even are SECAI; dates out of file_id order."""
+    dates = {1: '2024-03-04', 2: '2024-03-05', 3: '2024-02-26', 4: '2024-03-12', 5: '2024-03-11'}
+    return pd.DataFrame({
+        'file_id': list(file_ids),
+        'filename': [f'f{fid}.xer' for fid in file_ids],
+        'date': [dates[fid] for fid in file_ids],
+        'schedule_type': ['YATES' if fid % 2 else 'SECAI' for fid in file_ids],
+    })
+
+
+def reference_relationships(tables: dict, prev: int, curr: int) -> tuple[set, set]:
+    """Row-wise relationship diff as done by ScheduleSlippageAnalyzer."""
+    def rel_set(fid):
+        tasks = tables['task'][tables['task']['file_id'] == fid]
+        id_to_code = dict(zip(tasks['task_id'].astype(str), tasks['task_code']))
+        rels = tables['taskpred'][tables['taskpred']['file_id'] == fid]
+        return {
+            (id_to_code[str(r.pred_task_id)], id_to_code[str(r.task_id)], r.pred_type)
+            for r in rels.itertuples()
+        }
+    before, after = rel_set(prev), rel_set(curr)
+    return after - before, before - after
+
+
+def test_consecutive_pairs_per_schedule_type():
+    pairs = consecutive_pairs(make_files((1, 2, 3, 4, 5)))
+
+    assert list(pairs.itertuples(index=False, name=None)) == [
+        ('SECAI', 2, 4),
+        ('YATES', 3, 1),
+        ('YATES', 1, 5),
+    ]
+
+
+def test_diff_tasks_added_removed_changed():
+    prev = pd.DataFrame({
+        'task_id': ['1_1', '1_2', '1_3'],
+        'task_code': ['A', 'B', 'C'],
+        'status_code': ['TK_NotStart', 'TK_Active', 'TK_Active'],
+        'target_drtn_hr_cnt': ['80', '40', ''],
+    })
+    curr = pd.DataFrame({
+        'task_id': ['2_1', '2_2', '2_4'],
+        'task_code': ['A', 'B', 'D'],
+        'status_code': ['TK_NotStart', 'TK_Complete', 'TK_NotStart'],
+        'target_drtn_hr_cnt': [80.0, 48.0, 8.0],
+    })
+
+    delta = diff_tasks(prev, curr).set_index('task_code')
+
+    assert list(delta.index) == ['B', 'C', 'D']
+    assert delta.loc['B', 'change_type'] == 'changed'
+    assert delta.loc['B', 'changed_fields'] == 'status_code;target_drtn_hr_cnt'
+    assert delta.loc['C', 'change_type'] == 'removed'
+    assert delta.loc['D', 'change_type'] == 'added'
+    assert delta.loc['D', 'task_id_curr'] == '2_4'
+
+
+def test_relationship_changes_match_rowwise(tmp_path):
+    tables = make_p6_tables(file_ids=(1, 2, 3, 4))
+    update_schedule_deltas(tmp_path, make_files(), tables['task'], tables['taskpred'], verbose=False)
+    deltas = load_schedule_deltas(tmp_path)
+
+    for prev, curr in [(3, 1), (2, 4)]:
+        changes = relationship_changes(deltas, prev, curr)
+        added, removed = reference_relationships(tables, prev, curr)
+
+        assert set(changes['added_relationships']) == added
+        assert set(changes['removed_relationships']) == removed
+        assert changes['tasks_with_new_preds'] == {rel[1] for rel in added}
+
+    assert relationship_changes(deltas, 1, 2) is None
+
+
+def test_incremental_update_matches_rebuild(tmp_path):
+    tables = make_p6_tables(file_ids=(1, 2, 3, 4, 5))
+    first = {k: df[df['file_id'] <= 4] for k, df in tables.items()}
+    update_schedule_deltas(tmp_path, make_files(), first['task'], first['taskpred'], verbose=False)
+    # Reload through CSV so old and new snapshots have different dtypes, as in incremental ingestion
+    tasks = pd.concat([pd.read_csv(_write(first['task'], tmp_path / 'task.csv')),
+                       tables['task'][tables['task']['file_id'] == 5]], ignore_index=True)
+
+    update_schedule_deltas(tmp_path, make_files((1, 2, 3, 4, 5)), tasks, tables['taskpred'], verbose=False)
+    incremental = load_schedule_deltas(tmp_path)
+
+    rebuild_dir = tmp_path / 'rebuild'
+    rebuild_dir.mkdir()
+    update_schedule_deltas(rebuild_dir, make_files((1, 2, 3, 4, 5)), tables['task'], tables['taskpred'],
+                           rebuild=True, verbose=False)
+    rebuilt = load_schedule_deltas(rebuild_dir)
+
+    assert list(incremental['pairs']['file_id_curr']) == [4, 1, 5]
+    for name in ('pairs', 'task_delta', 'taskpred_delta'):
+        pd.testing.assert_frame_equal(incremental[name].reset_index(drop=True),
+                                      rebuilt[name].reset_index(drop=True))
+
+
+def _write(df: pd.DataFrame, path):
+    df.to_csv(path, index=False)
+    return path
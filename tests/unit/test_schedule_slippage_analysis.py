@@ -0,0 +1,552 @@
+"""Tests for ScheduleSlippageAnalyzer snapshot comparisons."""
+
+import time as timer
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.integrated_analysis import schedule_slippage_analysis as ssa
+from scripts.integrated_analysis.schedule_slippage_analysis import ScheduleSlippageAnalyzer
+from scripts.integrated_analysis.slippage_data import (
+    TASK_COLUMNS,
+    TASK_DATE_COLUMNS,
+    RelationshipIndex,
+    TaskSnapshotStore,
+)
+from tests.conftest import make_p6_tables
+
+
+@pytest.fixture
+def analyzer(slippage_data_dir, capsys):
+    analyzer = ScheduleSlippageAnalyzer(slippage_data_dir)
+    capsys.readouterr()
+    return analyzer
+
+
+def reference_relationships(data_dir, prev: int, curr: int) -> tuple[set, set]:
+    """Row-wise relationship diff, as previously done from taskpred.csv."""
+    tasks, taskpred = pd.read_csv(data_dir / 'task.csv'), pd.read_csv(data_dir / 'taskpred.csv')
+
+    def rel_set(fid):
+        snapshot = tasks[tasks['file_id'] == fid]
+        id_to_code = dict(zip(snapshot['task_id'].astype(str), snapshot['task_code']))
+        rels = taskpred[taskpred['file_id'] == fid]
+        return {
+            (id_to_code[str(r.pred_task_id)], id_to_code[str(r.task_id)], r.pred_type)
+            for r in rels.itertuples()
+        }
+    before, after = rel_set(prev), rel_set(curr)
+    return after - before, before - after
+
+
+@pytest.mark.parametrize('prev, curr', [(1, 2), (1, 3), (3, 1)])
+def test_compare_relationships_matches_row_wise_diff(analyzer, slippage_data_dir, prev, curr):
+    added, removed = reference_relationships(slippage_data_dir, prev, curr)
+
+    changes = analyzer._compare_relationships(prev, curr)
+
+    assert set(changes['added_relationships']) == added
+    assert set(changes['removed_relationships']) == removed
+    assert len(changes['added_relationships']) == len(added)
+    assert changes['tasks_with_new_preds'] == {succ for _, succ, _ in added}
+    assert changes['new_pred_count'] == pd.Series([succ for _, succ, _ in added]).value_counts().to_dict()
+
+
+def test_taskpred_is_read_once(analyzer, slippage_data_dir, monkeypatch):
+    reads = []
+    read_csv = pd.read_csv
+
+    def tracking(path, *args, **kwargs):
+        reads.append(str(path))
+        return read_csv(path, *args, **kwargs)
+
+    monkeypatch.setattr(pd, 'read_csv', tracking)
+    for prev, curr in [(1, 2), (2, 3)]:
+        result = analyzer.compare_schedules(prev, curr)
+        analyzer.trace_root_causes(result, curr)
+        analyzer._compare_relationships(prev, curr)
+
+    assert reads.count(str(slippage_data_dir / 'taskpred.csv')) == 1
+
+
+def test_relationship_index_drops_uncoded_tasks():
+    tasks = pd.DataFrame({
+        'task_id': ['1_1', '1_2', '1_3', '2_1', '2_2'],
+        'task_code': ['A', 'B', np.nan, 'A', 'B'],
+    })
+    taskpred = pd.DataFrame({
+        'file_id': [2, 1, 1, 1],
+        'task_id': ['2_2', '1_2', '1_3', '1_2'],
+        'pred_task_id': ['2_1', '1_1', '1_1', '1_9'],
+        'pred_type': ['PR_SS', 'PR_FS', 'PR_FS', 'PR_FS'],
+    })
+
+    index = RelationshipIndex(taskpred, tasks)
+
+    assert index.decode(index.keys(1)) == [('A', 'B', 'PR_FS')]
+    added, removed = index.diff(1, 2)
+    assert index.decode(added) == [('A', 'B', 'PR_SS')]
+    assert index.decode(removed) == [('A', 'B', 'PR_FS')]
+    assert 3 not in index and len(index.relationships(3)) == 0
+
+
+def read_tasks(path) -> pd.DataFrame:
+    """task.csv as previously loaded by the analyzer (plain dtypes)."""
+    return pd.read_csv(path, usecols=TASK_COLUMNS, parse_dates=TASK_DATE_COLUMNS)
+
+
+def test_task_store_snapshots_round_trip(slippage_data_dir):
+    tasks = read_tasks(slippage_data_dir / 'task.csv')
+    # Interleave snapshots so the store has to sort by file_id
+    tasks = tasks.sample(frac=1, random_state=0)
+
+    store = TaskSnapshotStore(tasks)
+
+    assert store.file_ids() == [1, 2, 3]
+    for file_id in (3, 1, 2):
+        expected = tasks[tasks['file_id'] == file_id].reset_index(drop=True)
+        pd.testing.assert_frame_equal(store.frame(file_id).reset_index(drop=True), expected)
+    assert len(store.frame(4)) == 0
+
+
+def test_task_store_snapshot_is_a_view(slippage_data_dir):
+    store = TaskSnapshotStore.from_csv(slippage_data_dir / 'task.csv')
+
+    snapshot = store.snapshot(2)
+
+    assert (snapshot['file_id'] == 2).all()
+    assert np.shares_memory(snapshot['early_end_date'].to_numpy(), store.df['early_end_date'].to_numpy())
+    assert isinstance(snapshot['task_code'].dtype, pd.CategoricalDtype)
+
+
+def test_task_store_memory(tmp_path):
+    """20 weekly snapshots of the same 2,000 tasks: compact store vs. plain DataFrame."""
+    task = make_p6_tables(n_tasks=2000, file_ids=(1,))['task']
+    task['target_start_date'] = task['early_start_date']
+    task['target_end_date'] = task['early_end_date']
+    pd.concat([
+        task.assign(file_id=fid, task_id=task['task_id'].str.replace('^1_', f'{fid}_', regex=True))
+        for fid in range(1, 21)
+    ]).to_csv(tmp_path / 'task.csv', index=False)
+
+    plain = read_tasks(tmp_path / 'task.csv').memory_usage(deep=True).sum()
+    compact = TaskSnapshotStore.from_csv(tmp_path / 'task.csv').df.memory_usage(deep=True).sum()
+
+    print(f"\n40,000 task rows: plain {plain / 1e6:.1f} MB, compact {compact / 1e6:.1f} MB")
+    assert compact * 2 < plain
+
+
+def assert_same_comparison(actual: dict, expected: dict):
+    pd.testing.assert_frame_equal(actual['tasks'], expected['tasks'])
+    pd.testing.assert_frame_equal(actual['new_tasks'], expected['new_tasks'])
+    assert actual['project_metrics'] == expected['project_metrics']
+    assert actual['relationship_changes'] == expected['relationship_changes']
+
+
+def test_cold_cached_run_reads_each_table_once(slippage_data_dir, monkeypatch, capsys):
+    reads = []
+    read_csv = pd.read_csv
+    monkeypatch.setattr(pd, 'read_csv', lambda path, *args, **kwargs: (
+        reads.append(Path(path).name), read_csv(path, *args, **kwargs))[1])
+
+    analyzer = ScheduleSlippageAnalyzer(slippage_data_dir)
+    for prev, curr in [(1, 2), (2, 3)]:
+        analyzer.compare_schedules(prev, curr)
+
+    assert {name: reads.count(name) for name in ('task.csv', 'taskpred.csv', 'project.csv')} \
+        == {'task.csv': 1, 'taskpred.csv': 1, 'project.csv': 1}
+
+
+def test_cached_comparison_skips_task_csv(analyzer, slippage_data_dir, monkeypatch, capsys):
+    fresh = ScheduleSlippageAnalyzer(slippage_data_dir, use_cache=False).compare_schedules(1, 2, 'a', 'b')
+    analyzer.compare_schedules(1, 2, 'a', 'b')
+    assert (analyzer.comparisons.hits, analyzer.comparisons.misses) == (0, 1)
+
+    reads = []
+    read_csv = pd.read_csv
+    monkeypatch.setattr(pd, 'read_csv', lambda path, *args, **kwargs: (
+        reads.append(str(path)), read_csv(path, *args, **kwargs))[1])
+    later = ScheduleSlippageAnalyzer(slippage_data_dir)
+    cached = later.compare_schedules(1, 2, 'a', 'b')
+
+    assert later.comparisons.hits == 1
+    assert_same_comparison(cached, fresh)
+    assert str(slippage_data_dir / 'task.csv') not in reads
+    # Different labels are a different comparison
+    later.compare_schedules(1, 2)
+    assert later.comparisons.misses == 1
+
+
+def test_comparison_cache_invalidated_by_snapshot_change(analyzer, slippage_data_dir, capsys):
+    analyzer.compare_schedules(1, 2)
+    analyzer.compare_schedules(1, 3)
+
+    tasks = pd.read_csv(slippage_data_dir / 'task.csv')
+    changed = tasks['file_id'] == 2
+    tasks.loc[changed, 'early_end_date'] = (
+        pd.to_datetime(tasks.loc[changed, 'early_end_date']) + pd.Timedelta(days=3)
+    ).dt.strftime('%Y-%m-%d %H:%M')
+    tasks.to_csv(slippage_data_dir / 'task.csv', index=False)
+
+    later = ScheduleSlippageAnalyzer(slippage_data_dir)
+    result = later.compare_schedules(1, 2)
+    later.compare_schedules(1, 3)
+
+    assert (later.comparisons.hits, later.comparisons.misses) == (1, 1)
+    fresh = ScheduleSlippageAnalyzer(slippage_data_dir, use_cache=False).compare_schedules(1, 2)
+    assert_same_comparison(result, fresh)
+
+    later.comparisons.version += 1
+    assert later.comparisons.get(1, 3) is None
+
+
+def test_month_comparisons_follow_analyze_month(analyzer):
+    months = analyzer.month_comparisons()
+
+    assert months[['month', 'file_id_prev', 'file_id_curr']].values.tolist() == [
+        ['2024-02', 1, 2], ['2024-03', 2, 3], ['2024-04', 2, 3],
+    ]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_analyze_all_months_writes_every_month(analyzer, tmp_path, capsys, workers):
+    output_dir = tmp_path / 'slippage'
+
+    summary = analyzer.analyze_all_months(output_dir=output_dir, workers=workers)
+
+    assert summary['month'].tolist() == ['2024-02', '2024-03', '2024-04']
+    assert (output_dir / 'monthly_summary.csv').exists()
+    for month in ('2024-02', '2024-03', '2024-04'):
+        year, mon = map(int, month.split('-'))
+        capsys.readouterr()
+        expected = analyzer.analyze_month(year, mon)
+        month_dir = output_dir / month
+        assert (month_dir / 'tasks.csv').read_text() == expected['tasks'].to_csv(index=False)
+        assert (month_dir / 'new_tasks.csv').read_text() == expected['new_tasks'].to_csv(index=False)
+        metrics = pd.read_csv(month_dir / 'project_metrics.csv').iloc[0]
+        assert metrics['project_slippage_days'] == expected['project_metrics']['project_slippage_days']
+        assert 'PROJECT SLIPPAGE' in (month_dir / 'slippage_report.md').read_text()
+        row = summary[summary['month'] == month].iloc[0]
+        assert (row['file_id_prev'], row['file_id_curr']) == (
+            expected['project_metrics']['file_id_prev'], expected['project_metrics']['file_id_curr'])
+
+
+def reference_root_causes(tasks_df, pred_adjacency, own_delay_threshold=0.8) -> pd.DataFrame:
+    """Recursive upstream tracing as previously done by trace_root_causes."""
+    affected_tasks = tasks_df[tasks_df['float_change_days'].fillna(0) < -1]
+    task_metrics = {}
+    for _, row in tasks_df.iterrows():
+        task_metrics[row['task_code']] = {
+            'own_delay': row.get('own_delay_days', 0) or 0,
+            'float_change': row.get('float_change_days', 0) or 0,
+            'constraint_tightened': row.get('constraint_tightened', False),
+            'has_new_predecessors': row.get('has_new_predecessors', False),
+        }
+    root_cause_cache = {}
+
+    def determine_cause_type(task_code):
+        metrics = task_metrics.get(task_code, {})
+        if metrics.get('constraint_tightened', False):
+            return 'CONSTRAINT'
+        if metrics.get('has_new_predecessors', False):
+            return 'LOGIC_CHANGE'
+        if abs(metrics.get('own_delay', 0)) > 1:
+            return 'DURATION'
+        return 'UNKNOWN'
+
+    def trace_upstream(task_code, visited=None, depth=0):
+        if visited is None:
+            visited = set()
+        if task_code in visited:
+            return (task_code, 'UNKNOWN', depth)
+        visited.add(task_code)
+        if task_code in root_cause_cache:
+            cached = root_cause_cache[task_code]
+            return (cached[0], cached[1], cached[2] + depth)
+        metrics = task_metrics.get(task_code, {})
+        own_delay = abs(metrics.get('own_delay', 0))
+        float_decrease = abs(metrics.get('float_change', 0))
+        if float_decrease > 0 and own_delay >= own_delay_threshold * float_decrease:
+            cause_type = determine_cause_type(task_code)
+            root_cause_cache[task_code] = (task_code, cause_type, 0)
+            return (task_code, cause_type, depth)
+        if metrics.get('constraint_tightened', False):
+            root_cause_cache[task_code] = (task_code, 'CONSTRAINT', 0)
+            return (task_code, 'CONSTRAINT', depth)
+        if metrics.get('has_new_predecessors', False):
+            root_cause_cache[task_code] = (task_code, 'LOGIC_CHANGE', 0)
+            return (task_code, 'LOGIC_CHANGE', depth)
+        predecessors = pred_adjacency.get(task_code, [])
+        if not predecessors:
+            cause_type = determine_cause_type(task_code)
+            root_cause_cache[task_code] = (task_code, cause_type, 0)
+            return (task_code, cause_type, depth)
+        max_pred_float_decrease = 0
+        max_pred = None
+        for pred_code in predecessors:
+            pred_float_decrease = abs(task_metrics.get(pred_code, {}).get('float_change', 0))
+            if pred_float_decrease > max_pred_float_decrease:
+                max_pred_float_decrease = pred_float_decrease
+                max_pred = pred_code
+        if max_pred and max_pred_float_decrease >= float_decrease * 0.5:
+            result = trace_upstream(max_pred, visited, depth + 1)
+            root_cause_cache[task_code] = (result[0], result[1], result[2] - depth)
+            return result
+        cause_type = determine_cause_type(task_code)
+        root_cause_cache[task_code] = (task_code, cause_type, 0)
+        return (task_code, cause_type, depth)
+
+    results = []
+    for _, row in affected_tasks.iterrows():
+        root_cause, cause_type, prop_depth = trace_upstream(row['task_code'])
+        results.append({
+            'task_code': row['task_code'],
+            'is_root_cause': root_cause == row['task_code'],
+            'root_cause_task': root_cause,
+            'cause_type': cause_type,
+            'propagation_depth': prop_depth,
+        })
+    result_df = pd.DataFrame(results)
+    counts = result_df.groupby('root_cause_task').size()
+    result_df['downstream_impact_count'] = result_df['root_cause_task'].map(lambda x: counts.get(x, 0))
+    return result_df
+
+
+def random_trace_network(n: int, seed: int = 0) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """(comparison tasks, task rows, taskpred rows): chained float loss, a few logic loops."""
+    rng = np.random.default_rng(seed)
+    codes = [f'T{i:05d}' for i in range(n)]
+    own_delay = rng.choice([0, 0, 0, 0.5, 2, 5, -3], n).astype(float)
+    own_delay[rng.random(n) < 0.03] = np.nan
+    float_change = -rng.integers(0, 12, n).astype(float)
+    float_change[rng.random(n) < 0.03] = np.nan
+    tasks_df = pd.DataFrame({
+        'task_code': codes,
+        'own_delay_days': own_delay,
+        'float_change_days': float_change,
+        'constraint_tightened': rng.random(n) < 0.03,
+        'has_new_predecessors': rng.random(n) < 0.03,
+    })
+    # Mostly short back-links (long chains); a few forward links close loops
+    succ = np.repeat(np.arange(1, n), 2)
+    pred = np.maximum(succ - rng.integers(1, 6, len(succ)), 0)
+    loops = rng.integers(0, n - 10, n // 200)
+    succ, pred = np.r_[succ, loops], np.r_[pred, loops + rng.integers(1, 10, len(loops))]
+    # Tasks outside the comparison (new in the current snapshot) still link chains
+    tasks = pd.DataFrame({'task_id': [f'9_{i}' for i in range(n + 5)],
+                          'task_code': codes + [f'N{i}' for i in range(5)]})
+    pred[:5] = n + np.arange(5)
+    taskpred = pd.DataFrame({
+        'file_id': 9,
+        'task_id': [f'9_{i}' for i in succ],
+        'pred_task_id': [f'9_{i}' for i in pred],
+        'pred_type': 'PR_FS',
+    })
+    return tasks_df, tasks, taskpred
+
+
+def test_trace_root_causes_matches_recursive_tracing(analyzer):
+    tasks_df, tasks, taskpred = random_trace_network(3000)
+    analyzer._relationships = RelationshipIndex(taskpred, tasks)
+    rels = analyzer.relationships.relationships(9).astype(object)
+    pred_adjacency = rels.groupby('task_code', sort=False)['pred_task_code'].agg(list).to_dict()
+
+    expected = reference_root_causes(tasks_df, pred_adjacency)
+    result = analyzer.trace_root_causes({'tasks': tasks_df}, 9)
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert expected['propagation_depth'].max() > 5
+    assert (~expected['is_root_cause']).sum() > 100
+    assert (expected['cause_type'] == 'UNKNOWN').any()
+
+
+def test_trace_root_causes_long_chain(analyzer):
+    """A 20,000-task chain: each task inherits its float loss from its predecessor."""
+    n = 20000
+    codes = [f'T{i:05d}' for i in range(n)]
+    tasks = pd.DataFrame({'task_id': [f'9_{i}' for i in range(n)], 'task_code': codes})
+    analyzer._relationships = RelationshipIndex(pd.DataFrame({
+        'file_id': 9,
+        'task_id': [f'9_{i}' for i in range(1, n)],
+        'pred_task_id': [f'9_{i}' for i in range(n - 1)],
+        'pred_type': 'PR_FS',
+    }), tasks)
+    tasks_df = pd.DataFrame({
+        'task_code': codes[::-1],  # trace downstream-most task first
+        'own_delay_days': [0.0] * (n - 1) + [10.0],
+        'float_change_days': -10.0,
+        'constraint_tightened': False,
+        'has_new_predecessors': False,
+    })
+
+    start = timer.perf_counter()
+    result = analyzer.trace_root_causes({'tasks': tasks_df}, 9)
+    elapsed = timer.perf_counter() - start
+
+    assert (result['root_cause_task'] == 'T00000').all()
+    assert result['propagation_depth'].tolist() == list(range(n - 1, -1, -1))
+    assert (result['downstream_impact_count'] == n).all()
+    assert result['cause_type'].iloc[-1] == 'DURATION'
+    assert elapsed < 5
+
+
+# Row-wise categorization rules as previously applied by compare_schedules
+def categorize_task(row):
+    status = row['status_curr']
+    own_delay = row['own_delay_days'] if pd.notna(row['own_delay_days']) else 0
+    inherited = row['inherited_delay_days'] if pd.notna(row['inherited_delay_days']) else 0
+    float_change = row['float_change_days'] if pd.notna(row['float_change_days']) else 0
+    finish_slip = row['finish_slip_days'] if pd.notna(row['finish_slip_days']) else 0
+
+    if status == 'TK_Complete':
+        if own_delay > ssa.OWN_DELAY_THRESHOLD_DAYS and finish_slip > 0:
+            return 'COMPLETED_DELAYER'
+        return 'COMPLETED_OK'
+    elif status == 'TK_Active':
+        if own_delay > ssa.OWN_DELAY_THRESHOLD_DAYS and finish_slip > 0:
+            return 'ACTIVE_DELAYER'
+        return 'ACTIVE_OK'
+    else:
+        if inherited > ssa.INHERITED_DELAY_THRESHOLD_DAYS:
+            return 'WAITING_INHERITED'
+        if float_change < ssa.FLOAT_SQUEEZE_THRESHOLD_DAYS:
+            return 'WAITING_SQUEEZED'
+        return 'WAITING_OK'
+
+
+def categorize_task_enhanced(row):
+    status = row['status_curr']
+    own_delay = row['own_delay_days'] if pd.notna(row['own_delay_days']) else 0
+    inherited = row['inherited_delay_days'] if pd.notna(row['inherited_delay_days']) else 0
+    float_change = row['float_change_days'] if pd.notna(row['float_change_days']) else 0
+    finish_slip = row['finish_slip_days'] if pd.notna(row['finish_slip_days']) else 0
+    float_loss_front = row.get('float_loss_from_front', 0) or 0
+    float_loss_back = row.get('float_loss_from_back', 0) or 0
+    constraint_tightened = row.get('constraint_tightened', False)
+    has_new_preds = row.get('has_new_predecessors', False)
+
+    if status == 'TK_Complete':
+        if own_delay > ssa.OWN_DELAY_THRESHOLD_DAYS and finish_slip > 0:
+            if constraint_tightened:
+                return 'CAUSE_CONSTRAINT'
+            return 'CAUSE_DURATION'
+        return 'COMPLETED_OK'
+    if status == 'TK_Active':
+        if own_delay > ssa.OWN_DELAY_THRESHOLD_DAYS and finish_slip > 0:
+            if constraint_tightened:
+                return 'CAUSE_CONSTRAINT'
+            if inherited > ssa.OWN_DELAY_THRESHOLD_DAYS:
+                return 'CAUSE_PLUS_INHERITED'
+            return 'CAUSE_DURATION'
+        return 'ACTIVE_OK'
+    if constraint_tightened and float_change < ssa.FLOAT_SQUEEZE_THRESHOLD_DAYS:
+        return 'CAUSE_CONSTRAINT'
+    if has_new_preds and inherited > ssa.INHERITED_DELAY_THRESHOLD_DAYS:
+        return 'INHERITED_LOGIC_CHANGE'
+    if float_loss_front > 1 and float_loss_back > 1:
+        return 'DUAL_SQUEEZE'
+    if float_loss_back > float_loss_front + 1 and float_change < ssa.FLOAT_SQUEEZE_THRESHOLD_DAYS:
+        return 'SQUEEZED_FROM_SUCC'
+    if inherited > ssa.INHERITED_DELAY_THRESHOLD_DAYS:
+        return 'INHERITED_FROM_PRED'
+    if float_change < ssa.FLOAT_SQUEEZE_THRESHOLD_DAYS:
+        if float_loss_back > float_loss_front:
+            return 'SQUEEZED_FROM_SUCC'
+        return 'WAITING_SQUEEZED'
+    return 'WAITING_OK'
+
+
+def classify_priority_tier(row):
+    own_delay = row['own_delay_days'] if pd.notna(row['own_delay_days']) else 0
+    float_curr_hrs = row['total_float_hr_cnt_curr']
+    float_curr = float_curr_hrs / ssa.HOURS_PER_WORKDAY if pd.notna(float_curr_hrs) else None
+    float_change = row['float_change_days'] if pd.notna(row['float_change_days']) else 0
+    on_driving = row['on_driving_path']
+
+    if float_curr is None or pd.isna(float_curr):
+        float_curr = 999
+    if on_driving and own_delay > ssa.OWN_DELAY_THRESHOLD_DAYS:
+        return 'DRIVING'
+    if float_curr <= 0:
+        return 'CRITICAL'
+    if float_curr <= ssa.TIER_NEAR_CRITICAL_FLOAT_THRESHOLD_DAYS:
+        return 'NEAR_CRITICAL'
+    if float_change < -ssa.TIER_ERODING_FLOAT_LOSS_THRESHOLD_DAYS:
+        return 'ERODING'
+    return 'BUFFERED'
+
+
+def random_common(n: int, seed: int = 0) -> pd.DataFrame:
+    """Matched-task metrics around every rule threshold, with missing values."""
+    rng = np.random.default_rng(seed)
+
+    def days(low, high, missing=0.1):
+        values = rng.integers(low, high, n).astype(float) + rng.choice([0, 0.5], n)
+        values[rng.random(n) < missing] = np.nan
+        return values
+
+    return pd.DataFrame({
+        'status_curr': rng.choice(['TK_Complete', 'TK_Active', 'TK_NotStart', None], n, p=[0.3, 0.3, 0.35, 0.05]),
+        'own_delay_days': days(-5, 6),
+        'inherited_delay_days': days(-3, 4),
+        'float_change_days': days(-12, 4),
+        'finish_slip_days': days(-3, 4),
+        'float_loss_from_front': days(0, 4),
+        'float_loss_from_back': days(0, 4),
+        'constraint_tightened': rng.random(n) < 0.2,
+        'has_new_predecessors': rng.random(n) < 0.3,
+        'total_float_hr_cnt_curr': days(-40, 200),
+        'on_driving_path': rng.random(n) < 0.2,
+    })
+
+
+def test_vectorized_categorization_matches_row_wise_rules():
+    common = random_common(20000)
+
+    assert (ssa.categorize_tasks(common) == common.apply(categorize_task, axis=1)).all()
+    assert (ssa.categorize_tasks_enhanced(common) == common.apply(categorize_task_enhanced, axis=1)).all()
+
+    tiers = ssa.classify_priority_tiers(common)
+    assert (tiers == common.apply(classify_priority_tier, axis=1)).all()
+
+    common['priority_tier'] = tiers
+    expected = common.apply(
+        lambda row: max(0, row['own_delay_days'] if pd.notna(row['own_delay_days']) else 0) *
+                    ssa.TIER_WEIGHTS.get(row['priority_tier'], 1),
+        axis=1
+    )
+    pd.testing.assert_series_equal(ssa.priority_scores(common['own_delay_days'], tiers), expected)
+
+
+def test_vectorized_categorization_covers_every_category():
+    common = random_common(20000)
+
+    assert set(ssa.categorize_tasks_enhanced(common)) == {
+        'CAUSE_DURATION', 'CAUSE_CONSTRAINT', 'INHERITED_FROM_PRED', 'INHERITED_LOGIC_CHANGE',
+        'SQUEEZED_FROM_SUCC', 'CAUSE_PLUS_INHERITED', 'DUAL_SQUEEZE', 'COMPLETED_OK',
+        'ACTIVE_OK', 'WAITING_OK', 'WAITING_SQUEEZED',
+    }
+    assert set(ssa.classify_priority_tiers(common)) == set(ssa.TIER_WEIGHTS)
+
+
+@pytest.mark.slow
+def test_categorization_benchmark():
+    """Benchmark: categorize 50,000 matched tasks, row-wise apply vs. vectorized."""
+    common = random_common(50000)
+
+    start = timer.perf_counter()
+    common.apply(categorize_task, axis=1)
+    common.apply(categorize_task_enhanced, axis=1)
+    common.apply(classify_priority_tier, axis=1)
+    row_time = timer.perf_counter() - start
+
+    start = timer.perf_counter()
+    ssa.categorize_tasks(common)
+    ssa.categorize_tasks_enhanced(common)
+    ssa.classify_priority_tiers(common)
+    vector_time = timer.perf_counter() - start
+
+    print(f"\n50,000 tasks: row-wise {row_time:.2f}s, vectorized {vector_time * 1000:.1f}ms")
+    assert vector_time < row_time / 10
@@ -0,0 +1,163 @@
+"""Tests for the per-file_id P6 schedule store."""
+
+import time as timer
+
+import pandas as pd
+import pytest
+
+from scripts.primavera.analyze.schedule_store import CalendarCache, ScheduleStore, build_calendars, parse_dates
+from scripts.primavera.analyze.cpm.calendar import WorkTimeIndex
+from tests.conftest import make_p6_tables
+
+
+class TestPartitions:
+    """Partitioned table access."""
+
+    def test_partition_matches_filtered_table(self, p6_data_dir):
+        store = ScheduleStore(p6_data_dir)
+
+        part = store.get_table('task', 2)
+        full = pd.read_csv(p6_data_dir / 'task.csv')
+
+        assert len(part) == (full['file_id'] == 2).sum()
+        assert set(part['task_id']) == set(full.loc[full['file_id'] == 2, 'task_id'])
+        assert store.file_ids() == [1, 2, 3]
+
+    def test_partitions_persist_across_instances(self, p6_data_dir):
+        ScheduleStore(p6_data_dir).get_table('task', 1)
+        manifest = p6_data_dir / '_cache' / 'schedule_store' / 'task' / 'manifest.json'
+        mtime = manifest.stat().st_mtime_ns
+
+        ScheduleStore(p6_data_dir).get_table('task', 1)
+
+        assert manifest.stat().st_mtime_ns == mtime
+
+    def test_partitions_rebuilt_when_source_changes(self, p6_data_dir):
+        store = ScheduleStore(p6_data_dir)
+        assert store.file_ids() == [1, 2, 3]
+
+        full = pd.read_csv(p6_data_dir / 'task.csv')
+        full[full['file_id'] != 3].to_csv(p6_data_dir / 'task.csv', index=False)
+
+        assert ScheduleStore(p6_data_dir).file_ids() == [1, 2]
+
+    def test_missing_file_id_returns_empty(self, p6_data_dir):
+        assert len(ScheduleStore(p6_data_dir).get_table('task', 99)) == 0
+
+
+class TestLoadSchedule:
+    """Built schedules and the LRU."""
+
+    def test_load_schedule(self, p6_data_dir):
+        network, calendars, info = ScheduleStore(p6_data_dir).load_schedule(2)
+
+        assert len(network.tasks) == 61
+        assert len(calendars) == 3
+        assert info['data_date'] == pd.Timestamp('2024-03-11 08:00')
+        task = network.tasks['2_1000']
+        assert task.task_code == 'CN.T0000'
+        assert task.calendar_id.startswith('2_')
+
+    def test_cached_loads_are_independent_copies(self, p6_data_dir):
+        store = ScheduleStore(p6_data_dir)
+        first, _, _ = store.load_schedule(1)
+        first.modify_task_duration('1_1000', 999.0)
+
+        second, _, _ = store.load_schedule(1)
+
+        assert second.tasks['1_1000'].duration_hours != 999.0
+        assert len(store._schedules) == 1
+
+    def test_lru_evicts_oldest(self, p6_data_dir):
+        store = ScheduleStore(p6_data_dir, max_cached_schedules=2)
+        for file_id in (1, 2, 3):
+            store.load_schedule(file_id)
+
+        assert [key[0] for key in store._schedules] == [2, 3]
+
+
+class TestCalendarCache:
+    """Calendars interned by content across versions."""
+
+    def test_identical_calendars_parsed_once_and_shared(self, p6_data_dir):
+        store = ScheduleStore(p6_data_dir)
+        _, first, _ = store.load_schedule(1)
+        _, second, _ = store.load_schedule(2)
+
+        assert store.calendars.parsed == 3
+        assert sorted(second) == ['2_100', '2_101', '2_102']
+        std1, std2 = first['1_100'], second['2_100']
+        assert (std1.clndr_id, std1.clndr_name, std2.clndr_id) == ('1_100', 'std', '2_100')
+        assert std1._work_index is not None and std1._work_index is std2._work_index
+
+    def test_interned_calendars_match_fresh_parse(self, p6_data_dir):
+        table = ScheduleStore(p6_data_dir).get_table('calendar', 3)
+
+        assert build_calendars(table, CalendarCache()) == build_calendars(table)
+
+    def test_calendars_and_indexes_persist_across_instances(self, p6_data_dir):
+        ScheduleStore(p6_data_dir).load_schedule(1)
+
+        store = ScheduleStore(p6_data_dir)
+        _, calendars, _ = store.load_schedule(3)
+
+        assert store.calendars.parsed == 0
+        assert calendars['3_100']._work_index is not None
+        assert calendars['3_100'].add_work_hours(pd.Timestamp('2024-03-04 08:00').to_pydatetime(), 8) \
+            == pd.Timestamp('2024-03-04 17:00')
+
+    def test_grown_index_is_saved_again(self, tmp_path):
+        cache = CalendarCache(tmp_path)
+        std = cache.get('a', '', 8.0)
+        assert cache.save() == 1 and cache.save() == 0
+
+        std._get_work_index(pd.Timestamp('2024-01-01').date())
+        assert cache.save() == 1
+
+    def test_index_version_change_skips_pickled_calendars(self, tmp_path, monkeypatch):
+        first = CalendarCache(tmp_path)
+        first.get('a', '', 8.0)
+        first.save()
+        reloaded = CalendarCache(tmp_path)
+        reloaded.get('a', '', 8.0)
+        assert reloaded.parsed == 0
+
+        monkeypatch.setattr(WorkTimeIndex, 'VERSION', WorkTimeIndex.VERSION + 1)
+        cache = CalendarCache(tmp_path)
+        cache.get('a', '', 8.0)
+        assert cache.parsed == 1
+
+
+@pytest.mark.slow
+def test_calendar_cache_benchmark(tmp_path):
+    """Benchmark: loading calendars of 150 versions, parsed per version vs. interned."""
+    tables = make_p6_tables(n_tasks=5, file_ids=range(1, 151))
+    for table, df in tables.items():
+        df.to_csv(tmp_path / f'{table}.csv', index=False)
+    store = ScheduleStore(tmp_path)
+    parts = [store.get_table('calendar', fid) for fid in store.file_ids('calendar')]
+
+    start = timer.perf_counter()
+    for part in parts:
+        build_calendars(part)
+    parse_time = timer.perf_counter() - start
+
+    cache = CalendarCache()
+    start = timer.perf_counter()
+    for part in parts:
+        build_calendars(part, cache)
+    interned_time = timer.perf_counter() - start
+
+    print(f"\nCalendars of 150 versions: parsed {parse_time:.3f}s, interned {interned_time:.3f}s")
+    assert cache.parsed == 3
+    assert interned_time < parse_time
+
+
+def test_parse_dates_matches_scalar_parsing():
+    values = pd.Series(['2024-01-15 08:00', '', None, '01/02/2024', 'garbage'], dtype=object)
+
+    parsed = parse_dates(values)
+
+    assert parsed[0] == pd.Timestamp('2024-01-15 08:00')
+    assert parsed[1] is None and parsed[2] is None and parsed[4] is None
+    assert parsed[3] == pd.to_datetime('01/02/2024')
@@ -0,0 +1,100 @@
+"""Tests for shared-baseline and parallel task sensitivity sweeps."""
+
+import time as timer
+
+import pytest
+
+from scripts.primavera.analyze.analysis.single_task_impact import (
+    analyze_task_impact,
+    analyze_task_sensitivity,
+    iter_ranked_sensitivity,
+    iter_task_sensitivity,
+)
+from scripts.primavera.analyze.cpm.incremental import IncrementalCPM
+from scripts.primavera.analyze.schedule_store import ScheduleStore
+from tests.conftest import make_p6_tables
+
+
+def reference_sensitivity(network, calendars, task_ids, data_date):
+    """One analyze_task_impact call (with its own baseline CPM) per task."""
+    return {tid: analyze_task_impact(network, calendars, tid, 40.0, data_date=data_date) for tid in task_ids}
+
+
+@pytest.fixture
+def schedule(p6_data_dir):
+    network, calendars, info = ScheduleStore(p6_data_dir).load_schedule(1)
+    task_ids = [t.task_id for t in network.tasks.values() if not t.is_completed() and t.duration_hours > 0]
+    return network, calendars, info['data_date'], task_ids
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_sweep_matches_per_task_impact(schedule, workers):
+    network, calendars, data_date, task_ids = schedule
+    expected = reference_sensitivity(network, calendars, task_ids[:24], data_date)
+
+    streamed = list(iter_task_sensitivity(network, calendars, task_ids[:24], data_date=data_date,
+                                          workers=workers, chunk_size=5))
+
+    assert sorted(r.task_id for r in streamed) == sorted(expected)
+    for result in streamed:
+        assert result == expected[result.task_id]
+
+
+def test_ranked_and_failing_tasks_skipped(schedule):
+    network, calendars, data_date, task_ids = schedule
+
+    results = analyze_task_sensitivity(network, calendars, task_ids[:10] + ['missing'], data_date=data_date)
+
+    assert len(results) == 10
+    assert [r.slip_hours for r in results] == sorted((r.slip_hours for r in results), reverse=True)
+
+
+def test_ranking_streams_after_each_chunk(schedule):
+    network, calendars, data_date, task_ids = schedule
+    expected = analyze_task_sensitivity(network, calendars, task_ids[:12], data_date=data_date)
+
+    rankings = list(iter_ranked_sensitivity(network, calendars, task_ids[:12], data_date=data_date,
+                                            workers=1, chunk_size=5))
+    top = list(iter_ranked_sensitivity(network, calendars, task_ids[:12], data_date=data_date,
+                                       workers=1, chunk_size=5, top_n=3))
+
+    assert [len(r) for r in rankings] == [5, 10, 12]
+    for ranking in rankings:
+        assert [r.slip_hours for r in ranking] == sorted((r.slip_hours for r in ranking), reverse=True)
+    assert rankings[-1] == expected
+    assert top[-1] == expected[:3]
+
+
+def test_baseline_of_another_network_raises(schedule, p6_data_dir):
+    network, calendars, data_date, task_ids = schedule
+    other, other_calendars, _ = ScheduleStore(p6_data_dir).load_schedule(1)
+    baseline = IncrementalCPM(other, other_calendars, data_date=data_date)
+
+    with pytest.raises(ValueError, match='different network'):
+        analyze_task_impact(network, calendars, task_ids[0], 40.0, baseline=baseline)
+    with pytest.raises(ValueError, match='different network'):
+        analyze_task_sensitivity(network, calendars, task_ids[:2], baseline=baseline)
+
+
+@pytest.mark.slow
+def test_sensitivity_sweep_benchmark(tmp_path):
+    """Benchmark: per-task baseline CPM vs. shared baseline, serial and pooled."""
+    for table, df in make_p6_tables(n_tasks=1500, file_ids=(1,)).items():
+        df.to_csv(tmp_path / f'{table}.csv', index=False)
+    network, calendars, info = ScheduleStore(tmp_path).load_schedule(1)
+    data_date = info['data_date']
+    task_ids = [t.task_id for t in network.tasks.values() if t.is_not_started()][:40]
+
+    start = timer.perf_counter()
+    reference_sensitivity(network, calendars, task_ids, data_date)
+    per_task_time = timer.perf_counter() - start
+
+    timings = {}
+    for workers in (1, 4):
+        start = timer.perf_counter()
+        analyze_task_sensitivity(network, calendars, task_ids, data_date=data_date, workers=workers)
+        timings[workers] = timer.perf_counter() - start
+
+    print(f"\n40-task sweep: per-task baseline {per_task_time:.2f}s, shared baseline {timings[1]:.2f}s, "
+          f"4 workers {timings[4]:.2f}s")
+    assert timings[1] < per_task_time
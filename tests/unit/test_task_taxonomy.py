@@ -0,0 +1,240 @@
+"""Tests for task taxonomy generation."""
+
+import time as timer
+
+import pandas as pd
+import pytest
+
+from scripts.integrated_analysis import add_csi_to_p6_tasks as csi
+from scripts.primavera.derive import generate_task_taxonomy as gtt
+from scripts.shared.pipeline_utils import write_fact_and_quality
+from task_taxonomy import InferenceMemo, infer_all_fields, inference_keys
+from task_taxonomy.context import ACTIVITY_CODE_COLUMNS, build_activity_code_lookup
+from task_taxonomy import memo as memo_module
+from tests.conftest import make_taxonomy_tables
+
+
+def build_context(tables: dict) -> pd.DataFrame:
+    return gtt.build_task_context(
+        tasks_df=tables['task'],
+        wbs_df=tables['projwbs'],
+        taskactv_df=tables['taskactv'],
+        actvcode_df=tables['actvcode'],
+        actvtype_df=tables['actvtype'],
+        verbose=False,
+    )
+
+
+def row_wise_taxonomy(context: pd.DataFrame) -> pd.DataFrame:
+    """Taxonomy as previously generated: infer_all_fields on every row."""
+    return pd.DataFrame([infer_all_fields(row) for _, row in context.iterrows()])
+
+
+@pytest.fixture
+def inference_calls(monkeypatch):
+    calls = []
+
+    def counting(row, gridline_mapping=None):
+        calls.append(row['task_id'])
+        return infer_all_fields(row, gridline_mapping=gridline_mapping)
+
+    monkeypatch.setattr(memo_module, 'infer_all_fields', counting)
+    return calls
+
+
+def test_generate_taxonomy_matches_row_wise_inference(gridline_mapping, inference_calls):
+    context = build_context(make_taxonomy_tables())
+
+    taxonomy = gtt.generate_taxonomy(context, verbose=False)
+
+    pd.testing.assert_frame_equal(taxonomy, row_wise_taxonomy(context))
+    assert len(inference_calls) == len(set(inference_keys(context)))
+    assert len(inference_calls) < len(context) / 2
+
+
+def test_inference_memo_only_infers_new_keys(gridline_mapping, inference_calls, tmp_path, monkeypatch):
+    memo_path = tmp_path / 'inference_memo.pkl'
+    gtt.generate_taxonomy(build_context(make_taxonomy_tables(file_ids=(1, 2))), verbose=False,
+                          memo=InferenceMemo(memo_path))
+    first_run = len(inference_calls)
+
+    # A later export adds a version: only its new task contexts are inferred
+    context = build_context(make_taxonomy_tables(file_ids=(1, 2, 3)))
+    inference_calls.clear()
+    taxonomy = gtt.generate_taxonomy(context, verbose=False, memo=InferenceMemo(memo_path))
+
+    pd.testing.assert_frame_equal(taxonomy, row_wise_taxonomy(context))
+    assert 0 < len(inference_calls) == len(set(inference_keys(context))) - first_run
+
+    # New inference rules invalidate the memo
+    monkeypatch.setattr(memo_module, 'INFERENCE_VERSION', memo_module.INFERENCE_VERSION + 1)
+    inference_calls.clear()
+    gtt.generate_taxonomy(context, verbose=False, memo=InferenceMemo(memo_path))
+    assert len(inference_calls) == len(set(inference_keys(context)))
+
+
+def row_wise_activity_codes(tables: dict) -> dict:
+    """Task -> {code type: value} as previously built, one taskactv row at a time."""
+    type_lookup = dict(zip(tables['actvtype']['actv_code_type_id'], tables['actvtype']['actv_code_type']))
+    code_lookup = dict(zip(tables['actvcode']['actv_code_id'], tables['actvcode']['actv_code_name']))
+    code_to_type = {
+        code_id: type_lookup[type_id]
+        for code_id, type_id in zip(tables['actvcode']['actv_code_id'], tables['actvcode']['actv_code_type_id'])
+        if type_id in type_lookup
+    }
+    lookup = {}
+    for task_id, code_id in zip(tables['taskactv']['task_id'], tables['taskactv']['actv_code_id']):
+        code_type, code_value = code_to_type.get(code_id), code_lookup.get(code_id)
+        if code_type in ACTIVITY_CODE_COLUMNS and code_value:
+            lookup.setdefault(task_id, {})[code_type] = code_value
+    return lookup
+
+
+def test_task_context_activity_codes_match_row_wise_lookup():
+    tables = make_taxonomy_tables()
+    # Repeated and empty assignments: the last non-empty one wins
+    taskactv = tables['taskactv']
+    tables['taskactv'] = pd.concat([taskactv, taskactv.sample(frac=0.2, random_state=0)], ignore_index=True)
+    tables['actvcode'].loc[tables['actvcode'].index[::7], 'actv_code_name'] = ''
+
+    expected = row_wise_activity_codes(tables)
+    assert build_activity_code_lookup(tables['taskactv'], tables['actvcode'], tables['actvtype']) == expected
+
+    context = build_context(tables)
+    for code_type, column in ACTIVITY_CODE_COLUMNS.items():
+        assert context[column].tolist() == [expected.get(t, {}).get(code_type) for t in context['task_id']]
+
+
+def test_write_taxonomy_chunks_match_single_write(gridline_mapping, tmp_path, monkeypatch):
+    context = build_context(make_taxonomy_tables())
+    taxonomy = gtt.generate_taxonomy(context, verbose=False)
+    fact_rows, _ = write_fact_and_quality(
+        df=taxonomy,
+        primary_key='task_id',
+        quality_columns=gtt.P6_TAXONOMY_DATA_QUALITY_COLUMNS,
+        fact_path=tmp_path / 'single.csv',
+        quality_path=tmp_path / 'single_quality.csv',
+    )
+
+    # Several inference chunks so they run on the process pool
+    monkeypatch.setattr(memo_module, 'INFERENCE_CHUNK_SIZE', 50)
+    summary, stats = gtt.write_taxonomy(
+        context,
+        fact_path=tmp_path / 'chunked.csv',
+        quality_path=tmp_path / 'chunked_quality.csv',
+        workers=2,
+        chunk_size=97,
+        add_location_id=False,
+        verbose=False,
+    )
+
+    assert (tmp_path / 'chunked.csv').read_bytes() == (tmp_path / 'single.csv').read_bytes()
+    assert (tmp_path / 'chunked_quality.csv').read_bytes() == (tmp_path / 'single_quality.csv').read_bytes()
+    assert summary['tasks'] == fact_rows == len(context)
+    assert stats == gtt.source_statistics(row_wise_taxonomy(context))
+    expected = gtt.summary_counts(taxonomy)
+    assert summary.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, pd.Series):
+            pd.testing.assert_series_equal(summary[key].sort_index(), value.sort_index(), check_dtype=False)
+        else:
+            assert summary[key] == value, key
+
+
+def update_taxonomy(tables: dict, output_dir, **kwargs):
+    return gtt.update_taxonomy(
+        tables['task'], tables['projwbs'], tables['xer_files'],
+        tables['taskactv'], tables['actvcode'], tables['actvtype'],
+        fact_path=output_dir / 'primavera' / 'p6_task_taxonomy.csv',
+        quality_path=output_dir / 'primavera' / 'p6_task_taxonomy_data_quality.csv',
+        add_location_id=False,
+        verbose=False,
+        **kwargs,
+    )
+
+
+def test_incremental_taxonomy_appends_new_versions(gridline_mapping, tmp_path, monkeypatch):
+    full_dir, incremental_dir = tmp_path / 'full', tmp_path / 'incremental'
+    tables = make_taxonomy_tables(file_ids=(1, 2, 3))
+    update_taxonomy(tables, full_dir)
+
+    update_taxonomy(make_taxonomy_tables(file_ids=(1, 2)), incremental_dir, incremental=True)
+    summary, _ = update_taxonomy(tables, incremental_dir, incremental=True)
+
+    assert summary['tasks'] == (tables['task']['file_id'] == 3).sum()
+    for name in ('p6_task_taxonomy.csv', 'p6_task_taxonomy_data_quality.csv'):
+        assert (incremental_dir / 'primavera' / name).read_bytes() == (full_dir / 'primavera' / name).read_bytes()
+    assert update_taxonomy(tables, incremental_dir, incremental=True) is None
+
+    # A file_id now naming another XER (re-parse) and new inference rules force a rebuild
+    renamed = dict(tables, xer_files=tables['xer_files'].assign(filename=lambda f: f['filename'] + '.new'))
+    summary, _ = update_taxonomy(renamed, incremental_dir, incremental=True)
+    assert summary['tasks'] == len(tables['task'])
+    monkeypatch.setattr(gtt, 'INFERENCE_VERSION', gtt.INFERENCE_VERSION + 1)
+    summary, _ = update_taxonomy(renamed, incremental_dir, incremental=True)
+    assert summary['tasks'] == len(tables['task'])
+
+    # So does a taxonomy written by another step
+    fact_path = incremental_dir / 'primavera' / 'p6_task_taxonomy.csv'
+    pd.read_csv(fact_path).to_csv(fact_path, index=False)
+    summary, _ = update_taxonomy(renamed, incremental_dir, incremental=True)
+    assert summary['tasks'] == len(tables['task'])
+
+
+def test_incremental_csi_only_infers_new_versions(gridline_mapping, tmp_path, monkeypatch):
+    tables = make_taxonomy_tables(file_ids=(1, 2, 3))
+    tables['task'].to_csv(tmp_path / 'task.csv', index=False)
+    monkeypatch.setattr(csi.settings, 'PRIMAVERA_PROCESSED_DIR', tmp_path)
+    calls = []
+
+    def counting(task_name, sub_trade, scope):
+        calls.append(task_name)
+        return infer_csi(task_name, sub_trade, scope)
+
+    infer_csi = csi.infer_csi_from_taxonomy
+    monkeypatch.setattr(csi, 'infer_csi_from_taxonomy', counting)
+
+    full_dir, incremental_dir = tmp_path / 'full', tmp_path / 'incremental'
+    update_taxonomy(tables, full_dir)
+    csi.add_csi_to_p6_tasks(staging_dir=full_dir)
+
+    update_taxonomy(make_taxonomy_tables(file_ids=(1, 2)), incremental_dir, incremental=True)
+    csi.add_csi_to_p6_tasks(staging_dir=incremental_dir, incremental=True)
+    update_taxonomy(tables, incremental_dir, incremental=True)
+    calls.clear()
+    csi.add_csi_to_p6_tasks(staging_dir=incremental_dir, incremental=True)
+
+    assert len(calls) == (tables['task']['file_id'] == 3).sum()
+    fact_path = incremental_dir / 'primavera' / 'p6_task_taxonomy.csv'
+    assert fact_path.read_bytes() == (full_dir / 'primavera' / 'p6_task_taxonomy.csv').read_bytes()
+
+    # Nothing new: no inference, the taxonomy state survives the CSI rewrite
+    calls.clear()
+    csi.add_csi_to_p6_tasks(staging_dir=incremental_dir, incremental=True)
+    assert calls == []
+    assert update_taxonomy(tables, incremental_dir, incremental=True) is None
+
+
+def test_csi_file_ids_tolerate_unprefixed_task_ids():
+    file_ids = csi.task_file_ids(pd.Series(['12_34', '7_1_2', 'orphan', None]))
+
+    assert file_ids.iloc[:2].tolist() == [12, 7]
+    assert file_ids.iloc[2:].isna().all()
+
+
+@pytest.mark.slow
+def test_generate_taxonomy_benchmark(gridline_mapping):
+    """Benchmark: 20 versions of 1,000 tasks, row-wise vs. deduplicated inference."""
+    context = build_context(make_taxonomy_tables(n_tasks=1000, file_ids=tuple(range(1, 21))))
+
+    start = timer.perf_counter()
+    expected = row_wise_taxonomy(context)
+    row_wise_time = timer.perf_counter() - start
+
+    start = timer.perf_counter()
+    taxonomy = gtt.generate_taxonomy(context, verbose=False)
+    dedup_time = timer.perf_counter() - start
+
+    print(f"\n{len(context):,} tasks: row-wise {row_wise_time:.2f}s, deduplicated {dedup_time:.2f}s")
+    pd.testing.assert_frame_equal(taxonomy, expected)
+    assert dedup_time * 3 < row_wise_time
@@ -0,0 +1,55 @@
+"""Tests for all-versions CPM validation with cached per-version results."""
+
+import pandas as pd
+import pytest
+
+from scripts.primavera.analyze import validate_cpm as vc
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Record which file_ids are actually validated (in-process runs only)."""
+    validated = []
+    original = vc._validate_summary_row
+
+    def tracking(file_id, engine, data_dir):
+        validated.append(file_id)
+        return original(file_id, engine, data_dir)
+
+    monkeypatch.setattr(vc, '_validate_summary_row', tracking)
+    return validated
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_validate_all_matches_single_version_runs(p6_data_dir, workers):
+    expected = [vc.validate_cpm(fid, verbose=False, data_dir=p6_data_dir).get_summary_row()
+                for fid in (1, 2, 3)]
+
+    summary = vc.validate_all(data_dir=p6_data_dir, workers=workers, verbose=False)
+
+    assert list(summary.columns) == vc.SUMMARY_COLUMNS
+    assert summary.to_dict('records') == expected
+
+
+def test_only_new_or_changed_versions_are_revalidated(p6_data_dir, calls, monkeypatch):
+    first = vc.validate_all(data_dir=p6_data_dir, workers=1, verbose=False)
+    assert calls == [1, 2, 3]
+
+    calls.clear()
+    assert vc.validate_all(data_dir=p6_data_dir, workers=1, verbose=False).equals(first)
+    assert calls == []
+
+    task = pd.read_csv(p6_data_dir / 'task.csv')
+    task.loc[task.index[task['file_id'] == 2][-1], 'target_drtn_hr_cnt'] += 80
+    task.to_csv(p6_data_dir / 'task.csv', index=False)
+    vc.validate_all(data_dir=p6_data_dir, workers=1, verbose=False)
+    assert calls == [2]
+
+    calls.clear()
+    monkeypatch.setitem(vc.ENGINE_VERSIONS, 'cpm', vc.ENGINE_VERSIONS['cpm'] + 1)
+    vc.validate_all(data_dir=p6_data_dir, workers=1, verbose=False)
+    assert calls == [1, 2, 3]
+
+    calls.clear()
+    vc.validate_all(data_dir=p6_data_dir, workers=1, verbose=False, use_cache=False)
+    assert calls == [1, 2, 3]
@@ -0,0 +1,85 @@
+"""Tests for vectorized WBS tier expansion."""
+
+import numpy as np
+import pandas as pd
+
+from scripts.primavera.derive.build_wbs_hierarchy import (
+    add_tier_columns,
+    build_hierarchy_tree,
+    build_tier_columns,
+    get_ancestors,
+    get_tier_label,
+)
+
+
+def make_wbs(seed: int = 0) -> pd.DataFrame:
+    """Two files of random WBS trees, with a cycle, a deep chain and odd names."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for file_id in (2, 1):
+        for i in range(80):
+            parent = f'{file_id}_{rng.integers(0, i)}' if i else ''
+            rows.append({
+                'file_id': file_id,
+                'wbs_id': f'{file_id}_{i}',
+                'parent_wbs_id': parent,
+                'wbs_short_name': rng.choice(['SN', 'Same']),
+                'wbs_name': rng.choice(['SAMSUNG-TFAB1', 'Level 1', 'Same', 'x' * 60, '']),
+            })
+        # Cycle between two nodes and a chain deeper than the ancestor cap
+        rows.append({'file_id': file_id, 'wbs_id': f'{file_id}_c1', 'parent_wbs_id': f'{file_id}_c2',
+                     'wbs_short_name': 'C1', 'wbs_name': 'Cycle 1'})
+        rows.append({'file_id': file_id, 'wbs_id': f'{file_id}_c2', 'parent_wbs_id': f'{file_id}_c1',
+                     'wbs_short_name': 'C2', 'wbs_name': 'Cycle 2'})
+        for i in range(12):
+            rows.append({'file_id': file_id, 'wbs_id': f'{file_id}_d{i}',
+                         'parent_wbs_id': f'{file_id}_d{i - 1}' if i else '',
+                         'wbs_short_name': f'D{i}', 'wbs_name': f'Deep {i}'})
+    return pd.DataFrame(rows)
+
+
+def reference_tiers(wbs_df: pd.DataFrame, num_tiers: int = 6) -> pd.DataFrame:
+    """Row-wise tier columns built from the scalar tree helpers."""
+    results = []
+    for file_id in wbs_df['file_id'].unique():
+        file_wbs = wbs_df[wbs_df['file_id'] == file_id]
+        tree = build_hierarchy_tree(file_wbs)
+        for wbs_id in file_wbs['wbs_id']:
+            ancestors = get_ancestors(wbs_id, tree)
+            row = {'wbs_id': wbs_id, 'depth': len(ancestors) - 1}
+            for i in range(num_tiers):
+                row[f'tier_{i + 1}'] = get_tier_label(ancestors[i]) if i < len(ancestors) else None
+            results.append(row)
+    return pd.DataFrame(results)
+
+
+def test_build_tier_columns_matches_rowwise():
+    wbs = make_wbs()
+
+    result = build_tier_columns(wbs, verbose=False)
+
+    pd.testing.assert_frame_equal(result, reference_tiers(wbs))
+
+
+def test_depth_is_capped_for_cycles_and_deep_chains():
+    wbs = make_wbs()
+
+    result = build_tier_columns(wbs, verbose=False).set_index('wbs_id')
+
+    assert result.loc['1_c1', 'depth'] == 9
+    assert result.loc['1_d11', 'depth'] == 9
+    assert result.loc['1_d11', 'tier_1'] == 'Deep 2'
+    assert result.loc['1_0', 'depth'] == 0
+
+
+def test_add_tier_columns_replaces_existing_columns():
+    wbs = make_wbs()
+    wbs['depth'] = -1
+    wbs['tier_1'] = 'stale'
+
+    result = add_tier_columns(wbs)
+
+    assert list(result.columns[-7:]) == ['depth'] + [f'tier_{i}' for i in range(1, 7)]
+    assert len(result) == len(wbs)
+    assert (result['depth'] >= 0).all()
+    assert 'stale' not in set(result['tier_1'])